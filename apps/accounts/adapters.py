@@ -0,0 +1,41 @@
+from allauth.account.adapter import DefaultAccountAdapter
+from allauth.core import context as allauth_context
+from django.contrib.sites.shortcuts import get_current_site
+
+from apps.notificaciones.services import CorreoService
+from core.utils import get_client_ip
+
+from .services import IntentosLoginService
+
+
+class AccountAdapter(DefaultAccountAdapter):
+    """
+    Adapter de allauth que encola los correos en la bandeja de salida y
+    bloquea los logins de usuarios o IPs con demasiados intentos fallidos.
+
+    El formulario de restablecer contraseña responde sin esperar al servidor
+    SMTP; el comando `enviar_correos` hace la entrega.
+    """
+
+    def pre_authenticate(self, request, **credentials):
+        """Rechaza el intento antes de verificar la contraseña si está bloqueado."""
+        username = credentials.get("username") or credentials.get("email") or ""
+        ip = get_client_ip(request)
+        service = IntentosLoginService()
+        if service.esta_bloqueado(username, ip):
+            service.registrar_fallido(
+                username, ip, request.META.get("HTTP_USER_AGENT", ""), bloqueado=True
+            )
+            raise self.validation_error("too_many_login_attempts")
+        super().pre_authenticate(request, **credentials)
+
+    def send_mail(self, template_prefix: str, email: str, context: dict) -> None:
+        request = allauth_context.request
+        ctx = {
+            "request": request,
+            "email": email,
+            "current_site": get_current_site(request),
+        }
+        ctx.update(context)
+        mensaje = self.render_mail(template_prefix, email, ctx)
+        CorreoService().encolar_mensaje(mensaje)
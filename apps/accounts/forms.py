@@ -3,7 +3,8 @@ from allauth.account.forms import LoginForm, SignupForm, ChangePasswordForm, Res
 from django.contrib.auth.forms import AuthenticationForm
 from django import forms
 from django.contrib.auth.models import User
-from .models import AuthEstado
+from .models import AuthEstado, AuthLogAccion
+from .services import PermisosService
 
 
 class UserLoginForm(LoginForm):
@@ -254,7 +255,7 @@ class UserPasswordChangeForm(forms.Form):
 
 # ========== FORMULARIOS DE GESTIÓN DE GRUPOS/ROLES ==========
 
-from django.contrib.auth.models import Group, Permission
+from django.contrib.auth.models import Group
 
 class GroupForm(forms.ModelForm):
     """Formulario para crear/editar grupos (roles)."""
@@ -272,25 +273,51 @@ class GroupForm(forms.ModelForm):
         }
 
 
-class GroupPermissionsForm(forms.ModelForm):
-    """Formulario para asignar permisos a un grupo."""
-    permissions = forms.ModelMultipleChoiceField(
-        queryset=Permission.objects.all(),
-        widget=forms.CheckboxSelectMultiple,
-        required=False,
-        label='Permisos'
-    )
+class PermisosArbolForm(forms.Form):
+    """
+    Base de los formularios de asignación de permisos.
 
-    class Meta:
-        model = Group
-        fields = ['permissions']
+    Las opciones salen del árbol de permisos en caché (sin consultar
+    Permission) y al guardar solo se agregan o quitan las diferencias con
+    los permisos actuales de la instancia.
+    """
+    campo = None
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, instance=None, **kwargs):
         super().__init__(*args, **kwargs)
-        # Organizar permisos por app/modelo
-        self.fields['permissions'].queryset = Permission.objects.select_related(
-            'content_type'
-        ).order_by('content_type__app_label', 'content_type__model', 'codename')
+        self.instance = instance
+        self.service = PermisosService()
+        self.fields[self.campo] = forms.TypedMultipleChoiceField(
+            choices=[
+                (permiso['id'], permiso['codename'])
+                for app in self.service.arbol() for modelo in app['modelos'] for permiso in modelo['permisos']
+            ],
+            coerce=int, required=False, label='Permisos'
+        )
+        self.agregados, self.quitados = set(), set()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        cleaned_data[self.campo] = set(cleaned_data.get(self.campo) or [])
+        return cleaned_data
+
+    def _relacion(self):
+        return getattr(self.instance, self.campo)
+
+    def asignados(self) -> set:
+        """IDs de los permisos actuales de la instancia (para marcar los checkboxes)."""
+        return self.service.ids_asignados(self._relacion())
+
+    def save(self):
+        self.agregados, self.quitados = self.service.guardar(
+            self._relacion(), self.cleaned_data[self.campo]
+        )
+        return self.instance
+
+
+class GroupPermissionsForm(PermisosArbolForm):
+    """Formulario para asignar permisos a un grupo."""
+    campo = 'permissions'
 
 
 class UserGroupsForm(forms.ModelForm):
@@ -307,25 +334,9 @@ class UserGroupsForm(forms.ModelForm):
         fields = ['groups']
 
 
-class UserPermissionsForm(forms.ModelForm):
+class UserPermissionsForm(PermisosArbolForm):
     """Formulario para asignar permisos específicos a un usuario."""
-    user_permissions = forms.ModelMultipleChoiceField(
-        queryset=Permission.objects.all(),
-        widget=forms.CheckboxSelectMultiple,
-        required=False,
-        label='Permisos del Usuario'
-    )
-
-    class Meta:
-        model = User
-        fields = ['user_permissions']
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Organizar permisos por app/modelo
-        self.fields['user_permissions'].queryset = Permission.objects.select_related(
-            'content_type'
-        ).order_by('content_type__app_label', 'content_type__model', 'codename')
+    campo = 'user_permissions'
 
 
 # ========== FORMULARIOS DE FILTROS ==========
@@ -371,4 +382,50 @@ class UserFilterForm(forms.Form):
     )
 
 
-
+class AuditoriaFilterForm(forms.Form):
+    """Formulario de filtros del navegador de logs de auditoría."""
+    usuario = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Nombre de usuario'}),
+        label='Usuario'
+    )
+    accion = forms.ModelChoiceField(
+        queryset=AuthLogAccion.objects.order_by('glosa'),
+        required=False,
+        empty_label='Todas las acciones',
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Acción'
+    )
+    desde = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+        label='Desde'
+    )
+    hasta = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+        label='Hasta'
+    )
+    texto = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Palabras en la descripción'}),
+        label='Texto'
+    )
+    referencia_tipo = forms.ChoiceField(
+        required=False,
+        choices=[
+            ('', 'Cualquier objeto'),
+            ('activo', 'Activo'),
+            ('solicitud', 'Solicitud'),
+            ('toma', 'Toma de inventario'),
+            ('usuario', 'Usuario'),
+            ('grupo', 'Grupo/Rol'),
+        ],
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Objeto'
+    )
+    referencia_valor = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Código, número o ID'}),
+        label='Código'
+    )
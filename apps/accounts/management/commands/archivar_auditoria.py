@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.accounts.repositories import AuthLogsRepository
+from apps.accounts.services import AuditoriaArchivoService
+
+
+class Command(BaseCommand):
+    help = (
+        'Mueve los logs de auditoría (AuthLogs) más antiguos que el período de '
+        'retención a archivos JSONL comprimidos por día bajo MEDIA_ROOT y los '
+        'elimina de la tabla por bloques. Pensado para ejecutarse desde cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias', type=int, default=settings.AUDITORIA_RETENCION_DIAS,
+            help='Días que se conservan en la tabla (default: AUDITORIA_RETENCION_DIAS)'
+        )
+        parser.add_argument(
+            '--lote', type=int, default=1000,
+            help='Logs archivados y eliminados por bloque (default: 1000)'
+        )
+        parser.add_argument(
+            '--pausa', type=float, default=0.1,
+            help='Segundos de espera entre bloques (default: 0.1)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo informa cuántos logs se archivarían'
+        )
+
+    def handle(self, *args, **options):
+        service = AuditoriaArchivoService()
+        fecha_limite = service.fecha_limite(options['dias'])
+
+        pendientes = AuthLogsRepository.count_anteriores(fecha_limite)
+        self.stdout.write(
+            f'[+] Logs anteriores a {fecha_limite:%Y-%m-%d %H:%M}: {pendientes} '
+            f'(destino: {service.directorio})'
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('\n[!] Dry-run: no se archivó ningún log'))
+            return
+
+        inicio = time.perf_counter()
+        total, bloques, ultimo_id = 0, 0, 0
+        while True:
+            archivados, ultimo_id = service.archivar_lote(
+                fecha_limite, desde_id=ultimo_id, lote=options['lote']
+            )
+            if ultimo_id is None:
+                break
+            total += archivados
+            bloques += 1
+            if bloques % 20 == 0:
+                self.stdout.write(f'  [+] {total} archivados en {bloques} bloques...')
+            time.sleep(options['pausa'])
+
+        duracion = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f'\n[+] Archivo finalizado: {total} logs en {bloques} bloques ({duracion:.1f} s)'
+        ))
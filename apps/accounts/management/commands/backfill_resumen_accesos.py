@@ -0,0 +1,54 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.accounts.services import ResumenAccesosService
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula los resúmenes de accesos por hora y por día desde '
+        'HistorialLogin y AuthLogs, por bloques de días. Reemplaza los '
+        'resúmenes existentes del rango, por lo que puede re-ejecutarse.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--desde', type=date.fromisoformat, default=None,
+            help='Primer día (YYYY-MM-DD, default: hace 30 días)'
+        )
+        parser.add_argument(
+            '--hasta', type=date.fromisoformat, default=None,
+            help='Último día inclusive (YYYY-MM-DD, default: hoy)'
+        )
+        parser.add_argument(
+            '--dias-por-lote', type=int, default=7,
+            help='Días recalculados por transacción (default: 7)'
+        )
+
+    def handle(self, *args, **options):
+        hoy = timezone.localdate()
+        hasta = options['hasta'] or hoy
+        desde = options['desde'] or hasta - timedelta(days=30)
+        if desde > hasta:
+            raise CommandError('--desde no puede ser posterior a --hasta')
+        paso = timedelta(days=max(options['dias_por_lote'], 1))
+
+        service = ResumenAccesosService()
+        self.stdout.write(f'[+] Recalculando resúmenes de accesos del {desde} al {hasta}...')
+
+        inicio = time.perf_counter()
+        total, dia = 0, desde
+        while dia <= hasta:
+            fin = min(dia + paso, hasta + timedelta(days=1))
+            filas = service.recalcular(dia, fin)
+            total += filas
+            self.stdout.write(f'  [+] {dia} a {fin - timedelta(days=1)}: {filas} resúmenes')
+            dia = fin
+
+        duracion = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f'\n[+] Backfill finalizado: {total} resúmenes ({duracion:.1f} s)'
+        ))
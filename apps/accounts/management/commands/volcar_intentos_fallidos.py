@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.accounts.services import IntentosLoginService
+
+
+class Command(BaseCommand):
+    help = (
+        'Escribe en AuthLogs los resúmenes de logins fallidos que siguen '
+        'acumulados en la caché. Pensado para ejecutarse desde cron cada '
+        'pocos minutos, para que los últimos intentos de un ataque no queden '
+        'sin registrar. Requiere una caché compartida (CACHE_URL); con la '
+        'caché por proceso cada worker vuelca lo suyo al recibir intentos.'
+    )
+
+    def handle(self, *args, **options):
+        escritos = IntentosLoginService().volcar_pendientes()
+        self.stdout.write(self.style.SUCCESS(f'[+] Resúmenes de logins fallidos escritos: {escritos}'))
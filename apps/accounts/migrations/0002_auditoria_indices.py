@@ -0,0 +1,97 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Índice de texto completo sobre auth_logs.descripcion. En SQLite es una tabla
+# FTS5 de contenido externo mantenida por triggers; en PostgreSQL, un índice GIN
+# sobre to_tsvector. Otros motores siguen usando icontains.
+# Ojo: si una migración futura obliga a SQLite a reconstruir auth_logs, los
+# triggers se pierden con la tabla vieja y hay que volver a crearlos.
+SQLITE_FTS = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS auth_logs_fts USING fts5(
+        descripcion, content='auth_logs', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS auth_logs_fts_ai AFTER INSERT ON auth_logs BEGIN
+        INSERT INTO auth_logs_fts(rowid, descripcion) VALUES (new.id, new.descripcion);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS auth_logs_fts_ad AFTER DELETE ON auth_logs BEGIN
+        INSERT INTO auth_logs_fts(auth_logs_fts, rowid, descripcion) VALUES ('delete', old.id, old.descripcion);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS auth_logs_fts_au AFTER UPDATE OF descripcion ON auth_logs BEGIN
+        INSERT INTO auth_logs_fts(auth_logs_fts, rowid, descripcion) VALUES ('delete', old.id, old.descripcion);
+        INSERT INTO auth_logs_fts(rowid, descripcion) VALUES (new.id, new.descripcion);
+    END""",
+    "INSERT INTO auth_logs_fts(auth_logs_fts) VALUES ('rebuild')",
+]
+SQLITE_FTS_REVERSE = [
+    "DROP TRIGGER IF EXISTS auth_logs_fts_au",
+    "DROP TRIGGER IF EXISTS auth_logs_fts_ad",
+    "DROP TRIGGER IF EXISTS auth_logs_fts_ai",
+    "DROP TABLE IF EXISTS auth_logs_fts",
+]
+POSTGRES_FTS = [
+    "CREATE INDEX IF NOT EXISTS ix_logs_descripcion_fts ON auth_logs "
+    "USING GIN (to_tsvector('spanish', descripcion))",
+]
+POSTGRES_FTS_REVERSE = [
+    "DROP INDEX IF EXISTS ix_logs_descripcion_fts",
+]
+
+
+def _ejecutar(schema_editor, por_motor):
+    for sql in por_motor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def crear_indice_texto(apps, schema_editor):
+    _ejecutar(schema_editor, {'sqlite': SQLITE_FTS, 'postgresql': POSTGRES_FTS})
+
+
+def eliminar_indice_texto(apps, schema_editor):
+    _ejecutar(schema_editor, {'sqlite': SQLITE_FTS_REVERSE, 'postgresql': POSTGRES_FTS_REVERSE})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthLogReferencia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=50)),
+                ('objeto_id', models.BigIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Referencia de log',
+                'verbose_name_plural': 'Referencias de logs',
+                'db_table': 'auth_log_referencia',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='authlogs',
+            index=models.Index(fields=['usuario', 'fecha_creacion'], name='ix_logs_usuario_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='authlogs',
+            index=models.Index(fields=['accion', 'fecha_creacion'], name='ix_logs_accion_fecha'),
+        ),
+        migrations.AddField(
+            model_name='authlogreferencia',
+            name='log',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='referencias', to='accounts.authlogs'),
+        ),
+        migrations.AddIndex(
+            model_name='authlogreferencia',
+            index=models.Index(fields=['tipo', 'objeto_id'], name='ix_logref_tipo_objeto'),
+        ),
+        migrations.RunPython(crear_indice_texto, eliminar_indice_texto),
+    ]
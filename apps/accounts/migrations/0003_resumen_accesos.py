@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_auditoria_indices'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenAcceso',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('periodo', models.CharField(choices=[('HORA', 'Hora'), ('DIA', 'Día')], max_length=4)),
+                ('inicio', models.DateTimeField()),
+                ('logins', models.PositiveIntegerField(default=0)),
+                ('usuarios_distintos', models.PositiveIntegerField(default=0)),
+                ('fallidos', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Resumen de accesos',
+                'verbose_name_plural': 'Resúmenes de accesos',
+                'db_table': 'auth_resumen_acceso',
+                'ordering': ['periodo', '-inicio'],
+                'constraints': [models.UniqueConstraint(fields=('periodo', 'inicio'), name='uq_resumen_acceso_periodo_inicio')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenAccesoIP',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('periodo', models.CharField(choices=[('HORA', 'Hora'), ('DIA', 'Día')], max_length=4)),
+                ('inicio', models.DateTimeField()),
+                ('direccion_ip', models.CharField(blank=True, default='', max_length=45)),
+                ('logins', models.PositiveIntegerField(default=0)),
+                ('fallidos', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Resumen de accesos por IP',
+                'verbose_name_plural': 'Resúmenes de accesos por IP',
+                'db_table': 'auth_resumen_acceso_ip',
+                'constraints': [models.UniqueConstraint(fields=('periodo', 'inicio', 'direccion_ip'), name='uq_resumen_acceso_ip')],
+            },
+        ),
+    ]
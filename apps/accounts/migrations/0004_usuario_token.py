@@ -0,0 +1,64 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:39
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def tokens_busqueda(*valores):
+    """
+    Copia congelada de core.utils.tokens_busqueda al crear esta migración,
+    para que los cambios posteriores del tokenizador no la alteren.
+    """
+    tokens = set()
+    for valor in valores:
+        if not valor:
+            continue
+        descompuesto = unicodedata.normalize('NFKD', valor)
+        valor = ''.join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+        tokens.add(valor)
+        tokens.update(palabra for palabra in re.split(r'[\W_]+', valor) if palabra)
+    return sorted({token[:254] for token in tokens})
+
+
+def indexar_usuarios(apps, schema_editor):
+    """Genera los tokens de búsqueda de los usuarios existentes."""
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    UsuarioToken = apps.get_model('accounts', 'UsuarioToken')
+    tokens = []
+    for usuario in User.objects.only('username', 'first_name', 'last_name', 'email').iterator(chunk_size=2000):
+        palabras = tokens_busqueda(usuario.username, usuario.first_name, usuario.last_name, usuario.email)
+        tokens.extend(UsuarioToken(usuario_id=usuario.pk, token=p) for p in palabras)
+        if len(tokens) >= 5000:
+            UsuarioToken.objects.bulk_create(tokens)
+            tokens = []
+    UsuarioToken.objects.bulk_create(tokens)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_resumen_accesos'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsuarioToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=254)),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens_busqueda', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Token de búsqueda de usuario',
+                'verbose_name_plural': 'Tokens de búsqueda de usuarios',
+                'db_table': 'auth_user_token',
+                'indexes': [models.Index(fields=['token', 'usuario'], name='ix_user_token')],
+            },
+        ),
+        migrations.RunPython(indexar_usuarios, migrations.RunPython.noop),
+    ]
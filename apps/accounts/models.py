@@ -72,6 +72,8 @@ class AuthLogs(models.Model):
             models.Index(fields=["usuario"]),
             models.Index(fields=["accion"]),
             models.Index(fields=["-fecha_creacion"]),
+            models.Index(fields=["usuario", "fecha_creacion"], name="ix_logs_usuario_fecha"),
+            models.Index(fields=["accion", "fecha_creacion"], name="ix_logs_accion_fecha"),
         ]
 
     def __str__(self):
@@ -79,6 +81,30 @@ class AuthLogs(models.Model):
         return f"[{self.fecha_creacion}] {u} - {self.accion}"
 
 
+class AuthLogReferencia(models.Model):
+    """
+    Objetos referenciados por un log de auditoría (activo, solicitud, toma...).
+
+    Se extraen de las claves `<tipo>_id` / `<tipo>_ids` de AuthLogs.meta al
+    registrar el log, para buscar "qué se hizo con este objeto" por índice en
+    lugar de recorrer el JSON.
+    """
+    log = models.ForeignKey(AuthLogs, on_delete=models.CASCADE, related_name="referencias")
+    tipo = models.CharField(max_length=50)
+    objeto_id = models.BigIntegerField()
+
+    class Meta:
+        db_table = "auth_log_referencia"
+        verbose_name = "Referencia de log"
+        verbose_name_plural = "Referencias de logs"
+        indexes = [
+            models.Index(fields=["tipo", "objeto_id"], name="ix_logref_tipo_objeto"),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo}:{self.objeto_id}"
+
+
 class HistorialLogin(models.Model):
     """
     Tabla para guardar historial de logins: sesión (clave), IP, user-agent y fecha/hora.
@@ -116,4 +142,90 @@ class HistorialLogin(models.Model):
         ordering = ["-fecha_login"]
 
     def __str__(self):
-        return f"{self.usuario or 'anon'} @ {self.fecha_login.isoformat()} ({self.direccion_ip})"
\ No newline at end of file
+        return f"{self.usuario or 'anon'} @ {self.fecha_login.isoformat()} ({self.direccion_ip})"
+
+
+class ResumenAcceso(models.Model):
+    """
+    Resumen de accesos por hora y por día (rollup de HistorialLogin y de los
+    logins fallidos de AuthLogs).
+
+    Se mantiene de forma incremental desde las señales de login y se puede
+    recalcular por rangos con el comando backfill_resumen_accesos, para que
+    los paneles de uso no recorran el historial completo.
+    """
+    PERIODO_HORA = "HORA"
+    PERIODO_DIA = "DIA"
+    PERIODO_CHOICES = [
+        (PERIODO_HORA, "Hora"),
+        (PERIODO_DIA, "Día"),
+    ]
+
+    periodo = models.CharField(max_length=4, choices=PERIODO_CHOICES)
+    inicio = models.DateTimeField()
+    logins = models.PositiveIntegerField(default=0)
+    usuarios_distintos = models.PositiveIntegerField(default=0)
+    fallidos = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "auth_resumen_acceso"
+        verbose_name = "Resumen de accesos"
+        verbose_name_plural = "Resúmenes de accesos"
+        ordering = ["periodo", "-inicio"]
+        constraints = [
+            models.UniqueConstraint(fields=["periodo", "inicio"], name="uq_resumen_acceso_periodo_inicio"),
+        ]
+
+    def __str__(self):
+        return f"{self.periodo} {self.inicio.isoformat()}: {self.logins} logins"
+
+
+class ResumenAccesoIP(models.Model):
+    """Logins y fallidos por dirección IP en cada hora/día del resumen."""
+    periodo = models.CharField(max_length=4, choices=ResumenAcceso.PERIODO_CHOICES)
+    inicio = models.DateTimeField()
+    direccion_ip = models.CharField(max_length=45, blank=True, default="")
+    logins = models.PositiveIntegerField(default=0)
+    fallidos = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "auth_resumen_acceso_ip"
+        verbose_name = "Resumen de accesos por IP"
+        verbose_name_plural = "Resúmenes de accesos por IP"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["periodo", "inicio", "direccion_ip"], name="uq_resumen_acceso_ip"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.periodo} {self.inicio.isoformat()} {self.direccion_ip}"
+
+
+class UsuarioToken(models.Model):
+    """
+    Palabras normalizadas (minúsculas, sin tildes) del usuario, nombre,
+    apellido y email de cada usuario.
+
+    Es la columna de búsqueda del listado de usuarios: cada palabra buscada
+    se resuelve como un rango sobre el índice de `token` (búsqueda por
+    prefijo), en lugar de cuatro icontains sobre auth_user. Se mantiene con la
+    señal post_save de User.
+    """
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="tokens_busqueda",
+    )
+    token = models.CharField(max_length=254)
+
+    class Meta:
+        db_table = "auth_user_token"
+        verbose_name = "Token de búsqueda de usuario"
+        verbose_name_plural = "Tokens de búsqueda de usuarios"
+        indexes = [
+            models.Index(fields=["token", "usuario"], name="ix_user_token"),
+        ]
+
+    def __str__(self):
+        return f"{self.usuario_id}: {self.token}"
@@ -0,0 +1,377 @@
+"""
+Repository Pattern para el módulo de cuentas.
+
+Separa la lógica de acceso a datos de la lógica de negocio,
+siguiendo el principio de Inversión de Dependencias (SOLID).
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple
+from django.db import connection, transaction, IntegrityError
+from django.db.models import QuerySet, Q, F, Count, Sum, Value, BooleanField, IntegerField
+from django.db.models.fields.json import KT
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce, TruncHour, TruncDay
+from django.contrib.auth.models import Permission, User
+from django.db.models import prefetch_related_objects
+from .models import (
+    AuthLogs, AuthLogAccion, AuthLogReferencia, HistorialLogin, ResumenAcceso, ResumenAccesoIP,
+    UsuarioToken
+)
+
+
+# ==================== AUTH LOGS REPOSITORY ====================
+
+class AuthLogsRepository:
+    """Repository para el log de auditoría (AuthLogs)."""
+
+    CAMPOS_ARCHIVO = (
+        'id', 'fecha_creacion', 'usuario_id', 'usuario__username', 'accion__glosa',
+        'descripcion', 'ip_usuario', 'agente', 'meta'
+    )
+
+    @staticmethod
+    def crear(glosa: str, **campos) -> AuthLogs:
+        """Crea un log con la acción indicada, creando la acción si no existe."""
+        accion, _ = AuthLogAccion.objects.get_or_create(glosa=glosa, defaults={'activo': True})
+        return AuthLogs.objects.create(accion=accion, **campos)
+
+    @staticmethod
+    def count_anteriores(fecha_limite: datetime) -> int:
+        """Cuenta los logs creados antes de `fecha_limite`."""
+        return AuthLogs.objects.filter(fecha_creacion__lt=fecha_limite).count()
+
+    @staticmethod
+    def get_lote_anteriores(fecha_limite: datetime, desde_id: int, limite: int) -> List[dict]:
+        """
+        Retorna el siguiente bloque de logs anteriores a `fecha_limite` con
+        id > desde_id, como diccionarios listos para archivar.
+
+        Avanza sobre la clave primaria, por lo que cada bloque es una lectura
+        acotada sin importar el tamaño de la tabla. Cada registro incluye sus
+        referencias como pares [tipo, objeto_id] bajo la clave 'referencias',
+        ya que al eliminar el log se borran en cascada.
+        """
+        logs = list(
+            AuthLogs.objects.filter(
+                fecha_creacion__lt=fecha_limite,
+                id__gt=desde_id
+            ).order_by('id').values(*AuthLogsRepository.CAMPOS_ARCHIVO)[:limite]
+        )
+        referencias = {log['id']: [] for log in logs}
+        for log_id, tipo, objeto_id in AuthLogReferencia.objects.filter(
+            log_id__in=referencias
+        ).order_by('id').values_list('log_id', 'tipo', 'objeto_id'):
+            referencias[log_id].append([tipo, objeto_id])
+        for log in logs:
+            log['referencias'] = referencias[log['id']]
+        return logs
+
+    @staticmethod
+    def delete_by_ids(log_ids: List[int]) -> int:
+        """
+        Elimina un bloque de logs; sus AuthLogReferencia se borran en cascada
+        (quedan en el archivo junto a cada registro, ver get_lote_anteriores).
+        """
+        eliminados, _ = AuthLogs.objects.filter(id__in=log_ids).delete()
+        return eliminados
+
+    @staticmethod
+    def filter_logs(
+        usuario_id: Optional[int] = None,
+        accion: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None
+    ) -> QuerySet:
+        """Filtra los logs de la tabla por usuario, glosa de acción y rango de fechas."""
+        queryset = AuthLogs.objects.all()
+        if usuario_id is not None:
+            queryset = queryset.filter(usuario_id=usuario_id)
+        if accion:
+            queryset = queryset.filter(accion__glosa=accion.upper())
+        if desde:
+            queryset = queryset.filter(fecha_creacion__gte=desde)
+        if hasta:
+            queryset = queryset.filter(fecha_creacion__lt=hasta)
+        return queryset.order_by('-fecha_creacion', '-id').values(*AuthLogsRepository.CAMPOS_ARCHIVO)
+
+    @staticmethod
+    def filtrar_texto(queryset: QuerySet, texto: str) -> QuerySet:
+        """
+        Filtra por palabras en la descripción usando el índice de texto
+        completo del motor (FTS5 en SQLite, GIN/tsvector en PostgreSQL).
+
+        Cada palabra debe aparecer; en SQLite cada una se busca como frase,
+        así un código como "SOL-0001" coincide con sus partes consecutivas.
+        """
+        palabras = texto.split()
+        if not palabras:
+            return queryset
+        if connection.vendor == 'sqlite':
+            consulta = ' '.join('"{}"'.format(palabra.replace('"', '""')) for palabra in palabras)
+            return queryset.filter(id__in=RawSQL(
+                'SELECT rowid FROM auth_logs_fts WHERE auth_logs_fts MATCH %s', [consulta]
+            ))
+        if connection.vendor == 'postgresql':
+            return queryset.annotate(
+                coincide_texto=RawSQL(
+                    "to_tsvector('spanish', descripcion) @@ plainto_tsquery('spanish', %s)",
+                    [texto], output_field=BooleanField()
+                )
+            ).filter(coincide_texto=True)
+        for palabra in palabras:
+            queryset = queryset.filter(descripcion__icontains=palabra)
+        return queryset
+
+    @staticmethod
+    def buscar_pagina(
+        usuario_id: Optional[int] = None,
+        accion_id: Optional[int] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        texto: Optional[str] = None,
+        referencia: Optional[Tuple[str, int]] = None,
+        despues_de: Optional[Tuple[datetime, int]] = None,
+        limite: int = 50
+    ) -> List[AuthLogs]:
+        """
+        Retorna una página de logs, del más reciente al más antiguo.
+
+        La paginación es por keyset sobre (fecha_creacion, id): `despues_de`
+        es la clave del último log de la página anterior, de modo que cada
+        página es un recorrido corto de los índices (usuario, fecha_creacion)
+        o (accion, fecha_creacion) sin OFFSET.
+
+        Args:
+            usuario_id: Usuario que realizó la acción
+            accion_id: Acción (AuthLogAccion)
+            desde: Fecha inicial inclusive
+            hasta: Fecha final exclusiva
+            texto: Palabras a buscar en la descripción
+            referencia: Par (tipo, id) de un objeto referenciado por el log
+            despues_de: Clave (fecha_creacion, id) del último log ya mostrado
+            limite: Tamaño de la página
+
+        Returns:
+            Lista de logs con usuario y acción cargados
+        """
+        queryset = AuthLogs.objects.select_related('usuario', 'accion')
+        if usuario_id is not None:
+            queryset = queryset.filter(usuario_id=usuario_id)
+        if accion_id is not None:
+            queryset = queryset.filter(accion_id=accion_id)
+        if desde:
+            queryset = queryset.filter(fecha_creacion__gte=desde)
+        if hasta:
+            queryset = queryset.filter(fecha_creacion__lt=hasta)
+        if texto:
+            queryset = AuthLogsRepository.filtrar_texto(queryset, texto)
+        if referencia:
+            tipo, objeto_id = referencia
+            queryset = queryset.filter(id__in=AuthLogReferencia.objects.filter(
+                tipo=tipo, objeto_id=objeto_id
+            ).values('log_id'))
+        if despues_de:
+            fecha, log_id = despues_de
+            queryset = queryset.filter(
+                Q(fecha_creacion__lt=fecha) | Q(fecha_creacion=fecha, id__lt=log_id)
+            )
+        return list(queryset.order_by('-fecha_creacion', '-id')[:limite])
+
+
+# ==================== RESUMEN DE ACCESOS REPOSITORY ====================
+
+class ResumenAccesoRepository:
+    """Repository para los resúmenes (rollups) de accesos por hora y día."""
+
+    TRUNC = {
+        ResumenAcceso.PERIODO_HORA: TruncHour,
+        ResumenAcceso.PERIODO_DIA: TruncDay,
+    }
+
+    @staticmethod
+    def incrementar(modelo, claves: dict, **deltas) -> None:
+        """
+        Suma `deltas` a la fila identificada por `claves`, creándola si no existe.
+
+        El UPDATE con F() es atómico; si la fila no existe se inserta dentro de
+        un savepoint y, si otra petición la creó a la vez, se reintenta el UPDATE.
+        """
+        cambios = {campo: F(campo) + valor for campo, valor in deltas.items() if valor}
+        if not cambios:
+            return
+        if modelo.objects.filter(**claves).update(**cambios):
+            return
+        try:
+            with transaction.atomic():
+                modelo.objects.create(**claves, **{campo: valor for campo, valor in deltas.items()})
+        except IntegrityError:
+            modelo.objects.filter(**claves).update(**cambios)
+
+    @staticmethod
+    def usuario_tiene_login_desde(usuario_id: int, inicio: datetime, excluir_id: int) -> bool:
+        """Indica si el usuario ya tenía un login en el período (índice usuario, fecha_login)."""
+        return HistorialLogin.objects.filter(
+            usuario_id=usuario_id,
+            fecha_login__gte=inicio
+        ).exclude(id=excluir_id).exists()
+
+    @staticmethod
+    def delete_rango(desde: datetime, hasta: datetime) -> None:
+        """Elimina los resúmenes con inicio en [desde, hasta)."""
+        ResumenAcceso.objects.filter(inicio__gte=desde, inicio__lt=hasta).delete()
+        ResumenAccesoIP.objects.filter(inicio__gte=desde, inicio__lt=hasta).delete()
+
+    @staticmethod
+    def agregar_logins(periodo: str, desde: datetime, hasta: datetime) -> QuerySet:
+        """Logins y usuarios distintos por período desde HistorialLogin."""
+        trunc = ResumenAccesoRepository.TRUNC[periodo]
+        return HistorialLogin.objects.filter(
+            fecha_login__gte=desde, fecha_login__lt=hasta
+        ).annotate(inicio=trunc('fecha_login')).values('inicio').annotate(
+            logins=Count('id'),
+            usuarios_distintos=Count('usuario', distinct=True)
+        ).order_by()
+
+    @staticmethod
+    def agregar_logins_ip(periodo: str, desde: datetime, hasta: datetime) -> QuerySet:
+        """Logins por período e IP desde HistorialLogin."""
+        trunc = ResumenAccesoRepository.TRUNC[periodo]
+        return HistorialLogin.objects.filter(
+            fecha_login__gte=desde, fecha_login__lt=hasta
+        ).annotate(inicio=trunc('fecha_login')).values('inicio', 'direccion_ip').annotate(
+            total=Count('id')
+        ).order_by()
+
+    @staticmethod
+    def agregar_fallidos_ip(periodo: str, desde: datetime, hasta: datetime, glosa: str) -> QuerySet:
+        """
+        Logins fallidos por período e IP desde AuthLogs.
+
+        Un log puede resumir varios intentos (meta.intentos); los logs sin ese
+        dato cuentan como un intento.
+        """
+        trunc = ResumenAccesoRepository.TRUNC[periodo]
+        return AuthLogs.objects.filter(
+            accion__glosa=glosa,
+            fecha_creacion__gte=desde, fecha_creacion__lt=hasta
+        ).annotate(inicio=trunc('fecha_creacion')).values('inicio', 'ip_usuario').annotate(
+            total=Sum(Coalesce(Cast(KT('meta__intentos'), IntegerField()), Value(1)))
+        ).order_by()
+
+    @staticmethod
+    def bulk_create(resumenes: List[ResumenAcceso], resumenes_ip: List[ResumenAccesoIP]) -> None:
+        """Inserta resúmenes recalculados en lotes."""
+        ResumenAcceso.objects.bulk_create(resumenes, batch_size=500)
+        ResumenAccesoIP.objects.bulk_create(resumenes_ip, batch_size=500)
+
+    @staticmethod
+    def get_serie(periodo: str, desde: datetime) -> QuerySet[ResumenAcceso]:
+        """Resúmenes del período desde una fecha, en orden cronológico."""
+        return ResumenAcceso.objects.filter(
+            periodo=periodo, inicio__gte=desde
+        ).order_by('inicio')
+
+    @staticmethod
+    def get_top_ips(desde: datetime, limite: int = 10) -> QuerySet:
+        """IPs con más logins y fallidos desde una fecha, sumando los resúmenes diarios."""
+        return ResumenAccesoIP.objects.filter(
+            periodo=ResumenAcceso.PERIODO_DIA, inicio__gte=desde
+        ).values('direccion_ip').annotate(
+            total_logins=Sum('logins'),
+            total_fallidos=Sum('fallidos')
+        ).order_by((F('total_logins') + F('total_fallidos')).desc())[:limite]
+
+
+# ==================== USUARIO REPOSITORY ====================
+
+class UsuarioRepository:
+    """Repository para el listado de usuarios y su índice de búsqueda."""
+
+    @staticmethod
+    def reemplazar_tokens(usuario_id: int, tokens: List[str]) -> None:
+        """Reemplaza los tokens de búsqueda de un usuario."""
+        UsuarioToken.objects.filter(usuario_id=usuario_id).delete()
+        UsuarioToken.objects.bulk_create([
+            UsuarioToken(usuario_id=usuario_id, token=token) for token in tokens
+        ])
+
+    @staticmethod
+    def filtrar_palabras(queryset: QuerySet, palabras: List[str]) -> QuerySet:
+        """
+        Filtra usuarios que tengan, por cada palabra, algún token que empiece
+        con ella. El prefijo se consulta como rango (token >= p AND token < p')
+        para que use el índice en cualquier motor.
+        """
+        for palabra in palabras:
+            siguiente = palabra[:-1] + chr(ord(palabra[-1]) + 1)
+            queryset = queryset.filter(id__in=UsuarioToken.objects.filter(
+                token__gte=palabra, token__lt=siguiente
+            ).values('usuario_id'))
+        return queryset
+
+    @staticmethod
+    def buscar_pagina(
+        palabras: List[str],
+        is_active: Optional[bool] = None,
+        is_staff: Optional[bool] = None,
+        grupo_id: Optional[int] = None,
+        despues_de: Optional[str] = None,
+        limite: int = 51
+    ) -> List[User]:
+        """
+        Retorna hasta `limite` usuarios ordenados por username (keyset).
+
+        El filtro por grupo consulta la tabla intermedia usuario-grupo, y los
+        grupos se cargan solo para los usuarios de la página.
+
+        Args:
+            palabras: Palabras normalizadas a buscar
+            is_active: Filtrar por estado (None = todos)
+            is_staff: Filtrar por staff (None = todos)
+            grupo_id: ID del grupo (opcional)
+            despues_de: Último username de la página anterior
+            limite: Cantidad máxima de usuarios
+        """
+        queryset = UsuarioRepository.filtrar_palabras(User.objects.all(), palabras)
+        if is_active is not None:
+            queryset = queryset.filter(is_active=is_active)
+        if is_staff is not None:
+            queryset = queryset.filter(is_staff=is_staff)
+        if grupo_id:
+            queryset = queryset.filter(id__in=User.groups.through.objects.filter(
+                group_id=grupo_id
+            ).values('user_id'))
+        if despues_de:
+            queryset = queryset.filter(username__gt=despues_de)
+
+        usuarios = list(queryset.order_by('username')[:limite])
+        prefetch_related_objects(usuarios, 'groups')
+        return usuarios
+
+
+# ==================== PERMISO REPOSITORY ====================
+
+class PermisoRepository:
+    """Repository para los permisos y su asignación a grupos y usuarios."""
+
+    @staticmethod
+    def get_all_con_tipo() -> QuerySet:
+        """Todos los permisos con su app y modelo, ordenados para agrupar."""
+        return Permission.objects.values(
+            'id', 'codename', 'name', 'content_type__app_label', 'content_type__model'
+        ).order_by('content_type__app_label', 'content_type__model', 'codename')
+
+    @staticmethod
+    def get_ids(relacion) -> set:
+        """IDs de los permisos de una relación (grupo.permissions o usuario.user_permissions)."""
+        return set(relacion.values_list('id', flat=True))
+
+    @staticmethod
+    def agregar(relacion, ids: set) -> None:
+        if ids:
+            relacion.add(*ids)
+
+    @staticmethod
+    def quitar(relacion, ids: set) -> None:
+        if ids:
+            relacion.remove(*ids)
@@ -0,0 +1,680 @@
+"""
+Service Layer para el módulo de cuentas.
+
+Contiene la lógica de negocio y coordina los repositories,
+siguiendo el principio de Single Responsibility (SOLID).
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import AuthLogs, HistorialLogin, ResumenAcceso, ResumenAccesoIP
+from core.utils import normalizar_texto, tokens_busqueda
+from .repositories import AuthLogsRepository, PermisoRepository, ResumenAccesoRepository, UsuarioRepository
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== LISTADO DE USUARIOS ====================
+
+class UsuarioListadoService:
+    """Listado de usuarios paginado por username con búsqueda indexada."""
+
+    CAMPOS_BUSQUEDA = ('username', 'first_name', 'last_name', 'email')
+
+    def __init__(self):
+        self.usuario_repo = UsuarioRepository()
+
+    @classmethod
+    def tokens(cls, usuario: User) -> List[str]:
+        """
+        Tokens de búsqueda del usuario: cada campo normalizado completo y sus
+        palabras (el email "ana.perez@colegio.cl" aporta también "ana", "perez"...).
+        """
+        return tokens_busqueda(*(getattr(usuario, campo) for campo in cls.CAMPOS_BUSQUEDA))
+
+    def indexar(self, usuario: User) -> None:
+        """Regenera los tokens de búsqueda de un usuario."""
+        self.usuario_repo.reemplazar_tokens(usuario.pk, self.tokens(usuario))
+
+    def buscar_pagina(self, filtros: dict, cursor: Optional[str] = None, por_pagina: int = 50) -> Tuple[List[User], Optional[str]]:
+        """
+        Retorna una página de usuarios y el cursor (username) de la siguiente.
+
+        Args:
+            filtros: cleaned_data de UserFilterForm
+            cursor: Último username de la página anterior (opcional)
+            por_pagina: Usuarios por página
+
+        Returns:
+            Tupla (usuarios, cursor siguiente o None si es la última página)
+        """
+        is_active = filtros.get('is_active')
+        is_staff = filtros.get('is_staff')
+        grupo = filtros.get('group')
+        usuarios = self.usuario_repo.buscar_pagina(
+            palabras=normalizar_texto(filtros.get('buscar') or '').split(),
+            is_active=None if is_active in ('', None) else is_active,
+            is_staff=None if is_staff in ('', None) else is_staff,
+            grupo_id=grupo.pk if grupo else None,
+            despues_de=cursor or None,
+            limite=por_pagina + 1
+        )
+        siguiente = usuarios[por_pagina - 1].username if len(usuarios) > por_pagina else None
+        return usuarios[:por_pagina], siguiente
+
+
+# ==================== NAVEGADOR DE AUDITORÍA ====================
+
+class AuditoriaService:
+    """Búsqueda paginada en el log de auditoría para el navegador de logs."""
+
+    # tipo de referencia -> (modelo, campo con el código visible)
+    REFERENCIAS = {
+        'activo': ('activos.Activo', 'codigo'),
+        'solicitud': ('solicitudes.Solicitud', 'numero'),
+        'toma': ('inventario.TomaInventario', 'numero'),
+        'usuario': ('auth.User', 'username'),
+        'grupo': ('auth.Group', 'name'),
+    }
+
+    def __init__(self):
+        self.logs_repo = AuthLogsRepository()
+
+    @classmethod
+    def resolver_referencia(cls, tipo: str, valor: str) -> Optional[int]:
+        """
+        Traduce el código visible de un objeto (p. ej. el código del activo)
+        a su ID; acepta también el ID numérico directamente.
+        """
+        valor = (valor or '').strip()
+        if tipo not in cls.REFERENCIAS or not valor:
+            return None
+        modelo, campo = cls.REFERENCIAS[tipo]
+        objeto_id = apps.get_model(modelo).objects.filter(**{campo: valor}).values_list('id', flat=True).first()
+        if objeto_id is None and valor.isdigit():
+            objeto_id = int(valor)
+        return objeto_id
+
+    @staticmethod
+    def codificar_cursor(log: AuthLogs) -> str:
+        return f'{log.fecha_creacion.isoformat()}|{log.pk}'
+
+    @staticmethod
+    def decodificar_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+        try:
+            fecha, log_id = (cursor or '').split('|')
+            fecha = parse_datetime(fecha)
+            return (fecha, int(log_id)) if fecha else None
+        except ValueError:
+            return None
+
+    def buscar_pagina(self, filtros: dict, cursor: Optional[str] = None, por_pagina: int = 50) -> Tuple[List[AuthLogs], Optional[str]]:
+        """
+        Retorna una página de logs y el cursor de la siguiente.
+
+        Args:
+            filtros: cleaned_data de AuditoriaFilterForm
+            cursor: Cursor recibido de la página anterior (opcional)
+            por_pagina: Logs por página
+
+        Returns:
+            Tupla (logs, cursor siguiente o None si es la última página)
+        """
+        usuario_id = None
+        if filtros.get('usuario'):
+            usuario_id = User.objects.filter(
+                username=filtros['usuario'].strip()
+            ).values_list('id', flat=True).first()
+            if usuario_id is None:
+                return [], None
+
+        referencia = None
+        if filtros.get('referencia_tipo') and filtros.get('referencia_valor'):
+            objeto_id = self.resolver_referencia(filtros['referencia_tipo'], filtros['referencia_valor'])
+            if objeto_id is None:
+                return [], None
+            referencia = (filtros['referencia_tipo'], objeto_id)
+
+        desde = filtros.get('desde')
+        hasta = filtros.get('hasta')
+        zona = timezone.get_current_timezone()
+        logs = self.logs_repo.buscar_pagina(
+            usuario_id=usuario_id,
+            accion_id=filtros['accion'].pk if filtros.get('accion') else None,
+            desde=datetime.combine(desde, datetime.min.time(), zona) if desde else None,
+            hasta=datetime.combine(hasta + timedelta(days=1), datetime.min.time(), zona) if hasta else None,
+            texto=filtros.get('texto'),
+            referencia=referencia,
+            despues_de=self.decodificar_cursor(cursor),
+            limite=por_pagina + 1
+        )
+        siguiente = self.codificar_cursor(logs[por_pagina - 1]) if len(logs) > por_pagina else None
+        return logs[:por_pagina], siguiente
+
+
+# ==================== ARCHIVO DE AUDITORÍA ====================
+
+class AuditoriaArchivoService:
+    """
+    Retención del log de auditoría (AuthLogs).
+
+    Los logs más antiguos que el período de retención se escriben en archivos
+    JSONL comprimidos particionados por día
+    (MEDIA_ROOT/<AUDITORIA_ARCHIVO_DIR>/AAAA/MM/auth_logs-AAAA-MM-DD.jsonl.gz)
+    y luego se eliminan de la tabla por bloques. Cada bloque se agrega como un
+    miembro gzip nuevo, así una ejecución interrumpida deja archivos válidos;
+    si se corta entre la escritura y el DELETE, el bloque queda duplicado en
+    el archivo y `buscar` lo descarta por id. Las referencias del log
+    (AuthLogReferencia) se guardan dentro de cada registro, porque la tabla
+    las elimina en cascada con el log.
+    """
+
+    PREFIJO_ARCHIVO = 'auth_logs-'
+    EXTENSION_ARCHIVO = '.jsonl.gz'
+
+    def __init__(self, directorio: Optional[Path] = None):
+        self.directorio = Path(directorio or Path(settings.MEDIA_ROOT) / settings.AUDITORIA_ARCHIVO_DIR)
+        self.logs_repo = AuthLogsRepository()
+
+    def _ruta(self, dia: date) -> Path:
+        return self.directorio / f'{dia:%Y}' / f'{dia:%m}' / f'{self.PREFIJO_ARCHIVO}{dia:%Y-%m-%d}{self.EXTENSION_ARCHIVO}'
+
+    def archivar_lote(self, fecha_limite: datetime, desde_id: int = 0, lote: int = 1000) -> Tuple[int, Optional[int]]:
+        """
+        Archiva y elimina un bloque de logs anteriores a `fecha_limite`.
+
+        Args:
+            fecha_limite: Se archivan los logs creados antes de esta fecha
+            desde_id: Último ID procesado en el bloque anterior
+            lote: Máximo de logs por bloque
+
+        Returns:
+            Tupla (archivados, último ID del bloque o None si no quedan)
+        """
+        logs = self.logs_repo.get_lote_anteriores(fecha_limite, desde_id, lote)
+        if not logs:
+            return 0, None
+
+        por_dia = defaultdict(list)
+        for log in logs:
+            por_dia[timezone.localdate(log['fecha_creacion'])].append(log)
+
+        for dia, registros in por_dia.items():
+            ruta = self._ruta(dia)
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            with open(ruta, 'ab') as archivo:
+                with gzip.GzipFile(fileobj=archivo, mode='wb') as comprimido:
+                    for registro in registros:
+                        comprimido.write(json.dumps(
+                            registro, cls=DjangoJSONEncoder, ensure_ascii=False
+                        ).encode('utf-8') + b'\n')
+                archivo.flush()
+                os.fsync(archivo.fileno())
+
+        with transaction.atomic():
+            self.logs_repo.delete_by_ids([log['id'] for log in logs])
+        return len(logs), logs[-1]['id']
+
+    def _dias_archivados(self, desde: Optional[datetime], hasta: Optional[datetime]) -> List[Tuple[date, Path]]:
+        """Archivos diarios que se solapan con el rango (se descartan por nombre, sin abrirlos)."""
+        dia_desde = timezone.localdate(desde) if desde else None
+        dia_hasta = timezone.localdate(hasta) if hasta else None
+        dias = []
+        for ruta in self.directorio.glob(f'*/*/{self.PREFIJO_ARCHIVO}*{self.EXTENSION_ARCHIVO}'):
+            nombre = ruta.name[len(self.PREFIJO_ARCHIVO):-len(self.EXTENSION_ARCHIVO)]
+            try:
+                dia = date.fromisoformat(nombre)
+            except ValueError:
+                continue
+            if (dia_desde and dia < dia_desde) or (dia_hasta and dia > dia_hasta):
+                continue
+            dias.append((dia, ruta))
+        return sorted(dias, reverse=True)
+
+    def _leer_archivo(self, ruta: Path) -> Iterator[dict]:
+        with gzip.open(ruta, 'rt', encoding='utf-8') as archivo:
+            for linea in archivo:
+                if linea.strip():
+                    registro = json.loads(linea)
+                    registro['fecha_creacion'] = parse_datetime(registro['fecha_creacion'])
+                    yield registro
+
+    def buscar(
+        self,
+        usuario: Optional[User] = None,
+        accion: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        limite: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Busca logs en la tabla y en el archivo como si fueran una sola fuente.
+
+        Solo se leen los archivos de los días que caen en el rango; conviene
+        acotar `desde` para no recorrer todo el archivo.
+
+        Args:
+            usuario: Usuario que realizó la acción (opcional)
+            accion: Glosa de la acción, p. ej. 'LOGIN' (opcional)
+            desde: Fecha inicial inclusive (opcional)
+            hasta: Fecha final exclusiva (opcional)
+            limite: Máximo de resultados, los más recientes primero (opcional)
+
+        Returns:
+            Lista de diccionarios con los campos de AuthLogsRepository.CAMPOS_ARCHIVO,
+            ordenada de más reciente a más antiguo; los que vienen del archivo
+            traen además sus 'referencias' como pares [tipo, objeto_id]
+        """
+        usuario_id = usuario.pk if usuario else None
+        resultados = list(self.logs_repo.filter_logs(usuario_id, accion, desde, hasta)[:limite])
+        if limite is not None and len(resultados) >= limite:
+            return resultados
+
+        vistos = {registro['id'] for registro in resultados}
+        archivados = []
+        for _, ruta in self._dias_archivados(desde, hasta):
+            for registro in self._leer_archivo(ruta):
+                if registro['id'] in vistos:
+                    continue
+                if usuario_id is not None and registro['usuario_id'] != usuario_id:
+                    continue
+                if accion and registro['accion__glosa'] != accion.upper():
+                    continue
+                if (desde and registro['fecha_creacion'] < desde) or (hasta and registro['fecha_creacion'] >= hasta):
+                    continue
+                vistos.add(registro['id'])
+                archivados.append(registro)
+            # Los archivos se recorren del día más reciente al más antiguo
+            if limite is not None and len(resultados) + len(archivados) >= limite:
+                break
+
+        archivados.sort(key=lambda registro: (registro['fecha_creacion'], registro['id']), reverse=True)
+        resultados.extend(archivados)
+        return resultados[:limite] if limite is not None else resultados
+
+    @staticmethod
+    def fecha_limite(dias: int) -> datetime:
+        """Fecha de corte para conservar `dias` días en la tabla."""
+        return timezone.now() - timedelta(days=dias)
+
+
+# ==================== RESUMEN DE ACCESOS ====================
+
+class ResumenAccesosService:
+    """
+    Rollups de accesos por hora y por día.
+
+    Las señales de login suman cada acceso a la hora y al día en curso (hora
+    local); `recalcular` reconstruye rangos completos desde HistorialLogin y
+    AuthLogs. El panel de uso lee solo estas tablas.
+    """
+
+    GLOSA_FALLIDO = 'LOGIN_FALLIDO'
+
+    def __init__(self):
+        self.resumen_repo = ResumenAccesoRepository()
+
+    @staticmethod
+    def inicios(fecha: datetime) -> dict:
+        """Inicio (hora local) de la hora y del día que contienen `fecha`."""
+        hora = timezone.localtime(fecha).replace(minute=0, second=0, microsecond=0)
+        return {
+            ResumenAcceso.PERIODO_HORA: hora,
+            ResumenAcceso.PERIODO_DIA: hora.replace(hour=0),
+        }
+
+    def registrar_login(self, historial: HistorialLogin) -> None:
+        """
+        Suma un login exitoso a los resúmenes de su hora y su día.
+
+        El usuario cuenta como distinto si no tenía otro login en el período,
+        lo que se verifica con el índice (usuario, fecha_login). Un error aquí
+        se registra pero no interrumpe el login.
+        """
+        try:
+            with transaction.atomic():
+                for periodo, inicio in self.inicios(historial.fecha_login).items():
+                    nuevo_usuario = bool(historial.usuario_id) and not self.resumen_repo.usuario_tiene_login_desde(
+                        historial.usuario_id, inicio, excluir_id=historial.pk
+                    )
+                    self.resumen_repo.incrementar(
+                        ResumenAcceso, {'periodo': periodo, 'inicio': inicio},
+                        logins=1, usuarios_distintos=int(nuevo_usuario)
+                    )
+                    self.resumen_repo.incrementar(
+                        ResumenAccesoIP,
+                        {'periodo': periodo, 'inicio': inicio, 'direccion_ip': historial.direccion_ip or ''},
+                        logins=1
+                    )
+        except Exception:
+            logger.exception('Error al actualizar el resumen de accesos')
+
+    def registrar_fallidos(self, direccion_ip: Optional[str], fecha: Optional[datetime] = None, cantidad: int = 1) -> None:
+        """Suma `cantidad` logins fallidos desde una IP a los resúmenes de su hora y su día."""
+        try:
+            with transaction.atomic():
+                for periodo, inicio in self.inicios(fecha or timezone.now()).items():
+                    self.resumen_repo.incrementar(
+                        ResumenAcceso, {'periodo': periodo, 'inicio': inicio}, fallidos=cantidad
+                    )
+                    self.resumen_repo.incrementar(
+                        ResumenAccesoIP,
+                        {'periodo': periodo, 'inicio': inicio, 'direccion_ip': direccion_ip or ''},
+                        fallidos=cantidad
+                    )
+        except Exception:
+            logger.exception('Error al actualizar el resumen de accesos')
+
+    @transaction.atomic
+    def recalcular(self, desde: date, hasta: date) -> int:
+        """
+        Reconstruye los resúmenes de los días [desde, hasta) desde el historial.
+
+        Args:
+            desde: Primer día (hora local)
+            hasta: Día siguiente al último
+
+        Returns:
+            Cantidad de filas de resumen generadas
+        """
+        zona = timezone.get_current_timezone()
+        inicio_rango = datetime.combine(desde, datetime.min.time(), zona)
+        fin_rango = datetime.combine(hasta, datetime.min.time(), zona)
+        self.resumen_repo.delete_rango(inicio_rango, fin_rango)
+
+        resumenes, resumenes_ip = [], []
+        for periodo in (ResumenAcceso.PERIODO_HORA, ResumenAcceso.PERIODO_DIA):
+            filas = {}
+            for fila in self.resumen_repo.agregar_logins(periodo, inicio_rango, fin_rango):
+                filas[fila['inicio']] = ResumenAcceso(
+                    periodo=periodo, inicio=fila['inicio'],
+                    logins=fila['logins'], usuarios_distintos=fila['usuarios_distintos']
+                )
+
+            por_ip = {}
+            for fila in self.resumen_repo.agregar_logins_ip(periodo, inicio_rango, fin_rango):
+                clave = (fila['inicio'], fila['direccion_ip'] or '')
+                por_ip.setdefault(clave, ResumenAccesoIP(
+                    periodo=periodo, inicio=fila['inicio'], direccion_ip=clave[1]
+                )).logins += fila['total']
+            for fila in self.resumen_repo.agregar_fallidos_ip(periodo, inicio_rango, fin_rango, self.GLOSA_FALLIDO):
+                clave = (fila['inicio'], fila['ip_usuario'] or '')
+                por_ip.setdefault(clave, ResumenAccesoIP(
+                    periodo=periodo, inicio=fila['inicio'], direccion_ip=clave[1]
+                )).fallidos += fila['total']
+                filas.setdefault(fila['inicio'], ResumenAcceso(
+                    periodo=periodo, inicio=fila['inicio']
+                )).fallidos += fila['total']
+
+            resumenes.extend(filas.values())
+            resumenes_ip.extend(por_ip.values())
+
+        self.resumen_repo.bulk_create(resumenes, resumenes_ip)
+        return len(resumenes)
+
+    def obtener_panel(self, dias: int = 30, horas: int = 48, top: int = 10) -> dict:
+        """
+        Datos del panel de uso leídos solo de los resúmenes.
+
+        Returns:
+            Diccionario con la serie diaria, la serie horaria y las IPs más activas
+        """
+        ahora = timezone.now()
+        desde_dia = self.inicios(ahora - timedelta(days=dias - 1))[ResumenAcceso.PERIODO_DIA]
+        return {
+            'por_dia': list(self.resumen_repo.get_serie(ResumenAcceso.PERIODO_DIA, desde_dia)),
+            'por_hora': list(self.resumen_repo.get_serie(
+                ResumenAcceso.PERIODO_HORA, ahora - timedelta(hours=horas)
+            )),
+            'top_ips': list(self.resumen_repo.get_top_ips(desde_dia, top)),
+        }
+
+
+# ==================== BLOQUEO DE LOGINS FALLIDOS ====================
+
+class IntentosLoginService:
+    """
+    Contador de logins fallidos por usuario e IP en la caché.
+
+    Cada clave guarda las marcas de tiempo de los últimos intentos (a lo sumo
+    LOGIN_INTENTOS_MAX), lo que basta para una ventana deslizante. Los fallidos
+    de una IP se acumulan y se escriben en AuthLogs como un solo resumen cada
+    LOGIN_FALLIDOS_INTERVALO segundos: un ataque cuesta escrituras constantes
+    en la base de datos, no una por intento.
+
+    Con la caché por proceso (locmem) los contadores son por worker; con una
+    caché compartida (CACHE_URL) valen para todo el despliegue. Las
+    actualizaciones no son atómicas entre procesos, un intento puede perderse
+    en una carrera, lo que es aceptable para un límite de este tipo.
+    """
+
+    PREFIJO = 'login_fallidos'
+    MAX_USUARIOS_RESUMEN = 10
+
+    def __init__(self):
+        self.maximo = settings.LOGIN_INTENTOS_MAX
+        self.ventana = settings.LOGIN_INTENTOS_VENTANA
+        self.intervalo = settings.LOGIN_FALLIDOS_INTERVALO
+
+    def _claves(self, username: str, ip: Optional[str]) -> List[str]:
+        # El usuario se resume con un hash: puede traer espacios o caracteres
+        # que algunos backends de caché no aceptan en las claves
+        usuario = hashlib.sha1((username or '').lower().encode()).hexdigest()
+        return [
+            f'{self.PREFIJO}:usuario:{usuario}',
+            f'{self.PREFIJO}:ip:{ip or ""}',
+        ]
+
+    def _intentos(self, clave: str, ahora: float) -> List[float]:
+        """Marcas de tiempo de la clave que siguen dentro de la ventana."""
+        return [t for t in cache.get(clave, []) if t > ahora - self.ventana]
+
+    def esta_bloqueado(self, username: str, ip: Optional[str]) -> bool:
+        """Indica si el usuario o la IP alcanzaron el máximo de intentos en la ventana."""
+        ahora = time.time()
+        return any(
+            len(self._intentos(clave, ahora)) >= self.maximo
+            for clave in self._claves(username, ip)
+        )
+
+    def registrar_fallido(self, username: str, ip: Optional[str], agente: str = '', bloqueado: bool = False) -> None:
+        """
+        Suma un intento fallido a los contadores y al resumen pendiente de la IP.
+
+        El primer fallido de una IP en cada intervalo escribe el resumen de
+        inmediato; los siguientes esperan al próximo intervalo o a
+        `volcar_pendientes`.
+
+        Args:
+            username: Usuario (o email) intentado
+            ip: IP de origen
+            agente: User agent de la petición
+            bloqueado: True si el intento fue rechazado sin autenticar
+        """
+        ahora = time.time()
+        for clave in self._claves(username, ip):
+            intentos = self._intentos(clave, ahora) + [ahora]
+            cache.set(clave, intentos[-self.maximo:], self.ventana)
+
+        clave_pendiente = f'{self.PREFIJO}:pendiente:{ip or ""}'
+        pendiente = cache.get(clave_pendiente) or {
+            'intentos': 0, 'bloqueados': 0, 'usuarios': [], 'agente': agente,
+            'desde': timezone.now().isoformat(),
+        }
+        pendiente['intentos'] += 1
+        pendiente['bloqueados'] += int(bloqueado)
+        if username not in pendiente['usuarios'] and len(pendiente['usuarios']) < self.MAX_USUARIOS_RESUMEN:
+            pendiente['usuarios'].append(username)
+        cache.set(clave_pendiente, pendiente, None)
+
+        ips = cache.get(f'{self.PREFIJO}:pendientes', set())
+        if (ip or '') not in ips:
+            cache.set(f'{self.PREFIJO}:pendientes', ips | {ip or ''}, None)
+
+        if cache.add(f'{self.PREFIJO}:volcado:{ip or ""}', True, self.intervalo):
+            self.volcar(ip)
+
+    def volcar(self, ip: Optional[str]) -> Optional[AuthLogs]:
+        """
+        Escribe el resumen pendiente de una IP como un solo log LOGIN_FALLIDO
+        y lo suma a los resúmenes de accesos.
+
+        Returns:
+            El log creado, o None si no había intentos pendientes
+        """
+        clave_pendiente = f'{self.PREFIJO}:pendiente:{ip or ""}'
+        pendiente = cache.get(clave_pendiente)
+        cache.delete(clave_pendiente)
+        ips = cache.get(f'{self.PREFIJO}:pendientes', set())
+        cache.set(f'{self.PREFIJO}:pendientes', ips - {ip or ''}, None)
+        if not pendiente:
+            return None
+
+        usuarios = ', '.join(pendiente['usuarios'])
+        if pendiente['intentos'] == 1:
+            descripcion = f"Intento fallido de login con usuario: {usuarios}"
+        else:
+            descripcion = f"{pendiente['intentos']} intentos fallidos de login con usuarios: {usuarios}"
+        if pendiente['bloqueados']:
+            descripcion += f" ({pendiente['bloqueados']} bloqueados)"
+
+        log = AuthLogsRepository.crear(
+            ResumenAccesosService.GLOSA_FALLIDO,
+            usuario=None,
+            descripcion=descripcion,
+            ip_usuario=ip or None,
+            agente=pendiente['agente'],
+            meta={
+                'intentos': pendiente['intentos'],
+                'bloqueados': pendiente['bloqueados'],
+                'usuarios': pendiente['usuarios'],
+                'desde': pendiente['desde'],
+            },
+        )
+        ResumenAccesosService().registrar_fallidos(ip, cantidad=pendiente['intentos'])
+        return log
+
+    def volcar_pendientes(self) -> int:
+        """
+        Escribe los resúmenes pendientes de todas las IPs (comando
+        volcar_intentos_fallidos, para que no queden intentos sin registrar
+        cuando un ataque se detiene).
+
+        Returns:
+            Cantidad de logs escritos
+        """
+        ips = cache.get(f'{self.PREFIJO}:pendientes', set())
+        return sum(1 for ip in ips if self.volcar(ip or None))
+
+
+# ==================== ÁRBOL DE PERMISOS ====================
+
+class PermisosService:
+    """
+    Árbol de permisos (app -> modelo -> permisos) para las pantallas de
+    asignación a roles y usuarios.
+
+    El árbol se arma una vez y queda en caché hasta la próxima migración o
+    cambio de un Permission (ver signals). VERSION cambia cuando cambia el
+    formato del árbol, para no leer uno viejo de una caché compartida tras un
+    despliegue.
+    """
+
+    VERSION = 1
+    CLAVE_CACHE = f'permisos:arbol:v{VERSION}'
+
+    def __init__(self):
+        self.permiso_repo = PermisoRepository()
+
+    def arbol(self) -> List[dict]:
+        """
+        Retorna el árbol de permisos, desde la caché si está disponible.
+
+        Returns:
+            Lista de apps: {'app_label', 'nombre', 'total', 'modelos': [
+            {'modelo', 'nombre', 'permisos': [{'id', 'codename', 'name'}]}]}
+        """
+        arbol = cache.get(self.CLAVE_CACHE)
+        if arbol is None:
+            arbol = self._construir()
+            cache.set(self.CLAVE_CACHE, arbol, None)
+        return arbol
+
+    def _construir(self) -> List[dict]:
+        arbol, app_actual, modelo_actual = [], None, None
+        for permiso in self.permiso_repo.get_all_con_tipo():
+            app_label = permiso['content_type__app_label']
+            modelo = permiso['content_type__model']
+            if app_actual is None or app_actual['app_label'] != app_label:
+                app_actual = {
+                    'app_label': app_label, 'nombre': self._nombre_app(app_label),
+                    'total': 0, 'modelos': [],
+                }
+                arbol.append(app_actual)
+                modelo_actual = None
+            if modelo_actual is None or modelo_actual['modelo'] != modelo:
+                modelo_actual = {
+                    'modelo': modelo, 'nombre': self._nombre_modelo(app_label, modelo), 'permisos': [],
+                }
+                app_actual['modelos'].append(modelo_actual)
+            modelo_actual['permisos'].append({
+                'id': permiso['id'], 'codename': permiso['codename'], 'name': permiso['name'],
+            })
+            app_actual['total'] += 1
+        return arbol
+
+    @staticmethod
+    def _nombre_app(app_label: str) -> str:
+        try:
+            return str(apps.get_app_config(app_label).verbose_name)
+        except LookupError:
+            return app_label.title()
+
+    @staticmethod
+    def _nombre_modelo(app_label: str, modelo: str) -> str:
+        try:
+            return str(apps.get_model(app_label, modelo)._meta.verbose_name_plural).capitalize()
+        except LookupError:
+            return modelo
+
+    @classmethod
+    def invalidar(cls) -> None:
+        cache.delete(cls.CLAVE_CACHE)
+
+    def ids_asignados(self, relacion) -> set:
+        """IDs de los permisos asignados (grupo.permissions o usuario.user_permissions)."""
+        return self.permiso_repo.get_ids(relacion)
+
+    @transaction.atomic
+    def guardar(self, relacion, seleccion: set) -> Tuple[set, set]:
+        """
+        Deja en la relación exactamente los permisos seleccionados, agregando
+        y quitando solo las diferencias.
+
+        Args:
+            relacion: grupo.permissions o usuario.user_permissions
+            seleccion: IDs de permisos marcados
+
+        Returns:
+            Tupla (ids agregados, ids quitados)
+        """
+        actuales = self.permiso_repo.get_ids(relacion)
+        agregados, quitados = seleccion - actuales, actuales - seleccion
+        self.permiso_repo.agregar(relacion, agregados)
+        self.permiso_repo.quitar(relacion, quitados)
+        return agregados, quitados
@@ -1,13 +1,14 @@
 import decimal, datetime
 from django.utils import timezone
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
-from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models.signals import pre_save, post_save, post_delete, post_migrate
 from django.dispatch import receiver
 from django.forms.models import model_to_dict
-from django.contrib.auth.models import User
+from django.contrib.auth.models import User, Permission
 from .models import AuthLogs, AuthLogAccion, HistorialLogin
 from .utils import get_client_ip
 from .middleware import get_current_user
+from .services import IntentosLoginService, PermisosService, ResumenAccesosService, UsuarioListadoService
 
 
 # --------------------------
@@ -39,14 +40,15 @@ def log_user_login(sender, request, user, **kwargs):
         agente=agente,
     )
 
-    # Crear registro en historial de login
-    HistorialLogin.objects.create(
+    # Crear registro en historial de login y sumarlo a los resúmenes
+    historial = HistorialLogin.objects.create(
         usuario=user,
         session_key=session_key,
         direccion_ip=ip,
         agente=agente,
         fecha_login=timezone.now()
     )
+    ResumenAccesosService().registrar_login(historial)
 
 
 @receiver(user_logged_out)
@@ -72,21 +74,36 @@ def log_user_logout(sender, request, user, **kwargs):
 
 @receiver(user_login_failed)
 def log_user_login_failed(sender, credentials, request, **kwargs):
-    """Registra intentos de login fallidos."""
+    """
+    Registra intentos de login fallidos.
+
+    Los intentos se cuentan en caché y se escriben en AuthLogs como un
+    resumen periódico por IP (ver IntentosLoginService).
+    """
     ip = get_client_ip(request)
     agente = request.META.get("HTTP_USER_AGENT", "")
+    username = credentials.get('username') or credentials.get('email') or ''
 
-    # Obtener o crear la acción de login fallido
-    accion, created = AuthLogAccion.objects.get_or_create(
-        glosa="LOGIN_FALLIDO",
-        defaults={'activo': True}
-    )
+    IntentosLoginService().registrar_fallido(username, ip, agente)
 
-    AuthLogs.objects.create(
-        accion=accion,
-        usuario=None,
-        descripcion=f"Intento fallido de login con usuario: {credentials.get('username')}",
-        ip_usuario=ip,
-        agente=agente,
-    )
 
+# --------------------------
+#  Índice de búsqueda de usuarios
+# --------------------------
+@receiver(post_save, sender=User)
+def indexar_usuario(sender, instance, created, update_fields=None, **kwargs):
+    """Regenera los tokens de búsqueda si cambió algún campo buscable."""
+    if update_fields and not set(update_fields) & set(UsuarioListadoService.CAMPOS_BUSQUEDA):
+        return
+    UsuarioListadoService().indexar(instance)
+
+
+# --------------------------
+#  Árbol de permisos en caché
+# --------------------------
+@receiver(post_migrate)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def invalidar_arbol_permisos(sender, **kwargs):
+    """Descarta el árbol de permisos tras una migración o un cambio de Permission."""
+    PermisosService.invalidar()
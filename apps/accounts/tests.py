@@ -20,21 +20,34 @@ Fecha: 2025-10-10
 from django.test import TestCase, Client, RequestFactory, override_settings
 from django.contrib.auth.models import User
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
+from django.core.cache import cache
 from django.urls import reverse
 from django.utils import timezone
 from datetime import datetime, timedelta
 import json
+import shutil
+import tempfile
+from unittest.mock import patch
+from pathlib import Path
 
 from apps.accounts.models import (
     AuthEstado,
     AuthUserEstado,
     AuthLogAccion,
     AuthLogs,
-    HistorialLogin
+    HistorialLogin,
+    AuthLogReferencia,
+    ResumenAcceso,
+    ResumenAccesoIP
 )
 from apps.accounts.signals import log_user_login, log_user_logout, log_user_login_failed
 from apps.accounts.utils import get_client_ip
 from apps.accounts.forms import UserLoginForm
+from apps.accounts.services import (
+    AuditoriaArchivoService, AuditoriaService, IntentosLoginService, ResumenAccesosService,
+    PermisosService, UsuarioListadoService
+)
+from core.utils import registrar_log_auditoria
 
 
 # ============================================================================
@@ -854,8 +867,9 @@ class LoginFailedSignalTest(TestCase):
     """
 
     def setUp(self):
-        """Configuración inicial: crear factory."""
+        """Configuración inicial: crear factory y limpiar contadores de intentos."""
         self.factory = RequestFactory()
+        cache.clear()
 
     def test_signal_crea_log_en_login_fallido(self):
         """
@@ -941,6 +955,7 @@ class LoginViewIntegrationTest(TestCase):
 
     def setUp(self):
         """Configuración inicial: crear usuario y cliente."""
+        cache.clear()
         self.client = Client()
         self.user = User.objects.create_user(
             username='testuser',
@@ -1358,6 +1373,7 @@ class SecurityTests(TestCase):
 
     def setUp(self):
         """Configuración inicial."""
+        cache.clear()
         self.client = Client()
         self.user = User.objects.create_user(
             username='testuser',
@@ -1438,19 +1454,21 @@ class SecurityTests(TestCase):
     def test_multiples_intentos_fallidos_se_registran(self):
         """
         Test: Múltiples intentos fallidos deben registrarse todos.
-        Criterio: Base para implementar rate limiting.
+        Criterio: Se resumen en pocos logs cuyo meta.intentos suma el total.
         """
         for i in range(5):
             self.client.post(self.login_url, {
                 'login': 'testuser',
                 'password': 'wrongpass'
             })
+        IntentosLoginService().volcar_pendientes()
 
         logs = AuthLogs.objects.filter(
             accion__glosa='LOGIN_FALLIDO'
         )
 
-        self.assertEqual(logs.count(), 5)
+        self.assertEqual(logs.count(), 2)
+        self.assertEqual(sum(log.meta['intentos'] for log in logs), 5)
 
 
 # ============================================================================
@@ -1505,6 +1523,407 @@ class UserLoginFormTest(TestCase):
         self.assertIsNotNone(form)
 
 
+# ============================================================================
+# TESTS DE RETENCIÓN DE AUDITORÍA
+# ============================================================================
+
+class AuditoriaArchivoTest(TestCase):
+    """
+    Tests del archivo de AuthLogs en JSONL comprimido.
+    Valida el traslado por bloques y la búsqueda sobre tabla y archivo.
+    """
+
+    def setUp(self):
+        """Crea logs antiguos y recientes y un directorio de archivo temporal."""
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio, ignore_errors=True)
+        self.service = AuditoriaArchivoService(directorio=self.directorio)
+
+        self.user = User.objects.create_user(username='auditado', password='x')
+        login = AuthLogAccion.objects.create(glosa='LOGIN')
+        editar = AuthLogAccion.objects.create(glosa='EDITAR')
+        ahora = timezone.now()
+        for dias in range(10):
+            for accion in (login, editar):
+                log = AuthLogs.objects.create(
+                    usuario=self.user, accion=accion,
+                    descripcion=f'{accion.glosa} hace {dias * 30} días', meta={'dias': dias}
+                )
+                AuthLogs.objects.filter(pk=log.pk).update(fecha_creacion=ahora - timedelta(days=dias * 30))
+
+    def test_archiva_por_dia_y_elimina(self):
+        """
+        Test: Los logs anteriores al corte pasan a archivos diarios y salen de la tabla.
+        Criterio: Quedan solo los recientes y hay un archivo por día archivado.
+        """
+        fecha_limite = self.service.fecha_limite(100)
+        total, ultimo_id = 0, 0
+        while True:
+            archivados, ultimo_id = self.service.archivar_lote(fecha_limite, ultimo_id, lote=3)
+            if ultimo_id is None:
+                break
+            total += archivados
+
+        self.assertEqual(total, 12)
+        self.assertEqual(AuthLogs.objects.count(), 8)
+        self.assertEqual(len(list(Path(self.directorio).rglob('*.jsonl.gz'))), 6)
+
+    def test_busqueda_combina_tabla_y_archivo(self):
+        """
+        Test: La búsqueda devuelve logs de la tabla y del archivo, ordenados y filtrados.
+        Criterio: Mismos resultados antes y después de archivar.
+        """
+        desde = timezone.now() - timedelta(days=200)
+        antes = self.service.buscar(usuario=self.user, accion='login', desde=desde)
+
+        self.service.archivar_lote(self.service.fecha_limite(100), lote=100)
+        despues = self.service.buscar(usuario=self.user, accion='login', desde=desde)
+
+        self.assertEqual([r['id'] for r in despues], [r['id'] for r in antes])
+        self.assertEqual(len(despues), 7)
+        self.assertEqual(despues[-1]['meta'], {'dias': 6})
+        self.assertEqual(len(self.service.buscar(accion='EDITAR', limite=4)), 4)
+
+    def test_archivo_conserva_referencias(self):
+        """
+        Test: Las referencias de un log archivado viajan en su registro.
+        Criterio: Se eliminan de la tabla con el log y quedan en el archivo.
+        """
+        antiguo = AuthLogs.objects.filter(meta__dias=9).first()
+        AuthLogReferencia.objects.bulk_create([
+            AuthLogReferencia(log=antiguo, tipo='activo', objeto_id=7),
+            AuthLogReferencia(log=antiguo, tipo='toma', objeto_id=3),
+        ])
+
+        self.service.archivar_lote(self.service.fecha_limite(100), lote=100)
+
+        self.assertFalse(AuthLogReferencia.objects.exists())
+        registros = {r['id']: r for r in self.service.buscar(desde=timezone.now() - timedelta(days=300))}
+        self.assertEqual(registros[antiguo.pk]['referencias'], [['activo', 7], ['toma', 3]])
+        self.assertEqual(
+            sum(1 for r in registros.values() if r.get('referencias') == []), 11
+        )
+
+
+class NavegadorAuditoriaTest(TestCase):
+    """
+    Tests del navegador de logs de auditoría.
+    Valida referencias extraídas de meta, texto completo y paginación por cursor.
+    """
+
+    def setUp(self):
+        """Registra logs con referencias a objetos."""
+        self.admin = User.objects.create_superuser(username='auditor', password='x')
+        self.request = RequestFactory().get('/')
+        for i in range(7):
+            registrar_log_auditoria(
+                self.admin, 'ACTUALIZAR', f'Cerró la toma de inventario TOMA-{i:04d}',
+                self.request, meta={'toma_id': i, 'activo_ids': [100, 100 + i], 'omitidos': []}
+            )
+        self.service = AuditoriaService()
+
+    def test_referencias_extraidas_de_meta(self):
+        """
+        Test: Las claves *_id y *_ids de meta se indexan como referencias.
+        Criterio: Buscar por activo o toma devuelve solo los logs que lo mencionan.
+        """
+        self.assertEqual(AuthLogReferencia.objects.filter(tipo='activo', objeto_id=100).count(), 7)
+
+        logs, _ = self.service.buscar_pagina({'referencia_tipo': 'activo', 'referencia_valor': '103'})
+        self.assertEqual([log.meta['toma_id'] for log in logs], [3])
+
+    def test_busqueda_texto_completo(self):
+        """
+        Test: La búsqueda por texto usa el índice de texto completo.
+        Criterio: Un código con guion coincide con el log exacto.
+        """
+        logs, _ = self.service.buscar_pagina({'texto': 'TOMA-0005'})
+        self.assertEqual(len(logs), 1)
+        self.assertIn('TOMA-0005', logs[0].descripcion)
+
+    def test_paginacion_por_cursor(self):
+        """
+        Test: Las páginas se encadenan por cursor sin repetir ni saltar logs.
+        Criterio: Tres páginas de 3, 3 y 1 logs, del más reciente al más antiguo.
+        """
+        vistos, cursor = [], None
+        while True:
+            logs, cursor = self.service.buscar_pagina({}, cursor=cursor, por_pagina=3)
+            vistos.extend(log.pk for log in logs)
+            if not cursor:
+                break
+        self.assertEqual(vistos, list(AuthLogs.objects.order_by('-fecha_creacion', '-id').values_list('pk', flat=True)))
+
+    def test_vista_requiere_permiso(self):
+        """
+        Test: El navegador solo es accesible con permiso de ver logs.
+        Criterio: 403 sin permiso, 200 para superusuario.
+        """
+        User.objects.create_user(username='sinpermiso', password='x')
+        self.client.login(username='sinpermiso', password='x')
+        self.assertEqual(self.client.get(reverse('accounts:lista_auditoria')).status_code, 403)
+
+        self.client.login(username='auditor', password='x')
+        response = self.client.get(reverse('accounts:lista_auditoria'), {'texto': 'TOMA-0001'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['logs']), 1)
+
+
+class ResumenAccesosTest(TestCase):
+    """
+    Tests de los resúmenes de accesos por hora y por día.
+    Valida que el mantenimiento incremental coincide con el recálculo.
+    """
+
+    def setUp(self):
+        """Crea usuarios y un request con IP conocida."""
+        cache.clear()
+        self.usuarios = [User.objects.create(username=f'resumen{i}') for i in range(3)]
+        self.factory = RequestFactory()
+
+    def _login(self, usuario, ip):
+        request = self.factory.get('/', REMOTE_ADDR=ip)
+        request.session = self.client.session
+        user_logged_in.send(sender=User, request=request, user=usuario)
+
+    def _fallido(self, ip):
+        request = self.factory.post('/', REMOTE_ADDR=ip)
+        user_login_failed.send(sender=User, credentials={'username': 'x'}, request=request)
+
+    def _estado(self):
+        return (
+            sorted(ResumenAcceso.objects.values_list('periodo', 'inicio', 'logins', 'usuarios_distintos', 'fallidos')),
+            sorted(ResumenAccesoIP.objects.values_list('periodo', 'inicio', 'direccion_ip', 'logins', 'fallidos')),
+        )
+
+    def test_incremental_coincide_con_recalculo(self):
+        """
+        Test: Las señales de login mantienen los resúmenes al día.
+        Criterio: Recalcular el día produce exactamente las mismas filas.
+        """
+        self._login(self.usuarios[0], '10.0.0.1')
+        self._login(self.usuarios[0], '10.0.0.1')
+        self._login(self.usuarios[1], '10.0.0.2')
+        self._fallido('10.0.0.9')
+        self._fallido('10.0.0.9')
+        IntentosLoginService().volcar_pendientes()
+
+        dia = ResumenAcceso.objects.get(periodo=ResumenAcceso.PERIODO_DIA)
+        self.assertEqual((dia.logins, dia.usuarios_distintos, dia.fallidos), (3, 2, 2))
+
+        incremental = self._estado()
+        hoy = timezone.localdate()
+        ResumenAccesosService().recalcular(hoy, hoy + timedelta(days=1))
+        self.assertEqual(self._estado(), incremental)
+
+    def test_panel_lee_resumenes(self):
+        """
+        Test: El panel de accesos se arma solo con los resúmenes.
+        Criterio: 200 con los totales y la IP con más actividad primero.
+        """
+        self._login(self.usuarios[2], '10.0.0.3')
+        self._fallido('10.0.0.9')
+        self._fallido('10.0.0.9')
+        IntentosLoginService().volcar_pendientes()
+        admin = User.objects.create_superuser(username='panel', password='x')
+        self.client.force_login(admin)
+
+        response = self.client.get(reverse('accounts:panel_accesos'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_fallidos'], 2)
+        self.assertEqual(response.context['top_ips'][0]['direccion_ip'], '10.0.0.9')
+
+
+class IntentosLoginTest(TestCase):
+    """
+    Tests del bloqueo de logins fallidos.
+    Valida el bloqueo por ventana y las escrituras constantes en AuthLogs.
+    """
+
+    def setUp(self):
+        """Crea un usuario y limpia los contadores."""
+        cache.clear()
+        self.user = User.objects.create_user(username='victima', password='clave-correcta', email='v@example.com')
+        self.login_url = reverse('account_login')
+
+    @override_settings(LOGIN_INTENTOS_MAX=3)
+    def test_bloquea_antes_de_autenticar(self):
+        """
+        Test: Superado el máximo, el login se rechaza sin verificar la contraseña.
+        Criterio: Ni la contraseña correcta inicia sesión y no se llama al backend.
+        """
+        for i in range(3):
+            self.client.post(self.login_url, {'login': 'victima', 'password': 'mala'})
+
+        with patch('django.contrib.auth.backends.ModelBackend.authenticate') as autenticar:
+            response = self.client.post(self.login_url, {'login': 'victima', 'password': 'clave-correcta'})
+
+        autenticar.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_ataque_cuesta_escrituras_constantes(self):
+        """
+        Test: Muchos intentos desde una IP no generan un log por intento.
+        Criterio: Un log inmediato y un resumen al volcar, con el total en meta.
+        """
+        request = RequestFactory().post('/', REMOTE_ADDR='203.0.113.7')
+        for i in range(50):
+            user_login_failed.send(sender=User, credentials={'username': f'spray{i}'}, request=request)
+
+        self.assertEqual(AuthLogs.objects.filter(accion__glosa='LOGIN_FALLIDO').count(), 1)
+
+        IntentosLoginService().volcar_pendientes()
+        logs = AuthLogs.objects.filter(accion__glosa='LOGIN_FALLIDO').order_by('id')
+        self.assertEqual([log.meta['intentos'] for log in logs], [1, 49])
+        self.assertEqual(ResumenAcceso.objects.get(periodo=ResumenAcceso.PERIODO_DIA).fallidos, 50)
+
+
+class UsuarioListadoTest(TestCase):
+    """
+    Tests del listado de usuarios paginado.
+    Valida la búsqueda normalizada, el filtro por grupo y el keyset por username.
+    """
+
+    def setUp(self):
+        """Crea usuarios con nombres acentuados y un grupo."""
+        from django.contrib.auth.models import Group
+        self.grupo = Group.objects.create(name='Docentes')
+        for i in range(7):
+            usuario = User.objects.create(
+                username=f'docente{i}', first_name='José', last_name=f'Muñoz{i}',
+                email=f'jose.munoz{i}@colegio.cl'
+            )
+            if i % 2 == 0:
+                usuario.groups.add(self.grupo)
+        User.objects.create(username='apoderado', first_name='Ana', email='ana@correo.cl')
+        self.service = UsuarioListadoService()
+
+    def test_busqueda_sin_tildes_por_prefijo(self):
+        """
+        Test: La búsqueda ignora tildes y mayúsculas y busca por prefijo.
+        Criterio: "MUNOZ3" y "jose.munoz3@" encuentran al mismo usuario.
+        """
+        usuarios, _ = self.service.buscar_pagina({'buscar': 'MUNOZ3'})
+        self.assertEqual([u.username for u in usuarios], ['docente3'])
+
+        usuarios, _ = self.service.buscar_pagina({'buscar': 'jose.munoz3@'})
+        self.assertEqual([u.username for u in usuarios], ['docente3'])
+
+    def test_edicion_actualiza_indice(self):
+        """
+        Test: Editar el nombre regenera los tokens; guardar last_login no.
+        Criterio: El nuevo apellido se encuentra y el viejo ya no.
+        """
+        usuario = User.objects.get(username='apoderado')
+        usuario.last_name = 'Pérez'
+        usuario.save()
+
+        self.assertEqual(len(self.service.buscar_pagina({'buscar': 'perez'})[0]), 1)
+        with self.assertNumQueries(1):
+            usuario.last_login = timezone.now()
+            usuario.save(update_fields=['last_login'])
+
+    def test_paginacion_keyset_y_grupo(self):
+        """
+        Test: El filtro por grupo pagina por username sin repetir usuarios.
+        Criterio: Dos páginas de 2 y 2 con los docentes pares, en orden.
+        """
+        vistos, cursor = [], None
+        while True:
+            with self.assertNumQueries(2):
+                usuarios, cursor = self.service.buscar_pagina({'group': self.grupo}, cursor=cursor, por_pagina=2)
+            vistos.extend(u.username for u in usuarios)
+            self.assertTrue(all(u.groups.all()[0] == self.grupo for u in usuarios))
+            if not cursor:
+                break
+        self.assertEqual(vistos, ['docente0', 'docente2', 'docente4', 'docente6'])
+
+    def test_migracion_genera_los_mismos_tokens(self):
+        """
+        Test: La migración que indexa usuarios existentes y el servicio tokenizan igual.
+        Criterio: Regenerar el índice desde la migración deja los tokens del servicio.
+        """
+        from importlib import import_module
+        from django.apps import apps as registro
+        from apps.accounts.models import UsuarioToken
+        migracion = import_module('apps.accounts.migrations.0004_usuario_token')
+        User.objects.create(username='largo', first_name='María José', email=f"{'a' * 240}@colegio.cl")
+
+        UsuarioToken.objects.all().delete()
+        migracion.indexar_usuarios(registro, None)
+
+        for usuario in User.objects.all():
+            self.assertEqual(
+                sorted(UsuarioToken.objects.filter(usuario=usuario).values_list('token', flat=True)),
+                UsuarioListadoService.tokens(usuario)
+            )
+
+
+class PermisosArbolTest(TestCase):
+    """
+    Tests del árbol de permisos en caché de las pantallas de asignación.
+    Valida la caché, el marcado por conjunto de IDs y el guardado por diferencias.
+    """
+
+    def setUp(self):
+        """Crea un rol con dos permisos y un administrador."""
+        from django.contrib.auth.models import Group, Permission
+        cache.clear()
+        self.permisos = list(Permission.objects.filter(content_type__app_label='accounts').order_by('id')[:3])
+        self.grupo = Group.objects.create(name='Bodega')
+        self.grupo.permissions.add(*self.permisos[:2])
+        self.admin = User.objects.create_superuser(username='roles', password='x')
+        self.client.force_login(self.admin)
+
+    def test_arbol_se_construye_una_vez(self):
+        """
+        Test: El árbol agrupa por app y modelo y se sirve desde la caché.
+        Criterio: La segunda lectura no consulta la base de datos.
+        """
+        arbol = PermisosService().arbol()
+        app = next(app for app in arbol if app['app_label'] == 'accounts')
+        self.assertEqual(app['nombre'], 'Gestión de Usuarios y Permisos')
+        self.assertEqual(app['total'], sum(len(m['permisos']) for m in app['modelos']))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(PermisosService().arbol(), arbol)
+
+    def test_guardar_solo_diferencias(self):
+        """
+        Test: Guardar agrega y quita solo los permisos que cambiaron.
+        Criterio: Se quita el primero, se agrega el tercero y se audita la diferencia.
+        """
+        url = reverse('accounts:asignar_permisos_grupo', args=[self.grupo.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.context['permisos_asignados'], {p.pk for p in self.permisos[:2]})
+
+        self.client.post(url, {'permissions': [self.permisos[1].pk, self.permisos[2].pk]})
+
+        self.assertEqual(
+            set(self.grupo.permissions.values_list('id', flat=True)),
+            {self.permisos[1].pk, self.permisos[2].pk}
+        )
+        log = AuthLogs.objects.filter(descripcion__contains='grupo: Bodega').latest('id')
+        self.assertEqual(log.meta['permisos_agregados'], [self.permisos[2].pk])
+        self.assertEqual(log.meta['permisos_quitados'], [self.permisos[0].pk])
+
+    def test_permiso_nuevo_invalida_arbol(self):
+        """
+        Test: Crear un Permission descarta el árbol en caché.
+        Criterio: El nuevo permiso aparece en la siguiente lectura.
+        """
+        from django.contrib.auth.models import Permission
+        from django.contrib.contenttypes.models import ContentType
+        PermisosService().arbol()
+        nuevo = Permission.objects.create(
+            codename='exportar_x', name='Puede exportar',
+            content_type=ContentType.objects.get_for_model(AuthLogs)
+        )
+        ids = {p['id'] for app in PermisosService().arbol() for m in app['modelos'] for p in m['permisos']}
+        self.assertIn(nuevo.pk, ids)
+
+
 # ============================================================================
 # SUITE DE TESTS - RESUMEN
 # ============================================================================
@@ -28,4 +28,10 @@ urlpatterns = [
 
     # Asignación de permisos a grupos
     path('grupos/<int:pk>/asignar-permisos/', views.asignar_permisos_grupo, name='asignar_permisos_grupo'),
+
+    # Log de auditoría
+    path('auditoria/', views.lista_auditoria, name='lista_auditoria'),
+
+    # Panel de accesos (resúmenes por hora/día)
+    path('accesos/', views.panel_accesos, name='panel_accesos'),
 ]
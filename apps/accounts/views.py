@@ -3,17 +3,19 @@ from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.views.generic import TemplateView
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.db.models import Count
 from django.contrib.auth.models import User, Group, Permission
 from django.db import transaction
 
 from .forms import (
     UserCreateForm, UserUpdateForm, UserPasswordChangeForm,
     GroupForm, GroupPermissionsForm, UserGroupsForm, UserPermissionsForm,
-    UserFilterForm
+    UserFilterForm, AuditoriaFilterForm
 )
 from .models import AuthLogs, AuthLogAccion
 
+from .services import AuditoriaService, ResumenAccesosService, UsuarioListadoService
+
 # Importar utilidades centralizadas
 from core.utils import registrar_log_auditoria
 
@@ -43,6 +45,8 @@ class MenuUsuariosView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView
             'puede_eliminar_usuarios': self.request.user.has_perm('auth.delete_user'),
             'puede_gestionar_grupos': self.request.user.has_perm('auth.change_group'),
             'puede_gestionar_permisos': self.request.user.has_perm('auth.change_permission'),
+            'puede_ver_auditoria': self.request.user.has_perm('accounts.view_authlogs'),
+            'puede_ver_accesos': self.request.user.has_perm('accounts.view_historiallogin'),
         }
 
         context['titulo'] = 'Gestión de Usuarios y Permisos'
@@ -55,33 +59,19 @@ class MenuUsuariosView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView
 @login_required
 @permission_required('auth.view_user', raise_exception=True)
 def lista_usuarios(request):
-    """Listar todos los usuarios con filtros"""
+    """Listar usuarios con filtros, paginados por username"""
     form = UserFilterForm(request.GET or None)
-    usuarios = User.objects.prefetch_related('groups').all()
-
-    # Aplicar filtros
+    usuarios, siguiente = [], None
     if form.is_valid():
-        buscar = form.cleaned_data.get('buscar')
-        is_active = form.cleaned_data.get('is_active')
-        is_staff = form.cleaned_data.get('is_staff')
-        group = form.cleaned_data.get('group')
-
-        if buscar:
-            usuarios = usuarios.filter(
-                Q(username__icontains=buscar) |
-                Q(email__icontains=buscar) |
-                Q(first_name__icontains=buscar) |
-                Q(last_name__icontains=buscar)
-            )
-
-        if is_active != '':
-            usuarios = usuarios.filter(is_active=is_active)
-
-        if is_staff != '':
-            usuarios = usuarios.filter(is_staff=is_staff)
+        usuarios, siguiente = UsuarioListadoService().buscar_pagina(
+            form.cleaned_data, cursor=request.GET.get('cursor')
+        )
+    elif not form.is_bound:
+        usuarios, siguiente = UsuarioListadoService().buscar_pagina({})
 
-        if group:
-            usuarios = usuarios.filter(groups=group)
+    # Querystring de los filtros para el enlace "Siguiente"
+    filtros = request.GET.copy()
+    filtros.pop('cursor', None)
 
     # Permisos
     permisos = {
@@ -96,6 +86,9 @@ def lista_usuarios(request):
         'usuarios': usuarios,
         'form': form,
         'permisos': permisos,
+        'siguiente': siguiente,
+        'filtros': filtros.urlencode(),
+        'es_primera_pagina': 'cursor' not in request.GET,
     }
 
     return render(request, 'account/gestion_usuarios/lista_usuarios.html', context)
@@ -138,7 +131,8 @@ def crear_usuario(request):
                 request.user,
                 'CREAR',
                 f'Usuario creado: {usuario.username}',
-                request
+                request,
+                meta={'usuario_id': usuario.pk}
             )
 
             messages.success(request, f'Usuario {usuario.username} creado exitosamente.')
@@ -172,7 +166,8 @@ def editar_usuario(request, pk):
                 request.user,
                 'ACTUALIZAR',
                 f'Usuario actualizado: {usuario.username}',
-                request
+                request,
+                meta={'usuario_id': usuario.pk}
             )
 
             messages.success(request, f'Usuario {usuario.username} actualizado exitosamente.')
@@ -216,7 +211,8 @@ def eliminar_usuario(request, pk):
             request.user,
             'ELIMINAR',
             f'Usuario desactivado: {username}',
-            request
+            request,
+            meta={'usuario_id': usuario.pk}
         )
 
         messages.success(request, f'Usuario {username} desactivado exitosamente.')
@@ -248,7 +244,8 @@ def cambiar_password_usuario(request, pk):
                 request.user,
                 'ACTUALIZAR',
                 f'Contraseña cambiada para usuario: {usuario.username}',
-                request
+                request,
+                meta={'usuario_id': usuario.pk}
             )
 
             messages.success(request, f'Contraseña de {usuario.username} actualizada exitosamente.')
@@ -328,7 +325,8 @@ def crear_grupo(request):
                 request.user,
                 'CREAR',
                 f'Grupo/Rol creado: {grupo.name}',
-                request
+                request,
+                meta={'grupo_id': grupo.pk}
             )
 
             messages.success(request, f'Rol {grupo.name} creado exitosamente.')
@@ -362,7 +360,8 @@ def editar_grupo(request, pk):
                 request.user,
                 'ACTUALIZAR',
                 f'Grupo/Rol actualizado: {grupo.name}',
-                request
+                request,
+                meta={'grupo_id': grupo.pk}
             )
 
             messages.success(request, f'Rol {grupo.name} actualizado exitosamente.')
@@ -396,7 +395,8 @@ def eliminar_grupo(request, pk):
             request.user,
             'ELIMINAR',
             f'Grupo/Rol eliminado: {nombre}',
-            request
+            request,
+            meta={'grupo_id': pk}
         )
 
         messages.success(request, f'Rol {nombre} eliminado exitosamente.')
@@ -429,7 +429,12 @@ def asignar_permisos_grupo(request, pk):
                 request.user,
                 'ACTUALIZAR',
                 f'Permisos actualizados para grupo: {grupo.name}',
-                request
+                request,
+                meta={
+                    'grupo_id': grupo.pk,
+                    'permisos_agregados': sorted(form.agregados),
+                    'permisos_quitados': sorted(form.quitados),
+                }
             )
 
             messages.success(request, f'Permisos del rol {grupo.name} actualizados exitosamente.')
@@ -437,19 +442,13 @@ def asignar_permisos_grupo(request, pk):
     else:
         form = GroupPermissionsForm(instance=grupo)
 
-    # Organizar permisos por app
-    permisos_organizados = {}
-    for permission in form.fields['permissions'].queryset:
-        app_label = permission.content_type.app_label
-        if app_label not in permisos_organizados:
-            permisos_organizados[app_label] = []
-        permisos_organizados[app_label].append(permission)
 
     context = {
         'titulo': f'Asignar Permisos: {grupo.name}',
         'form': form,
         'grupo': grupo,
-        'permisos_organizados': permisos_organizados,
+        'arbol_permisos': form.service.arbol(),
+        'permisos_asignados': form.asignados(),
     }
 
     return render(request, 'account/gestion_usuarios/asignar_permisos_grupo.html', context)
@@ -472,7 +471,8 @@ def asignar_grupos_usuario(request, pk):
                 request.user,
                 'ACTUALIZAR',
                 f'Grupos actualizados para usuario: {usuario.username}',
-                request
+                request,
+                meta={'usuario_id': usuario.pk}
             )
 
             messages.success(request, f'Roles del usuario {usuario.username} actualizados exitosamente.')
@@ -506,7 +506,12 @@ def asignar_permisos_usuario(request, pk):
                 request.user,
                 'ACTUALIZAR',
                 f'Permisos actualizados para usuario: {usuario.username}',
-                request
+                request,
+                meta={
+                    'usuario_id': usuario.pk,
+                    'permisos_agregados': sorted(form.agregados),
+                    'permisos_quitados': sorted(form.quitados),
+                }
             )
 
             messages.success(request, f'Permisos del usuario {usuario.username} actualizados exitosamente.')
@@ -514,19 +519,62 @@ def asignar_permisos_usuario(request, pk):
     else:
         form = UserPermissionsForm(instance=usuario)
 
-    # Organizar permisos por app
-    permisos_organizados = {}
-    for permission in form.fields['user_permissions'].queryset:
-        app_label = permission.content_type.app_label
-        if app_label not in permisos_organizados:
-            permisos_organizados[app_label] = []
-        permisos_organizados[app_label].append(permission)
 
     context = {
         'titulo': f'Asignar Permisos: {usuario.username}',
         'form': form,
         'usuario_detalle': usuario,
-        'permisos_organizados': permisos_organizados,
+        'arbol_permisos': form.service.arbol(),
+        'permisos_asignados': form.asignados(),
     }
 
     return render(request, 'account/gestion_usuarios/asignar_permisos_usuario.html', context)
+
+
+# ========== AUDITORÍA ==========
+
+@login_required
+@permission_required('accounts.view_authlogs', raise_exception=True)
+def lista_auditoria(request):
+    """Navegador del log de auditoría con filtros y paginación por cursor"""
+    form = AuditoriaFilterForm(request.GET or None)
+    logs, siguiente = [], None
+    if form.is_valid():
+        logs, siguiente = AuditoriaService().buscar_pagina(
+            form.cleaned_data, cursor=request.GET.get('cursor')
+        )
+    elif not form.is_bound:
+        logs, siguiente = AuditoriaService().buscar_pagina({})
+
+    # Querystring de los filtros para el enlace "Siguiente"
+    filtros = request.GET.copy()
+    filtros.pop('cursor', None)
+
+    context = {
+        'titulo': 'Log de Auditoría',
+        'form': form,
+        'logs': logs,
+        'siguiente': siguiente,
+        'filtros': filtros.urlencode(),
+        'es_primera_pagina': 'cursor' not in request.GET,
+    }
+
+    return render(request, 'account/gestion_usuarios/lista_auditoria.html', context)
+
+
+@login_required
+@permission_required('accounts.view_historiallogin', raise_exception=True)
+def panel_accesos(request):
+    """Panel de uso del sistema: logins, usuarios distintos, fallidos e IPs (solo resúmenes)"""
+    panel = ResumenAccesosService().obtener_panel()
+
+    context = {
+        'titulo': 'Panel de Accesos',
+        'por_dia': panel['por_dia'],
+        'por_hora': panel['por_hora'],
+        'top_ips': panel['top_ips'],
+        'total_logins': sum(r.logins for r in panel['por_dia']),
+        'total_fallidos': sum(r.fallidos for r in panel['por_dia']),
+    }
+
+    return render(request, 'account/gestion_usuarios/panel_accesos.html', context)
@@ -154,27 +154,26 @@ class ActivoForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Filtrar solo registros activos para los selectores
-        self.fields['categoria'].queryset = CategoriaActivo.objects.filter(activo=True, eliminado=False)
+        self.fields['categoria'].queryset = CategoriaActivo.vivos.filter(activo=True)
         self.fields['estado'].queryset = EstadoActivo.objects.filter(activo=True)
-        self.fields['unidad_medida'].queryset = UnidadMedida.objects.filter(activo=True, eliminado=False)
+        self.fields['unidad_medida'].queryset = UnidadMedida.vivos.filter(activo=True)
         
         # Filtrar marcas y modelos activos
         from apps.inventario.models import Marca, Modelo, NombreArticulo, SectorInventario
-        self.fields['marca'].queryset = Marca.objects.filter(activo=True, eliminado=False)
-        self.fields['modelo'].queryset = Modelo.objects.filter(activo=True, eliminado=False)
+        self.fields['marca'].queryset = Marca.vivos.filter(activo=True)
+        self.fields['modelo'].queryset = Modelo.vivos.filter(activo=True)
         self.fields['modelo'].required = False
         
         # Si hay instancia y tiene marca, filtrar modelos
         if self.instance and self.instance.pk and self.instance.marca:
-            self.fields['modelo'].queryset = Modelo.objects.filter(
+            self.fields['modelo'].queryset = Modelo.vivos.filter(
                 marca=self.instance.marca,
-                activo=True,
-                eliminado=False
+                activo=True
             )
         
         # Cargar nombres de artículos y sectores activos
-        self.fields['nombre_articulo'].queryset = NombreArticulo.objects.filter(activo=True, eliminado=False)
-        self.fields['sector'].queryset = SectorInventario.objects.filter(activo=True, eliminado=False)
+        self.fields['nombre_articulo'].queryset = NombreArticulo.vivos.filter(activo=True)
+        self.fields['sector'].queryset = SectorInventario.vivos.filter(activo=True)
 
     def save(self, commit=True):
         instance = super().save(commit=False)
@@ -309,7 +308,7 @@ class MovimientoActivoForm(forms.ModelForm):
             'categoria', 'estado'
         )
         self.fields['tipo_movimiento'].queryset = TipoMovimientoActivo.objects.filter(activo=True)
-        self.fields['ubicacion_destino'].queryset = Ubicacion.objects.filter(activo=True, eliminado=False)
+        self.fields['ubicacion_destino'].queryset = Ubicacion.vivos.filter(activo=True)
         self.fields['responsable'].queryset = User.objects.filter(is_active=True).order_by('username')
 
         # Hacer que todos los campos opcionales sean realmente opcionales al inicio
@@ -369,11 +368,100 @@ class MovimientoActivoForm(forms.ModelForm):
         return cleaned_data
 
 
+class TrasladoMasivoForm(forms.Form):
+    """
+    Formulario para trasladar varios activos en una sola operación.
+    Los activos se seleccionan por ubicación, responsable, categoría y/o
+    una lista de códigos escaneados (se combinan todos los criterios indicados).
+    """
+
+    # Selección de activos
+    ubicacion_origen = forms.ModelChoiceField(
+        queryset=Ubicacion.vivos.filter(activo=True),
+        required=False,
+        empty_label='Cualquier ubicación',
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Ubicación Actual'
+    )
+    responsable_origen = forms.ModelChoiceField(
+        queryset=User.objects.filter(is_active=True).order_by('username'),
+        required=False,
+        empty_label='Cualquier responsable',
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Responsable Actual'
+    )
+    categoria = forms.ModelChoiceField(
+        queryset=CategoriaActivo.vivos.filter(activo=True),
+        required=False,
+        empty_label='Todas las categorías',
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Categoría'
+    )
+    codigos = forms.CharField(
+        required=False,
+        widget=forms.Textarea(
+            attrs={'class': 'form-control', 'rows': 6, 'placeholder': 'Un código o código de barras por línea...'}
+        ),
+        label='Códigos Escaneados'
+    )
+
+    # Destino
+    tipo_movimiento = forms.ModelChoiceField(
+        queryset=TipoMovimientoActivo.vivos.filter(activo=True),
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Tipo de Movimiento'
+    )
+    ubicacion_destino = forms.ModelChoiceField(
+        queryset=Ubicacion.vivos.filter(activo=True),
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Ubicación Destino'
+    )
+    responsable = forms.ModelChoiceField(
+        queryset=User.objects.filter(is_active=True).order_by('username'),
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Responsable Destino'
+    )
+    observaciones = forms.CharField(
+        required=False,
+        widget=forms.Textarea(
+            attrs={'class': 'form-control', 'rows': 3, 'placeholder': 'Observaciones del traslado...'}
+        ),
+        label='Observaciones'
+    )
+
+    def clean_codigos(self):
+        """Convierte el texto escaneado en una lista de códigos sin duplicados."""
+        texto = self.cleaned_data.get('codigos', '')
+        codigos = [linea.strip() for linea in texto.replace(',', '\n').splitlines()]
+        return list(dict.fromkeys(codigo for codigo in codigos if codigo)) or None
+
+    def clean(self):
+        cleaned_data = super().clean()
+
+        criterios = ('ubicacion_origen', 'responsable_origen', 'categoria', 'codigos')
+        if not any(cleaned_data.get(campo) for campo in criterios):
+            raise forms.ValidationError(
+                'Debe indicar al menos un criterio de selección de activos.'
+            )
+
+        tipo_movimiento = cleaned_data.get('tipo_movimiento')
+        if tipo_movimiento:
+            if tipo_movimiento.requiere_ubicacion and not cleaned_data.get('ubicacion_destino'):
+                self.add_error('ubicacion_destino', 'Este tipo de movimiento requiere ubicación destino')
+
+            if tipo_movimiento.requiere_responsable and not cleaned_data.get('responsable'):
+                self.add_error('responsable', 'Este tipo de movimiento requiere responsable')
+
+        return cleaned_data
+
+
 class FiltroActivosForm(forms.Form):
     """Formulario para filtrar activos en la lista"""
 
     categoria = forms.ModelChoiceField(
-        queryset=CategoriaActivo.objects.filter(activo=True, eliminado=False),
+        queryset=CategoriaActivo.vivos.filter(activo=True),
         required=False,
         empty_label='Todas las categorías',
         widget=forms.Select(attrs={'class': 'form-select'})
@@ -0,0 +1,124 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.activos.models import (
+    Activo, CategoriaActivo, UnidadMedida, EstadoActivo, Ubicacion,
+    TipoMovimientoActivo, UbicacionActual
+)
+from apps.activos.repositories import ActivoRepository
+from apps.activos.services import MovimientoActivoService
+
+
+class _Rollback(Exception):
+    """Fuerza el rollback de los datos sintéticos del benchmark."""
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el traslado masivo de activos entre ubicaciones. Crea activos '
+        'sintéticos dentro de una transacción que se revierte al terminar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--activos', type=int, default=1000,
+            help='Cantidad de activos a trasladar (default: 1000)'
+        )
+        parser.add_argument(
+            '--comparar', action='store_true',
+            help='Mide también el registro uno a uno (registrar_movimiento) para comparar'
+        )
+
+    def handle(self, *args, **options):
+        cantidad = options['activos']
+        self.stdout.write(f'[+] Benchmark de traslado masivo con {cantidad} activos...\n')
+
+        try:
+            with transaction.atomic():
+                datos = self._crear_datos(cantidad)
+                self._medir_masivo(datos)
+                if options['comparar']:
+                    self._medir_individual(datos)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('\n[+] Benchmark finalizado (datos sintéticos revertidos)'))
+
+    def _crear_datos(self, cantidad: int) -> dict:
+        """Crea catálogos y activos sintéticos ubicados en una sala de origen."""
+        usuario = User.objects.create(username='__benchmark_traslado__')
+        categoria = CategoriaActivo.objects.create(codigo='__BENCH__', nombre='Benchmark')
+        unidad = UnidadMedida.objects.create(codigo='__BENCH__', nombre='Benchmark', simbolo='u')
+        estado = EstadoActivo.objects.create(codigo='__BENCH__', nombre='Benchmark')
+        origen = Ubicacion.objects.create(codigo='__BENCH_ORIG__', nombre='Sala Origen')
+        destino = Ubicacion.objects.create(codigo='__BENCH_DEST__', nombre='Sala Destino')
+        tipo = TipoMovimientoActivo.objects.create(
+            codigo='__BENCH__', nombre='Traslado Benchmark',
+            requiere_ubicacion=True, requiere_responsable=False
+        )
+
+        activos = Activo.objects.bulk_create([
+            Activo(
+                codigo=f'BENCH-{i:06d}', codigo_barras=f'BENCH{i:06d}',
+                nombre=f'Activo benchmark {i}', categoria=categoria,
+                unidad_medida=unidad, estado=estado
+            )
+            for i in range(cantidad)
+        ], batch_size=500)
+        UbicacionActual.objects.bulk_create([
+            UbicacionActual(activo=activo, ubicacion=origen) for activo in activos
+        ], batch_size=500)
+
+        return {
+            'usuario': usuario, 'origen': origen, 'destino': destino,
+            'tipo': tipo, 'activos': activos,
+        }
+
+    def _medir_masivo(self, datos: dict) -> None:
+        """Mide trasladar_masivo sobre todos los activos de la sala de origen."""
+        service = MovimientoActivoService()
+        activos = ActivoRepository.filter_para_traslado(ubicacion=datos['origen'])
+
+        with CaptureQueriesContext(connection) as ctx:
+            inicio = time.perf_counter()
+            movimientos, omitidos = service.trasladar_masivo(
+                activos=activos,
+                tipo_movimiento=datos['tipo'],
+                usuario_registro=datos['usuario'],
+                ubicacion_destino=datos['destino']
+            )
+            duracion = time.perf_counter() - inicio
+
+        en_destino = UbicacionActual.objects.filter(ubicacion=datos['destino']).count()
+        self.stdout.write(
+            f'  [+] Masivo: {len(movimientos)} activos en {duracion * 1000:.1f} ms, '
+            f'{len(ctx.captured_queries)} consultas, {en_destino} en destino'
+        )
+
+    def _medir_individual(self, datos: dict) -> None:
+        """Mide el registro uno a uno de vuelta a la sala de origen."""
+        service = MovimientoActivoService()
+        activos = list(
+            Activo.objects.filter(id__in=[a.id for a in datos['activos']]).select_related('estado')
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            inicio = time.perf_counter()
+            for activo in activos:
+                service.registrar_movimiento(
+                    activo=activo,
+                    tipo_movimiento=datos['tipo'],
+                    usuario_registro=datos['usuario'],
+                    ubicacion_destino=datos['origen']
+                )
+            duracion = time.perf_counter() - inicio
+
+        self.stdout.write(
+            f'  [+] Individual: {len(activos)} activos en {duracion * 1000:.1f} ms, '
+            f'{len(ctx.captured_queries)} consultas'
+        )
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activos', '0006_activo_nombre_articulo_activo_sector_and_more'),
+        ('inventario', '0003_toma_inventario'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_activo_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='activo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['categoria', 'codigo'], name='ix_activo_cat_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='activo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['estado', 'codigo'], name='ix_activo_est_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='categoriaactivo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_actcat_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='estadoactivo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_actestado_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='proveniencia',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_proven_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='tipomovimientoactivo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_tipomovact_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='ubicacion',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_ubicacion_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='unidadmedida',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_unidad_codigo_vivo'),
+        ),
+    ]
@@ -2,7 +2,7 @@
 from django.db import models
 from django.core.validators import MinValueValidator
 from django.contrib.auth.models import User
-from core.models import BaseModel
+from core.models import BaseModel, indice_vivos
 
 
 class CategoriaActivo(BaseModel):
@@ -21,6 +21,9 @@ class CategoriaActivo(BaseModel):
         verbose_name = 'Categoría de Activo'
         verbose_name_plural = 'Categorías de Activos'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_actcat_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -41,6 +44,9 @@ class UnidadMedida(BaseModel):
         verbose_name = 'Unidad de Medida'
         verbose_name_plural = 'Unidades de Medida'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_unidad_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre} ({self.simbolo})"
@@ -69,6 +75,9 @@ class EstadoActivo(BaseModel):
         verbose_name = 'Estado de Activo'
         verbose_name_plural = 'Estados de Activos'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_actestado_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -92,6 +101,9 @@ class Ubicacion(BaseModel):
         verbose_name = 'Ubicación'
         verbose_name_plural = 'Ubicaciones'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_ubicacion_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -112,6 +124,9 @@ class Proveniencia(BaseModel):
         verbose_name = 'Proveniencia'
         verbose_name_plural = 'Proveniencias'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_proven_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -134,6 +149,9 @@ class TipoMovimientoActivo(BaseModel):
         verbose_name = 'Tipo de Movimiento de Activo'
         verbose_name_plural = 'Tipos de Movimiento de Activos'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_tipomovact_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -283,6 +301,11 @@ class Activo(BaseModel):
             ('importar_activos', 'Puede importar activos masivamente'),
             ('exportar_activos', 'Puede exportar listado de activos'),
         ]
+        indexes = [
+            indice_vivos('codigo', nombre='ix_activo_codigo_vivo'),
+            indice_vivos('categoria', 'codigo', nombre='ix_activo_cat_codigo_vivo'),
+            indice_vivos('estado', 'codigo', nombre='ix_activo_est_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
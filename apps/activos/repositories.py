@@ -8,6 +8,7 @@ from typing import Optional, List
 from decimal import Decimal
 from django.db.models import QuerySet, Q
 from django.contrib.auth.models import User
+from django.utils import timezone
 from .models import (
     CategoriaActivo, UnidadMedida, EstadoActivo, Ubicacion,
     TipoMovimientoActivo, Activo, MovimientoActivo, UbicacionActual
@@ -22,18 +23,18 @@ class CategoriaActivoRepository:
     @staticmethod
     def get_all() -> QuerySet[CategoriaActivo]:
         """Retorna todas las categorías no eliminadas."""
-        return CategoriaActivo.objects.filter(eliminado=False).order_by('codigo')
+        return CategoriaActivo.vivos.order_by('codigo')
 
     @staticmethod
     def get_active() -> QuerySet[CategoriaActivo]:
         """Retorna solo categorías activas y no eliminadas."""
-        return CategoriaActivo.objects.filter(activo=True, eliminado=False).order_by('codigo')
+        return CategoriaActivo.vivos.filter(activo=True).order_by('codigo')
 
     @staticmethod
     def get_by_id(categoria_id: int) -> Optional[CategoriaActivo]:
         """Obtiene una categoría por su ID."""
         try:
-            return CategoriaActivo.objects.get(id=categoria_id, eliminado=False)
+            return CategoriaActivo.vivos.get(id=categoria_id)
         except CategoriaActivo.DoesNotExist:
             return None
 
@@ -41,16 +42,15 @@ class CategoriaActivoRepository:
     def get_by_codigo(codigo: str) -> Optional[CategoriaActivo]:
         """Obtiene una categoría por su código."""
         try:
-            return CategoriaActivo.objects.get(codigo=codigo, eliminado=False)
+            return CategoriaActivo.vivos.get(codigo=codigo)
         except CategoriaActivo.DoesNotExist:
             return None
 
     @staticmethod
     def search(query: str) -> QuerySet[CategoriaActivo]:
         """Búsqueda de categorías por código o nombre."""
-        return CategoriaActivo.objects.filter(
-            Q(codigo__icontains=query) | Q(nombre__icontains=query),
-            eliminado=False
+        return CategoriaActivo.vivos.filter(
+            Q(codigo__icontains=query) | Q(nombre__icontains=query)
         ).order_by('codigo')
 
 
@@ -60,18 +60,18 @@ class UnidadMedidaRepository:
     @staticmethod
     def get_all() -> QuerySet[UnidadMedida]:
         """Retorna todas las unidades no eliminadas."""
-        return UnidadMedida.objects.filter(eliminado=False).order_by('codigo')
+        return UnidadMedida.vivos.order_by('codigo')
 
     @staticmethod
     def get_active() -> QuerySet[UnidadMedida]:
         """Retorna solo unidades activas y no eliminadas."""
-        return UnidadMedida.objects.filter(activo=True, eliminado=False).order_by('codigo')
+        return UnidadMedida.vivos.filter(activo=True).order_by('codigo')
 
     @staticmethod
     def get_by_id(unidad_id: int) -> Optional[UnidadMedida]:
         """Obtiene una unidad por su ID."""
         try:
-            return UnidadMedida.objects.get(id=unidad_id, eliminado=False)
+            return UnidadMedida.vivos.get(id=unidad_id)
         except UnidadMedida.DoesNotExist:
             return None
 
@@ -82,28 +82,36 @@ class EstadoActivoRepository:
     @staticmethod
     def get_all() -> QuerySet[EstadoActivo]:
         """Retorna todos los estados no eliminados."""
-        return EstadoActivo.objects.filter(eliminado=False).order_by('codigo')
+        return EstadoActivo.vivos.order_by('codigo')
 
     @staticmethod
     def get_active() -> QuerySet[EstadoActivo]:
         """Retorna solo estados activos y no eliminados."""
-        return EstadoActivo.objects.filter(activo=True, eliminado=False).order_by('codigo')
+        return EstadoActivo.vivos.filter(activo=True).order_by('codigo')
 
     @staticmethod
     def get_by_id(estado_id: int) -> Optional[EstadoActivo]:
         """Obtiene un estado por su ID."""
         try:
-            return EstadoActivo.objects.get(id=estado_id, eliminado=False)
+            return EstadoActivo.vivos.get(id=estado_id)
         except EstadoActivo.DoesNotExist:
             return None
 
     @staticmethod
     def get_inicial() -> Optional[EstadoActivo]:
         """Obtiene el estado inicial del sistema."""
-        return EstadoActivo.objects.filter(
-            es_inicial=True, activo=True, eliminado=False
+        return EstadoActivo.vivos.filter(
+            es_inicial=True, activo=True
         ).first()
 
+    @staticmethod
+    def get_by_codigo(codigo: str) -> Optional[EstadoActivo]:
+        """Obtiene un estado por su código."""
+        try:
+            return EstadoActivo.vivos.get(codigo=codigo)
+        except EstadoActivo.DoesNotExist:
+            return None
+
 
 class UbicacionRepository:
     """Repository para gestionar acceso a datos de Ubicacion."""
@@ -111,30 +119,29 @@ class UbicacionRepository:
     @staticmethod
     def get_all() -> QuerySet[Ubicacion]:
         """Retorna todas las ubicaciones no eliminadas."""
-        return Ubicacion.objects.filter(eliminado=False).order_by('codigo')
+        return Ubicacion.vivos.order_by('codigo')
 
     @staticmethod
     def get_active() -> QuerySet[Ubicacion]:
         """Retorna solo ubicaciones activas y no eliminadas."""
-        return Ubicacion.objects.filter(activo=True, eliminado=False).order_by('codigo')
+        return Ubicacion.vivos.filter(activo=True).order_by('codigo')
 
     @staticmethod
     def get_by_id(ubicacion_id: int) -> Optional[Ubicacion]:
         """Obtiene una ubicación por su ID."""
         try:
-            return Ubicacion.objects.get(id=ubicacion_id, eliminado=False)
+            return Ubicacion.vivos.get(id=ubicacion_id)
         except Ubicacion.DoesNotExist:
             return None
 
     @staticmethod
     def search(query: str) -> QuerySet[Ubicacion]:
         """Búsqueda de ubicaciones por código, nombre, edificio o área."""
-        return Ubicacion.objects.filter(
+        return Ubicacion.vivos.filter(
             Q(codigo__icontains=query) |
             Q(nombre__icontains=query) |
             Q(edificio__icontains=query) |
-            Q(area__icontains=query),
-            eliminado=False
+            Q(area__icontains=query)
         ).order_by('codigo')
 
 
@@ -144,18 +151,26 @@ class TipoMovimientoActivoRepository:
     @staticmethod
     def get_all() -> QuerySet[TipoMovimientoActivo]:
         """Retorna todos los tipos de movimiento no eliminados."""
-        return TipoMovimientoActivo.objects.filter(eliminado=False).order_by('codigo')
+        return TipoMovimientoActivo.vivos.order_by('codigo')
 
     @staticmethod
     def get_active() -> QuerySet[TipoMovimientoActivo]:
         """Retorna solo tipos activos y no eliminados."""
-        return TipoMovimientoActivo.objects.filter(activo=True, eliminado=False).order_by('codigo')
+        return TipoMovimientoActivo.vivos.filter(activo=True).order_by('codigo')
 
     @staticmethod
     def get_by_id(tipo_id: int) -> Optional[TipoMovimientoActivo]:
         """Obtiene un tipo de movimiento por su ID."""
         try:
-            return TipoMovimientoActivo.objects.get(id=tipo_id, eliminado=False)
+            return TipoMovimientoActivo.vivos.get(id=tipo_id)
+        except TipoMovimientoActivo.DoesNotExist:
+            return None
+
+    @staticmethod
+    def get_by_codigo(codigo: str) -> Optional[TipoMovimientoActivo]:
+        """Obtiene un tipo de movimiento por su código."""
+        try:
+            return TipoMovimientoActivo.vivos.get(codigo=codigo)
         except TipoMovimientoActivo.DoesNotExist:
             return None
 
@@ -168,17 +183,15 @@ class ActivoRepository:
     @staticmethod
     def get_all() -> QuerySet[Activo]:
         """Retorna todos los activos no eliminados con relaciones optimizadas."""
-        return Activo.objects.filter(
-            eliminado=False
-        ).select_related(
+        return Activo.vivos.select_related(
             'categoria', 'unidad_medida', 'estado'
         ).order_by('codigo')
 
     @staticmethod
     def get_active() -> QuerySet[Activo]:
         """Retorna solo activos activos y no eliminados."""
-        return Activo.objects.filter(
-            activo=True, eliminado=False
+        return Activo.vivos.filter(
+            activo=True
         ).select_related(
             'categoria', 'unidad_medida', 'estado'
         ).order_by('codigo')
@@ -187,9 +200,9 @@ class ActivoRepository:
     def get_by_id(activo_id: int) -> Optional[Activo]:
         """Obtiene un activo por su ID."""
         try:
-            return Activo.objects.select_related(
+            return Activo.vivos.select_related(
                 'categoria', 'unidad_medida', 'estado'
-            ).get(id=activo_id, eliminado=False)
+            ).get(id=activo_id)
         except Activo.DoesNotExist:
             return None
 
@@ -197,18 +210,17 @@ class ActivoRepository:
     def get_by_codigo(codigo: str) -> Optional[Activo]:
         """Obtiene un activo por su código."""
         try:
-            return Activo.objects.select_related(
+            return Activo.vivos.select_related(
                 'categoria', 'unidad_medida', 'estado'
-            ).get(codigo=codigo, eliminado=False)
+            ).get(codigo=codigo)
         except Activo.DoesNotExist:
             return None
 
     @staticmethod
     def filter_by_categoria(categoria: CategoriaActivo) -> QuerySet[Activo]:
         """Retorna activos de una categoría específica."""
-        return Activo.objects.filter(
-            categoria=categoria,
-            eliminado=False
+        return Activo.vivos.filter(
+            categoria=categoria
         ).select_related(
             'categoria', 'unidad_medida', 'estado'
         ).order_by('codigo')
@@ -216,23 +228,28 @@ class ActivoRepository:
     @staticmethod
     def filter_by_estado(estado: EstadoActivo) -> QuerySet[Activo]:
         """Retorna activos en un estado específico."""
-        return Activo.objects.filter(
-            estado=estado,
-            eliminado=False
+        return Activo.vivos.filter(
+            estado=estado
         ).select_related(
             'categoria', 'unidad_medida', 'estado'
         ).order_by('codigo')
 
+    @staticmethod
+    def filter_by_ubicacion_actual(ubicacion: Ubicacion) -> QuerySet[Activo]:
+        """Retorna activos cuya ubicación actual es la ubicación indicada."""
+        return Activo.vivos.filter(
+            ubicacion_actual__ubicacion=ubicacion
+        ).order_by('codigo')
+
     @staticmethod
     def search(query: str) -> QuerySet[Activo]:
         """Búsqueda de activos por código, nombre, marca, modelo o serie."""
-        return Activo.objects.filter(
+        return Activo.vivos.filter(
             Q(codigo__icontains=query) |
             Q(nombre__icontains=query) |
-            Q(marca__icontains=query) |
-            Q(modelo__icontains=query) |
-            Q(numero_serie__icontains=query),
-            eliminado=False
+            Q(marca__nombre__icontains=query) |
+            Q(modelo__nombre__icontains=query) |
+            Q(numero_serie__icontains=query)
         ).select_related(
             'categoria', 'unidad_medida', 'estado'
         ).order_by('codigo')
@@ -245,6 +262,70 @@ class ActivoRepository:
             queryset = queryset.exclude(id=exclude_id)
         return queryset.exists()
 
+    @staticmethod
+    def filter_para_traslado(
+        ubicacion: Optional[Ubicacion] = None,
+        responsable: Optional[User] = None,
+        categoria: Optional[CategoriaActivo] = None,
+        codigos: Optional[List[str]] = None
+    ) -> QuerySet[Activo]:
+        """
+        Selecciona activos para un traslado masivo.
+
+        Los criterios se combinan con AND: ubicación actual, responsable actual,
+        categoría y/o una lista escaneada de códigos o códigos de barras.
+        """
+        queryset = Activo.vivos.all()
+
+        if ubicacion is not None:
+            queryset = queryset.filter(ubicacion_actual__ubicacion=ubicacion)
+
+        if responsable is not None:
+            queryset = queryset.filter(ubicacion_actual__responsable=responsable)
+
+        if categoria is not None:
+            queryset = queryset.filter(categoria=categoria)
+
+        if codigos is not None:
+            queryset = queryset.filter(
+                Q(codigo__in=codigos) | Q(codigo_barras__in=codigos)
+            )
+
+        return queryset.order_by('codigo')
+
+    @staticmethod
+    def get_resumen_by_codigos_barras(codigos_barras: List[str]) -> QuerySet:
+        """
+        Retorna los datos mínimos de los activos con los códigos de barras dados.
+
+        Usa el índice único de codigo_barras y resuelve estado y ubicación
+        actual en la misma consulta.
+        """
+        return Activo.vivos.filter(
+            codigo_barras__in=codigos_barras
+        ).values(
+            'id', 'codigo_barras', 'codigo', 'nombre',
+            'estado__codigo', 'ubicacion_actual__ubicacion__codigo'
+        ).order_by()
+
+    @staticmethod
+    def get_codigos_barras_by_ids(activo_ids: List[int]) -> List[str]:
+        """Retorna los códigos de barras de los activos indicados."""
+        return list(
+            Activo.objects.filter(
+                id__in=activo_ids,
+                codigo_barras__isnull=False
+            ).values_list('codigo_barras', flat=True).order_by()
+        )
+
+    @staticmethod
+    def bulk_update_estado(activo_ids: List[int], estado: EstadoActivo) -> int:
+        """Cambia el estado de varios activos con un único UPDATE."""
+        return Activo.objects.filter(id__in=activo_ids).update(
+            estado=estado,
+            fecha_actualizacion=timezone.now()
+        )
+
 
 # ==================== MOVIMIENTO ACTIVO REPOSITORY ====================
 
@@ -322,6 +403,16 @@ class MovimientoActivoRepository:
             observaciones=observaciones
         )
 
+    @staticmethod
+    def bulk_create(movimientos: List[MovimientoActivo], batch_size: int = 500) -> List[MovimientoActivo]:
+        """
+        Inserta varios movimientos en lote.
+
+        Los IDs quedan asignados en las instancias (RETURNING en SQLite/PostgreSQL),
+        por lo que pueden usarse como ultimo_movimiento de UbicacionActual.
+        """
+        return MovimientoActivo.objects.bulk_create(movimientos, batch_size=batch_size)
+
 
 # ==================== UBICACION ACTUAL REPOSITORY ====================
 
@@ -380,3 +471,25 @@ class UbicacionActualRepository:
             }
         )
         return ubicacion_actual
+
+    @staticmethod
+    def bulk_upsert(
+        ubicaciones: List[UbicacionActual],
+        batch_size: int = 500
+    ) -> List[UbicacionActual]:
+        """
+        Inserta o actualiza en lote la ubicación actual de varios activos.
+
+        Usa INSERT ... ON CONFLICT (activo) DO UPDATE, de modo que activos sin
+        registro previo se crean y los existentes se actualizan en la misma sentencia.
+        """
+        return UbicacionActual.objects.bulk_create(
+            ubicaciones,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['activo'],
+            update_fields=[
+                'ubicacion', 'responsable', 'ultimo_movimiento',
+                'fecha_ultima_actualizacion'
+            ]
+        )
@@ -4,9 +4,11 @@ Service Layer para el módulo de activos.
 Contiene la lógica de negocio y coordina los repositories,
 siguiendo el principio de Single Responsibility (SOLID).
 """
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, List
 from decimal import Decimal
+from datetime import date
 from django.db import transaction
+from django.db.models import QuerySet
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from .models import (
@@ -19,6 +21,7 @@ from .repositories import (
     TipoMovimientoActivoRepository, ActivoRepository,
     MovimientoActivoRepository, UbicacionActualRepository
 )
+from .signals import activos_actualizados_masivo
 
 
 # ==================== ACTIVO SERVICE ====================
@@ -248,6 +251,167 @@ class MovimientoActivoService:
 
         return movimiento
 
+    @transaction.atomic
+    def trasladar_masivo(
+        self,
+        activos: QuerySet[Activo],
+        tipo_movimiento: TipoMovimientoActivo,
+        usuario_registro: User,
+        ubicacion_destino: Optional[Ubicacion] = None,
+        responsable: Optional[User] = None,
+        observaciones: Optional[str] = None,
+        conservar_responsable: bool = False
+    ) -> Tuple[List[MovimientoActivo], List[str]]:
+        """
+        Traslada un conjunto de activos a una ubicación/responsable en una operación.
+
+        Lee los activos con una sola consulta (incluyendo lote y vencimiento del
+        último movimiento para arrastrarlos), crea todos los movimientos con
+        bulk_create y actualiza UbicacionActual con un upsert por lotes.
+        Los activos cuyo estado no permite movimiento se omiten.
+
+        Args:
+            activos: QuerySet con los activos a trasladar
+            tipo_movimiento: Tipo de movimiento
+            usuario_registro: Usuario que registra
+            ubicacion_destino: Ubicación destino (opcional)
+            responsable: Responsable destino (opcional)
+            observaciones: Observaciones (opcional)
+            conservar_responsable: Si no se indica responsable, cada activo
+                mantiene su responsable actual (solo cambia de ubicación); el
+                tipo de movimiento no exige entonces un responsable nuevo
+
+        Returns:
+            Tupla (movimientos creados, códigos de activos omitidos)
+
+        Raises:
+            ValidationError: Si faltan datos requeridos o no hay activos para trasladar
+        """
+        errors = {}
+
+        if tipo_movimiento.requiere_ubicacion and not ubicacion_destino:
+            errors['ubicacion_destino'] = 'Este tipo de movimiento requiere ubicación destino'
+
+        if tipo_movimiento.requiere_responsable and not responsable and not conservar_responsable:
+            errors['responsable'] = 'Este tipo de movimiento requiere responsable'
+
+        if errors:
+            raise ValidationError(errors)
+
+        filas = activos.values_list(
+            'id', 'codigo', 'numero_serie', 'estado__permite_movimiento',
+            'ubicacion_actual__ultimo_movimiento__lote',
+            'ubicacion_actual__ultimo_movimiento__fecha_vencimiento',
+            'ubicacion_actual__responsable_id',
+        )
+
+        movimientos = []
+        omitidos = []
+        for activo_id, codigo, numero_serie, permite_movimiento, lote, vencimiento, responsable_actual_id in filas:
+            if not permite_movimiento:
+                omitidos.append(codigo)
+                continue
+            if responsable is not None:
+                responsable_id = responsable.pk
+            else:
+                responsable_id = responsable_actual_id if conservar_responsable else None
+            movimientos.append(MovimientoActivo(
+                activo_id=activo_id,
+                tipo_movimiento=tipo_movimiento,
+                usuario_registro=usuario_registro,
+                ubicacion_destino=ubicacion_destino,
+                responsable_id=responsable_id,
+                numero_serie=numero_serie,
+                lote=lote,
+                fecha_vencimiento=vencimiento,
+                observaciones=observaciones
+            ))
+
+        if not movimientos:
+            raise ValidationError('No hay activos que puedan trasladarse con los criterios indicados.')
+
+        movimientos = self.movimiento_repo.bulk_create(movimientos)
+
+        self.ubicacion_actual_repo.bulk_upsert([
+            UbicacionActual(
+                activo_id=movimiento.activo_id,
+                ubicacion=ubicacion_destino,
+                responsable_id=movimiento.responsable_id,
+                ultimo_movimiento=movimiento
+            )
+            for movimiento in movimientos
+        ])
+        activos_actualizados_masivo.send(
+            sender=Activo, activo_ids=[movimiento.activo_id for movimiento in movimientos]
+        )
+
+        return movimientos, omitidos
+
+    @transaction.atomic
+    def dar_de_baja_masivo(
+        self,
+        activo_ids: List[int],
+        estado_baja: EstadoActivo,
+        tipo_movimiento: TipoMovimientoActivo,
+        usuario_registro: User,
+        fecha_baja: date,
+        motivo_baja: str,
+        observaciones: Optional[str] = None
+    ) -> List[MovimientoActivo]:
+        """
+        Aplica la baja a un conjunto de activos con operaciones por lotes.
+
+        En una sola pasada cambia el estado de todos los activos, registra un
+        MovimientoActivo de baja por activo y deja su ubicación actual vacía
+        (sin ubicación ni responsable). El número de consultas no depende de la
+        cantidad de activos (salvo el particionado interno de bulk_create).
+
+        Args:
+            activo_ids: IDs de los activos a dar de baja
+            estado_baja: Estado que se asigna a los activos
+            tipo_movimiento: Tipo de movimiento de baja
+            usuario_registro: Usuario que registra la baja
+            fecha_baja: Fecha de la baja
+            motivo_baja: Motivo de la baja
+            observaciones: Observaciones del movimiento (opcional)
+
+        Returns:
+            Lista de movimientos creados
+        """
+        activo_ids = list(dict.fromkeys(activo_ids))
+        if not activo_ids:
+            return []
+
+        # Cambiar estado de todos los activos en un único UPDATE
+        ActivoRepository.bulk_update_estado(activo_ids, estado_baja)
+
+        # Registrar movimientos de baja
+        movimientos = self.movimiento_repo.bulk_create([
+            MovimientoActivo(
+                activo_id=activo_id,
+                tipo_movimiento=tipo_movimiento,
+                usuario_registro=usuario_registro,
+                fecha_baja=fecha_baja,
+                motivo_baja=motivo_baja,
+                observaciones=observaciones
+            )
+            for activo_id in activo_ids
+        ])
+
+        # Limpiar ubicación actual apuntando al movimiento de baja
+        self.ubicacion_actual_repo.bulk_upsert([
+            UbicacionActual(
+                activo_id=movimiento.activo_id,
+                ubicacion=None,
+                responsable=None,
+                ultimo_movimiento=movimiento
+            )
+            for movimiento in movimientos
+        ])
+        activos_actualizados_masivo.send(sender=Activo, activo_ids=activo_ids)
+
+        return movimientos
+
     def obtener_historial_activo(
         self,
         activo: Activo,
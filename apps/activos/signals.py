@@ -0,0 +1,11 @@
+from django.dispatch import Signal
+
+
+# --------------------------
+#  Operaciones masivas
+# --------------------------
+# Los UPDATE y bulk_create de las operaciones masivas no disparan post_save.
+# Se envía después de escribir, con activo_ids=[...], para que otras
+# aplicaciones (p. ej. la caché del escáner de inventario) reaccionen sin que
+# activos dependa de ellas.
+activos_actualizados_masivo = Signal()
@@ -0,0 +1,93 @@
+"""
+Tests de los movimientos masivos de activos.
+"""
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from apps.activos.models import (
+    Activo, CategoriaActivo, EstadoActivo, MovimientoActivo, TipoMovimientoActivo,
+    UnidadMedida, Ubicacion, UbicacionActual
+)
+from apps.activos.repositories import ActivoRepository
+from apps.activos.services import MovimientoActivoService
+
+
+# ============================================================================
+# TRASLADO MASIVO
+# ============================================================================
+
+class TrasladoMasivoTest(TestCase):
+    """
+    Test: trasladar_masivo mueve en bloque los activos seleccionados
+    Criterio: Un movimiento por activo trasladable, ubicación actual
+              actualizada, omitidos los que no permiten movimiento y
+              validados los datos que exige el tipo de movimiento
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = User.objects.create_user('traslados', password='traslados123')
+        cls.custodio = User.objects.create_user('custodio', password='custodio123')
+        cls.disponible = EstadoActivo.objects.create(codigo='DISP', nombre='Disponible', es_inicial=True)
+        cls.reparacion = EstadoActivo.objects.create(
+            codigo='REP', nombre='En reparación', permite_movimiento=False
+        )
+        cls.tipo = TipoMovimientoActivo.objects.create(codigo='TRAS', nombre='Traslado')
+        cls.origen = Ubicacion.objects.create(codigo='SALA-1', nombre='Sala 1')
+        cls.destino = Ubicacion.objects.create(codigo='SALA-2', nombre='Sala 2')
+        categoria = CategoriaActivo.objects.create(codigo='CAT', nombre='Mobiliario')
+        unidad = UnidadMedida.objects.create(codigo='UN', nombre='Unidad', simbolo='un')
+        cls.activos = []
+        for i, estado in enumerate([cls.disponible, cls.disponible, cls.reparacion]):
+            activo = Activo.objects.create(
+                codigo=f'A-{i:02d}', nombre=f'Silla {i}', categoria=categoria,
+                unidad_medida=unidad, estado=estado
+            )
+            UbicacionActual.objects.create(activo=activo, ubicacion=cls.origen, responsable=cls.usuario)
+            cls.activos.append(activo)
+
+    def test_traslada_y_omite_no_movibles(self):
+        """Los disponibles pasan al destino con el nuevo responsable; el en reparación se omite."""
+        movimientos, omitidos = MovimientoActivoService().trasladar_masivo(
+            activos=ActivoRepository.filter_para_traslado(ubicacion=self.origen),
+            tipo_movimiento=self.tipo,
+            usuario_registro=self.usuario,
+            ubicacion_destino=self.destino,
+            responsable=self.custodio
+        )
+
+        movidos = [a.pk for a in self.activos[:2]]
+        self.assertEqual(sorted(m.activo_id for m in movimientos), movidos)
+        self.assertEqual(omitidos, ['A-02'])
+        self.assertEqual(MovimientoActivo.objects.filter(activo_id__in=movidos).count(), 2)
+        for ubicacion_actual in UbicacionActual.objects.filter(activo_id__in=movidos):
+            self.assertEqual(ubicacion_actual.ubicacion, self.destino)
+            self.assertEqual(ubicacion_actual.responsable, self.custodio)
+            self.assertEqual(ubicacion_actual.ultimo_movimiento.activo_id, ubicacion_actual.activo_id)
+        self.assertEqual(UbicacionActual.objects.get(activo=self.activos[2]).ubicacion, self.origen)
+
+    def test_filtra_por_codigos_escaneados(self):
+        """La selección acepta códigos o códigos de barras y se combina con la ubicación."""
+        activos = ActivoRepository.filter_para_traslado(
+            ubicacion=self.origen, codigos=[self.activos[0].codigo, self.activos[1].codigo_barras, 'X-99']
+        )
+
+        self.assertEqual(list(activos), self.activos[:2])
+
+    def test_valida_requisitos_del_tipo(self):
+        """El tipo exige ubicación y responsable; sin activos movibles también se rechaza."""
+        service = MovimientoActivoService()
+        todos = ActivoRepository.filter_para_traslado(ubicacion=self.origen)
+
+        with self.assertRaises(ValidationError) as error:
+            service.trasladar_masivo(activos=todos, tipo_movimiento=self.tipo, usuario_registro=self.usuario)
+        self.assertEqual(set(error.exception.message_dict), {'ubicacion_destino', 'responsable'})
+
+        with self.assertRaises(ValidationError):
+            service.trasladar_masivo(
+                activos=todos.filter(pk=self.activos[2].pk), tipo_movimiento=self.tipo,
+                usuario_registro=self.usuario, ubicacion_destino=self.destino, responsable=self.custodio
+            )
+        self.assertFalse(MovimientoActivo.objects.exists())
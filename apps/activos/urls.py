@@ -20,6 +20,7 @@ urlpatterns = [
     # ==================== MOVIMIENTOS Y UBICACIONES ====================
     path('movimientos/', views.MovimientoListView.as_view(), name='lista_movimientos'),
     path('movimientos/registrar/', views.MovimientoCreateView.as_view(), name='registrar_movimiento'),
+    path('movimientos/traslado-masivo/', views.TrasladoMasivoView.as_view(), name='traslado_masivo'),
     path('movimientos/<int:pk>/', views.MovimientoDetailView.as_view(), name='detalle_movimiento'),
     path('ubicacion-actual/', views.UbicacionActualListView.as_view(), name='ubicacion_actual'),
 
@@ -14,14 +14,16 @@ from typing import Any, Optional
 from django.db.models import QuerySet, Q
 from django.urls import reverse_lazy
 from django.views.generic import (
-    TemplateView, ListView, DetailView, CreateView, UpdateView, DeleteView
+    TemplateView, ListView, DetailView, CreateView, UpdateView, DeleteView, FormView
 )
+from django.shortcuts import redirect
 from django.contrib import messages
 from django.core.exceptions import ValidationError
 from core.mixins import (
     BaseAuditedViewMixin, AtomicTransactionMixin, SoftDeleteMixin,
     PaginatedListMixin, FilteredListMixin
 )
+from core.utils import registrar_log_auditoria
 from .models import (
     Activo, CategoriaActivo, UnidadMedida, EstadoActivo,
     Ubicacion, TipoMovimientoActivo, MovimientoActivo, UbicacionActual
@@ -29,7 +31,7 @@ from .models import (
 from .forms import (
     ActivoForm, CategoriaActivoForm, UnidadMedidaForm, EstadoActivoForm,
     UbicacionForm, TipoMovimientoActivoForm, MovimientoActivoForm,
-    FiltroActivosForm
+    FiltroActivosForm, TrasladoMasivoForm
 )
 from .repositories import (
     ActivoRepository, CategoriaActivoRepository, UnidadMedidaRepository,
@@ -129,8 +131,8 @@ class ActivoListView(BaseAuditedViewMixin, PaginatedListMixin, FilteredListMixin
                 queryset = queryset.filter(
                     Q(codigo__icontains=q) |
                     Q(nombre__icontains=q) |
-                    Q(marca__icontains=q) |
-                    Q(modelo__icontains=q)
+                    Q(marca__nombre__icontains=q) |
+                    Q(modelo__nombre__icontains=q)
                 )
 
         return queryset.order_by('codigo')
@@ -243,7 +245,7 @@ class ActivoUpdateView(BaseAuditedViewMixin, AtomicTransactionMixin, UpdateView)
 
     def get_queryset(self) -> QuerySet:
         """Solo permite editar activos no eliminados."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_success_url(self) -> str:
         """Redirige al detalle del activo editado."""
@@ -286,7 +288,7 @@ class ActivoDeleteView(BaseAuditedViewMixin, SoftDeleteMixin, DeleteView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite eliminar activos no eliminados."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -345,8 +347,8 @@ class MovimientoListView(BaseAuditedViewMixin, PaginatedListMixin, ListView):
             queryset = queryset.filter(
                 Q(activo__codigo__icontains=buscar) |
                 Q(activo__nombre__icontains=buscar) |
-                Q(activo__marca__icontains=buscar) |
-                Q(activo__modelo__icontains=buscar) |
+                Q(activo__marca__nombre__icontains=buscar) |
+                Q(activo__modelo__nombre__icontains=buscar) |
                 Q(numero_serie__icontains=buscar) |
                 Q(numero_factura_guia__icontains=buscar)
             )
@@ -450,6 +452,79 @@ class MovimientoCreateView(BaseAuditedViewMixin, AtomicTransactionMixin, CreateV
         return context
 
 
+class TrasladoMasivoView(BaseAuditedViewMixin, AtomicTransactionMixin, FormView):
+    """
+    Vista para trasladar varios activos en una sola operación.
+
+    Selecciona activos por ubicación actual, responsable, categoría o lista
+    escaneada y registra todos los movimientos por lotes.
+
+    Permisos: activos.registrar_movimiento
+    Auditoría: Registra una única entrada agregada para todo el traslado
+    Transacción atómica: Todos los activos se trasladan o ninguno
+    """
+    form_class = TrasladoMasivoForm
+    template_name = 'activos/traslado_masivo.html'
+    permission_required = 'activos.registrar_movimiento'
+    success_url = reverse_lazy('activos:lista_movimientos')
+
+    def get_context_data(self, **kwargs) -> dict:
+        """Agrega datos al contexto."""
+        context = super().get_context_data(**kwargs)
+        context['titulo'] = 'Traslado Masivo de Activos'
+        context['action'] = 'Trasladar'
+        return context
+
+    def form_valid(self, form):
+        """Selecciona los activos y registra el traslado usando el service."""
+        data = form.cleaned_data
+        activos = ActivoRepository.filter_para_traslado(
+            ubicacion=data.get('ubicacion_origen'),
+            responsable=data.get('responsable_origen'),
+            categoria=data.get('categoria'),
+            codigos=data.get('codigos')
+        )
+
+        try:
+            movimientos, omitidos = MovimientoActivoService().trasladar_masivo(
+                activos=activos,
+                tipo_movimiento=data['tipo_movimiento'],
+                usuario_registro=self.request.user,
+                ubicacion_destino=data.get('ubicacion_destino'),
+                responsable=data.get('responsable'),
+                observaciones=data.get('observaciones') or None
+            )
+        except ValidationError as e:
+            for error in e.messages:
+                messages.error(self.request, error)
+            return self.form_invalid(form)
+
+        # Una sola entrada de auditoría para todo el traslado
+        destino = data['ubicacion_destino'].nombre if data.get('ubicacion_destino') else 'sin ubicación'
+        registrar_log_auditoria(
+            usuario=self.request.user,
+            accion_glosa='CREAR',
+            descripcion=f'Registró traslado masivo de {len(movimientos)} activo(s) a {destino}',
+            request=self.request,
+            meta={
+                'tipo_movimiento_id': data['tipo_movimiento'].id,
+                'ubicacion_destino_id': data['ubicacion_destino'].id if data.get('ubicacion_destino') else None,
+                'responsable_id': data['responsable'].id if data.get('responsable') else None,
+                'activo_ids': [m.activo_id for m in movimientos],
+                'omitidos': omitidos,
+            }
+        )
+
+        messages.success(self.request, f'Se trasladaron {len(movimientos)} activo(s) exitosamente.')
+        if omitidos:
+            messages.warning(
+                self.request,
+                f'Se omitieron {len(omitidos)} activo(s) cuyo estado no permite movimientos: '
+                f'{", ".join(omitidos[:20])}{"..." if len(omitidos) > 20 else ""}'
+            )
+        return redirect(self.get_success_url())
+
+
 class UbicacionActualListView(BaseAuditedViewMixin, PaginatedListMixin, ListView):
     """
     Vista para ver la ubicación actual de todos los activos.
@@ -492,7 +567,7 @@ class CategoriaListView(BaseAuditedViewMixin, PaginatedListMixin, ListView):
 
     def get_queryset(self) -> QuerySet:
         """Retorna solo categorías no eliminadas."""
-        return super().get_queryset().filter(eliminado=False).order_by('codigo')
+        return super().get_queryset().vivos().order_by('codigo')
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos adicionales al contexto."""
@@ -557,7 +632,7 @@ class CategoriaUpdateView(BaseAuditedViewMixin, UpdateView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite editar categorías no eliminadas."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -596,7 +671,7 @@ class CategoriaDeleteView(BaseAuditedViewMixin, SoftDeleteMixin, DeleteView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite eliminar categorías no eliminadas."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -622,7 +697,7 @@ class UnidadMedidaListView(BaseAuditedViewMixin, PaginatedListMixin, ListView):
 
     def get_queryset(self) -> QuerySet:
         """Retorna solo unidades no eliminadas."""
-        return super().get_queryset().filter(eliminado=False).order_by('codigo')
+        return super().get_queryset().vivos().order_by('codigo')
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos adicionales al contexto."""
@@ -687,7 +762,7 @@ class UnidadMedidaUpdateView(BaseAuditedViewMixin, UpdateView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite editar unidades no eliminadas."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -726,7 +801,7 @@ class UnidadMedidaDeleteView(BaseAuditedViewMixin, SoftDeleteMixin, DeleteView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite eliminar unidades no eliminadas."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -752,7 +827,7 @@ class EstadoActivoListView(BaseAuditedViewMixin, PaginatedListMixin, ListView):
 
     def get_queryset(self) -> QuerySet:
         """Retorna solo estados no eliminados."""
-        return super().get_queryset().filter(eliminado=False).order_by('codigo')
+        return super().get_queryset().vivos().order_by('codigo')
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos adicionales al contexto."""
@@ -817,7 +892,7 @@ class EstadoActivoUpdateView(BaseAuditedViewMixin, UpdateView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite editar estados no eliminados."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -856,7 +931,7 @@ class EstadoActivoDeleteView(BaseAuditedViewMixin, SoftDeleteMixin, DeleteView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite eliminar estados no eliminados."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -882,7 +957,7 @@ class UbicacionListView(BaseAuditedViewMixin, PaginatedListMixin, ListView):
 
     def get_queryset(self) -> QuerySet:
         """Retorna solo ubicaciones no eliminadas."""
-        return super().get_queryset().filter(eliminado=False).order_by('codigo')
+        return super().get_queryset().vivos().order_by('codigo')
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos adicionales al contexto."""
@@ -947,7 +1022,7 @@ class UbicacionUpdateView(BaseAuditedViewMixin, UpdateView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite editar ubicaciones no eliminadas."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -986,7 +1061,7 @@ class UbicacionDeleteView(BaseAuditedViewMixin, SoftDeleteMixin, DeleteView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite eliminar ubicaciones no eliminadas."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -1012,7 +1087,7 @@ class TipoMovimientoListView(BaseAuditedViewMixin, PaginatedListMixin, ListView)
 
     def get_queryset(self) -> QuerySet:
         """Retorna solo tipos de movimiento no eliminados."""
-        return super().get_queryset().filter(eliminado=False).order_by('codigo')
+        return super().get_queryset().vivos().order_by('codigo')
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos adicionales al contexto."""
@@ -1077,7 +1152,7 @@ class TipoMovimientoUpdateView(BaseAuditedViewMixin, UpdateView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite editar tipos de movimiento no eliminados."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -1116,7 +1191,7 @@ class TipoMovimientoDeleteView(BaseAuditedViewMixin, SoftDeleteMixin, DeleteView
 
     def get_queryset(self) -> QuerySet:
         """Solo permite eliminar tipos de movimiento no eliminados."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
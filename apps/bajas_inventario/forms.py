@@ -1,7 +1,7 @@
 from django import forms
 from django.forms import inlineformset_factory
 from .models import BajaInventario, DetalleBaja, MotivoBaja, EstadoBaja, HistorialBaja
-from apps.activos.models import Activo
+from apps.activos.models import Activo, Ubicacion
 from apps.bodega.models import Bodega
 
 
@@ -37,12 +37,12 @@ class BajaInventarioForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Filtrar solo motivos activos
-        self.fields['motivo'].queryset = MotivoBaja.objects.filter(
-            activo=True, eliminado=False
+        self.fields['motivo'].queryset = MotivoBaja.vivos.filter(
+            activo=True
         )
         # Filtrar solo bodegas activas
-        self.fields['bodega'].queryset = Bodega.objects.filter(
-            activo=True, eliminado=False
+        self.fields['bodega'].queryset = Bodega.vivos.filter(
+            activo=True
         )
 
 
@@ -102,6 +102,49 @@ DetalleBajaFormSet = inlineformset_factory(
 )
 
 
+class AgregarActivosBajaForm(forms.Form):
+    """Formulario para agregar activos en lote a una baja de inventario"""
+    ubicacion = forms.ModelChoiceField(
+        queryset=Ubicacion.vivos.filter(activo=True),
+        required=False,
+        empty_label='Seleccione una ubicación (opcional)',
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Todos los activos de la ubicación'
+    )
+    activos = forms.ModelMultipleChoiceField(
+        queryset=Activo.vivos.all(),
+        required=False,
+        widget=forms.SelectMultiple(attrs={'class': 'form-select', 'size': 10}),
+        label='Activos específicos'
+    )
+    cantidad = forms.DecimalField(
+        initial=1,
+        min_value=0.01,
+        decimal_places=2,
+        widget=forms.NumberInput(attrs={
+            'class': 'form-control',
+            'step': '0.01',
+            'min': '0.01'
+        }),
+        label='Cantidad por activo'
+    )
+    observaciones = forms.CharField(
+        required=False,
+        widget=forms.Textarea(attrs={
+            'class': 'form-control',
+            'rows': 2,
+            'placeholder': 'Observaciones para todos los detalles (opcional)'
+        }),
+        label='Observaciones'
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('ubicacion') and not cleaned_data.get('activos'):
+            raise forms.ValidationError('Debe seleccionar una ubicación o al menos un activo.')
+        return cleaned_data
+
+
 class AutorizarBajaForm(forms.Form):
     """Formulario para autorizar una baja de inventario"""
     notas_autorizacion = forms.CharField(
@@ -131,13 +174,13 @@ class RechazarBajaForm(forms.Form):
 class FiltroBajasForm(forms.Form):
     """Formulario para filtrar bajas de inventario"""
     estado = forms.ModelChoiceField(
-        queryset=EstadoBaja.objects.filter(activo=True, eliminado=False),
+        queryset=EstadoBaja.vivos.filter(activo=True),
         required=False,
         empty_label='Todos los estados',
         widget=forms.Select(attrs={'class': 'form-select'})
     )
     motivo = forms.ModelChoiceField(
-        queryset=MotivoBaja.objects.filter(activo=True, eliminado=False),
+        queryset=MotivoBaja.vivos.filter(activo=True),
         required=False,
         empty_label='Todos los motivos',
         widget=forms.Select(attrs={'class': 'form-select'})
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activos', '0007_indices_vivos'),
+        ('bajas_inventario', '0001_initial'),
+        ('bodega', '0006_indices_vivos'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bajainventario',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['-fecha_baja', '-numero'], name='ix_baja_fecha_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='bajainventario',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['solicitante', '-fecha_baja', '-numero'], name='ix_baja_solicitante_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='bajainventario',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['estado', '-fecha_baja', '-numero'], name='ix_baja_estado_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='detallebaja',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['baja'], name='ix_bajadet_baja_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='estadobaja',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_bajaestado_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='historialbaja',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['baja', '-fecha_cambio'], name='ix_bajahist_baja_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='motivobaja',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_bajamotivo_codigo_vivo'),
+        ),
+    ]
@@ -3,7 +3,7 @@ from django.core.validators import MinValueValidator
 from django.contrib.auth.models import User
 from apps.activos.models import Activo
 from apps.bodega.models import Bodega
-from core.models import BaseModel
+from core.models import BaseModel, indice_vivos
 
 
 class MotivoBaja(BaseModel):
@@ -28,6 +28,9 @@ class MotivoBaja(BaseModel):
         verbose_name = 'Motivo de Baja'
         verbose_name_plural = 'Motivos de Baja'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_bajamotivo_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -54,6 +57,9 @@ class EstadoBaja(BaseModel):
         verbose_name = 'Estado de Baja'
         verbose_name_plural = 'Estados de Bajas'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_bajaestado_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -135,6 +141,11 @@ class BajaInventario(BaseModel):
         verbose_name = 'Baja de Inventario'
         verbose_name_plural = 'Bajas de Inventario'
         ordering = ['-fecha_baja', '-numero']
+        indexes = [
+            indice_vivos('-fecha_baja', '-numero', nombre='ix_baja_fecha_vivo'),
+            indice_vivos('solicitante', '-fecha_baja', '-numero', nombre='ix_baja_solicitante_vivo'),
+            indice_vivos('estado', '-fecha_baja', '-numero', nombre='ix_baja_estado_vivo'),
+        ]
 
     def __str__(self):
         return f"BAJA-{self.numero} - {self.motivo.nombre}"
@@ -182,6 +193,9 @@ class DetalleBaja(BaseModel):
         verbose_name = 'Detalle de Baja'
         verbose_name_plural = 'Detalles de Bajas'
         ordering = ['baja', 'id']
+        indexes = [
+            indice_vivos('baja', nombre='ix_bajadet_baja_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.baja.numero} - {self.activo.codigo} ({self.cantidad})"
@@ -228,6 +242,9 @@ class HistorialBaja(BaseModel):
         verbose_name = 'Historial de Baja'
         verbose_name_plural = 'Historial de Bajas'
         ordering = ['-fecha_cambio']
+        indexes = [
+            indice_vivos('baja', '-fecha_cambio', nombre='ix_bajahist_baja_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.baja.numero} - {self.estado_nuevo.nombre} ({self.fecha_cambio})"
@@ -4,8 +4,9 @@ Repository Pattern para el módulo de bajas de inventario.
 Separa la lógica de acceso a datos de la lógica de negocio,
 siguiendo el principio de Inversión de Dependencias (SOLID).
 """
-from typing import Optional
-from django.db.models import QuerySet
+from typing import Optional, List
+from decimal import Decimal
+from django.db.models import QuerySet, Sum
 from django.contrib.auth.models import User
 from .models import (
     MotivoBaja, EstadoBaja, BajaInventario,
@@ -22,15 +23,15 @@ class MotivoBajaRepository:
     @staticmethod
     def get_all() -> QuerySet[MotivoBaja]:
         """Retorna todos los motivos activos y no eliminados."""
-        return MotivoBaja.objects.filter(
-            activo=True, eliminado=False
+        return MotivoBaja.vivos.filter(
+            activo=True
         ).order_by('codigo')
 
     @staticmethod
     def get_by_id(motivo_id: int) -> Optional[MotivoBaja]:
         """Obtiene un motivo por su ID."""
         try:
-            return MotivoBaja.objects.get(id=motivo_id, eliminado=False, activo=True)
+            return MotivoBaja.vivos.get(id=motivo_id, activo=True)
         except MotivoBaja.DoesNotExist:
             return None
 
@@ -38,22 +39,22 @@ class MotivoBajaRepository:
     def get_by_codigo(codigo: str) -> Optional[MotivoBaja]:
         """Obtiene un motivo por su código."""
         try:
-            return MotivoBaja.objects.get(codigo=codigo, eliminado=False, activo=True)
+            return MotivoBaja.vivos.get(codigo=codigo, activo=True)
         except MotivoBaja.DoesNotExist:
             return None
 
     @staticmethod
     def get_with_autorizacion() -> QuerySet[MotivoBaja]:
         """Retorna motivos que requieren autorización."""
-        return MotivoBaja.objects.filter(
-            requiere_autorizacion=True, activo=True, eliminado=False
+        return MotivoBaja.vivos.filter(
+            requiere_autorizacion=True, activo=True
         ).order_by('codigo')
 
     @staticmethod
     def get_with_documento() -> QuerySet[MotivoBaja]:
         """Retorna motivos que requieren documento."""
-        return MotivoBaja.objects.filter(
-            requiere_documento=True, activo=True, eliminado=False
+        return MotivoBaja.vivos.filter(
+            requiere_documento=True, activo=True
         ).order_by('codigo')
 
 
@@ -65,15 +66,15 @@ class EstadoBajaRepository:
     @staticmethod
     def get_all() -> QuerySet[EstadoBaja]:
         """Retorna todos los estados activos y no eliminados."""
-        return EstadoBaja.objects.filter(
-            activo=True, eliminado=False
+        return EstadoBaja.vivos.filter(
+            activo=True
         ).order_by('codigo')
 
     @staticmethod
     def get_by_id(estado_id: int) -> Optional[EstadoBaja]:
         """Obtiene un estado por su ID."""
         try:
-            return EstadoBaja.objects.get(id=estado_id, eliminado=False, activo=True)
+            return EstadoBaja.vivos.get(id=estado_id, activo=True)
         except EstadoBaja.DoesNotExist:
             return None
 
@@ -81,29 +82,29 @@ class EstadoBajaRepository:
     def get_by_codigo(codigo: str) -> Optional[EstadoBaja]:
         """Obtiene un estado por su código."""
         try:
-            return EstadoBaja.objects.get(codigo=codigo, eliminado=False, activo=True)
+            return EstadoBaja.vivos.get(codigo=codigo, activo=True)
         except EstadoBaja.DoesNotExist:
             return None
 
     @staticmethod
     def get_inicial() -> Optional[EstadoBaja]:
         """Obtiene el estado inicial del sistema."""
-        return EstadoBaja.objects.filter(
-            es_inicial=True, activo=True, eliminado=False
+        return EstadoBaja.vivos.filter(
+            es_inicial=True, activo=True
         ).first()
 
     @staticmethod
     def get_finales() -> QuerySet[EstadoBaja]:
         """Retorna todos los estados finales."""
-        return EstadoBaja.objects.filter(
-            es_final=True, activo=True, eliminado=False
+        return EstadoBaja.vivos.filter(
+            es_final=True, activo=True
         ).order_by('codigo')
 
     @staticmethod
     def get_que_permiten_edicion() -> QuerySet[EstadoBaja]:
         """Retorna estados que permiten edición."""
-        return EstadoBaja.objects.filter(
-            permite_edicion=True, activo=True, eliminado=False
+        return EstadoBaja.vivos.filter(
+            permite_edicion=True, activo=True
         ).order_by('codigo')
 
 
@@ -115,9 +116,7 @@ class BajaInventarioRepository:
     @staticmethod
     def get_all() -> QuerySet[BajaInventario]:
         """Retorna todas las bajas no eliminadas con relaciones optimizadas."""
-        return BajaInventario.objects.filter(
-            eliminado=False
-        ).select_related(
+        return BajaInventario.vivos.select_related(
             'motivo', 'estado', 'bodega', 'solicitante', 'autorizador'
         ).order_by('-fecha_baja', '-numero')
 
@@ -125,9 +124,9 @@ class BajaInventarioRepository:
     def get_by_id(baja_id: int) -> Optional[BajaInventario]:
         """Obtiene una baja por su ID."""
         try:
-            return BajaInventario.objects.select_related(
+            return BajaInventario.vivos.select_related(
                 'motivo', 'estado', 'bodega', 'solicitante', 'autorizador'
-            ).get(id=baja_id, eliminado=False)
+            ).get(id=baja_id)
         except BajaInventario.DoesNotExist:
             return None
 
@@ -135,18 +134,17 @@ class BajaInventarioRepository:
     def get_by_numero(numero: str) -> Optional[BajaInventario]:
         """Obtiene una baja por su número."""
         try:
-            return BajaInventario.objects.select_related(
+            return BajaInventario.vivos.select_related(
                 'motivo', 'estado', 'bodega', 'solicitante', 'autorizador'
-            ).get(numero=numero, eliminado=False)
+            ).get(numero=numero)
         except BajaInventario.DoesNotExist:
             return None
 
     @staticmethod
     def filter_by_solicitante(solicitante: User) -> QuerySet[BajaInventario]:
         """Retorna bajas de un solicitante específico."""
-        return BajaInventario.objects.filter(
-            solicitante=solicitante,
-            eliminado=False
+        return BajaInventario.vivos.filter(
+            solicitante=solicitante
         ).select_related(
             'motivo', 'estado', 'bodega', 'autorizador'
         ).order_by('-fecha_baja')
@@ -154,9 +152,8 @@ class BajaInventarioRepository:
     @staticmethod
     def filter_by_estado(estado: EstadoBaja) -> QuerySet[BajaInventario]:
         """Retorna bajas en un estado específico."""
-        return BajaInventario.objects.filter(
-            estado=estado,
-            eliminado=False
+        return BajaInventario.vivos.filter(
+            estado=estado
         ).select_related(
             'motivo', 'bodega', 'solicitante', 'autorizador'
         ).order_by('-fecha_baja')
@@ -164,9 +161,8 @@ class BajaInventarioRepository:
     @staticmethod
     def filter_by_motivo(motivo: MotivoBaja) -> QuerySet[BajaInventario]:
         """Retorna bajas de un motivo específico."""
-        return BajaInventario.objects.filter(
-            motivo=motivo,
-            eliminado=False
+        return BajaInventario.vivos.filter(
+            motivo=motivo
         ).select_related(
             'estado', 'bodega', 'solicitante', 'autorizador'
         ).order_by('-fecha_baja')
@@ -174,9 +170,8 @@ class BajaInventarioRepository:
     @staticmethod
     def filter_by_bodega(bodega: Bodega) -> QuerySet[BajaInventario]:
         """Retorna bajas de una bodega específica."""
-        return BajaInventario.objects.filter(
-            bodega=bodega,
-            eliminado=False
+        return BajaInventario.vivos.filter(
+            bodega=bodega
         ).select_related(
             'motivo', 'estado', 'solicitante', 'autorizador'
         ).order_by('-fecha_baja')
@@ -184,9 +179,8 @@ class BajaInventarioRepository:
     @staticmethod
     def filter_pendientes_autorizacion() -> QuerySet[BajaInventario]:
         """Retorna bajas pendientes de autorización."""
-        return BajaInventario.objects.filter(
-            autorizador__isnull=True,
-            eliminado=False
+        return BajaInventario.vivos.filter(
+            autorizador__isnull=True
         ).select_related(
             'motivo', 'estado', 'bodega', 'solicitante'
         ).order_by('-fecha_baja')
@@ -203,12 +197,11 @@ class BajaInventarioRepository:
     def search(query: str) -> QuerySet[BajaInventario]:
         """Búsqueda de bajas por número o solicitante."""
         from django.db.models import Q
-        return BajaInventario.objects.filter(
+        return BajaInventario.vivos.filter(
             Q(numero__icontains=query) |
             Q(solicitante__first_name__icontains=query) |
             Q(solicitante__last_name__icontains=query) |
-            Q(descripcion__icontains=query),
-            eliminado=False
+            Q(descripcion__icontains=query)
         ).select_related(
             'motivo', 'estado', 'bodega', 'solicitante', 'autorizador'
         ).order_by('-fecha_baja')
@@ -222,21 +215,44 @@ class DetalleBajaRepository:
     @staticmethod
     def filter_by_baja(baja: BajaInventario) -> QuerySet[DetalleBaja]:
         """Retorna detalles de una baja específica."""
-        return DetalleBaja.objects.filter(
-            baja=baja,
-            eliminado=False
+        return DetalleBaja.vivos.filter(
+            baja=baja
         ).select_related('activo').order_by('id')
 
     @staticmethod
     def get_by_id(detalle_id: int) -> Optional[DetalleBaja]:
         """Obtiene un detalle por su ID."""
         try:
-            return DetalleBaja.objects.select_related(
+            return DetalleBaja.vivos.select_related(
                 'baja', 'activo'
-            ).get(id=detalle_id, eliminado=False)
+            ).get(id=detalle_id)
         except DetalleBaja.DoesNotExist:
             return None
 
+    @staticmethod
+    def get_total_by_baja(baja: BajaInventario) -> Decimal:
+        """Calcula el valor total de una baja con un único agregado SQL."""
+        total = DetalleBaja.vivos.filter(
+            baja=baja
+        ).aggregate(total=Sum('valor_total'))['total']
+        return total or Decimal('0')
+
+    @staticmethod
+    def get_activo_ids_by_baja(baja: BajaInventario) -> QuerySet:
+        """Retorna (como subconsulta) los IDs de activos ya incluidos en la baja."""
+        return DetalleBaja.vivos.filter(
+            baja=baja
+        ).values('activo_id')
+
+    @staticmethod
+    def bulk_create(detalles: List[DetalleBaja], batch_size: int = 500) -> List[DetalleBaja]:
+        """
+        Inserta varios detalles en lote.
+
+        bulk_create no llama a save(), por lo que valor_total debe venir calculado.
+        """
+        return DetalleBaja.objects.bulk_create(detalles, batch_size=batch_size)
+
 
 # ==================== HISTORIAL BAJA REPOSITORY ====================
 
@@ -246,9 +262,8 @@ class HistorialBajaRepository:
     @staticmethod
     def filter_by_baja(baja: BajaInventario) -> QuerySet[HistorialBaja]:
         """Retorna el historial de una baja específica."""
-        return HistorialBaja.objects.filter(
-            baja=baja,
-            eliminado=False
+        return HistorialBaja.vivos.filter(
+            baja=baja
         ).select_related(
             'estado_anterior', 'estado_nuevo', 'usuario'
         ).order_by('-fecha_cambio')
@@ -257,9 +272,9 @@ class HistorialBajaRepository:
     def get_by_id(historial_id: int) -> Optional[HistorialBaja]:
         """Obtiene un registro de historial por su ID."""
         try:
-            return HistorialBaja.objects.select_related(
+            return HistorialBaja.vivos.select_related(
                 'baja', 'estado_anterior', 'estado_nuevo', 'usuario'
-            ).get(id=historial_id, eliminado=False)
+            ).get(id=historial_id)
         except HistorialBaja.DoesNotExist:
             return None
 
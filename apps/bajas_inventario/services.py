@@ -5,9 +5,10 @@ Contiene la lógica de negocio siguiendo el principio de
 Single Responsibility (SOLID). Las operaciones críticas
 usan transacciones atómicas para garantizar consistencia.
 """
-from typing import Optional
+from typing import Optional, Iterable, List, Union
 from decimal import Decimal
 from datetime import date
+from django.conf import settings
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
@@ -22,7 +23,11 @@ from .repositories import (
     DetalleBajaRepository, HistorialBajaRepository
 )
 from apps.bodega.models import Bodega
-from apps.activos.models import Activo
+from apps.activos.models import Activo, Ubicacion
+from apps.activos.repositories import (
+    ActivoRepository, EstadoActivoRepository, TipoMovimientoActivoRepository
+)
+from apps.activos.services import MovimientoActivoService
 
 
 # ==================== BAJA INVENTARIO SERVICE ====================
@@ -274,6 +279,11 @@ class BajaInventarioService:
         """
         Confirma y finaliza una baja de inventario.
 
+        Además de cambiar el estado de la baja, aplica la baja a todos los
+        activos del detalle: cambia su estado, registra un movimiento de baja
+        por activo y limpia su ubicación actual, todo con operaciones por lotes
+        dentro de la misma transacción.
+
         Args:
             baja: Baja a confirmar
             usuario: Usuario que confirma
@@ -288,9 +298,11 @@ class BajaInventarioService:
         if baja.motivo.requiere_autorizacion and not baja.autorizador:
             raise ValidationError('La baja debe estar autorizada antes de confirmarla')
 
-        # Validar que tenga detalles
-        detalles = self.detalle_repo.filter_by_baja(baja)
-        if not detalles.exists():
+        # Activos de la baja (una sola consulta)
+        activo_ids = list(
+            self.detalle_repo.filter_by_baja(baja).values_list('activo_id', flat=True)
+        )
+        if not activo_ids:
             raise ValidationError('La baja no tiene detalles para confirmar')
 
         # Cambiar a estado confirmado
@@ -298,6 +310,34 @@ class BajaInventarioService:
         if not estado_confirmado:
             raise ValidationError('No existe el estado CONFIRMADO en el sistema')
 
+        # Estado y tipo de movimiento configurados para activos dados de baja
+        estado_activo_baja = EstadoActivoRepository.get_by_codigo(
+            settings.BAJAS_ESTADO_ACTIVO_CODIGO
+        )
+        if not estado_activo_baja:
+            raise ValidationError(
+                f'No existe el estado de activo {settings.BAJAS_ESTADO_ACTIVO_CODIGO} en el sistema'
+            )
+
+        tipo_movimiento_baja = TipoMovimientoActivoRepository.get_by_codigo(
+            settings.BAJAS_TIPO_MOVIMIENTO_CODIGO
+        )
+        if not tipo_movimiento_baja:
+            raise ValidationError(
+                f'No existe el tipo de movimiento {settings.BAJAS_TIPO_MOVIMIENTO_CODIGO} en el sistema'
+            )
+
+        # Aplicar la baja a todos los activos en una sola pasada
+        MovimientoActivoService().dar_de_baja_masivo(
+            activo_ids=activo_ids,
+            estado_baja=estado_activo_baja,
+            tipo_movimiento=tipo_movimiento_baja,
+            usuario_registro=usuario,
+            fecha_baja=baja.fecha_baja,
+            motivo_baja=f'{baja.motivo.nombre}: {baja.descripcion}',
+            observaciones=f'Baja de inventario {baja.numero}'
+        )
+
         estado_anterior = baja.estado
         baja.estado = estado_confirmado
         baja.save()
@@ -324,11 +364,8 @@ class BajaInventarioService:
         Returns:
             BajaInventario: Baja actualizada
         """
-        detalles = self.detalle_repo.filter_by_baja(baja)
-        total = sum(d.valor_total for d in detalles)
-
-        baja.valor_total = total
-        baja.save()
+        baja.valor_total = self.detalle_repo.get_total_by_baja(baja)
+        baja.save(update_fields=['valor_total', 'fecha_modificacion', 'fecha_actualizacion'])
 
         return baja
 
@@ -349,6 +386,7 @@ class DetalleBajaService:
         activo: Activo,
         cantidad: Decimal,
         valor_unitario: Decimal,
+        recalcular: bool = True,
         **kwargs
     ) -> DetalleBaja:
         """
@@ -359,6 +397,8 @@ class DetalleBajaService:
             activo: Activo a dar de baja
             cantidad: Cantidad
             valor_unitario: Valor unitario
+            recalcular: Si es False no se recalcula el total de la baja
+                (útil cuando el llamador agrega varios detalles y recalcula al final)
             **kwargs: Campos opcionales (lote, numero_serie, observaciones)
 
         Returns:
@@ -392,10 +432,90 @@ class DetalleBajaService:
         )
 
         # Recalcular total de la baja
+        if recalcular:
+            baja_service = BajaInventarioService()
+            baja_service.recalcular_total(baja)
+
+        return detalle
+
+    @transaction.atomic
+    def agregar_detalles_masivo(
+        self,
+        baja: BajaInventario,
+        activos: Optional[Iterable[Union[Activo, int]]] = None,
+        ubicacion: Optional[Ubicacion] = None,
+        cantidad: Decimal = Decimal('1'),
+        observaciones: str = ''
+    ) -> List[DetalleBaja]:
+        """
+        Agrega en lote varios activos a una baja de inventario.
+
+        Los activos se indican como lista (instancias o IDs) y/o como todos
+        los activos cuya ubicación actual es `ubicacion`. El valor unitario se
+        toma de Activo.precio_unitario en una sola consulta, los detalles se
+        insertan con bulk_create y el total de la baja se recalcula una vez.
+        Los activos que ya figuran en la baja se omiten.
+
+        Args:
+            baja: Baja de inventario
+            activos: Activos a dar de baja (opcional)
+            ubicacion: Ubicación cuyos activos se dan de baja (opcional)
+            cantidad: Cantidad por activo (default: 1)
+            observaciones: Observaciones para todos los detalles
+
+        Returns:
+            List[DetalleBaja]: Detalles creados
+
+        Raises:
+            ValidationError: Si hay errores de validación
+        """
+        if baja.estado.es_final:
+            raise ValidationError('No se pueden agregar detalles a una baja finalizada')
+
+        if cantidad <= 0:
+            raise ValidationError({'cantidad': 'La cantidad debe ser mayor a cero'})
+
+        if activos is None and ubicacion is None:
+            raise ValidationError('Debe indicar los activos o una ubicación')
+
+        # Seleccionar activos (una sola consulta con precio incluido)
+        if ubicacion is not None:
+            queryset = ActivoRepository.filter_by_ubicacion_actual(ubicacion)
+        else:
+            queryset = Activo.vivos.all()
+
+        if activos is not None:
+            activo_ids = [a.pk if isinstance(a, Activo) else a for a in activos]
+            queryset = queryset.filter(id__in=activo_ids)
+
+        filas = queryset.exclude(
+            id__in=self.detalle_repo.get_activo_ids_by_baja(baja)
+        ).order_by('codigo').values_list('id', 'precio_unitario')
+
+        detalles = []
+        for activo_id, precio_unitario in filas:
+            valor_unitario = precio_unitario or Decimal('0')
+            detalles.append(DetalleBaja(
+                baja=baja,
+                activo_id=activo_id,
+                cantidad=cantidad,
+                valor_unitario=valor_unitario,
+                valor_total=cantidad * valor_unitario,
+                lote='',
+                numero_serie='',
+                observaciones=observaciones
+            ))
+
+        if not detalles:
+            return []
+
+        detalles = self.detalle_repo.bulk_create(detalles)
+
+        # Recalcular total de la baja una sola vez
         baja_service = BajaInventarioService()
         baja_service.recalcular_total(baja)
 
-        return detalle
+        return detalles
 
     @transaction.atomic
     def eliminar_detalle(self, detalle: DetalleBaja) -> None:
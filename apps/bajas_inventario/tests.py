@@ -0,0 +1,200 @@
+"""
+Tests de las bajas de inventario.
+
+Cubren la carga de detalles por lotes y la confirmación, que aplica la baja a
+todos los activos del detalle con operaciones masivas.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+
+from apps.activos.models import (
+    Activo, CategoriaActivo, EstadoActivo, MovimientoActivo, TipoMovimientoActivo,
+    UnidadMedida, Ubicacion, UbicacionActual
+)
+from apps.bajas_inventario.models import BajaInventario, DetalleBaja, EstadoBaja, MotivoBaja
+from apps.bajas_inventario.services import BajaInventarioService, DetalleBajaService
+from apps.bodega.models import Bodega
+
+
+def crear_activos(codigos, estado, ubicacion=None, precio=Decimal('100')):
+    """Crea activos con la categoría y unidad de prueba, opcionalmente ubicados."""
+    categoria, _ = CategoriaActivo.objects.get_or_create(codigo='CAT', defaults={'nombre': 'Mobiliario'})
+    unidad, _ = UnidadMedida.objects.get_or_create(codigo='UN', defaults={'nombre': 'Unidad', 'simbolo': 'un'})
+    activos = []
+    for codigo in codigos:
+        activo = Activo.objects.create(
+            codigo=codigo, nombre=f'Activo {codigo}', categoria=categoria,
+            unidad_medida=unidad, estado=estado, precio_unitario=precio
+        )
+        if ubicacion is not None:
+            UbicacionActual.objects.create(activo=activo, ubicacion=ubicacion)
+        activos.append(activo)
+    return activos
+
+
+class BajaTestMixin:
+    """Datos comunes: estados de baja, motivo sin autorización, bodega y activos."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = User.objects.create_user('bajas', password='bajas123')
+        cls.estado_inicial = EstadoBaja.objects.create(codigo='BORRADOR', nombre='Borrador', es_inicial=True)
+        cls.estado_confirmado = EstadoBaja.objects.create(codigo='CONFIRMADO', nombre='Confirmado', es_final=True)
+        cls.motivo = MotivoBaja.objects.create(codigo='DET', nombre='Deterioro', requiere_autorizacion=False)
+        cls.bodega = Bodega.objects.create(codigo='BB', nombre='Bodega Bajas', responsable=cls.usuario)
+        cls.estado_activo = EstadoActivo.objects.create(codigo='DISP', nombre='Disponible', es_inicial=True)
+        cls.sala = Ubicacion.objects.create(codigo='SALA-1', nombre='Sala 1')
+        cls.bodega_activos = Ubicacion.objects.create(codigo='BOD-1', nombre='Bodega de activos')
+        cls.en_sala = crear_activos(['A-01', 'A-02', 'A-03'], cls.estado_activo, cls.sala)
+        cls.en_bodega = crear_activos(['B-01'], cls.estado_activo, cls.bodega_activos, precio=Decimal('40'))
+
+    def crear_baja(self) -> BajaInventario:
+        return BajaInventarioService().crear_baja(
+            motivo=self.motivo, bodega=self.bodega, solicitante=self.usuario,
+            fecha_baja=date.today(), descripcion='Mobiliario en mal estado'
+        )
+
+
+# ============================================================================
+# DETALLES POR LOTES
+# ============================================================================
+
+class AgregarDetallesMasivoTest(BajaTestMixin, TestCase):
+    """
+    Test: agregar_detalles_masivo carga activos por lista y/o por ubicación
+    Criterio: Un detalle por activo elegible, sin duplicados, y el total de la
+              baja igual a la suma de los detalles
+    """
+
+    def test_por_ubicacion_con_precio_y_total(self):
+        """Todos los activos de la sala, valorizados con su precio unitario."""
+        baja = self.crear_baja()
+
+        detalles = DetalleBajaService().agregar_detalles_masivo(baja, ubicacion=self.sala, cantidad=Decimal('2'))
+
+        self.assertEqual([d.activo_id for d in detalles], [a.pk for a in self.en_sala])
+        self.assertTrue(all(d.valor_total == Decimal('200') for d in detalles))
+        baja.refresh_from_db()
+        self.assertEqual(baja.valor_total, Decimal('600'))
+
+    def test_omite_duplicados_y_no_elegibles(self):
+        """Repetidos, ya incluidos, eliminados y de otra ubicación no generan detalle."""
+        baja = self.crear_baja()
+        service = DetalleBajaService()
+        service.agregar_detalles_masivo(baja, activos=[self.en_sala[0]])
+        eliminado = self.en_sala[2]
+        eliminado.eliminado = True
+        eliminado.save()
+
+        detalles = service.agregar_detalles_masivo(
+            baja,
+            activos=[self.en_sala[0].pk, self.en_sala[1], self.en_sala[1].pk, eliminado, self.en_bodega[0]],
+            ubicacion=self.sala
+        )
+
+        self.assertEqual([d.activo_id for d in detalles], [self.en_sala[1].pk])
+        self.assertEqual(DetalleBaja.objects.filter(baja=baja).count(), 2)
+        self.assertEqual(service.agregar_detalles_masivo(baja, activos=[self.en_sala[1]]), [])
+
+    def test_total_suma_todos_los_detalles(self):
+        """El total recalculado en SQL incluye detalles individuales y masivos, no los eliminados."""
+        baja = self.crear_baja()
+        service = DetalleBajaService()
+        individual = service.agregar_detalle(baja, self.en_bodega[0], Decimal('1'), Decimal('40'))
+        service.agregar_detalles_masivo(baja, activos=self.en_sala[:2])
+        baja.refresh_from_db()
+        self.assertEqual(baja.valor_total, Decimal('240'))
+
+        individual.eliminado = True
+        individual.save()
+        BajaInventarioService().recalcular_total(baja)
+
+        baja.refresh_from_db()
+        self.assertEqual(baja.valor_total, Decimal('200'))
+
+    def test_validaciones(self):
+        """Sin criterio, con cantidad no positiva o con la baja finalizada se rechaza."""
+        baja = self.crear_baja()
+        service = DetalleBajaService()
+
+        with self.assertRaises(ValidationError):
+            service.agregar_detalles_masivo(baja)
+        with self.assertRaises(ValidationError):
+            service.agregar_detalles_masivo(baja, ubicacion=self.sala, cantidad=Decimal('0'))
+
+        baja.estado = self.estado_confirmado
+        baja.save()
+        with self.assertRaises(ValidationError):
+            service.agregar_detalles_masivo(baja, ubicacion=self.sala)
+        self.assertFalse(DetalleBaja.objects.filter(baja=baja).exists())
+
+
+# ============================================================================
+# CONFIRMACIÓN
+# ============================================================================
+
+class ConfirmarBajaTest(BajaTestMixin, TestCase):
+    """
+    Test: confirmar_baja aplica la baja a todos los activos del detalle
+    Criterio: Cada activo queda en el estado de baja, con un movimiento de baja
+              propio y sin ubicación ni responsable; sin configuración no se
+              escribe nada
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.estado_activo_baja = EstadoActivo.objects.create(
+            codigo='BAJA', nombre='De baja', permite_movimiento=False
+        )
+        cls.tipo_baja = TipoMovimientoActivo.objects.create(
+            codigo='BAJA', nombre='Baja', requiere_ubicacion=False, requiere_responsable=False
+        )
+
+    def setUp(self):
+        self.baja = self.crear_baja()
+        DetalleBajaService().agregar_detalles_masivo(self.baja, ubicacion=self.sala)
+        self.ids = [a.pk for a in self.en_sala]
+
+    def test_confirma_varios_activos(self):
+        """Estado, un movimiento por activo y ubicación actual vacía apuntando a él."""
+        BajaInventarioService().confirmar_baja(self.baja, self.usuario)
+
+        self.baja.refresh_from_db()
+        self.assertEqual(self.baja.estado, self.estado_confirmado)
+        self.assertEqual(
+            set(Activo.objects.filter(pk__in=self.ids).values_list('estado__codigo', flat=True)), {'BAJA'}
+        )
+        movimientos = MovimientoActivo.objects.filter(activo_id__in=self.ids, tipo_movimiento=self.tipo_baja)
+        self.assertEqual(sorted(movimientos.values_list('activo_id', flat=True)), sorted(self.ids))
+        self.assertTrue(all(m.fecha_baja == self.baja.fecha_baja for m in movimientos))
+        for ubicacion_actual in UbicacionActual.objects.filter(activo_id__in=self.ids):
+            self.assertIsNone(ubicacion_actual.ubicacion)
+            self.assertIsNone(ubicacion_actual.responsable)
+            self.assertEqual(ubicacion_actual.ultimo_movimiento.activo_id, ubicacion_actual.activo_id)
+            self.assertEqual(ubicacion_actual.ultimo_movimiento.tipo_movimiento, self.tipo_baja)
+        # El activo que no estaba en la baja no se toca
+        self.assertEqual(Activo.objects.get(pk=self.en_bodega[0].pk).estado, self.estado_activo)
+        self.assertEqual(UbicacionActual.objects.get(activo=self.en_bodega[0]).ubicacion, self.bodega_activos)
+
+    @override_settings(BAJAS_ESTADO_ACTIVO_CODIGO='NO-EXISTE')
+    def test_sin_estado_de_activo_configurado(self):
+        """Sin el estado de activo configurado se rechaza sin modificar activos."""
+        with self.assertRaisesMessage(ValidationError, 'NO-EXISTE'):
+            BajaInventarioService().confirmar_baja(self.baja, self.usuario)
+        self.assertFalse(Activo.objects.filter(estado=self.estado_activo_baja).exists())
+        self.baja.refresh_from_db()
+        self.assertEqual(self.baja.estado, self.estado_inicial)
+
+    @override_settings(BAJAS_TIPO_MOVIMIENTO_CODIGO='NO-EXISTE')
+    def test_sin_tipo_de_movimiento_configurado(self):
+        """Sin el tipo de movimiento configurado se rechaza sin registrar movimientos."""
+        with self.assertRaisesMessage(ValidationError, 'NO-EXISTE'):
+            BajaInventarioService().confirmar_baja(self.baja, self.usuario)
+        self.assertFalse(MovimientoActivo.objects.filter(activo_id__in=self.ids).exists())
+        self.assertFalse(Activo.objects.filter(estado=self.estado_activo_baja).exists())
@@ -17,6 +17,7 @@ urlpatterns = [
     path('<int:pk>/', views.BajaInventarioDetailView.as_view(), name='detalle_baja'),
     path('<int:pk>/editar/', views.BajaInventarioUpdateView.as_view(), name='editar_baja'),
     path('<int:pk>/eliminar/', views.BajaInventarioDeleteView.as_view(), name='eliminar_baja'),
+    path('<int:pk>/agregar-activos/', views.BajaInventarioAgregarActivosView.as_view(), name='agregar_activos_baja'),
 
     # ==================== FLUJO DE AUTORIZACIÓN ====================
     path('<int:pk>/autorizar/', views.BajaInventarioAutorizarView.as_view(), name='autorizar_baja'),
@@ -13,12 +13,12 @@ from typing import Any
 from decimal import Decimal
 from django.db.models import QuerySet, Q
 from django.urls import reverse_lazy
-from django.shortcuts import redirect
+from django.shortcuts import redirect, get_object_or_404
 from django.contrib import messages
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.views.generic import (
-    TemplateView, ListView, DetailView, CreateView, UpdateView, DeleteView
+    TemplateView, ListView, DetailView, CreateView, UpdateView, DeleteView, FormView
 )
 from core.mixins import (
     BaseAuditedViewMixin, AtomicTransactionMixin, SoftDeleteMixin,
@@ -28,7 +28,7 @@ from core.utils import registrar_log_auditoria
 from .models import BajaInventario, DetalleBaja, MotivoBaja, EstadoBaja, HistorialBaja
 from .forms import (
     BajaInventarioForm, DetalleBajaFormSet, AutorizarBajaForm,
-    RechazarBajaForm, FiltroBajasForm
+    RechazarBajaForm, FiltroBajasForm, AgregarActivosBajaForm
 )
 from .repositories import (
     MotivoBajaRepository, EstadoBajaRepository, BajaInventarioRepository,
@@ -98,9 +98,7 @@ class BajaInventarioListView(BaseAuditedViewMixin, PaginatedListMixin, FilteredL
 
     def get_queryset(self) -> QuerySet:
         """Retorna bajas no eliminadas con relaciones optimizadas y filtros."""
-        queryset = super().get_queryset().filter(
-            eliminado=False
-        ).select_related(
+        queryset = super().get_queryset().vivos().select_related(
             'motivo', 'estado', 'solicitante', 'bodega', 'autorizador'
         )
 
@@ -151,7 +149,7 @@ class BajaInventarioDetailView(BaseAuditedViewMixin, DetailView):
 
     def get_queryset(self) -> QuerySet:
         """Optimiza consultas con select_related y filtra eliminados."""
-        return super().get_queryset().filter(eliminado=False).select_related(
+        return super().get_queryset().vivos().select_related(
             'motivo', 'estado', 'solicitante', 'autorizador', 'bodega'
         )
 
@@ -161,16 +159,12 @@ class BajaInventarioDetailView(BaseAuditedViewMixin, DetailView):
         context['titulo'] = f'Baja {self.object.numero}'
 
         # Detalles de la baja
-        context['detalles'] = self.object.detalles.filter(
-            eliminado=False
-        ).select_related(
+        context['detalles'] = self.object.detalles.vivos().select_related(
             'activo', 'activo__unidad_medida', 'activo__categoria'
         )
 
         # Historial de cambios
-        context['historial'] = self.object.historial.filter(
-            eliminado=False
-        ).select_related(
+        context['historial'] = self.object.historial.vivos().select_related(
             'estado_anterior', 'estado_nuevo', 'usuario'
         )
 
@@ -310,9 +304,13 @@ class BajaInventarioCreateView(BaseAuditedViewMixin, AtomicTransactionMixin, Cre
                             valor_unitario=detalle_form.cleaned_data['valor_unitario'],
                             lote=detalle_form.cleaned_data.get('lote', ''),
                             numero_serie=detalle_form.cleaned_data.get('numero_serie', ''),
-                            observaciones=detalle_form.cleaned_data.get('observaciones', '')
+                            observaciones=detalle_form.cleaned_data.get('observaciones', ''),
+                            recalcular=False
                         )
 
+                # Recalcular el total una sola vez para todos los detalles
+                baja_service.recalcular_total(baja)
+
                 self.object = baja
 
                 # Continuar con el flujo normal (mensaje y redirección)
@@ -352,7 +350,7 @@ class BajaInventarioUpdateView(BaseAuditedViewMixin, AtomicTransactionMixin, Upd
 
     def get_queryset(self) -> QuerySet:
         """Filtra bajas según permisos del usuario."""
-        queryset = super().get_queryset().filter(eliminado=False)
+        queryset = super().get_queryset().vivos()
 
         # Si no tiene permiso para editar cualquier baja, solo las propias
         if not self.request.user.has_perm('bajas_inventario.change_any_bajainventario'):
@@ -406,7 +404,7 @@ class BajaInventarioUpdateView(BaseAuditedViewMixin, AtomicTransactionMixin, Upd
             # Recalcular valor total
             valor_total = sum(
                 detalle.valor_total
-                for detalle in self.object.detalles.filter(eliminado=False)
+                for detalle in self.object.detalles.vivos()
             )
             self.object.valor_total = valor_total
             self.object.save()
@@ -441,7 +439,7 @@ class BajaInventarioDeleteView(BaseAuditedViewMixin, SoftDeleteMixin, DeleteView
 
     def get_queryset(self) -> QuerySet:
         """Filtra bajas según permisos del usuario."""
-        queryset = super().get_queryset().filter(eliminado=False)
+        queryset = super().get_queryset().vivos()
 
         # Si no tiene permiso para eliminar cualquier baja, solo las propias
         if not self.request.user.has_perm('bajas_inventario.delete_any_bajainventario'):
@@ -473,6 +471,78 @@ class BajaInventarioDeleteView(BaseAuditedViewMixin, SoftDeleteMixin, DeleteView
         return context
 
 
+class BajaInventarioAgregarActivosView(BaseAuditedViewMixin, AtomicTransactionMixin, FormView):
+    """
+    Vista para agregar activos en lote a una baja de inventario.
+
+    Permite seleccionar varios activos o todos los activos de una ubicación
+    (p.ej. un laboratorio completo) y los agrega con una sola inserción masiva.
+
+    Permisos: bajas_inventario.change_bajainventario
+    Auditoría: Registra acción EDITAR automáticamente
+    Transacción atómica: Garantiza que todos los detalles se agreguen o ninguno
+    """
+    form_class = AgregarActivosBajaForm
+    template_name = 'bajas_inventario/agregar_activos_baja.html'
+    permission_required = 'bajas_inventario.change_bajainventario'
+
+    # Configuración de auditoría
+    audit_action = 'EDITAR'
+
+    def setup(self, request, *args, **kwargs):
+        """Carga la baja sobre la que se agregarán los activos."""
+        super().setup(request, *args, **kwargs)
+        self.baja = get_object_or_404(
+            BajaInventario.vivos.select_related('estado'),
+            pk=kwargs['pk']
+        )
+
+    def get(self, request, *args, **kwargs):
+        """Verifica que la baja admita nuevos detalles."""
+        if self.baja.estado.es_final:
+            messages.warning(request, 'No se pueden agregar activos a una baja finalizada.')
+            return redirect('bajas_inventario:detalle_baja', pk=self.baja.pk)
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs) -> dict:
+        """Agrega la baja al contexto."""
+        context = super().get_context_data(**kwargs)
+        context['titulo'] = f'Agregar Activos a Baja {self.baja.numero}'
+        context['baja'] = self.baja
+        return context
+
+    def form_valid(self, form):
+        """Agrega los activos seleccionados usando el service de detalles."""
+        detalle_service = DetalleBajaService()
+
+        try:
+            detalles = detalle_service.agregar_detalles_masivo(
+                baja=self.baja,
+                activos=form.cleaned_data.get('activos') or None,
+                ubicacion=form.cleaned_data.get('ubicacion'),
+                cantidad=form.cleaned_data['cantidad'],
+                observaciones=form.cleaned_data.get('observaciones', '')
+            )
+        except ValidationError as e:
+            for error in e.messages:
+                messages.error(self.request, error)
+            return self.form_invalid(form)
+
+        if detalles:
+            self.audit_description_template = (
+                f'Agregó {len(detalles)} activo(s) a la baja {{obj.numero}}'
+            )
+            self.log_action(self.baja, self.request)
+            messages.success(
+                self.request,
+                f'Se agregaron {len(detalles)} activo(s) a la baja {self.baja.numero}.'
+            )
+        else:
+            messages.info(self.request, 'No hay activos nuevos para agregar a la baja.')
+
+        return redirect('bajas_inventario:detalle_baja', pk=self.baja.pk)
+
+
 # ==================== VISTAS DE WORKFLOW (AUTORIZAR, RECHAZAR) ====================
 
 class BajaInventarioAutorizarView(BaseAuditedViewMixin, AtomicTransactionMixin, DetailView):
@@ -494,7 +564,7 @@ class BajaInventarioAutorizarView(BaseAuditedViewMixin, AtomicTransactionMixin,
 
     def get_queryset(self) -> QuerySet:
         """Solo bajas no eliminadas."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega formulario y datos al contexto."""
@@ -575,7 +645,7 @@ class BajaInventarioRechazarView(BaseAuditedViewMixin, AtomicTransactionMixin, D
 
     def get_queryset(self) -> QuerySet:
         """Solo bajas no eliminadas."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega formulario y datos al contexto."""
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Bodega, Categoria, Articulo, TipoMovimiento, Movimiento
+from .models import Bodega, Categoria, Articulo, TipoMovimiento, Movimiento, CierreStock
 
 
 @admin.register(Bodega)
@@ -20,16 +20,16 @@ class CategoriaAdmin(admin.ModelAdmin):
 
 @admin.register(Articulo)
 class ArticuloAdmin(admin.ModelAdmin):
-    list_display = ['sku', 'codigo', 'nombre', 'categoria', 'stock_actual', 'stock_minimo', 'ubicacion_fisica', 'activo']
-    list_filter = ['categoria', 'ubicacion_fisica', 'activo']
+    list_display = ['sku', 'codigo', 'nombre', 'categoria', 'stock_actual', 'stock_minimo', 'estado_stock', 'ubicacion_fisica', 'activo']
+    list_filter = ['estado_stock', 'categoria', 'ubicacion_fisica', 'activo']
     search_fields = ['sku', 'codigo', 'nombre', 'marca']
-    readonly_fields = ['fecha_creacion', 'fecha_actualizacion']
+    readonly_fields = ['estado_stock', 'fecha_creacion', 'fecha_actualizacion']
     fieldsets = (
         ('Información General', {
             'fields': ('sku', 'codigo', 'nombre', 'descripcion', 'marca', 'categoria')
         }),
         ('Stock', {
-            'fields': ('stock_actual', 'stock_minimo', 'stock_maximo', 'punto_reorden', 'unidad_medida')
+            'fields': ('stock_actual', 'stock_minimo', 'stock_maximo', 'punto_reorden', 'estado_stock', 'unidad_medida')
         }),
         ('Ubicación', {
             'fields': ('ubicacion_fisica',)
@@ -58,3 +58,12 @@ class MovimientoAdmin(admin.ModelAdmin):
     search_fields = ['articulo__sku', 'articulo__nombre', 'usuario__correo', 'motivo']
     readonly_fields = ['fecha_creacion', 'fecha_actualizacion']
     date_hierarchy = 'fecha_creacion'
+
+
+@admin.register(CierreStock)
+class CierreStockAdmin(admin.ModelAdmin):
+    list_display = ['articulo', 'fecha', 'stock', 'fecha_creacion']
+    list_filter = ['fecha']
+    search_fields = ['articulo__sku', 'articulo__nombre']
+    readonly_fields = ['articulo', 'fecha', 'corte', 'stock', 'fecha_creacion']
+    date_hierarchy = 'fecha'
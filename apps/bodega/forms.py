@@ -73,21 +73,20 @@ class CategoriaForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # Filtrar solo marcas y modelos activos
         from apps.inventario.models import Marca, Modelo
-        self.fields['marca'].queryset = Marca.objects.filter(activo=True, eliminado=False)
-        self.fields['modelo'].queryset = Modelo.objects.filter(activo=True, eliminado=False)
+        self.fields['marca'].queryset = Marca.vivos.filter(activo=True)
+        self.fields['modelo'].queryset = Modelo.vivos.filter(activo=True)
         self.fields['modelo'].required = False
         
         # Si hay instancia y tiene marca, filtrar modelos
         if self.instance and self.instance.pk and self.instance.marca:
-            self.fields['modelo'].queryset = Modelo.objects.filter(
+            self.fields['modelo'].queryset = Modelo.vivos.filter(
                 marca=self.instance.marca,
-                activo=True,
-                eliminado=False
+                activo=True
             )
         
         # Cargar sectores activos
         from apps.inventario.models import SectorInventario
-        self.fields['sector'].queryset = SectorInventario.objects.filter(activo=True, eliminado=False)
+        self.fields['sector'].queryset = SectorInventario.vivos.filter(activo=True)
 
 
 class ArticuloForm(forms.ModelForm):
@@ -194,34 +193,31 @@ class ArticuloForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Filtrar solo categorías activas y no eliminadas
-        self.fields['categoria'].queryset = Categoria.objects.filter(
-            activo=True,
-            eliminado=False
+        self.fields['categoria'].queryset = Categoria.vivos.filter(
+            activo=True
         ).order_by('codigo')
 
         # Filtrar solo bodegas activas y no eliminadas
-        self.fields['ubicacion_fisica'].queryset = Bodega.objects.filter(
-            activo=True,
-            eliminado=False
+        self.fields['ubicacion_fisica'].queryset = Bodega.vivos.filter(
+            activo=True
         ).order_by('codigo')
         
         # Filtrar marcas y modelos activos
         from apps.inventario.models import Marca, Modelo, NombreArticulo, SectorInventario
-        self.fields['marca'].queryset = Marca.objects.filter(activo=True, eliminado=False)
-        self.fields['modelo'].queryset = Modelo.objects.filter(activo=True, eliminado=False)
+        self.fields['marca'].queryset = Marca.vivos.filter(activo=True)
+        self.fields['modelo'].queryset = Modelo.vivos.filter(activo=True)
         self.fields['modelo'].required = False
         
         # Si hay instancia y tiene marca, filtrar modelos
         if self.instance and self.instance.pk and self.instance.marca:
-            self.fields['modelo'].queryset = Modelo.objects.filter(
+            self.fields['modelo'].queryset = Modelo.vivos.filter(
                 marca=self.instance.marca,
-                activo=True,
-                eliminado=False
+                activo=True
             )
         
         # Cargar nombres de artículos y sectores activos
-        self.fields['nombre_articulo'].queryset = NombreArticulo.objects.filter(activo=True, eliminado=False)
-        self.fields['sector'].queryset = SectorInventario.objects.filter(activo=True, eliminado=False)
+        self.fields['nombre_articulo'].queryset = NombreArticulo.vivos.filter(activo=True)
+        self.fields['sector'].queryset = SectorInventario.vivos.filter(activo=True)
 
     def clean_sku(self):
         """Validar que el SKU sea único (en mayúsculas)."""
@@ -301,15 +297,13 @@ class MovimientoForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Filtrar solo artículos activos y no eliminados
-        self.fields['articulo'].queryset = Articulo.objects.filter(
-            activo=True,
-            eliminado=False
+        self.fields['articulo'].queryset = Articulo.vivos.filter(
+            activo=True
         ).select_related('categoria').order_by('sku')
 
         # Filtrar solo tipos de movimiento activos
-        self.fields['tipo'].queryset = TipoMovimiento.objects.filter(
-            activo=True,
-            eliminado=False
+        self.fields['tipo'].queryset = TipoMovimiento.vivos.filter(
+            activo=True
         ).order_by('codigo')
 
     def clean_cantidad(self):
@@ -349,7 +343,7 @@ class ArticuloFiltroForm(forms.Form):
     )
 
     categoria = forms.ModelChoiceField(
-        queryset=Categoria.objects.filter(activo=True, eliminado=False),
+        queryset=Categoria.vivos.filter(activo=True),
         required=False,
         empty_label='Todas las categorías',
         widget=forms.Select(attrs={
@@ -359,7 +353,7 @@ class ArticuloFiltroForm(forms.Form):
     )
 
     bodega = forms.ModelChoiceField(
-        queryset=Bodega.objects.filter(activo=True, eliminado=False),
+        queryset=Bodega.vivos.filter(activo=True),
         required=False,
         empty_label='Todas las bodegas',
         widget=forms.Select(attrs={
@@ -380,3 +374,36 @@ class ArticuloFiltroForm(forms.Form):
         }),
         label='Estado'
     )
+
+    estado_stock = forms.ChoiceField(
+        required=False,
+        choices=[('', 'Todos los niveles de stock')] + Articulo.ESTADO_STOCK_CHOICES,
+        widget=forms.Select(attrs={
+            'class': 'form-select'
+        }),
+        label='Nivel de Stock'
+    )
+
+
+class KardexFiltroForm(forms.Form):
+    """Formulario para elegir el rango de fechas del kardex de un artículo."""
+
+    desde = forms.DateField(
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+        label='Desde'
+    )
+    hasta = forms.DateField(
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+        label='Hasta'
+    )
+
+    def clean(self):
+        """Valida que el rango de fechas sea coherente."""
+        cleaned_data = super().clean()
+        desde = cleaned_data.get('desde')
+        hasta = cleaned_data.get('hasta')
+
+        if desde and hasta and desde > hasta:
+            raise ValidationError('La fecha inicial no puede ser posterior a la fecha final.')
+
+        return cleaned_data
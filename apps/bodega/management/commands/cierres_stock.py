@@ -0,0 +1,52 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.bodega.services import CierreStockService
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera los cierres mensuales de stock por artículo (checkpoints del '
+        'libro de movimientos) para los meses terminados que falten. Con '
+        '--desde regenera desde ese mes, reemplazando los cierres existentes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--desde', type=date.fromisoformat, default=None,
+            help='Día del primer mes a regenerar (YYYY-MM-DD, default: mes siguiente al último cierre)'
+        )
+        parser.add_argument(
+            '--hasta', type=date.fromisoformat, default=None,
+            help='Último día a considerar (YYYY-MM-DD, default: ayer); solo se cierran meses completos'
+        )
+
+    def handle(self, *args, **options):
+        hoy = timezone.localdate()
+        hasta = options['hasta'] or hoy - timedelta(days=1)
+        if hasta >= hoy:
+            raise CommandError('--hasta debe ser un día ya terminado')
+        if options['desde'] and options['desde'] > hasta:
+            raise CommandError('--desde no puede ser posterior a --hasta')
+
+        service = CierreStockService()
+        meses = service.meses_pendientes(hasta, options['desde'])
+        if not meses:
+            self.stdout.write(self.style.SUCCESS('[+] Los cierres de stock están al día'))
+            return
+
+        self.stdout.write(f'[+] Generando {len(meses)} cierres mensuales ({meses[0]} a {meses[-1]})...')
+        inicio = time.perf_counter()
+        total = 0
+        for fecha in meses:
+            filas = service.generar_cierre(fecha)
+            total += filas
+            self.stdout.write(f'  [+] {fecha}: {filas} artículos')
+
+        duracion = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f'\n[+] Cierres generados: {total} filas en {len(meses)} meses ({duracion:.1f} s)'
+        ))
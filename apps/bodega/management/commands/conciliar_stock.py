@@ -0,0 +1,106 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.bodega.models import TipoMovimiento
+from apps.bodega.services import ConciliacionStockService
+
+
+class Command(BaseCommand):
+    help = (
+        'Concilia stock_actual de cada artículo con el libro de movimientos: '
+        'recorre el libro con un solo agregado por artículo, informa los '
+        'descuadres de stock y de la cadena stock_antes/stock_despues y, con '
+        '--corregir, los corrige con movimientos compensatorios o actualizando '
+        'el stock en lote.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--corregir', choices=[ConciliacionStockService.MODO_LIBRO, ConciliacionStockService.MODO_STOCK],
+            default=None,
+            help='libro: movimiento compensatorio hasta el stock actual; stock: stock_actual = libro'
+        )
+        parser.add_argument(
+            '--tipo', default=None,
+            help='Código del tipo de movimiento compensatorio (requerido con --corregir libro)'
+        )
+        parser.add_argument(
+            '--usuario', default=None,
+            help='Usuario de los movimientos compensatorios (requerido con --corregir libro)'
+        )
+        parser.add_argument(
+            '--lote', type=int, default=1000,
+            help='Artículos por consulta y por transacción de corrección (default: 1000)'
+        )
+        parser.add_argument(
+            '--detalle', action='store_true',
+            help='Lista los movimientos que rompen la cadena de cada artículo informado'
+        )
+        parser.add_argument(
+            '--max-reporte', type=int, default=50,
+            help='Máximo de artículos descuadrados a listar (default: 50)'
+        )
+
+    def handle(self, *args, **options):
+        service = ConciliacionStockService()
+        tipo = usuario = None
+        if options['corregir'] == ConciliacionStockService.MODO_LIBRO:
+            if not options['tipo'] or not options['usuario']:
+                raise CommandError('--corregir libro requiere --tipo y --usuario')
+            tipo = TipoMovimiento.vivos.filter(codigo=options['tipo']).first()
+            if tipo is None:
+                raise CommandError(f'No existe el tipo de movimiento {options["tipo"]}')
+            usuario = User.objects.filter(username=options['usuario']).first()
+            if usuario is None:
+                raise CommandError(f'No existe el usuario {options["usuario"]}')
+
+        self.stdout.write('[+] Recorriendo el libro de movimientos...')
+        inicio = time.perf_counter()
+        lote = max(options['lote'], 1)
+        descuadres_stock = []
+        descuadres_cadena = 0
+        informados = 0
+        for descuadre in service.discrepancias(lote=lote):
+            if descuadre['descuadre_stock']:
+                descuadres_stock.append(descuadre['articulo_id'])
+            if descuadre['quiebres'] or descuadre['filas_invalidas']:
+                descuadres_cadena += 1
+            if informados < options['max_reporte']:
+                informados += 1
+                self._informar(service, descuadre, options['detalle'])
+        duracion = time.perf_counter() - inicio
+
+        self.stdout.write(
+            f'\n[+] Recorrido en {duracion:.1f} s: {len(descuadres_stock)} artículos con stock '
+            f'distinto del libro, {descuadres_cadena} con la cadena de movimientos rota'
+        )
+        if not descuadres_stock and not descuadres_cadena:
+            self.stdout.write(self.style.SUCCESS('[+] Stock y libro de movimientos conciliados'))
+            return
+
+        if options['corregir'] and descuadres_stock:
+            corregidos = service.corregir(descuadres_stock, options['corregir'], tipo, usuario, lote=lote)
+            self.stdout.write(self.style.SUCCESS(f'[+] {corregidos} artículos corregidos ({options["corregir"]})'))
+        elif descuadres_stock:
+            self.stdout.write(self.style.WARNING('[!] Use --corregir libro|stock para corregir el stock'))
+        if descuadres_cadena:
+            self.stdout.write(self.style.WARNING(
+                '[!] Los saltos en la cadena quedan en el historial; revíselos con --detalle'
+            ))
+
+    def _informar(self, service: ConciliacionStockService, descuadre: dict, detalle: bool) -> None:
+        self.stdout.write(
+            f'  [!] {descuadre["sku"]}: stock {descuadre["stock_actual"]:.2f} / libro {descuadre["libro"]:.2f} '
+            f'(diferencia {descuadre["descuadre_stock"]:.2f}); de {descuadre["movimientos"]} movimientos, '
+            f'{descuadre["quiebres"]} saltos en la cadena y {descuadre["filas_invalidas"]} con cantidad inconsistente'
+        )
+        if detalle and (descuadre['quiebres'] or descuadre['filas_invalidas']):
+            for mov in service.movimiento_repo.quiebres_cadena(descuadre['articulo_id']):
+                anterior = '-' if mov['anterior'] is None else f'{mov["anterior"]:.2f}'
+                self.stdout.write(
+                    f'      #{mov["id"]} {mov["fecha_creacion"]:%Y-%m-%d %H:%M} {mov["operacion"]} '
+                    f'{mov["cantidad"]:.2f}: {mov["stock_antes"]:.2f} → {mov["stock_despues"]:.2f} '
+                    f'(anterior {anterior}, esperado {mov["esperado"]:.2f})'
+                )
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.bodega.models import Articulo
+from apps.bodega.repositories import ArticuloRepository
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula la columna estado_stock de los artículos (OK, reorden, bajo, '
+        'agotado, sobrestock) desde su stock y umbrales. Sirve para rellenarla '
+        'tras cargas directas a la base de datos; solo escribe las filas cuyo '
+        'estado cambia.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote', type=int, default=1000,
+            help='Artículos por transacción (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        if lote < 1:
+            raise CommandError('--lote debe ser mayor que cero')
+
+        ids = list(Articulo.objects.order_by('id').values_list('id', flat=True))
+        self.stdout.write(f'[+] Recalculando estado de stock de {len(ids)} artículos...')
+        inicio = time.perf_counter()
+        total = 0
+        for i in range(0, len(ids), lote):
+            total += ArticuloRepository.actualizar_estado_stock(ids[i:i + lote])
+
+        duracion = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f'\n[+] Estado de stock actualizado en {total} artículos ({duracion:.1f} s)'
+        ))
@@ -0,0 +1,54 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.bodega.models import Bodega
+from apps.bodega.services import CierreStockService
+
+
+class Command(BaseCommand):
+    help = (
+        'Stock y valorización de los artículos al cierre de una fecha, a partir '
+        'del último cierre mensual y los movimientos posteriores.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fecha', type=date.fromisoformat, required=True,
+            help='Fecha de la consulta (YYYY-MM-DD, al cierre del día)'
+        )
+        parser.add_argument(
+            '--bodega', default=None,
+            help='Código de la bodega (default: todas)'
+        )
+        parser.add_argument(
+            '--con-cero', action='store_true',
+            help='Incluye los artículos sin stock a esa fecha'
+        )
+
+    def handle(self, *args, **options):
+        bodega = None
+        if options['bodega']:
+            bodega = Bodega.vivos.filter(codigo=options['bodega']).first()
+            if bodega is None:
+                raise CommandError(f'No existe la bodega {options["bodega"]}')
+
+        resultado = CierreStockService().valorizar(options['fecha'], bodega)
+
+        destino = bodega.nombre if bodega else 'todas las bodegas'
+        self.stdout.write(f'[+] Stock al {options["fecha"]:%d/%m/%Y} en {destino}\n')
+        self.stdout.write(f'  {"SKU":<20}{"Artículo":<40}{"Stock":>12}{"Costo":>14}{"Valor":>16}')
+        for articulo in resultado['articulos']:
+            if not articulo.stock_al and not options['con_cero']:
+                continue
+            costo = '-' if articulo.costo_unitario is None else f'{articulo.costo_unitario:.2f}'
+            valor = '-' if articulo.valor is None else f'{articulo.valor:.2f}'
+            self.stdout.write(
+                f'  {articulo.sku:<20}{articulo.nombre[:38]:<40}{articulo.stock_al:>12.2f}{costo:>14}{valor:>16}'
+            )
+
+        if resultado['sin_costo']:
+            self.stdout.write(self.style.WARNING(
+                f'\n[!] {resultado["sin_costo"]} artículos con stock sin precio de compra (no valorizados)'
+            ))
+        self.stdout.write(self.style.SUCCESS(f'\n[+] Valor total: {resultado["total_valor"]:.2f}'))
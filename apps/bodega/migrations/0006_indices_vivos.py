@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bodega', '0005_remove_articulo_marca_old'),
+        ('inventario', '0003_toma_inventario'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['sku'], name='ix_articulo_sku_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['categoria', 'sku'], name='ix_articulo_cat_sku_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['ubicacion_fisica', 'sku'], name='ix_articulo_bod_sku_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='bodega',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_bodega_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='categoria',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_bodcat_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='movimiento',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['-fecha_creacion'], name='ix_mov_fecha_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='movimiento',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['articulo', '-fecha_creacion'], name='ix_mov_articulo_fecha_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='tipomovimiento',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_tipomov_codigo_vivo'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bodega', '0006_indices_vivos'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='movimiento',
+            name='ix_mov_articulo_fecha_vivo',
+        ),
+        migrations.AddIndex(
+            model_name='movimiento',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['articulo', 'fecha_creacion'], name='ix_mov_articulo_fecha_vivo'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bodega', '0007_indice_kardex'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CierreStock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha de Cierre')),
+                ('corte', models.DateTimeField(help_text='Inicio del día siguiente al cierre (hora local); incluye los movimientos anteriores', verbose_name='Corte')),
+                ('stock', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Stock')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')),
+                ('articulo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cierres_stock', to='bodega.articulo', verbose_name='Artículo')),
+            ],
+            options={
+                'verbose_name': 'Cierre de Stock',
+                'verbose_name_plural': 'Cierres de Stock',
+                'db_table': 'tba_bodega_cierre_stock',
+                'ordering': ['articulo', '-fecha'],
+                'indexes': [models.Index(fields=['corte'], name='ix_cierre_stock_corte')],
+                'constraints': [models.UniqueConstraint(fields=('articulo', 'corte'), name='uq_cierre_stock_articulo_corte')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:47
+
+from django.db import migrations, models
+from django.db.models import Case, F, Value, When
+
+
+def calcular_estado_stock(apps, schema_editor):
+    """Rellena estado_stock de los artículos existentes (misma lógica que Articulo.expresion_estado_stock)."""
+    Articulo = apps.get_model('bodega', 'Articulo')
+    Articulo.objects.update(estado_stock=Case(
+        When(stock_actual__lte=0, then=Value('AGOTADO')),
+        When(stock_actual__lt=F('stock_minimo'), then=Value('BAJO')),
+        When(punto_reorden__isnull=False, stock_actual__lte=F('punto_reorden'), then=Value('REORDEN')),
+        When(stock_maximo__isnull=False, stock_actual__gt=F('stock_maximo'), then=Value('SOBRESTOCK')),
+        default=Value('OK'),
+        output_field=models.CharField(max_length=10)
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bodega', '0008_cierre_stock'),
+        ('inventario', '0004_indices_vivos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articulo',
+            name='estado_stock',
+            field=models.CharField(choices=[('OK', 'OK'), ('REORDEN', 'En punto de reorden'), ('BAJO', 'Bajo el mínimo'), ('AGOTADO', 'Agotado'), ('SOBRESTOCK', 'Sobre el máximo')], default='OK', editable=False, help_text='Calculado desde el stock y sus umbrales; permite filtrar stock bajo por índice', max_length=10, verbose_name='Estado de Stock'),
+        ),
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['estado_stock', 'sku'], name='ix_articulo_estado_sku_vivo'),
+        ),
+        migrations.RunPython(calcular_estado_stock, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,8 @@
 from django.db import models
+from django.db.models import Case, When, Value, F
 from django.core.validators import MinValueValidator
 from django.contrib.auth.models import User
-from core.models import BaseModel
+from core.models import BaseModel, indice_vivos
 
 
 class Bodega(BaseModel):
@@ -21,6 +22,9 @@ class Bodega(BaseModel):
         verbose_name = 'Bodega'
         verbose_name_plural = 'Bodegas'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_bodega_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -38,6 +42,9 @@ class Categoria(BaseModel):
         verbose_name = 'Categoría'
         verbose_name_plural = 'Categorías'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_bodcat_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -45,6 +52,25 @@ class Categoria(BaseModel):
 
 class Articulo(BaseModel):
     """Modelo para gestionar artículos en bodega"""
+    ESTADO_OK = 'OK'
+    ESTADO_REORDEN = 'REORDEN'
+    ESTADO_BAJO = 'BAJO'
+    ESTADO_AGOTADO = 'AGOTADO'
+    ESTADO_SOBRESTOCK = 'SOBRESTOCK'
+    ESTADO_STOCK_CHOICES = [
+        (ESTADO_OK, 'OK'),
+        (ESTADO_REORDEN, 'En punto de reorden'),
+        (ESTADO_BAJO, 'Bajo el mínimo'),
+        (ESTADO_AGOTADO, 'Agotado'),
+        (ESTADO_SOBRESTOCK, 'Sobre el máximo'),
+    ]
+    # Estados posibles de los artículos de los listados de stock bajo y de
+    # reorden (cada listado agrega además su comparación con el umbral)
+    ESTADOS_BAJO = [ESTADO_AGOTADO, ESTADO_BAJO]
+    ESTADOS_REORDEN = [ESTADO_AGOTADO, ESTADO_BAJO, ESTADO_REORDEN]
+    # Campos de los que depende estado_stock
+    CAMPOS_ESTADO_STOCK = {'stock_actual', 'stock_minimo', 'stock_maximo', 'punto_reorden'}
+
     sku = models.CharField(max_length=50, unique=True, verbose_name='SKU')
     codigo = models.CharField(max_length=50, verbose_name='Código')
     nombre_articulo = models.ForeignKey(
@@ -119,6 +145,14 @@ class Articulo(BaseModel):
         validators=[MinValueValidator(0)],
         verbose_name='Punto de Reorden'
     )
+    estado_stock = models.CharField(
+        max_length=10,
+        choices=ESTADO_STOCK_CHOICES,
+        default=ESTADO_OK,
+        editable=False,
+        verbose_name='Estado de Stock',
+        help_text='Calculado desde el stock y sus umbrales; permite filtrar stock bajo por índice'
+    )
     unidad_medida = models.CharField(max_length=20, verbose_name='Unidad de Medida')
     ubicacion_fisica = models.ForeignKey(
         Bodega,
@@ -144,15 +178,57 @@ class Articulo(BaseModel):
         verbose_name = 'Artículo'
         verbose_name_plural = 'Artículos'
         ordering = ['sku']
+        indexes = [
+            indice_vivos('sku', nombre='ix_articulo_sku_vivo'),
+            indice_vivos('categoria', 'sku', nombre='ix_articulo_cat_sku_vivo'),
+            indice_vivos('ubicacion_fisica', 'sku', nombre='ix_articulo_bod_sku_vivo'),
+            indice_vivos('estado_stock', 'sku', nombre='ix_articulo_estado_sku_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.sku} - {self.nombre}"
-    
+
+    def calcular_estado_stock(self) -> str:
+        """
+        Estado del stock según los umbrales del artículo.
+
+        Se evalúa de más a menos grave: agotado, bajo el mínimo, en punto de
+        reorden y sobre el máximo. Debe coincidir con expresion_estado_stock.
+        """
+        if self.stock_actual <= 0:
+            return self.ESTADO_AGOTADO
+        if self.stock_actual < self.stock_minimo:
+            return self.ESTADO_BAJO
+        if self.punto_reorden is not None and self.stock_actual <= self.punto_reorden:
+            return self.ESTADO_REORDEN
+        if self.stock_maximo is not None and self.stock_actual > self.stock_maximo:
+            return self.ESTADO_SOBRESTOCK
+        return self.ESTADO_OK
+
+    @classmethod
+    def expresion_estado_stock(cls) -> Case:
+        """
+        calcular_estado_stock como expresión SQL, para actualizar el estado
+        en las escrituras masivas (bulk_update, update) que no pasan por save().
+        """
+        return Case(
+            When(stock_actual__lte=0, then=Value(cls.ESTADO_AGOTADO)),
+            When(stock_actual__lt=F('stock_minimo'), then=Value(cls.ESTADO_BAJO)),
+            When(punto_reorden__isnull=False, stock_actual__lte=F('punto_reorden'), then=Value(cls.ESTADO_REORDEN)),
+            When(stock_maximo__isnull=False, stock_actual__gt=F('stock_maximo'), then=Value(cls.ESTADO_SOBRESTOCK)),
+            default=Value(cls.ESTADO_OK),
+            output_field=models.CharField(max_length=10)
+        )
+
     def save(self, *args, **kwargs):
-        """Auto-generar código de barras si no se proporciona"""
+        """Auto-generar código de barras si no se proporciona y recalcular el estado de stock"""
         if not self.codigo_barras and self.sku:
             # Generar código de barras desde el SKU
             self.codigo_barras = f"SKU{self.sku.replace('-', '').replace('_', '').upper()[:12]}"
+        self.estado_stock = self.calcular_estado_stock()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.CAMPOS_ESTADO_STOCK.intersection(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'estado_stock'}
         super().save(*args, **kwargs)
 
 
@@ -167,6 +243,9 @@ class TipoMovimiento(BaseModel):
         verbose_name = 'Tipo de Movimiento'
         verbose_name_plural = 'Tipos de Movimiento'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_tipomov_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -223,8 +302,50 @@ class Movimiento(BaseModel):
         verbose_name = 'Movimiento'
         verbose_name_plural = 'Movimientos'
         ordering = ['-fecha_creacion']
+        indexes = [
+            indice_vivos('-fecha_creacion', nombre='ix_mov_fecha_vivo'),
+            indice_vivos('articulo', 'fecha_creacion', nombre='ix_mov_articulo_fecha_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.operacion} - {self.articulo.sku} - {self.cantidad}"
 
 
+
+
+class CierreStock(models.Model):
+    """
+    Stock de un artículo al cierre de un mes (checkpoint del libro de movimientos).
+
+    El stock a cualquier fecha se calcula como el último cierre anterior más
+    los movimientos desde su corte, así que una consulta histórica recorre a
+    lo sumo un mes de movimientos. Se generan con el comando cierres_stock.
+    """
+    articulo = models.ForeignKey(
+        Articulo,
+        on_delete=models.CASCADE,
+        related_name='cierres_stock',
+        verbose_name='Artículo'
+    )
+    fecha = models.DateField(verbose_name='Fecha de Cierre')
+    corte = models.DateTimeField(
+        verbose_name='Corte',
+        help_text='Inicio del día siguiente al cierre (hora local); incluye los movimientos anteriores'
+    )
+    stock = models.DecimalField(max_digits=10, decimal_places=2, verbose_name='Stock')
+    fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')
+
+    class Meta:
+        db_table = 'tba_bodega_cierre_stock'
+        verbose_name = 'Cierre de Stock'
+        verbose_name_plural = 'Cierres de Stock'
+        ordering = ['articulo', '-fecha']
+        constraints = [
+            models.UniqueConstraint(fields=['articulo', 'corte'], name='uq_cierre_stock_articulo_corte'),
+        ]
+        indexes = [
+            models.Index(fields=['corte'], name='ix_cierre_stock_corte'),
+        ]
+
+    def __str__(self):
+        return f"{self.articulo.sku} al {self.fecha:%d/%m/%Y}: {self.stock}"
@@ -4,11 +4,17 @@ Repository Pattern para el módulo de bodega.
 Separa la lógica de acceso a datos de la lógica de negocio,
 siguiendo el principio de Inversión de Dependencias (SOLID).
 """
-from typing import Optional, List
+from datetime import date, datetime, timezone as dt_timezone
+from typing import Optional, List, Dict
 from decimal import Decimal
-from django.db.models import QuerySet, Q
+from django.db.models import (
+    QuerySet, Q, F, Case, When, Value, Sum, Count, Window, Subquery, OuterRef,
+    DecimalField, DateTimeField, ExpressionWrapper
+)
+from django.db.models.functions import Coalesce, Lag, TruncDate
+from django.db.models.expressions import RowRange
 from django.contrib.auth.models import User
-from .models import Bodega, Categoria, Articulo, TipoMovimiento, Movimiento
+from .models import Bodega, Categoria, Articulo, TipoMovimiento, Movimiento, CierreStock
 
 
 # ==================== BODEGA REPOSITORY ====================
@@ -19,12 +25,12 @@ class BodegaRepository:
     @staticmethod
     def get_all() -> QuerySet[Bodega]:
         """Retorna todas las bodegas no eliminadas."""
-        return Bodega.objects.filter(eliminado=False)
+        return Bodega.vivos.all()
 
     @staticmethod
     def get_active() -> QuerySet[Bodega]:
         """Retorna solo bodegas activas y no eliminadas."""
-        return Bodega.objects.filter(activo=True, eliminado=False)
+        return Bodega.vivos.filter(activo=True)
 
     @staticmethod
     def get_by_id(bodega_id: int) -> Optional[Bodega]:
@@ -38,7 +44,7 @@ class BodegaRepository:
             Bodega si existe, None en caso contrario
         """
         try:
-            return Bodega.objects.get(id=bodega_id, eliminado=False)
+            return Bodega.vivos.get(id=bodega_id)
         except Bodega.DoesNotExist:
             return None
 
@@ -54,16 +60,15 @@ class BodegaRepository:
             Bodega si existe, None en caso contrario
         """
         try:
-            return Bodega.objects.get(codigo=codigo, eliminado=False)
+            return Bodega.vivos.get(codigo=codigo)
         except Bodega.DoesNotExist:
             return None
 
     @staticmethod
     def filter_by_responsable(responsable: User) -> QuerySet[Bodega]:
         """Retorna bodegas gestionadas por un responsable específico."""
-        return Bodega.objects.filter(
-            responsable=responsable,
-            eliminado=False
+        return Bodega.vivos.filter(
+            responsable=responsable
         )
 
     @staticmethod
@@ -77,9 +82,8 @@ class BodegaRepository:
         Returns:
             QuerySet con resultados
         """
-        return Bodega.objects.filter(
-            Q(codigo__icontains=query) | Q(nombre__icontains=query),
-            eliminado=False
+        return Bodega.vivos.filter(
+            Q(codigo__icontains=query) | Q(nombre__icontains=query)
         )
 
 
@@ -91,12 +95,12 @@ class CategoriaRepository:
     @staticmethod
     def get_all() -> QuerySet[Categoria]:
         """Retorna todas las categorías no eliminadas."""
-        return Categoria.objects.filter(eliminado=False).order_by('codigo')
+        return Categoria.vivos.order_by('codigo')
 
     @staticmethod
     def get_active() -> QuerySet[Categoria]:
         """Retorna solo categorías activas y no eliminadas."""
-        return Categoria.objects.filter(activo=True, eliminado=False).order_by('codigo')
+        return Categoria.vivos.filter(activo=True).order_by('codigo')
 
     @staticmethod
     def get_by_id(categoria_id: int) -> Optional[Categoria]:
@@ -110,7 +114,7 @@ class CategoriaRepository:
             Categoría si existe, None en caso contrario
         """
         try:
-            return Categoria.objects.get(id=categoria_id, eliminado=False)
+            return Categoria.vivos.get(id=categoria_id)
         except Categoria.DoesNotExist:
             return None
 
@@ -126,7 +130,7 @@ class CategoriaRepository:
             Categoría si existe, None en caso contrario
         """
         try:
-            return Categoria.objects.get(codigo=codigo, eliminado=False)
+            return Categoria.vivos.get(codigo=codigo)
         except Categoria.DoesNotExist:
             return None
 
@@ -141,9 +145,8 @@ class CategoriaRepository:
         Returns:
             QuerySet con resultados
         """
-        return Categoria.objects.filter(
-            Q(codigo__icontains=query) | Q(nombre__icontains=query),
-            eliminado=False
+        return Categoria.vivos.filter(
+            Q(codigo__icontains=query) | Q(nombre__icontains=query)
         ).order_by('codigo')
 
     @staticmethod
@@ -172,17 +175,15 @@ class ArticuloRepository:
     @staticmethod
     def get_all() -> QuerySet[Articulo]:
         """Retorna todos los artículos no eliminados con relaciones optimizadas."""
-        return Articulo.objects.filter(
-            eliminado=False
-        ).select_related(
+        return Articulo.vivos.select_related(
             'categoria', 'ubicacion_fisica'
         ).order_by('sku')
 
     @staticmethod
     def get_active() -> QuerySet[Articulo]:
         """Retorna solo artículos activos y no eliminados."""
-        return Articulo.objects.filter(
-            activo=True, eliminado=False
+        return Articulo.vivos.filter(
+            activo=True
         ).select_related(
             'categoria', 'ubicacion_fisica'
         ).order_by('sku')
@@ -199,9 +200,9 @@ class ArticuloRepository:
             Artículo si existe, None en caso contrario
         """
         try:
-            return Articulo.objects.select_related(
+            return Articulo.vivos.select_related(
                 'categoria', 'ubicacion_fisica'
-            ).get(id=articulo_id, eliminado=False)
+            ).get(id=articulo_id)
         except Articulo.DoesNotExist:
             return None
 
@@ -217,18 +218,17 @@ class ArticuloRepository:
             Artículo si existe, None en caso contrario
         """
         try:
-            return Articulo.objects.select_related(
+            return Articulo.vivos.select_related(
                 'categoria', 'ubicacion_fisica'
-            ).get(sku=sku, eliminado=False)
+            ).get(sku=sku)
         except Articulo.DoesNotExist:
             return None
 
     @staticmethod
     def filter_by_categoria(categoria: Categoria) -> QuerySet[Articulo]:
         """Retorna artículos de una categoría específica."""
-        return Articulo.objects.filter(
-            categoria=categoria,
-            eliminado=False
+        return Articulo.vivos.filter(
+            categoria=categoria
         ).select_related(
             'categoria', 'ubicacion_fisica'
         ).order_by('sku')
@@ -236,21 +236,24 @@ class ArticuloRepository:
     @staticmethod
     def filter_by_bodega(bodega: Bodega) -> QuerySet[Articulo]:
         """Retorna artículos de una bodega específica."""
-        return Articulo.objects.filter(
-            ubicacion_fisica=bodega,
-            eliminado=False
+        return Articulo.vivos.filter(
+            ubicacion_fisica=bodega
         ).select_related(
             'categoria', 'ubicacion_fisica'
         ).order_by('sku')
 
     @staticmethod
     def get_low_stock() -> QuerySet[Articulo]:
-        """Retorna artículos con stock bajo (menor al mínimo)."""
-        from django.db.models import F
-        return Articulo.objects.filter(
-            eliminado=False,
-            activo=True
-        ).filter(
+        """
+        Retorna artículos con stock bajo (menor al mínimo).
+
+        El índice (estado_stock, sku) acota la lectura a los agotados y bajo
+        el mínimo; la comparación con stock_minimo descarta los agotados con
+        mínimo 0, que no están bajo el mínimo.
+        """
+        return Articulo.vivos.filter(
+            activo=True,
+            estado_stock__in=Articulo.ESTADOS_BAJO,
             stock_actual__lt=F('stock_minimo')
         ).select_related(
             'categoria', 'ubicacion_fisica'
@@ -258,18 +261,60 @@ class ArticuloRepository:
 
     @staticmethod
     def get_reorder_point() -> QuerySet[Articulo]:
-        """Retorna artículos que alcanzaron el punto de reorden."""
-        from django.db.models import F
-        return Articulo.objects.filter(
-            eliminado=False,
+        """
+        Retorna artículos que alcanzaron el punto de reorden.
+
+        El índice (estado_stock, sku) acota la lectura a los agotados, bajo el
+        mínimo y en reorden; la comparación con punto_reorden descarta los que
+        no lo tienen definido o siguen sobre él.
+        """
+        return Articulo.vivos.filter(
             activo=True,
-            punto_reorden__isnull=False
-        ).filter(
+            estado_stock__in=Articulo.ESTADOS_REORDEN,
+            punto_reorden__isnull=False,
             stock_actual__lte=F('punto_reorden')
         ).select_related(
             'categoria', 'ubicacion_fisica'
         ).order_by('sku')
 
+    @staticmethod
+    def count_by_estado_stock() -> Dict[str, int]:
+        """
+        Cuenta artículos activos por estado de stock.
+
+        Se resuelve recorriendo solo el índice (estado_stock, sku).
+
+        Returns:
+            Dict estado -> cantidad, con todos los estados (0 si no hay artículos)
+        """
+        conteo = dict.fromkeys((codigo for codigo, _ in Articulo.ESTADO_STOCK_CHOICES), 0)
+        filas = Articulo.vivos.filter(activo=True).values('estado_stock').annotate(
+            total=Count('id')
+        ).order_by()
+        for fila in filas:
+            conteo[fila['estado_stock']] = fila['total']
+        return conteo
+
+    @staticmethod
+    def actualizar_estado_stock(articulo_ids: Optional[List[int]] = None) -> int:
+        """
+        Recalcula estado_stock en la base de datos.
+
+        Lo usan las escrituras masivas, que no pasan por Articulo.save(). Solo
+        escribe las filas cuyo estado cambia.
+
+        Args:
+            articulo_ids: IDs a recalcular (None para todos)
+
+        Returns:
+            Cantidad de filas actualizadas
+        """
+        estado = Articulo.expresion_estado_stock()
+        articulos = Articulo.objects.all()
+        if articulo_ids is not None:
+            articulos = articulos.filter(id__in=articulo_ids)
+        return articulos.exclude(estado_stock=estado).update(estado_stock=estado)
+
     @staticmethod
     def search(query: str) -> QuerySet[Articulo]:
         """
@@ -281,16 +326,34 @@ class ArticuloRepository:
         Returns:
             QuerySet con resultados
         """
-        return Articulo.objects.filter(
+        return Articulo.vivos.filter(
             Q(sku__icontains=query) |
             Q(codigo__icontains=query) |
             Q(nombre__icontains=query) |
-            Q(marca__icontains=query),
-            eliminado=False
+            Q(marca__nombre__icontains=query)
         ).select_related(
             'categoria', 'ubicacion_fisica'
         ).order_by('sku')
 
+    @staticmethod
+    def get_resumen_by_codigos_barras(codigos_barras: List[str]) -> QuerySet:
+        """
+        Retorna los datos mínimos de los artículos con los códigos de barras dados.
+
+        Args:
+            codigos_barras: Códigos de barras a buscar (usa el índice único)
+
+        Returns:
+            QuerySet de diccionarios con id, código de barras, SKU, nombre,
+            unidad de medida y código de bodega
+        """
+        return Articulo.vivos.filter(
+            codigo_barras__in=codigos_barras
+        ).values(
+            'id', 'codigo_barras', 'sku', 'nombre',
+            'unidad_medida', 'ubicacion_fisica__codigo'
+        ).order_by()
+
     @staticmethod
     def exists_by_sku(sku: str, exclude_id: Optional[int] = None) -> bool:
         """
@@ -308,6 +371,44 @@ class ArticuloRepository:
             queryset = queryset.exclude(id=exclude_id)
         return queryset.exists()
 
+    @staticmethod
+    def get_stock_for_update(articulo_ids: List[int]) -> dict:
+        """
+        Obtiene el stock actual de varios artículos bloqueando sus filas.
+
+        Args:
+            articulo_ids: IDs de los artículos
+
+        Returns:
+            Diccionario articulo_id -> stock_actual
+        """
+        return dict(
+            Articulo.objects.select_for_update().filter(
+                id__in=articulo_ids
+            ).values_list('id', 'stock_actual').order_by()
+        )
+
+    @staticmethod
+    def bulk_update_stock(articulos: List[Articulo], batch_size: int = 500) -> int:
+        """
+        Actualiza el stock de varios artículos en lote y recalcula su estado_stock.
+
+        Args:
+            articulos: Artículos con stock_actual y fecha_actualizacion asignados
+            batch_size: Tamaño de cada UPDATE
+
+        Returns:
+            Cantidad de filas actualizadas
+        """
+        actualizadas = Articulo.objects.bulk_update(
+            articulos, ['stock_actual', 'fecha_actualizacion'], batch_size=batch_size
+        )
+        for inicio in range(0, len(articulos), batch_size):
+            ArticuloRepository.actualizar_estado_stock(
+                [articulo.id for articulo in articulos[inicio:inicio + batch_size]]
+            )
+        return actualizadas
+
     @staticmethod
     def update_stock(articulo: Articulo, nuevo_stock: Decimal) -> Articulo:
         """
@@ -333,13 +434,13 @@ class TipoMovimientoRepository:
     @staticmethod
     def get_all() -> QuerySet[TipoMovimiento]:
         """Retorna todos los tipos de movimiento no eliminados."""
-        return TipoMovimiento.objects.filter(eliminado=False).order_by('codigo')
+        return TipoMovimiento.vivos.order_by('codigo')
 
     @staticmethod
     def get_active() -> QuerySet[TipoMovimiento]:
         """Retorna solo tipos de movimiento activos y no eliminados."""
-        return TipoMovimiento.objects.filter(
-            activo=True, eliminado=False
+        return TipoMovimiento.vivos.filter(
+            activo=True
         ).order_by('codigo')
 
     @staticmethod
@@ -354,7 +455,7 @@ class TipoMovimientoRepository:
             TipoMovimiento si existe, None en caso contrario
         """
         try:
-            return TipoMovimiento.objects.get(id=tipo_id, eliminado=False)
+            return TipoMovimiento.vivos.get(id=tipo_id)
         except TipoMovimiento.DoesNotExist:
             return None
 
@@ -370,7 +471,7 @@ class TipoMovimientoRepository:
             TipoMovimiento si existe, None en caso contrario
         """
         try:
-            return TipoMovimiento.objects.get(codigo=codigo, eliminado=False)
+            return TipoMovimiento.vivos.get(codigo=codigo)
         except TipoMovimiento.DoesNotExist:
             return None
 
@@ -383,9 +484,7 @@ class MovimientoRepository:
     @staticmethod
     def get_all() -> QuerySet[Movimiento]:
         """Retorna todos los movimientos no eliminados con relaciones optimizadas."""
-        return Movimiento.objects.filter(
-            eliminado=False
-        ).select_related(
+        return Movimiento.vivos.select_related(
             'articulo', 'tipo', 'usuario'
         ).order_by('-fecha_creacion')
 
@@ -401,9 +500,9 @@ class MovimientoRepository:
             Movimiento si existe, None en caso contrario
         """
         try:
-            return Movimiento.objects.select_related(
+            return Movimiento.vivos.select_related(
                 'articulo', 'tipo', 'usuario'
-            ).get(id=movimiento_id, eliminado=False)
+            ).get(id=movimiento_id)
         except Movimiento.DoesNotExist:
             return None
 
@@ -419,9 +518,8 @@ class MovimientoRepository:
         Returns:
             QuerySet con movimientos limitados
         """
-        return Movimiento.objects.filter(
-            articulo=articulo,
-            eliminado=False
+        return Movimiento.vivos.filter(
+            articulo=articulo
         ).select_related(
             'tipo', 'usuario'
         ).order_by('-fecha_creacion')[:limit]
@@ -429,9 +527,8 @@ class MovimientoRepository:
     @staticmethod
     def filter_by_tipo(tipo: TipoMovimiento) -> QuerySet[Movimiento]:
         """Retorna movimientos de un tipo específico."""
-        return Movimiento.objects.filter(
-            tipo=tipo,
-            eliminado=False
+        return Movimiento.vivos.filter(
+            tipo=tipo
         ).select_related(
             'articulo', 'usuario'
         ).order_by('-fecha_creacion')
@@ -447,9 +544,8 @@ class MovimientoRepository:
         Returns:
             QuerySet con movimientos filtrados
         """
-        return Movimiento.objects.filter(
-            operacion=operacion,
-            eliminado=False
+        return Movimiento.vivos.filter(
+            operacion=operacion
         ).select_related(
             'articulo', 'tipo', 'usuario'
         ).order_by('-fecha_creacion')
@@ -457,13 +553,252 @@ class MovimientoRepository:
     @staticmethod
     def filter_by_usuario(usuario: User) -> QuerySet[Movimiento]:
         """Retorna movimientos realizados por un usuario específico."""
-        return Movimiento.objects.filter(
-            usuario=usuario,
-            eliminado=False
+        return Movimiento.vivos.filter(
+            usuario=usuario
         ).select_related(
             'articulo', 'tipo'
         ).order_by('-fecha_creacion')
 
+    @staticmethod
+    def cantidad_con_signo() -> Case:
+        """Expresión con la cantidad del movimiento: positiva si es ENTRADA, negativa si es SALIDA."""
+        return Case(
+            When(operacion='ENTRADA', then=F('cantidad')),
+            default=-F('cantidad'),
+            output_field=DecimalField(max_digits=10, decimal_places=2)
+        )
+
+    @staticmethod
+    def saldo_al(articulo: Articulo, fecha: datetime) -> Decimal:
+        """
+        Stock del artículo justo antes de `fecha` según el libro de movimientos.
+
+        Es el stock_despues del último movimiento anterior: una búsqueda en el
+        índice (articulo, fecha_creacion), sin recorrer la historia.
+
+        Args:
+            articulo: Artículo a consultar
+            fecha: Instante de corte (excluido)
+
+        Returns:
+            Decimal con el saldo (0 si no hay movimientos anteriores)
+        """
+        saldo = Movimiento.vivos.filter(
+            articulo=articulo,
+            fecha_creacion__lt=fecha
+        ).order_by('-fecha_creacion', '-id').values_list('stock_despues', flat=True).first()
+        return saldo if saldo is not None else Decimal('0')
+
+    @staticmethod
+    def totales_rango(articulo: Articulo, desde: datetime, hasta: datetime) -> Dict[str, Decimal]:
+        """
+        Suma de entradas y salidas del artículo en [desde, hasta).
+
+        Returns:
+            dict con 'entradas', 'salidas' y 'movimientos' (cantidad de filas)
+        """
+        totales = Movimiento.vivos.filter(
+            articulo=articulo,
+            fecha_creacion__gte=desde,
+            fecha_creacion__lt=hasta
+        ).aggregate(
+            entradas=Coalesce(Sum('cantidad', filter=Q(operacion='ENTRADA')), Decimal('0')),
+            salidas=Coalesce(Sum('cantidad', filter=Q(operacion='SALIDA')), Decimal('0')),
+            movimientos=Count('id')
+        )
+        return totales
+
+    @staticmethod
+    def totales_por_articulo() -> QuerySet:
+        """
+        Agregado del libro de movimientos agrupado por artículo.
+
+        Agrupa solo por articulo_id, así que se resuelve recorriendo el índice
+        (articulo, fecha_creacion) en orden, sin ordenar ni agrupar en memoria,
+        y se puede leer con iterator() sobre millones de filas.
+
+        Returns:
+            QuerySet de dicts con articulo_id, movimientos y filas_invalidas
+            (stock_despues distinto de stock_antes más la cantidad), ordenado
+            por articulo_id
+        """
+        signo = MovimientoRepository.cantidad_con_signo()
+        return Movimiento.vivos.order_by('articulo_id').values('articulo_id').annotate(
+            movimientos=Count('id'),
+            filas_invalidas=Count('id', filter=~Q(stock_despues=F('stock_antes') + signo))
+        )
+
+    @staticmethod
+    def stock_y_libro(articulo_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Stock actual y saldo del libro de varios artículos.
+
+        Args:
+            articulo_ids: IDs de los artículos
+
+        Returns:
+            Diccionario articulo_id -> dict con sku, stock_actual y libro
+            (stock_despues del último movimiento)
+        """
+        ultimo = Movimiento.vivos.filter(
+            articulo=OuterRef('pk')
+        ).order_by('-fecha_creacion', '-id').values('stock_despues')[:1]
+        return {
+            fila['id']: fila
+            for fila in Articulo.objects.filter(id__in=articulo_ids).annotate(
+                libro=Subquery(ultimo)
+            ).values('id', 'sku', 'stock_actual', 'libro')
+        }
+
+    @staticmethod
+    def _con_anterior(movimientos: QuerySet[Movimiento]) -> QuerySet[Movimiento]:
+        """Anota el stock_despues del movimiento anterior del mismo artículo (anterior)."""
+        return movimientos.annotate(anterior=Window(
+            Lag('stock_despues'),
+            partition_by=[F('articulo_id')],
+            order_by=[F('fecha_creacion').asc(), F('id').asc()]
+        ))
+
+    @staticmethod
+    def quiebres_por_articulo(articulo_ids: List[int]) -> Dict[int, int]:
+        """
+        Cantidad de saltos en la cadena de movimientos de varios artículos.
+
+        Un salto es un movimiento cuyo stock_antes no es el stock_despues del
+        anterior. La comparación la hace la base de datos con LAG(), que solo
+        devuelve los movimientos con salto.
+
+        Args:
+            articulo_ids: IDs de los artículos
+
+        Returns:
+            Diccionario articulo_id -> saltos (solo artículos con saltos)
+        """
+        saltos = MovimientoRepository._con_anterior(
+            Movimiento.vivos.filter(articulo_id__in=articulo_ids)
+        ).filter(anterior__isnull=False).exclude(
+            stock_antes=F('anterior')
+        ).order_by().values_list('articulo_id', flat=True)
+        resultado = {}
+        for articulo_id in saltos:
+            resultado[articulo_id] = resultado.get(articulo_id, 0) + 1
+        return resultado
+
+    @staticmethod
+    def quiebres_cadena(articulo_id: int) -> List[Dict]:
+        """
+        Movimientos de un artículo que rompen la cadena stock_antes/stock_despues.
+
+        Un movimiento rompe la cadena si no parte del stock en que terminó el
+        anterior o si su stock_despues no es stock_antes más la cantidad.
+
+        Args:
+            articulo_id: ID del artículo
+
+        Returns:
+            Lista de dicts con id, fecha_creacion, operacion, cantidad,
+            stock_antes, stock_despues y anterior (stock_despues previo)
+        """
+        signo = MovimientoRepository.cantidad_con_signo()
+        movimientos = MovimientoRepository._con_anterior(
+            Movimiento.vivos.filter(articulo_id=articulo_id)
+        ).annotate(
+            esperado=ExpressionWrapper(F('stock_antes') + signo, output_field=DecimalField(max_digits=10, decimal_places=2)),
+        ).order_by('fecha_creacion', 'id').values(
+            'id', 'fecha_creacion', 'operacion', 'cantidad', 'stock_antes', 'stock_despues', 'anterior', 'esperado'
+        )
+        return [
+            mov for mov in movimientos
+            if mov['stock_despues'] != mov['esperado']
+            or (mov['anterior'] is not None and mov['stock_antes'] != mov['anterior'])
+        ]
+
+    @staticmethod
+    def costo_unitario_subquery(articulo_ref, fecha) -> Subquery:
+        """
+        Subconsulta con el último precio de compra de un artículo a una fecha.
+
+        Toma el precio unitario de la línea de orden de compra más reciente
+        con fecha_orden hasta `fecha`.
+
+        Args:
+            articulo_ref: Referencia al artículo (OuterRef o id)
+            fecha: Fecha de corte incluida (date u OuterRef)
+
+        Returns:
+            Subquery escalar con el precio, o NULL si nunca se compró
+        """
+        from apps.compras.models import DetalleOrdenCompraArticulo
+        return Subquery(
+            DetalleOrdenCompraArticulo.vivos.filter(
+                articulo=articulo_ref,
+                orden_compra__fecha_orden__lte=fecha
+            ).order_by(
+                '-orden_compra__fecha_orden', '-id'
+            ).values('precio_unitario')[:1],
+            output_field=DecimalField(max_digits=12, decimal_places=2)
+        )
+
+    @staticmethod
+    def costos_unitarios_al(articulo: Articulo, fechas: Dict[str, date]) -> Dict[str, Optional[Decimal]]:
+        """
+        Último precio de compra del artículo a varias fechas en una sola consulta.
+
+        Args:
+            articulo: Artículo a valorizar
+            fechas: Diccionario nombre -> fecha de corte
+
+        Returns:
+            Diccionario nombre -> precio unitario (None si no hay compras)
+        """
+        return Articulo.objects.filter(pk=articulo.pk).values(**{
+            nombre: MovimientoRepository.costo_unitario_subquery(OuterRef('pk'), fecha)
+            for nombre, fecha in fechas.items()
+        }).get()
+
+    @staticmethod
+    def kardex(
+        articulo: Articulo,
+        desde: datetime,
+        hasta: datetime,
+        saldo_inicial: Decimal
+    ) -> QuerySet[Movimiento]:
+        """
+        Movimientos del artículo en [desde, hasta) con saldo acumulado y costo.
+
+        El saldo se calcula en SQL con una función de ventana (suma acumulada
+        de entradas menos salidas sobre saldo_inicial) en el orden del índice
+        (articulo, fecha_creacion), así que el recorrido no requiere ordenar.
+        El costo unitario es el último precio de compra a la fecha de cada
+        movimiento.
+
+        Args:
+            articulo: Artículo del kardex
+            desde: Inicio del rango (incluido)
+            hasta: Fin del rango (excluido)
+            saldo_inicial: Saldo antes de `desde` (ver saldo_al)
+
+        Returns:
+            QuerySet con entrada, salida, saldo y costo_unitario por movimiento,
+            en orden cronológico
+        """
+        signo = MovimientoRepository.cantidad_con_signo()
+        return Movimiento.vivos.filter(
+            articulo=articulo,
+            fecha_creacion__gte=desde,
+            fecha_creacion__lt=hasta
+        ).select_related('tipo', 'usuario').annotate(
+            fecha=TruncDate('fecha_creacion'),
+            entrada=Case(When(operacion='ENTRADA', then=F('cantidad')), default=None),
+            salida=Case(When(operacion='SALIDA', then=F('cantidad')), default=None),
+            saldo=Window(
+                Sum(signo),
+                order_by=[F('fecha_creacion').asc(), F('id').asc()],
+                frame=RowRange(start=None, end=0)
+            ) + Value(saldo_inicial),
+            costo_unitario=MovimientoRepository.costo_unitario_subquery(OuterRef('articulo'), OuterRef('fecha')),
+        ).order_by('fecha_creacion', 'id')
+
     @staticmethod
     def create(
         articulo: Articulo,
@@ -501,3 +836,165 @@ class MovimientoRepository:
             stock_antes=stock_antes,
             stock_despues=stock_despues
         )
+
+    @staticmethod
+    def bulk_create(movimientos: List[Movimiento], batch_size: int = 500) -> List[Movimiento]:
+        """
+        Inserta varios movimientos en lote.
+
+        Args:
+            movimientos: Movimientos con stock_antes/stock_despues ya calculados
+            batch_size: Tamaño de cada INSERT
+
+        Returns:
+            Lista de movimientos creados
+        """
+        return Movimiento.objects.bulk_create(movimientos, batch_size=batch_size)
+
+
+# ==================== CIERRE STOCK REPOSITORY ====================
+
+class CierreStockRepository:
+    """Repository para gestionar acceso a datos de CierreStock."""
+
+    # Límite inferior para los movimientos de un artículo sin cierres previos
+    INICIO_LIBRO = datetime(1900, 1, 1, tzinfo=dt_timezone.utc)
+
+    @staticmethod
+    def get_ultimo_corte(antes_de: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Retorna el corte del cierre más reciente.
+
+        Args:
+            antes_de: Si se indica, solo considera cortes anteriores a este
+
+        Returns:
+            Corte del cierre, None si no hay cierres
+        """
+        cierres = CierreStock.objects.all()
+        if antes_de is not None:
+            cierres = cierres.filter(corte__lt=antes_de)
+        return cierres.order_by('-corte').values_list('corte', flat=True).first()
+
+    @staticmethod
+    def get_primer_movimiento() -> Optional[datetime]:
+        """Retorna la fecha del primer movimiento vivo del libro."""
+        return Movimiento.vivos.order_by('fecha_creacion').values_list('fecha_creacion', flat=True).first()
+
+    @staticmethod
+    def stock_en_corte(corte: datetime) -> Dict[int, Decimal]:
+        """
+        Stock de cada artículo en un cierre.
+
+        Args:
+            corte: Corte del cierre
+
+        Returns:
+            Diccionario articulo_id -> stock
+        """
+        return dict(CierreStock.objects.filter(corte=corte).values_list('articulo_id', 'stock'))
+
+    @staticmethod
+    def stock_inicial(articulo_ids: List[int]) -> Dict[int, Decimal]:
+        """
+        Stock de los artículos antes de su primer movimiento.
+
+        Es el stock_antes del primer movimiento (el stock con que se creó el
+        artículo), o el stock actual si no tiene movimientos.
+
+        Args:
+            articulo_ids: IDs de los artículos
+
+        Returns:
+            Diccionario articulo_id -> stock inicial
+        """
+        return dict(
+            Articulo.objects.filter(id__in=articulo_ids).annotate(
+                inicial=CierreStockRepository._stock_inicial_expr()
+            ).values_list('id', 'inicial')
+        )
+
+    @staticmethod
+    def deltas(desde: Optional[datetime], hasta: datetime) -> Dict[int, Decimal]:
+        """
+        Variación neta del stock por artículo entre dos instantes.
+
+        Es un único agregado agrupado por artículo sobre el rango de fechas.
+
+        Args:
+            desde: Inicio incluido (None para desde el primer movimiento)
+            hasta: Fin excluido
+
+        Returns:
+            Diccionario articulo_id -> entradas menos salidas
+        """
+        movimientos = Movimiento.vivos.filter(fecha_creacion__lt=hasta)
+        if desde is not None:
+            movimientos = movimientos.filter(fecha_creacion__gte=desde)
+        return dict(
+            movimientos.order_by().values('articulo_id').annotate(
+                delta=Sum(MovimientoRepository.cantidad_con_signo())
+            ).values_list('articulo_id', 'delta')
+        )
+
+    @staticmethod
+    def delete_desde(corte: datetime) -> int:
+        """Elimina los cierres con corte igual o posterior al dado."""
+        return CierreStock.objects.filter(corte__gte=corte).delete()[0]
+
+    @staticmethod
+    def bulk_create(cierres: List[CierreStock], batch_size: int = 500) -> List[CierreStock]:
+        """Crea varios cierres en lote."""
+        return CierreStock.objects.bulk_create(cierres, batch_size=batch_size)
+
+    @staticmethod
+    def stock_al(articulos: QuerySet[Articulo], instante: datetime) -> QuerySet[Articulo]:
+        """
+        Anota en cada artículo su stock a un instante (stock_al).
+
+        El stock es el último cierre con corte <= instante (o el stock inicial
+        del artículo si no tiene cierres) más los movimientos desde ese corte
+        hasta el instante. Todo se resuelve con subconsultas correlacionadas
+        sobre los índices (articulo, corte) y (articulo, fecha_creacion), en
+        una sola consulta para cualquier cantidad de artículos.
+
+        Args:
+            articulos: QuerySet de artículos a anotar
+            instante: Instante de la consulta (excluido)
+
+        Returns:
+            QuerySet con las anotaciones corte_cierre, stock_cierre y stock_al
+        """
+        cierre = CierreStock.objects.filter(
+            articulo=OuterRef('pk'),
+            corte__lte=instante
+        ).order_by('-corte')
+        delta = Movimiento.vivos.filter(
+            articulo=OuterRef('pk'),
+            fecha_creacion__gte=OuterRef('desde_delta'),
+            fecha_creacion__lt=instante
+        ).order_by().values('articulo').annotate(
+            total=Sum(MovimientoRepository.cantidad_con_signo())
+        ).values('total')
+        decimal = DecimalField(max_digits=10, decimal_places=2)
+        return articulos.annotate(
+            corte_cierre=Subquery(cierre.values('corte')[:1]),
+            stock_cierre=Subquery(cierre.values('stock')[:1]),
+            desde_delta=Coalesce(
+                F('corte_cierre'), Value(CierreStockRepository.INICIO_LIBRO), output_field=DateTimeField()
+            ),
+        ).annotate(
+            stock_al=ExpressionWrapper(
+                Coalesce(F('stock_cierre'), CierreStockRepository._stock_inicial_expr())
+                + Coalesce(Subquery(delta, output_field=decimal), Value(Decimal('0'))),
+                output_field=decimal
+            )
+        )
+
+    @staticmethod
+    def _stock_inicial_expr() -> Coalesce:
+        """stock_antes del primer movimiento del artículo (OuterRef('pk')) o su stock actual."""
+        primero = Movimiento.vivos.filter(
+            articulo=OuterRef('pk')
+        ).order_by('fecha_creacion', 'id').values('stock_antes')[:1]
+        return Coalesce(Subquery(primero), F('stock_actual'))
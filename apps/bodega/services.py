@@ -4,18 +4,22 @@ Service Layer para el módulo de bodega.
 Contiene la lógica de negocio y coordina los repositories,
 siguiendo el principio de Single Responsibility (SOLID).
 """
-from typing import Optional, Dict, Any, Tuple
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Dict, Any, Tuple, List
 from decimal import Decimal
 from django.db import transaction
+from django.db.models import OuterRef
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from .models import Categoria, Articulo, TipoMovimiento, Movimiento, Bodega
+from .models import Categoria, Articulo, TipoMovimiento, Movimiento, Bodega, CierreStock
 from .repositories import (
     CategoriaRepository,
     ArticuloRepository,
     TipoMovimientoRepository,
     MovimientoRepository,
-    BodegaRepository
+    BodegaRepository,
+    CierreStockRepository
 )
 
 
@@ -303,6 +307,17 @@ class ArticuloService:
         """
         return list(self.repository.get_reorder_point())
 
+    def contar_por_estado_stock(self) -> List[Tuple[str, str, int]]:
+        """
+        Retorna la cantidad de artículos activos en cada estado de stock.
+
+        Returns:
+            Lista de tuplas (estado, etiqueta, cantidad) en el orden de
+            Articulo.ESTADO_STOCK_CHOICES
+        """
+        conteo = self.repository.count_by_estado_stock()
+        return [(estado, etiqueta, conteo[estado]) for estado, etiqueta in Articulo.ESTADO_STOCK_CHOICES]
+
 
 # ==================== MOVIMIENTO SERVICE ====================
 
@@ -477,6 +492,70 @@ class MovimientoService:
                 f'Debe ser "ENTRADA" o "SALIDA".'
             )
 
+    @transaction.atomic
+    def ajustar_stock_masivo(
+        self,
+        stock_contado: Dict[int, Decimal],
+        tipo: TipoMovimiento,
+        usuario: User,
+        motivo: str
+    ) -> List[Movimiento]:
+        """
+        Ajusta el stock de varios artículos a las cantidades contadas.
+
+        Registra un movimiento ENTRADA o SALIDA por cada artículo cuya
+        cantidad contada difiere del stock del sistema, y actualiza los
+        stocks con un bulk_update. Lee el stock vigente dentro de la misma
+        transacción, por lo que usa un número fijo de consultas.
+
+        Args:
+            stock_contado: Diccionario articulo_id -> cantidad contada
+            tipo: Tipo de movimiento de ajuste
+            usuario: Usuario que realiza el ajuste
+            motivo: Motivo del ajuste
+
+        Returns:
+            Lista de movimientos creados
+
+        Raises:
+            ValidationError: Si alguna cantidad contada es negativa
+        """
+        if any(cantidad < 0 for cantidad in stock_contado.values()):
+            raise ValidationError('Las cantidades contadas no pueden ser negativas.')
+
+        stock_sistema = self.articulo_repo.get_stock_for_update(list(stock_contado))
+        ahora = timezone.now()
+
+        movimientos = []
+        articulos = []
+        for articulo_id, stock_anterior in stock_sistema.items():
+            stock_nuevo = stock_contado[articulo_id]
+            diferencia = stock_nuevo - stock_anterior
+            if not diferencia:
+                continue
+
+            movimientos.append(Movimiento(
+                articulo_id=articulo_id,
+                tipo=tipo,
+                cantidad=abs(diferencia),
+                operacion='ENTRADA' if diferencia > 0 else 'SALIDA',
+                usuario=usuario,
+                motivo=motivo,
+                stock_antes=stock_anterior,
+                stock_despues=stock_nuevo
+            ))
+            articulos.append(Articulo(
+                id=articulo_id,
+                stock_actual=stock_nuevo,
+                fecha_actualizacion=ahora
+            ))
+
+        if movimientos:
+            movimientos = self.movimiento_repo.bulk_create(movimientos)
+            self.articulo_repo.bulk_update_stock(articulos)
+
+        return movimientos
+
     def obtener_historial_articulo(
         self,
         articulo: Articulo,
@@ -493,3 +572,362 @@ class MovimientoService:
             Lista de movimientos ordenados por fecha descendente
         """
         return list(self.movimiento_repo.filter_by_articulo(articulo, limit))
+
+    def kardex(self, articulo: Articulo, desde: date, hasta: date) -> Dict[str, Any]:
+        """
+        Arma el kardex valorizado de un artículo entre dos fechas (incluidas).
+
+        El saldo inicial se lee del último movimiento anterior al rango, los
+        totales salen de un solo agregado y los saldos por movimiento los
+        calcula la base de datos, así que el costo no depende del largo del
+        historial. Las filas se entregan como iterador para poder transmitir
+        el reporte sin cargarlo completo en memoria.
+
+        Args:
+            articulo: Artículo del kardex
+            desde: Fecha inicial
+            hasta: Fecha final
+
+        Returns:
+            Diccionario con saldos, totales, valorización inicial/final y
+            'filas', un iterador de movimientos con entrada, salida, saldo,
+            costo_unitario, valor_movimiento y valor_saldo
+
+        Raises:
+            ValidationError: Si la fecha inicial es posterior a la final
+        """
+        if desde > hasta:
+            raise ValidationError('La fecha inicial no puede ser posterior a la fecha final.')
+
+        zona = timezone.get_current_timezone()
+        inicio = datetime.combine(desde, time.min, tzinfo=zona)
+        fin = datetime.combine(hasta + timedelta(days=1), time.min, tzinfo=zona)
+
+        saldo_inicial = self.movimiento_repo.saldo_al(articulo, inicio)
+        totales = self.movimiento_repo.totales_rango(articulo, inicio, fin)
+        saldo_final = saldo_inicial + totales['entradas'] - totales['salidas']
+        costos = self.movimiento_repo.costos_unitarios_al(
+            articulo, {'inicial': desde - timedelta(days=1), 'final': hasta}
+        )
+
+        def filas():
+            movimientos = self.movimiento_repo.kardex(articulo, inicio, fin, saldo_inicial)
+            for movimiento in movimientos.iterator(chunk_size=2000):
+                costo = movimiento.costo_unitario
+                movimiento.valor_movimiento = None if costo is None else movimiento.cantidad * costo
+                movimiento.valor_saldo = None if costo is None else movimiento.saldo * costo
+                yield movimiento
+
+        return {
+            'articulo': articulo,
+            'desde': desde,
+            'hasta': hasta,
+            'saldo_inicial': saldo_inicial,
+            'total_entradas': totales['entradas'],
+            'total_salidas': totales['salidas'],
+            'total_movimientos': totales['movimientos'],
+            'saldo_final': saldo_final,
+            'costo_inicial': costos['inicial'],
+            'costo_final': costos['final'],
+            'valor_inicial': None if costos['inicial'] is None else saldo_inicial * costos['inicial'],
+            'valor_final': None if costos['final'] is None else saldo_final * costos['final'],
+            'filas': filas(),
+        }
+
+
+# ==================== CIERRE STOCK SERVICE ====================
+
+class CierreStockService:
+    """
+    Service para el stock histórico de los artículos.
+
+    Mantiene cierres mensuales del stock (checkpoints) y responde el stock a
+    cualquier fecha como último cierre más los movimientos posteriores, sin
+    recorrer el libro de movimientos desde el inicio.
+    """
+
+    def __init__(self):
+        self.cierre_repo = CierreStockRepository()
+
+    @staticmethod
+    def instante(fecha) -> datetime:
+        """
+        Instante de corte de una consulta histórica.
+
+        Una fecha se interpreta como el cierre de ese día (inicio del día
+        siguiente, hora local); un datetime se usa tal cual.
+        """
+        if isinstance(fecha, datetime):
+            return fecha
+        return datetime.combine(fecha + timedelta(days=1), time.min, tzinfo=timezone.get_current_timezone())
+
+    @staticmethod
+    def fin_de_mes(fecha: date) -> date:
+        """Último día del mes de `fecha`."""
+        return (fecha.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+    def meses_pendientes(self, hasta: date, desde: Optional[date] = None) -> List[date]:
+        """
+        Fechas de cierre (fin de mes) a generar hasta el último mes completo.
+
+        Args:
+            hasta: Fecha tope; solo se cierran meses terminados hasta ella
+            desde: Primer mes a (re)generar; por defecto el mes siguiente al
+                último cierre, o el mes del primer movimiento
+
+        Returns:
+            Lista de fechas de fin de mes en orden
+        """
+        if desde is None:
+            ultimo_corte = self.cierre_repo.get_ultimo_corte()
+            if ultimo_corte is not None:
+                desde = timezone.localtime(ultimo_corte).date()
+            else:
+                primer_movimiento = self.cierre_repo.get_primer_movimiento()
+                if primer_movimiento is None:
+                    return []
+                desde = timezone.localtime(primer_movimiento).date()
+
+        meses = []
+        cierre = self.fin_de_mes(desde)
+        while cierre <= hasta:
+            meses.append(cierre)
+            cierre = self.fin_de_mes(cierre + timedelta(days=1))
+        return meses
+
+    @transaction.atomic
+    def generar_cierre(self, fecha: date) -> int:
+        """
+        Genera (o regenera) el cierre de stock de todos los artículos a una fecha.
+
+        Parte del cierre anterior y le suma la variación de cada artículo en el
+        período, calculada con un único agregado agrupado por artículo. Los
+        artículos sin cierre anterior parten de su stock inicial. Los cierres
+        posteriores a la fecha se eliminan, porque quedan desactualizados.
+
+        Args:
+            fecha: Fecha de cierre (normalmente fin de mes)
+
+        Returns:
+            Cantidad de cierres escritos
+        """
+        corte = self.instante(fecha)
+        corte_anterior = self.cierre_repo.get_ultimo_corte(antes_de=corte)
+
+        stock = self.cierre_repo.stock_en_corte(corte_anterior) if corte_anterior else {}
+        deltas = self.cierre_repo.deltas(corte_anterior, corte)
+        nuevos = [articulo_id for articulo_id in deltas if articulo_id not in stock]
+        if nuevos:
+            stock.update(self.cierre_repo.stock_inicial(nuevos))
+        for articulo_id, delta in deltas.items():
+            stock[articulo_id] += delta
+
+        self.cierre_repo.delete_desde(corte)
+        self.cierre_repo.bulk_create([
+            CierreStock(articulo_id=articulo_id, fecha=fecha, corte=corte, stock=cantidad)
+            for articulo_id, cantidad in stock.items()
+        ])
+        return len(stock)
+
+    def stock_al(self, articulo: Articulo, fecha) -> Decimal:
+        """
+        Stock de un artículo a una fecha.
+
+        Args:
+            articulo: Artículo a consultar
+            fecha: date (cierre del día) o datetime (instante exacto)
+
+        Returns:
+            Decimal con el stock a esa fecha
+        """
+        return self.cierre_repo.stock_al(
+            Articulo.objects.filter(pk=articulo.pk), self.instante(fecha)
+        ).values_list('stock_al', flat=True).get()
+
+    def valorizar(self, fecha, bodega: Optional[Bodega] = None) -> Dict[str, Any]:
+        """
+        Valoriza el stock de todos los artículos (o de una bodega) a una fecha.
+
+        El stock y el último precio de compra de cada artículo se obtienen en
+        una sola consulta.
+
+        Args:
+            fecha: date (cierre del día) o datetime (instante exacto)
+            bodega: Bodega a valorizar (opcional, todas por defecto)
+
+        Returns:
+            Diccionario con 'instante', 'articulos' (con stock_al,
+            costo_unitario y valor), 'total_valor' y 'sin_costo'
+        """
+        instante = self.instante(fecha)
+        articulos = Articulo.vivos.filter(fecha_creacion__lt=instante)
+        if bodega is not None:
+            articulos = articulos.filter(ubicacion_fisica=bodega)
+        dia = timezone.localtime(instante - timedelta(microseconds=1)).date()
+        articulos = self.cierre_repo.stock_al(articulos, instante).annotate(
+            costo_unitario=MovimientoRepository.costo_unitario_subquery(OuterRef('pk'), dia)
+        ).order_by('sku')
+
+        resultado = []
+        total_valor = Decimal('0')
+        sin_costo = 0
+        for articulo in articulos:
+            if articulo.costo_unitario is None:
+                articulo.valor = None
+                sin_costo += 1 if articulo.stock_al else 0
+            else:
+                articulo.valor = articulo.stock_al * articulo.costo_unitario
+                total_valor += articulo.valor
+            resultado.append(articulo)
+
+        return {
+            'instante': instante,
+            'articulos': resultado,
+            'total_valor': total_valor,
+            'sin_costo': sin_costo,
+        }
+
+
+# ==================== CONCILIACIÓN STOCK SERVICE ====================
+
+class ConciliacionStockService:
+    """
+    Service para conciliar el stock de los artículos con el libro de movimientos.
+
+    Hay caminos que actualizan stock_actual sin registrar movimientos, por lo
+    que ambos pueden descuadrarse. La conciliación recorre el libro con un
+    solo agregado por artículo y, opcionalmente, corrige los descuadres.
+    """
+
+    MODO_LIBRO = 'libro'
+    MODO_STOCK = 'stock'
+
+    def __init__(self):
+        self.movimiento_repo = MovimientoRepository()
+        self.articulo_repo = ArticuloRepository()
+
+    def discrepancias(self, lote: int = 1000):
+        """
+        Recorre el libro y entrega los artículos descuadrados.
+
+        El agregado por artículo se lee como un flujo; el stock actual, el
+        saldo del libro y los saltos de la cadena se consultan por lotes de
+        `lote` artículos, así que la memoria no depende del tamaño del libro.
+
+        Args:
+            lote: Artículos por consulta de stock actual
+
+        Yields:
+            dict con articulo_id, sku, stock_actual, libro (último
+            stock_despues), movimientos, filas_invalidas, quiebres (saltos
+            entre movimientos consecutivos) y descuadre_stock (stock_actual
+            menos libro)
+        """
+        pendientes = []
+        for totales in self.movimiento_repo.totales_por_articulo().iterator(chunk_size=lote):
+            pendientes.append(totales)
+            if len(pendientes) >= lote:
+                yield from self._comparar(pendientes)
+                pendientes = []
+        if pendientes:
+            yield from self._comparar(pendientes)
+
+    def _comparar(self, totales: List[Dict]):
+        """Compara un lote de agregados con el stock actual y la cadena de sus artículos."""
+        ids = [fila['articulo_id'] for fila in totales]
+        articulos = self.movimiento_repo.stock_y_libro(ids)
+        saltos = self.movimiento_repo.quiebres_por_articulo(ids)
+        for fila in totales:
+            articulo = articulos[fila['articulo_id']]
+            descuadre_stock = articulo['stock_actual'] - articulo['libro']
+            quiebres = saltos.get(fila['articulo_id'], 0)
+            if descuadre_stock or quiebres or fila['filas_invalidas']:
+                yield {
+                    'articulo_id': fila['articulo_id'],
+                    'sku': articulo['sku'],
+                    'stock_actual': articulo['stock_actual'],
+                    'libro': articulo['libro'],
+                    'movimientos': fila['movimientos'],
+                    'filas_invalidas': fila['filas_invalidas'],
+                    'quiebres': quiebres,
+                    'descuadre_stock': descuadre_stock,
+                }
+
+    def corregir(
+        self,
+        articulo_ids: List[int],
+        modo: str,
+        tipo: Optional[TipoMovimiento] = None,
+        usuario: Optional[User] = None,
+        lote: int = 500
+    ) -> int:
+        """
+        Corrige los descuadres entre stock_actual y el libro.
+
+        Cada lote bloquea sus artículos y vuelve a comparar, por lo que un
+        movimiento concurrente posterior al recorrido no se corrige dos veces.
+        Los saltos dentro del historial no se reescriben: solo se informan.
+
+        Args:
+            articulo_ids: Artículos a corregir
+            modo: 'libro' registra un movimiento compensatorio que lleva el
+                libro al stock actual; 'stock' lleva stock_actual al libro
+            tipo: Tipo de movimiento compensatorio (modo 'libro')
+            usuario: Usuario del movimiento compensatorio (modo 'libro')
+            lote: Artículos por transacción
+
+        Returns:
+            Cantidad de artículos corregidos
+
+        Raises:
+            ValidationError: Si el modo no existe o faltan tipo o usuario
+        """
+        if modo not in (self.MODO_LIBRO, self.MODO_STOCK):
+            raise ValidationError(f'Modo de corrección desconocido: {modo}')
+        if modo == self.MODO_LIBRO and (tipo is None or usuario is None):
+            raise ValidationError('Los movimientos compensatorios requieren tipo y usuario.')
+
+        corregidos = 0
+        for inicio in range(0, len(articulo_ids), lote):
+            corregidos += self._corregir_lote(articulo_ids[inicio:inicio + lote], modo, tipo, usuario)
+        return corregidos
+
+    @transaction.atomic
+    def _corregir_lote(
+        self,
+        articulo_ids: List[int],
+        modo: str,
+        tipo: Optional[TipoMovimiento],
+        usuario: Optional[User]
+    ) -> int:
+        """Corrige un lote de artículos dentro de una transacción."""
+        stock_sistema = self.articulo_repo.get_stock_for_update(articulo_ids)
+        libros = self.movimiento_repo.stock_y_libro(articulo_ids)
+        ahora = timezone.now()
+
+        movimientos = []
+        articulos = []
+        for articulo_id, stock in stock_sistema.items():
+            libro = libros[articulo_id]['libro']
+            if libro is None or stock == libro:
+                continue
+            if modo == self.MODO_LIBRO:
+                diferencia = stock - libro
+                movimientos.append(Movimiento(
+                    articulo_id=articulo_id,
+                    tipo=tipo,
+                    cantidad=abs(diferencia),
+                    operacion='ENTRADA' if diferencia > 0 else 'SALIDA',
+                    usuario=usuario,
+                    motivo='Conciliación de stock con el libro de movimientos',
+                    stock_antes=libro,
+                    stock_despues=stock
+                ))
+            else:
+                articulos.append(Articulo(id=articulo_id, stock_actual=libro, fecha_actualizacion=ahora))
+
+        if movimientos:
+            self.movimiento_repo.bulk_create(movimientos)
+        if articulos:
+            self.articulo_repo.bulk_update_stock(articulos)
+        return len(movimientos) + len(articulos)
@@ -0,0 +1,305 @@
+"""
+Tests del módulo de bodega.
+
+Cubren el kardex (servicio y vista en HTML/CSV), el stock histórico con
+cierres mensuales, la conciliación stock / libro de movimientos y el estado
+de stock indexado.
+"""
+
+import csv
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import Permission, User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.bodega.models import Articulo, Bodega, CierreStock, Categoria, Movimiento, TipoMovimiento
+from apps.bodega.repositories import ArticuloRepository
+from apps.bodega.services import ArticuloService, CierreStockService, ConciliacionStockService, MovimientoService
+from apps.bodega.views import KardexArticuloView
+
+
+# ============================================================================
+# KARDEX
+# ============================================================================
+
+def crear_articulo_con_movimientos(movimientos):
+    """
+    Crea un artículo y registra sus movimientos con MovimientoService, con la
+    fecha de creación de cada uno movida al mediodía del día indicado (y la
+    del artículo, a un año antes de hoy).
+
+    Args:
+        movimientos: Pares (día, cantidad); cantidad negativa para salidas
+    """
+    usuario = User.objects.create_user('kardex', password='kardex123')
+    bodega = Bodega.objects.create(codigo='BK', nombre='Bodega Kardex', responsable=usuario)
+    categoria = Categoria.objects.create(codigo='CK', nombre='Categoría Kardex')
+    articulo = Articulo.objects.create(
+        sku='K-001', codigo='K-001', nombre='Resma', categoria=categoria,
+        unidad_medida='UN', ubicacion_fisica=bodega
+    )
+    Articulo.objects.filter(pk=articulo.pk).update(fecha_creacion=timezone.now() - timedelta(days=365))
+    tipo = TipoMovimiento.objects.create(codigo='AJ', nombre='Ajuste')
+
+    service = MovimientoService()
+    for dia, cantidad in movimientos:
+        registrar = service.registrar_entrada if cantidad > 0 else service.registrar_salida
+        movimiento = registrar(articulo, tipo, abs(cantidad), usuario, 'prueba')
+        Movimiento.objects.filter(pk=movimiento.pk).update(
+            fecha_creacion=datetime.combine(dia, time(12), tzinfo=timezone.get_current_timezone())
+        )
+    return articulo
+
+
+class KardexTest(TestCase):
+    """
+    Test: El kardex arma saldos acumulados en SQL a partir del libro de movimientos
+    Criterio: Saldo inicial del último movimiento previo, saldo por fila igual
+              al stock_despues y saldo final consistente con los totales
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        hoy = timezone.localdate()
+        cls.dias = [hoy - timedelta(days=n) for n in (10, 5, 2)]
+        cls.articulo = crear_articulo_con_movimientos(
+            zip(cls.dias, [Decimal('10'), Decimal('-3'), Decimal('5')])
+        )
+
+    def test_saldos_del_rango(self):
+        """El primer movimiento queda fuera del rango y forma el saldo inicial."""
+        kardex = MovimientoService().kardex(self.articulo, self.dias[1], self.dias[2])
+        filas = list(kardex['filas'])
+
+        self.assertEqual(kardex['saldo_inicial'], Decimal('10'))
+        self.assertEqual([fila.saldo for fila in filas], [Decimal('7'), Decimal('12')])
+        self.assertEqual([fila.saldo for fila in filas], [fila.stock_despues for fila in filas])
+        self.assertEqual((kardex['total_entradas'], kardex['total_salidas']), (Decimal('5'), Decimal('3')))
+        self.assertEqual(kardex['saldo_final'], Decimal('12'))
+        self.assertIsNone(filas[0].valor_saldo)
+
+    def test_rango_invertido(self):
+        """La fecha inicial posterior a la final es un error de validación."""
+        with self.assertRaises(ValidationError):
+            MovimientoService().kardex(self.articulo, self.dias[2], self.dias[1])
+
+
+class KardexVistaTest(TestCase):
+    """
+    Test: La vista del kardex transmite la tarjeta en HTML o CSV
+    Criterio: Una fila por movimiento del rango entre los saldos inicial y
+              final; un rango inválido vuelve al formulario con el error
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        hoy = timezone.localdate()
+        cls.dias = [hoy - timedelta(days=n) for n in (10, 5, 2)]
+        cls.articulo = crear_articulo_con_movimientos(
+            zip(cls.dias, [Decimal('10'), Decimal('-3'), Decimal('5')])
+        )
+        cls.usuario = User.objects.get(username='kardex')
+        cls.usuario.user_permissions.add(Permission.objects.get(codename='view_articulo'))
+
+    def setUp(self):
+        self.client.force_login(self.usuario)
+        self.url = reverse('bodega:articulo_kardex', kwargs={'pk': self.articulo.pk})
+        self.rango = {'desde': self.dias[1].isoformat(), 'hasta': self.dias[2].isoformat()}
+
+    def test_html_transmitido(self):
+        respuesta = self.client.get(self.url, self.rango)
+
+        self.assertTrue(respuesta.streaming)
+        self.assertEqual(respuesta['Content-Type'], 'text/html; charset=utf-8')
+        html = b''.join(respuesta.streaming_content).decode()
+        self.assertEqual(html.count('<tr><td>'), 2)
+        self.assertIn('Saldo final (2 movimientos)', html)
+        self.assertNotIn(KardexArticuloView.marcador_filas, html)
+        self.assertIn('formato=csv', html)
+
+    def test_csv(self):
+        respuesta = self.client.get(self.url, {**self.rango, 'formato': 'csv'})
+
+        self.assertTrue(respuesta.streaming)
+        self.assertIn(
+            f'kardex_K-001_{self.dias[1]:%Y%m%d}_{self.dias[2]:%Y%m%d}.csv', respuesta['Content-Disposition']
+        )
+        filas = list(csv.reader(b''.join(respuesta.streaming_content).decode().splitlines()))
+        self.assertEqual(filas[0][:3], ['fecha', 'tipo', 'motivo'])
+        self.assertEqual([fila[5] for fila in filas[1:]], ['10.00', '7.00', '12.00', '12.00'])
+        self.assertEqual((filas[1][1], filas[-1][1]), ('SALDO INICIAL', 'SALDO FINAL'))
+        self.assertEqual(filas[-1][3:5], ['5.00', '3.00'])
+
+    def test_rango_invalido(self):
+        """Desde posterior a hasta: formulario con error, sin tarjeta ni CSV."""
+        invertido = {'desde': self.dias[2].isoformat(), 'hasta': self.dias[1].isoformat()}
+        for params in (invertido, {**invertido, 'formato': 'csv'}, {'desde': 'ayer', 'hasta': ''}):
+            respuesta = self.client.get(self.url, params)
+            self.assertFalse(respuesta.streaming)
+            self.assertEqual(respuesta.status_code, 200)
+            self.assertFalse(respuesta.context['form'].is_valid())
+            self.assertNotIn('kardex', respuesta.context)
+        self.assertContains(respuesta, 'alert-danger')
+
+    def test_requiere_permiso(self):
+        self.client.force_login(User.objects.create_user('sin_permisos', password='x'))
+        self.assertEqual(self.client.get(self.url, self.rango).status_code, 403)
+
+
+# ============================================================================
+# STOCK HISTÓRICO
+# ============================================================================
+
+class CierreStockTest(TestCase):
+    """
+    Test: El stock a una fecha es el último cierre mensual más los movimientos posteriores
+    Criterio: Mismo resultado con y sin cierres, y consistente con el libro de movimientos
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        hoy = timezone.localdate()
+        cls.dias = [hoy - timedelta(days=n) for n in (100, 60, 20)]
+        cls.articulo = crear_articulo_con_movimientos(
+            zip(cls.dias, [Decimal('10'), Decimal('-3'), Decimal('5')])
+        )
+
+    def test_stock_al_con_y_sin_cierres(self):
+        """Antes, entre y después de los movimientos, con cierres generados y sin ellos."""
+        service = CierreStockService()
+        fechas = [self.dias[0] - timedelta(days=1)] + self.dias
+        esperado = [Decimal('0'), Decimal('10'), Decimal('7'), Decimal('12')]
+
+        sin_cierres = [service.stock_al(self.articulo, fecha) for fecha in fechas]
+        for fecha in service.meses_pendientes(timezone.localdate() - timedelta(days=1)):
+            service.generar_cierre(fecha)
+
+        self.assertGreaterEqual(CierreStock.objects.filter(articulo=self.articulo).count(), 3)
+        self.assertEqual(sin_cierres, esperado)
+        self.assertEqual([service.stock_al(self.articulo, fecha) for fecha in fechas], esperado)
+        self.assertEqual(service.valorizar(self.dias[2])['articulos'][0].stock_al, Decimal('12'))
+
+
+# ============================================================================
+# CONCILIACIÓN STOCK / LIBRO
+# ============================================================================
+
+class ConciliacionStockTest(TestCase):
+    """
+    Test: La conciliación detecta stock fuera del libro y saltos en la cadena
+    Criterio: El movimiento compensatorio deja stock y libro conciliados sin
+              tocar el stock actual
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        hoy = timezone.localdate()
+        cls.articulo = crear_articulo_con_movimientos([
+            (hoy - timedelta(days=3), Decimal('10')),
+            (hoy - timedelta(days=2), Decimal('-3')),
+            (hoy - timedelta(days=1), Decimal('5')),
+        ])
+
+    def test_detecta_y_corrige(self):
+        """Un save() sin movimiento descuadra el stock; un movimiento editado rompe la cadena."""
+        Articulo.objects.filter(pk=self.articulo.pk).update(stock_actual=Decimal('15'))
+        intermedio = Movimiento.objects.filter(articulo=self.articulo).order_by('fecha_creacion')[1]
+        Movimiento.objects.filter(pk=intermedio.pk).update(stock_antes=Decimal('11'), stock_despues=Decimal('8'))
+        service = ConciliacionStockService()
+
+        descuadres = list(service.discrepancias())
+
+        self.assertEqual(len(descuadres), 1)
+        self.assertEqual(descuadres[0]['descuadre_stock'], Decimal('3'))
+        self.assertEqual(descuadres[0]['quiebres'], 2)
+        self.assertEqual(descuadres[0]['filas_invalidas'], 0)
+
+        corregidos = service.corregir(
+            [self.articulo.pk], ConciliacionStockService.MODO_LIBRO,
+            TipoMovimiento.objects.get(codigo='AJ'), User.objects.get(username='kardex')
+        )
+
+        self.assertEqual(corregidos, 1)
+        self.assertEqual(Articulo.objects.get(pk=self.articulo.pk).stock_actual, Decimal('15'))
+        self.assertEqual([d['descuadre_stock'] for d in service.discrepancias()], [Decimal('0')])
+
+
+class EstadoStockTest(TestCase):
+    """
+    Test: estado_stock se mantiene al registrar movimientos, al cambiar los
+          umbrales y en la actualización masiva de stock
+    Criterio: Los listados de stock bajo y de reorden lo reflejan y el
+              comando de relleno corrige filas desactualizadas
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulo = crear_articulo_con_movimientos([(timezone.localdate(), Decimal('10'))])
+
+    def test_estado_sigue_stock_y_umbrales(self):
+        """Reorden al bajar del punto de reorden, bajo bajo el mínimo y sobrestock sobre el máximo."""
+        articulo = Articulo.objects.get(pk=self.articulo.pk)
+        self.assertEqual(articulo.estado_stock, Articulo.ESTADO_OK)
+
+        articulo.stock_minimo, articulo.punto_reorden, articulo.stock_maximo = Decimal('5'), Decimal('12'), Decimal('20')
+        articulo.save()
+        self.assertEqual(Articulo.objects.get(pk=articulo.pk).estado_stock, Articulo.ESTADO_REORDEN)
+        self.assertIn(articulo, ArticuloRepository.get_reorder_point())
+        self.assertNotIn(articulo, ArticuloRepository.get_low_stock())
+
+        MovimientoService().registrar_salida(
+            articulo, TipoMovimiento.objects.get(codigo='AJ'), Decimal('6'), User.objects.get(username='kardex'), 'prueba'
+        )
+        self.assertEqual(Articulo.objects.get(pk=articulo.pk).estado_stock, Articulo.ESTADO_BAJO)
+        self.assertIn(articulo, ArticuloRepository.get_low_stock())
+        conteo = {estado: cantidad for estado, _, cantidad in ArticuloService().contar_por_estado_stock()}
+        self.assertEqual(conteo, {'OK': 0, 'REORDEN': 0, 'BAJO': 1, 'AGOTADO': 0, 'SOBRESTOCK': 0})
+
+        articulo = Articulo.objects.get(pk=articulo.pk)
+        articulo.stock_actual = Decimal('25')
+        ArticuloRepository.bulk_update_stock([articulo])
+        self.assertEqual(Articulo.objects.get(pk=articulo.pk).estado_stock, Articulo.ESTADO_SOBRESTOCK)
+
+    def test_listados_conservan_sus_umbrales(self):
+        """Agotado con mínimo 0 no está bajo el mínimo; sin punto de reorden no se reordena."""
+        base = dict(categoria=self.articulo.categoria, unidad_medida='UN', ubicacion_fisica=self.articulo.ubicacion_fisica)
+        sin_minimo = Articulo.objects.create(sku='K-010', codigo='K-010', nombre='Sin mínimo', **base)
+        sin_reorden = Articulo.objects.create(
+            sku='K-011', codigo='K-011', nombre='Sin reorden', stock_actual=Decimal('2'),
+            stock_minimo=Decimal('5'), **base
+        )
+        bajo_reorden = Articulo.objects.create(
+            sku='K-012', codigo='K-012', nombre='Reorden bajo el mínimo', stock_actual=Decimal('3'),
+            stock_minimo=Decimal('5'), punto_reorden=Decimal('2'), **base
+        )
+        self.assertEqual(sin_minimo.estado_stock, Articulo.ESTADO_AGOTADO)
+        self.assertEqual(sin_reorden.estado_stock, Articulo.ESTADO_BAJO)
+
+        self.assertEqual(list(ArticuloRepository.get_low_stock()), [sin_reorden, bajo_reorden])
+        self.assertEqual(list(ArticuloRepository.get_reorder_point()), [])
+
+    def test_menu_muestra_conteo_por_estado(self):
+        """El menú de bodega muestra cada nivel de stock con enlace al listado filtrado."""
+        self.client.force_login(User.objects.get(username='kardex'))
+        Articulo.objects.filter(pk=self.articulo.pk).update(stock_actual=Decimal('0'))
+        call_command('recalcular_estado_stock', stdout=StringIO())
+
+        respuesta = self.client.get(reverse('bodega:menu_bodega'))
+
+        self.assertIn(('AGOTADO', 'Agotado', 1), respuesta.context['stats']['estados_stock'])
+        self.assertContains(respuesta, f"{reverse('bodega:articulo_lista')}?estado_stock=AGOTADO")
+
+    def test_comando_recalcula(self):
+        """Un update() directo deja el estado desactualizado hasta correr el comando."""
+        Articulo.objects.filter(pk=self.articulo.pk).update(stock_actual=Decimal('0'))
+        self.assertEqual(Articulo.objects.get(pk=self.articulo.pk).estado_stock, Articulo.ESTADO_OK)
+
+        call_command('recalcular_estado_stock', stdout=StringIO())
+
+        self.assertEqual(Articulo.objects.get(pk=self.articulo.pk).estado_stock, Articulo.ESTADO_AGOTADO)
@@ -17,7 +17,9 @@ urlpatterns = [
     path('articulos/', views.ArticuloListView.as_view(), name='articulo_lista'),
     path('articulos/crear/', views.ArticuloCreateView.as_view(), name='articulo_crear'),
     path('articulos/<int:pk>/', views.ArticuloDetailView.as_view(), name='articulo_detalle'),
+    path('articulos/<int:pk>/kardex/', views.KardexArticuloView.as_view(), name='articulo_kardex'),
     path('articulos/<int:pk>/editar/', views.ArticuloUpdateView.as_view(), name='articulo_editar'),
+    path('articulos/<int:pk>/eliminar/', views.ArticuloDeleteView.as_view(), name='articulo_eliminar'),
 
     # Movimientos
     path('movimientos/', views.MovimientoListView.as_view(), name='movimiento_lista'),
@@ -11,8 +11,19 @@ Implementa las mejores prácticas con CBVs siguiendo SOLID y DRY:
 - Paginación automática
 - Auditoría automática
 """
+import csv
+from datetime import timedelta
 from typing import Any, Optional
+from urllib.parse import urlencode
 from django.db.models import QuerySet, Q, Sum, Count
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect
+from django.template.defaultfilters import floatformat
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.dateformat import format as date_format
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django.urls import reverse_lazy
 from django.views.generic import (
     TemplateView, ListView, DetailView, CreateView, UpdateView, DeleteView
@@ -25,7 +36,9 @@ from core.mixins import (
     PaginatedListMixin, FilteredListMixin
 )
 from .models import Bodega, Categoria, Articulo, TipoMovimiento, Movimiento
-from .forms import CategoriaForm, ArticuloForm, MovimientoForm, ArticuloFiltroForm
+from .forms import (
+    CategoriaForm, ArticuloForm, MovimientoForm, ArticuloFiltroForm, KardexFiltroForm
+)
 from .repositories import (
     BodegaRepository, CategoriaRepository, ArticuloRepository,
     TipoMovimientoRepository, MovimientoRepository
@@ -64,6 +77,8 @@ class MenuBodegaView(LoginRequiredMixin, TemplateView):
             'stock_total': articulo_repo.get_all().aggregate(
                 total=Sum('stock_actual')
             )['total'] or 0,
+            # Artículos por nivel de stock, contados sobre el índice (estado_stock, sku)
+            'estados_stock': ArticuloService().contar_por_estado_stock(),
         }
 
         # Permisos del usuario
@@ -168,7 +183,7 @@ class CategoriaUpdateView(BaseAuditedViewMixin, UpdateView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite editar categorías no eliminadas."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -207,7 +222,7 @@ class CategoriaDeleteView(BaseAuditedViewMixin, SoftDeleteMixin, DeleteView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite eliminar categorías no eliminadas."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -215,7 +230,7 @@ class CategoriaDeleteView(BaseAuditedViewMixin, SoftDeleteMixin, DeleteView):
         context['titulo'] = f'Eliminar Categoría: {self.object.nombre}'
         context['categoria'] = self.object
         # Verificar si tiene artículos
-        context['tiene_articulos'] = self.object.articulos.filter(eliminado=False).exists()
+        context['tiene_articulos'] = self.object.articulos.vivos().exists()
         return context
 
 
@@ -226,7 +241,7 @@ class ArticuloListView(BaseAuditedViewMixin, PaginatedListMixin, FilteredListMix
     Vista para listar artículos con paginación y filtros.
 
     Permisos: bodega.view_articulo
-    Filtros: Categoría, bodega, búsqueda por texto, estado activo
+    Filtros: Categoría, bodega, búsqueda por texto, estado activo, nivel de stock
     """
     model = Articulo
     template_name = 'bodega/articulo/lista.html'
@@ -241,13 +256,12 @@ class ArticuloListView(BaseAuditedViewMixin, PaginatedListMixin, FilteredListMix
 
         Optimización N+1: Usa select_related para evitar queries adicionales.
         """
-        queryset = super().get_queryset().filter(
-            eliminado=False
-        ).select_related(
+        queryset = Articulo.vivos.select_related(
             'categoria', 'ubicacion_fisica'
         )
 
-        # Aplicar filtros del formulario
+        # Aplicar filtros del formulario (q no es un campo, por eso no se
+        # usa el apply_filters genérico de FilteredListMixin)
         form = self.filter_form_class(self.request.GET)
         if form.is_valid():
             data = form.cleaned_data
@@ -259,7 +273,7 @@ class ArticuloListView(BaseAuditedViewMixin, PaginatedListMixin, FilteredListMix
                     Q(sku__icontains=q) |
                     Q(codigo__icontains=q) |
                     Q(nombre__icontains=q) |
-                    Q(marca__icontains=q)
+                    Q(marca__nombre__icontains=q)
                 )
 
             # Filtro por categoría
@@ -274,6 +288,10 @@ class ArticuloListView(BaseAuditedViewMixin, PaginatedListMixin, FilteredListMix
             if data.get('activo') != '':
                 queryset = queryset.filter(activo=(data['activo'] == '1'))
 
+            # Filtro por nivel de stock (índice parcial estado_stock, sku)
+            if data.get('estado_stock'):
+                queryset = queryset.filter(estado_stock=data['estado_stock'])
+
         return queryset.order_by('sku')
 
     def get_context_data(self, **kwargs) -> dict:
@@ -339,7 +357,7 @@ class ArticuloUpdateView(BaseAuditedViewMixin, UpdateView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite editar artículos no eliminados."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -377,7 +395,7 @@ class ArticuloDeleteView(BaseAuditedViewMixin, SoftDeleteMixin, DeleteView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite eliminar artículos no eliminados."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -417,6 +435,140 @@ class ArticuloDetailView(BaseAuditedViewMixin, DetailView):
         return context
 
 
+class _Eco:
+    """Pseudo-archivo para csv.writer: devuelve cada línea en vez de guardarla."""
+
+    def write(self, valor: str) -> str:
+        return valor
+
+
+def _numero(valor) -> str:
+    """Formatea un número del kardex con dos decimales ('' si no hay valor)."""
+    return '' if valor is None else floatformat(valor, 2)
+
+
+def _decimal(valor) -> str:
+    """Número del kardex para CSV: punto decimal y dos decimales."""
+    return '' if valor is None else f'{valor:.2f}'
+
+
+class KardexArticuloView(BaseAuditedViewMixin, DetailView):
+    """
+    Vista del kardex valorizado de un artículo en un rango de fechas.
+
+    Entrega la tarjeta en HTML o, con ?formato=csv, como archivo CSV. En ambos
+    casos las filas se transmiten a medida que llegan de la base de datos
+    (StreamingHttpResponse), por lo que la memoria no crece con el rango.
+
+    Permisos: bodega.view_articulo
+    """
+    model = Articulo
+    template_name = 'bodega/articulo/kardex.html'
+    context_object_name = 'articulo'
+    permission_required = 'bodega.view_articulo'
+    marcador_filas = '<!-- filas -->'
+
+    def get_queryset(self) -> QuerySet[Articulo]:
+        """Usa repository para consultas optimizadas."""
+        return ArticuloRepository().get_all()
+
+    def get(self, request, *args, **kwargs):
+        """Valida el rango y responde con la tarjeta en HTML o CSV."""
+        self.object = self.get_object()
+        hoy = timezone.localdate()
+        form = KardexFiltroForm(request.GET or {
+            'desde': (hoy - timedelta(days=30)).isoformat(),
+            'hasta': hoy.isoformat(),
+        })
+        if not form.is_valid():
+            return self.render_to_response(self.get_context_data(form=form))
+
+        kardex = MovimientoService().kardex(
+            self.object, form.cleaned_data['desde'], form.cleaned_data['hasta']
+        )
+        if request.GET.get('formato') == 'csv':
+            return self._respuesta_csv(kardex)
+
+        contexto = self.get_context_data(form=form, kardex=kardex)
+        html = render_to_string(self.template_name, contexto, request)
+        encabezado, pie = html.split(self.marcador_filas, 1)
+        return StreamingHttpResponse(
+            self._transmitir_html(encabezado, kardex['filas'], pie),
+            content_type='text/html; charset=utf-8'
+        )
+
+    def get_context_data(self, **kwargs) -> dict:
+        """Agrega datos al contexto."""
+        context = super().get_context_data(**kwargs)
+        context['titulo'] = f'Kardex Artículo {self.object.sku}'
+        context['marcador_filas'] = mark_safe(self.marcador_filas)
+        if context['form'].is_valid():
+            context['csv_query'] = urlencode({
+                'desde': context['form'].cleaned_data['desde'].isoformat(),
+                'hasta': context['form'].cleaned_data['hasta'].isoformat(),
+                'formato': 'csv',
+            })
+        return context
+
+    @staticmethod
+    def _transmitir_html(encabezado: str, filas, pie: str):
+        """Genera el HTML de la tarjeta por partes."""
+        yield encabezado
+        for mov in filas:
+            yield format_html(
+                '<tr><td>{}</td><td>{}</td><td>{}</td><td class="text-end">{}</td>'
+                '<td class="text-end">{}</td><td class="text-end"><strong>{}</strong></td>'
+                '<td class="text-end">{}</td><td class="text-end">{}</td><td class="text-end">{}</td>'
+                '<td>{}</td></tr>\n',
+                date_format(timezone.localtime(mov.fecha_creacion), 'd/m/Y H:i'),
+                mov.tipo.nombre,
+                mov.motivo,
+                _numero(mov.entrada),
+                _numero(mov.salida),
+                _numero(mov.saldo),
+                _numero(mov.costo_unitario),
+                _numero(mov.valor_movimiento),
+                _numero(mov.valor_saldo),
+                mov.usuario.username,
+            )
+        yield pie
+
+    def _respuesta_csv(self, kardex: dict) -> StreamingHttpResponse:
+        """Arma la respuesta CSV del kardex."""
+        nombre = f'kardex_{self.object.sku}_{kardex["desde"]:%Y%m%d}_{kardex["hasta"]:%Y%m%d}.csv'
+        response = StreamingHttpResponse(
+            self._transmitir_csv(kardex), content_type='text/csv; charset=utf-8'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{nombre}"'
+        return response
+
+    @staticmethod
+    def _transmitir_csv(kardex: dict):
+        """Genera el CSV línea por línea (números con punto y dos decimales)."""
+        writer = csv.writer(_Eco())
+        yield writer.writerow([
+            'fecha', 'tipo', 'motivo', 'entrada', 'salida', 'saldo',
+            'costo_unitario', 'valor_movimiento', 'valor_saldo', 'usuario'
+        ])
+        yield writer.writerow([
+            kardex['desde'].isoformat(), 'SALDO INICIAL', '', '', '',
+            _decimal(kardex['saldo_inicial']), _decimal(kardex['costo_inicial']), '',
+            _decimal(kardex['valor_inicial']), ''
+        ])
+        for mov in kardex['filas']:
+            yield writer.writerow([
+                timezone.localtime(mov.fecha_creacion).isoformat(timespec='seconds'),
+                mov.tipo.nombre, mov.motivo, _decimal(mov.entrada), _decimal(mov.salida),
+                _decimal(mov.saldo), _decimal(mov.costo_unitario), _decimal(mov.valor_movimiento),
+                _decimal(mov.valor_saldo), mov.usuario.username
+            ])
+        yield writer.writerow([
+            kardex['hasta'].isoformat(), 'SALDO FINAL', '', _decimal(kardex['total_entradas']),
+            _decimal(kardex['total_salidas']), _decimal(kardex['saldo_final']),
+            _decimal(kardex['costo_final']), '', _decimal(kardex['valor_final']), ''
+        ])
+
+
 # ==================== VISTAS DE MOVIMIENTO ====================
 
 class MovimientoListView(BaseAuditedViewMixin, PaginatedListMixin, ListView):
@@ -433,9 +585,7 @@ class MovimientoListView(BaseAuditedViewMixin, PaginatedListMixin, ListView):
 
     def get_queryset(self) -> QuerySet:
         """Retorna movimientos con relaciones optimizadas."""
-        queryset = super().get_queryset().filter(
-            eliminado=False
-        ).select_related(
+        queryset = super().get_queryset().vivos().select_related(
             'articulo', 'tipo', 'usuario'
         )
 
@@ -459,7 +609,7 @@ class MovimientoListView(BaseAuditedViewMixin, PaginatedListMixin, ListView):
         """Agrega datos adicionales al contexto."""
         context = super().get_context_data(**kwargs)
         context['titulo'] = 'Movimientos de Inventario'
-        context['tipos'] = TipoMovimiento.objects.filter(activo=True, eliminado=False)
+        context['tipos'] = TipoMovimiento.vivos.filter(activo=True)
         context['operacion'] = self.request.GET.get('operacion', '')
         context['tipo_id'] = self.request.GET.get('tipo', '')
         return context
@@ -508,10 +658,11 @@ class MovimientoCreateView(BaseAuditedViewMixin, AtomicTransactionMixin, CreateV
 
             self.object = movimiento
 
-            # Continuar con el flujo normal (mensaje y redirección)
-            response = super().form_valid(form)
+            # El servicio ya guardó el movimiento: no se llama a
+            # super().form_valid, que volvería a guardar el formulario
+            messages.success(self.request, self.get_success_message(self.object))
             self.log_action(self.object, self.request)
-            return response
+            return redirect(self.get_success_url())
 
         except ValidationError as e:
             messages.error(self.request, str(e))
@@ -539,7 +690,7 @@ class MovimientoDetailView(BaseAuditedViewMixin, DetailView):
         """Optimiza consultas con select_related."""
         return super().get_queryset().select_related(
             'articulo', 'tipo', 'usuario'
-        ).filter(eliminado=False)
+        ).vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
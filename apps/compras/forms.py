@@ -88,13 +88,13 @@ class OrdenCompraForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
 
         # Filtrar proveedores activos
-        self.fields['proveedor'].queryset = Proveedor.objects.filter(
-            activo=True, eliminado=False
+        self.fields['proveedor'].queryset = Proveedor.vivos.filter(
+            activo=True
         ).order_by('razon_social')
 
         # Filtrar bodegas activas
-        self.fields['bodega_destino'].queryset = Bodega.objects.filter(
-            activo=True, eliminado=False
+        self.fields['bodega_destino'].queryset = Bodega.vivos.filter(
+            activo=True
         ).order_by('nombre')
 
         # Filtrar estados activos
@@ -104,9 +104,8 @@ class OrdenCompraForm(forms.ModelForm):
 
         # Filtrar solicitudes aprobadas (solo no eliminadas y con estado APROBADA)
         from apps.solicitudes.models import Solicitud
-        self.fields['solicitudes'].queryset = Solicitud.objects.filter(
-            estado__codigo='APROBADA',
-            eliminado=False
+        self.fields['solicitudes'].queryset = Solicitud.vivos.filter(
+            estado__codigo='APROBADA'
         ).select_related('solicitante', 'estado').order_by('-numero')
         self.fields['solicitudes'].required = False
         self.fields['solicitudes'].help_text = 'Seleccione las solicitudes aprobadas asociadas a esta orden (opcional)'
@@ -150,8 +149,8 @@ class DetalleOrdenCompraArticuloForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['articulo'].queryset = Articulo.objects.filter(
-            activo=True, eliminado=False
+        self.fields['articulo'].queryset = Articulo.vivos.filter(
+            activo=True
         ).select_related('categoria').order_by('sku')
 
     def clean(self):
@@ -187,8 +186,8 @@ class DetalleOrdenCompraActivoForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['activo'].queryset = Activo.objects.filter(
-            activo=True, eliminado=False
+        self.fields['activo'].queryset = Activo.vivos.filter(
+            activo=True
         ).select_related('categoria').order_by('codigo')
 
     def clean(self):
@@ -230,7 +229,7 @@ class OrdenCompraFiltroForm(forms.Form):
     proveedor = forms.ModelChoiceField(
         required=False,
         label='Proveedor',
-        queryset=Proveedor.objects.filter(activo=True, eliminado=False).order_by('razon_social'),
+        queryset=Proveedor.vivos.filter(activo=True).order_by('razon_social'),
         widget=forms.Select(attrs={'class': 'form-select'})
     )
 
@@ -255,8 +254,8 @@ class RecepcionArticuloForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
 
         # Filtrar tipos de recepción activos
-        self.fields['tipo'].queryset = TipoRecepcion.objects.filter(
-            activo=True, eliminado=False
+        self.fields['tipo'].queryset = TipoRecepcion.vivos.filter(
+            activo=True
         ).order_by('codigo')
 
         # Filtrar órdenes no finalizadas
@@ -267,8 +266,8 @@ class RecepcionArticuloForm(forms.ModelForm):
         self.fields['orden_compra'].required = False
 
         # Filtrar bodegas activas
-        self.fields['bodega'].queryset = Bodega.objects.filter(
-            activo=True, eliminado=False
+        self.fields['bodega'].queryset = Bodega.vivos.filter(
+            activo=True
         ).order_by('nombre')
 
     def clean(self):
@@ -301,8 +300,8 @@ class DetalleRecepcionArticuloForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['articulo'].queryset = Articulo.objects.filter(
-            activo=True, eliminado=False
+        self.fields['articulo'].queryset = Articulo.vivos.filter(
+            activo=True
         ).select_related('categoria').order_by('sku')
         self.fields['lote'].required = False
         self.fields['fecha_vencimiento'].required = False
@@ -314,14 +313,14 @@ class RecepcionArticuloFiltroForm(forms.Form):
     estado = forms.ModelChoiceField(
         required=False,
         label='Estado',
-        queryset=EstadoRecepcion.objects.filter(activo=True, eliminado=False).order_by('nombre'),
+        queryset=EstadoRecepcion.vivos.filter(activo=True).order_by('nombre'),
         widget=forms.Select(attrs={'class': 'form-select'})
     )
 
     bodega = forms.ModelChoiceField(
         required=False,
         label='Bodega',
-        queryset=Bodega.objects.filter(activo=True, eliminado=False).order_by('nombre'),
+        queryset=Bodega.vivos.filter(activo=True).order_by('nombre'),
         widget=forms.Select(attrs={'class': 'form-select'})
     )
 
@@ -379,8 +378,8 @@ class DetalleRecepcionActivoForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['activo'].queryset = Activo.objects.filter(
-            activo=True, eliminado=False
+        self.fields['activo'].queryset = Activo.vivos.filter(
+            activo=True
         ).select_related('categoria').order_by('codigo')
         self.fields['numero_serie'].required = False
 
@@ -391,6 +390,6 @@ class RecepcionActivoFiltroForm(forms.Form):
     estado = forms.ModelChoiceField(
         required=False,
         label='Estado',
-        queryset=EstadoRecepcion.objects.filter(activo=True, eliminado=False).order_by('nombre'),
+        queryset=EstadoRecepcion.vivos.filter(activo=True).order_by('nombre'),
         widget=forms.Select(attrs={'class': 'form-select'})
     )
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activos', '0007_indices_vivos'),
+        ('bodega', '0006_indices_vivos'),
+        ('compras', '0004_tiporecepcion_alter_recepcionarticulo_numero_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='detalleordencompra',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['orden_compra'], name='ix_ocdet_orden_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='detalleordencompraarticulo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['orden_compra'], name='ix_ocdetart_orden_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='detallerecepcionactivo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['recepcion'], name='ix_recactdet_rec_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='detallerecepcionarticulo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['recepcion'], name='ix_recartdet_rec_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='estadorecepcion',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_recestado_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='proveedor',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['razon_social'], name='ix_proveedor_razon_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='recepcionactivo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['-fecha_recepcion'], name='ix_recact_fecha_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='recepcionarticulo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['-fecha_recepcion'], name='ix_recart_fecha_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='tiporecepcion',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_rectipo_codigo_vivo'),
+        ),
+    ]
@@ -4,7 +4,7 @@ from django.core.validators import MinValueValidator, EmailValidator
 from django.contrib.auth.models import User
 from apps.activos.models import Activo
 from apps.bodega.models import Bodega, Articulo
-from core.models import BaseModel
+from core.models import BaseModel, indice_vivos
 
 
 class Proveedor(BaseModel):
@@ -49,6 +49,9 @@ class Proveedor(BaseModel):
         verbose_name = 'Proveedor'
         verbose_name_plural = 'Proveedores'
         ordering = ['razon_social']
+        indexes = [
+            indice_vivos('razon_social', nombre='ix_proveedor_razon_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.rut} - {self.razon_social}"
@@ -240,6 +243,9 @@ class DetalleOrdenCompra(BaseModel):
         verbose_name = 'Detalle de Orden de Compra'
         verbose_name_plural = 'Detalles de Órdenes de Compra'
         ordering = ['orden_compra', 'id']
+        indexes = [
+            indice_vivos('orden_compra', nombre='ix_ocdet_orden_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.orden_compra.numero} - {self.activo.codigo} ({self.cantidad})"
@@ -306,6 +312,9 @@ class DetalleOrdenCompraArticulo(BaseModel):
         verbose_name = 'Detalle Orden - Artículo'
         verbose_name_plural = 'Detalles Orden - Artículos'
         ordering = ['orden_compra', 'id']
+        indexes = [
+            indice_vivos('orden_compra', nombre='ix_ocdetart_orden_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.orden_compra.numero} - {self.articulo.sku} ({self.cantidad})"
@@ -333,6 +342,9 @@ class EstadoRecepcion(BaseModel):
         verbose_name = 'Estado de Recepción'
         verbose_name_plural = 'Estados de Recepción'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_recestado_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -351,6 +363,9 @@ class TipoRecepcion(BaseModel):
         verbose_name = 'Tipo de Recepción'
         verbose_name_plural = 'Tipos de Recepción'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_rectipo_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -407,6 +422,9 @@ class RecepcionArticulo(BaseModel):
         verbose_name = 'Recepción de Artículo'
         verbose_name_plural = 'Recepciones de Artículos'
         ordering = ['-fecha_recepcion']
+        indexes = [
+            indice_vivos('-fecha_recepcion', nombre='ix_recart_fecha_vivo'),
+        ]
 
     def __str__(self):
         return f"REC-ART-{self.numero} - {self.fecha_recepcion.strftime('%d/%m/%Y')}"
@@ -441,6 +459,9 @@ class DetalleRecepcionArticulo(BaseModel):
         verbose_name = 'Detalle Recepción Artículo'
         verbose_name_plural = 'Detalles Recepción Artículos'
         ordering = ['recepcion', 'id']
+        indexes = [
+            indice_vivos('recepcion', nombre='ix_recartdet_rec_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.recepcion.numero} - {self.articulo.sku} ({self.cantidad})"
@@ -485,6 +506,9 @@ class RecepcionActivo(BaseModel):
         verbose_name = 'Recepción de Bien/Activo'
         verbose_name_plural = 'Recepciones de Bienes/Activos'
         ordering = ['-fecha_recepcion']
+        indexes = [
+            indice_vivos('-fecha_recepcion', nombre='ix_recact_fecha_vivo'),
+        ]
 
     def __str__(self):
         return f"REC-ACT-{self.numero} - {self.fecha_recepcion.strftime('%d/%m/%Y')}"
@@ -518,6 +542,9 @@ class DetalleRecepcionActivo(BaseModel):
         verbose_name = 'Detalle Recepción Activo'
         verbose_name_plural = 'Detalles Recepción Activos'
         ordering = ['recepcion', 'id']
+        indexes = [
+            indice_vivos('recepcion', nombre='ix_recactdet_rec_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.recepcion.numero} - {self.activo.codigo} ({self.cantidad})"
@@ -26,20 +26,20 @@ class ProveedorRepository:
     @staticmethod
     def get_all() -> QuerySet[Proveedor]:
         """Retorna todos los proveedores no eliminados."""
-        return Proveedor.objects.filter(eliminado=False).order_by('razon_social')
+        return Proveedor.vivos.order_by('razon_social')
 
     @staticmethod
     def get_active() -> QuerySet[Proveedor]:
         """Retorna solo proveedores activos y no eliminados."""
-        return Proveedor.objects.filter(
-            activo=True, eliminado=False
+        return Proveedor.vivos.filter(
+            activo=True
         ).order_by('razon_social')
 
     @staticmethod
     def get_by_id(proveedor_id: int) -> Optional[Proveedor]:
         """Obtiene un proveedor por su ID."""
         try:
-            return Proveedor.objects.get(id=proveedor_id, eliminado=False)
+            return Proveedor.vivos.get(id=proveedor_id)
         except Proveedor.DoesNotExist:
             return None
 
@@ -47,18 +47,17 @@ class ProveedorRepository:
     def get_by_rut(rut: str) -> Optional[Proveedor]:
         """Obtiene un proveedor por su RUT."""
         try:
-            return Proveedor.objects.get(rut=rut, eliminado=False)
+            return Proveedor.vivos.get(rut=rut)
         except Proveedor.DoesNotExist:
             return None
 
     @staticmethod
     def search(query: str) -> QuerySet[Proveedor]:
         """Búsqueda de proveedores por RUT, razón social o nombre fantasía."""
-        return Proveedor.objects.filter(
+        return Proveedor.vivos.filter(
             Q(rut__icontains=query) |
             Q(razon_social__icontains=query) |
-            Q(nombre_fantasia__icontains=query),
-            eliminado=False
+            Q(nombre_fantasia__icontains=query)
         ).order_by('razon_social')
 
     @staticmethod
@@ -190,18 +189,17 @@ class DetalleOrdenCompraRepository:
     @staticmethod
     def filter_by_orden(orden: OrdenCompra) -> QuerySet[DetalleOrdenCompra]:
         """Retorna detalles de una orden específica."""
-        return DetalleOrdenCompra.objects.filter(
-            orden_compra=orden,
-            eliminado=False
+        return DetalleOrdenCompra.vivos.filter(
+            orden_compra=orden
         ).select_related('activo').order_by('id')
 
     @staticmethod
     def get_by_id(detalle_id: int) -> Optional[DetalleOrdenCompra]:
         """Obtiene un detalle por su ID."""
         try:
-            return DetalleOrdenCompra.objects.select_related(
+            return DetalleOrdenCompra.vivos.select_related(
                 'orden_compra', 'activo'
-            ).get(id=detalle_id, eliminado=False)
+            ).get(id=detalle_id)
         except DetalleOrdenCompra.DoesNotExist:
             return None
 
@@ -212,18 +210,17 @@ class DetalleOrdenCompraArticuloRepository:
     @staticmethod
     def filter_by_orden(orden: OrdenCompra) -> QuerySet[DetalleOrdenCompraArticulo]:
         """Retorna detalles de una orden específica."""
-        return DetalleOrdenCompraArticulo.objects.filter(
-            orden_compra=orden,
-            eliminado=False
+        return DetalleOrdenCompraArticulo.vivos.filter(
+            orden_compra=orden
         ).select_related('articulo').order_by('id')
 
     @staticmethod
     def get_by_id(detalle_id: int) -> Optional[DetalleOrdenCompraArticulo]:
         """Obtiene un detalle por su ID."""
         try:
-            return DetalleOrdenCompraArticulo.objects.select_related(
+            return DetalleOrdenCompraArticulo.vivos.select_related(
                 'orden_compra', 'articulo'
-            ).get(id=detalle_id, eliminado=False)
+            ).get(id=detalle_id)
         except DetalleOrdenCompraArticulo.DoesNotExist:
             return None
 
@@ -236,16 +233,16 @@ class EstadoRecepcionRepository:
     @staticmethod
     def get_all() -> QuerySet[EstadoRecepcion]:
         """Retorna todos los estados no eliminados."""
-        return EstadoRecepcion.objects.filter(
-            eliminado=False, activo=True
+        return EstadoRecepcion.vivos.filter(
+            activo=True
         ).order_by('codigo')
 
     @staticmethod
     def get_by_codigo(codigo: str) -> Optional[EstadoRecepcion]:
         """Obtiene un estado por su código."""
         try:
-            return EstadoRecepcion.objects.get(
-                codigo=codigo, eliminado=False, activo=True
+            return EstadoRecepcion.vivos.get(
+                codigo=codigo, activo=True
             )
         except EstadoRecepcion.DoesNotExist:
             return None
@@ -253,8 +250,8 @@ class EstadoRecepcionRepository:
     @staticmethod
     def get_inicial() -> Optional[EstadoRecepcion]:
         """Obtiene el estado inicial."""
-        return EstadoRecepcion.objects.filter(
-            es_inicial=True, eliminado=False, activo=True
+        return EstadoRecepcion.vivos.filter(
+            es_inicial=True, activo=True
         ).first()
 
 
@@ -266,9 +263,7 @@ class RecepcionArticuloRepository:
     @staticmethod
     def get_all() -> QuerySet[RecepcionArticulo]:
         """Retorna todas las recepciones con relaciones optimizadas."""
-        return RecepcionArticulo.objects.filter(
-            eliminado=False
-        ).select_related(
+        return RecepcionArticulo.vivos.select_related(
             'orden_compra', 'bodega', 'estado', 'recibido_por'
         ).order_by('-fecha_recepcion')
 
@@ -276,9 +271,9 @@ class RecepcionArticuloRepository:
     def get_by_id(recepcion_id: int) -> Optional[RecepcionArticulo]:
         """Obtiene una recepción por su ID."""
         try:
-            return RecepcionArticulo.objects.select_related(
+            return RecepcionArticulo.vivos.select_related(
                 'orden_compra', 'bodega', 'estado', 'recibido_por'
-            ).get(id=recepcion_id, eliminado=False)
+            ).get(id=recepcion_id)
         except RecepcionArticulo.DoesNotExist:
             return None
 
@@ -286,34 +281,31 @@ class RecepcionArticuloRepository:
     def get_by_numero(numero: str) -> Optional[RecepcionArticulo]:
         """Obtiene una recepción por su número."""
         try:
-            return RecepcionArticulo.objects.select_related(
+            return RecepcionArticulo.vivos.select_related(
                 'orden_compra', 'bodega', 'estado', 'recibido_por'
-            ).get(numero=numero, eliminado=False)
+            ).get(numero=numero)
         except RecepcionArticulo.DoesNotExist:
             return None
 
     @staticmethod
     def filter_by_orden(orden: OrdenCompra) -> QuerySet[RecepcionArticulo]:
         """Retorna recepciones de una orden específica."""
-        return RecepcionArticulo.objects.filter(
-            orden_compra=orden,
-            eliminado=False
+        return RecepcionArticulo.vivos.filter(
+            orden_compra=orden
         ).select_related('bodega', 'estado', 'recibido_por').order_by('-fecha_recepcion')
 
     @staticmethod
     def filter_by_bodega(bodega: Bodega) -> QuerySet[RecepcionArticulo]:
         """Retorna recepciones de una bodega específica."""
-        return RecepcionArticulo.objects.filter(
-            bodega=bodega,
-            eliminado=False
+        return RecepcionArticulo.vivos.filter(
+            bodega=bodega
         ).select_related('orden_compra', 'estado', 'recibido_por').order_by('-fecha_recepcion')
 
     @staticmethod
     def filter_by_estado(estado: EstadoRecepcion) -> QuerySet[RecepcionArticulo]:
         """Retorna recepciones en un estado específico."""
-        return RecepcionArticulo.objects.filter(
-            estado=estado,
-            eliminado=False
+        return RecepcionArticulo.vivos.filter(
+            estado=estado
         ).select_related(
             'orden_compra', 'bodega', 'recibido_por'
         ).order_by('-fecha_recepcion')
@@ -335,9 +327,8 @@ class DetalleRecepcionArticuloRepository:
     @staticmethod
     def filter_by_recepcion(recepcion: RecepcionArticulo) -> QuerySet[DetalleRecepcionArticulo]:
         """Retorna detalles de una recepción específica."""
-        return DetalleRecepcionArticulo.objects.filter(
-            recepcion=recepcion,
-            eliminado=False
+        return DetalleRecepcionArticulo.vivos.filter(
+            recepcion=recepcion
         ).select_related('articulo').order_by('id')
 
 
@@ -349,9 +340,7 @@ class RecepcionActivoRepository:
     @staticmethod
     def get_all() -> QuerySet[RecepcionActivo]:
         """Retorna todas las recepciones con relaciones optimizadas."""
-        return RecepcionActivo.objects.filter(
-            eliminado=False
-        ).select_related(
+        return RecepcionActivo.vivos.select_related(
             'orden_compra', 'estado', 'recibido_por'
         ).order_by('-fecha_recepcion')
 
@@ -359,9 +348,9 @@ class RecepcionActivoRepository:
     def get_by_id(recepcion_id: int) -> Optional[RecepcionActivo]:
         """Obtiene una recepción por su ID."""
         try:
-            return RecepcionActivo.objects.select_related(
+            return RecepcionActivo.vivos.select_related(
                 'orden_compra', 'estado', 'recibido_por'
-            ).get(id=recepcion_id, eliminado=False)
+            ).get(id=recepcion_id)
         except RecepcionActivo.DoesNotExist:
             return None
 
@@ -369,26 +358,24 @@ class RecepcionActivoRepository:
     def get_by_numero(numero: str) -> Optional[RecepcionActivo]:
         """Obtiene una recepción por su número."""
         try:
-            return RecepcionActivo.objects.select_related(
+            return RecepcionActivo.vivos.select_related(
                 'orden_compra', 'estado', 'recibido_por'
-            ).get(numero=numero, eliminado=False)
+            ).get(numero=numero)
         except RecepcionActivo.DoesNotExist:
             return None
 
     @staticmethod
     def filter_by_orden(orden: OrdenCompra) -> QuerySet[RecepcionActivo]:
         """Retorna recepciones de una orden específica."""
-        return RecepcionActivo.objects.filter(
-            orden_compra=orden,
-            eliminado=False
+        return RecepcionActivo.vivos.filter(
+            orden_compra=orden
         ).select_related('estado', 'recibido_por').order_by('-fecha_recepcion')
 
     @staticmethod
     def filter_by_estado(estado: EstadoRecepcion) -> QuerySet[RecepcionActivo]:
         """Retorna recepciones en un estado específico."""
-        return RecepcionActivo.objects.filter(
-            estado=estado,
-            eliminado=False
+        return RecepcionActivo.vivos.filter(
+            estado=estado
         ).select_related('orden_compra', 'recibido_por').order_by('-fecha_recepcion')
 
     @staticmethod
@@ -408,7 +395,6 @@ class DetalleRecepcionActivoRepository:
     @staticmethod
     def filter_by_recepcion(recepcion: RecepcionActivo) -> QuerySet[DetalleRecepcionActivo]:
         """Retorna detalles de una recepción específica."""
-        return DetalleRecepcionActivo.objects.filter(
-            recepcion=recepcion,
-            eliminado=False
+        return DetalleRecepcionActivo.vivos.filter(
+            recepcion=recepcion
         ).select_related('activo').order_by('id')
@@ -183,7 +183,7 @@ class ProveedorUpdateView(BaseAuditedViewMixin, UpdateView):
 
     def get_queryset(self) -> QuerySet:
         """Solo permite editar proveedores no eliminados."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -319,14 +319,10 @@ class OrdenCompraDetailView(BaseAuditedViewMixin, DetailView):
         context['titulo'] = f'Orden de Compra {self.object.numero}'
 
         # Detalles de artículos
-        context['detalles_articulos'] = self.object.detalles_articulos.filter(
-            eliminado=False
-        ).select_related('articulo', 'articulo__categoria')
+        context['detalles_articulos'] = self.object.detalles_articulos.vivos().select_related('articulo', 'articulo__categoria')
 
         # Detalles de activos
-        context['detalles_activos'] = self.object.detalles.filter(
-            eliminado=False
-        ).select_related('activo')
+        context['detalles_activos'] = self.object.detalles.vivos().select_related('activo')
 
         return context
 
@@ -521,7 +517,7 @@ class ObtenerDetallesSolicitudesView(View):
 
         for solicitud_id in solicitud_ids:
             try:
-                solicitud = Solicitud.objects.get(id=solicitud_id, eliminado=False)
+                solicitud = Solicitud.vivos.get(id=solicitud_id)
                 detalles = solicitud.detalles.filter(cantidad_aprobada__gt=0)
 
                 for detalle in detalles:
@@ -763,7 +759,7 @@ class RecepcionArticuloDetailView(BaseAuditedViewMixin, DetailView):
 
     def get_queryset(self) -> QuerySet:
         """Optimiza consultas con select_related."""
-        return super().get_queryset().filter(eliminado=False).select_related(
+        return super().get_queryset().vivos().select_related(
             'orden_compra', 'bodega', 'estado', 'recibido_por'
         )
 
@@ -773,9 +769,7 @@ class RecepcionArticuloDetailView(BaseAuditedViewMixin, DetailView):
         context['titulo'] = f'Recepción {self.object.numero}'
 
         # Detalles de la recepción
-        context['detalles'] = self.object.detalles.filter(
-            eliminado=False
-        ).select_related('articulo', 'articulo__categoria')
+        context['detalles'] = self.object.detalles.vivos().select_related('articulo', 'articulo__categoria')
 
         return context
 
@@ -814,13 +808,13 @@ class RecepcionArticuloCreateView(BaseAuditedViewMixin, AtomicTransactionMixin,
         context['action'] = 'Crear'
 
         # Agregar lista de artículos disponibles
-        context['articulos'] = Articulo.objects.filter(
-            activo=True, eliminado=False
+        context['articulos'] = Articulo.vivos.filter(
+            activo=True
         ).select_related('categoria').order_by('sku')
 
         # Pasar tipos de recepción en formato JSON
-        tipos_recepcion = list(TipoRecepcion.objects.filter(
-            activo=True, eliminado=False
+        tipos_recepcion = list(TipoRecepcion.vivos.filter(
+            activo=True
         ).values('id', 'codigo', 'nombre', 'requiere_orden'))
         context['tipos_recepcion'] = json.dumps(tipos_recepcion)
 
@@ -1031,8 +1025,8 @@ class RecepcionArticuloConfirmarView(BaseAuditedViewMixin, AtomicTransactionMixi
         if not estado_completado:
             # Si no existe COMPLETADA, buscar cualquier estado final
             from apps.compras.models import EstadoRecepcion
-            estado_completado = EstadoRecepcion.objects.filter(
-                es_final=True, activo=True, eliminado=False
+            estado_completado = EstadoRecepcion.vivos.filter(
+                es_final=True, activo=True
             ).exclude(codigo='CANCELADA').first()
 
         if estado_completado:
@@ -1050,7 +1044,7 @@ class RecepcionArticuloConfirmarView(BaseAuditedViewMixin, AtomicTransactionMixi
             from apps.bodega.models import TipoMovimiento
             tipo_movimiento = TipoMovimiento.objects.filter(activo=True).first()
 
-        for detalle in self.object.detalles.filter(eliminado=False):
+        for detalle in self.object.detalles.vivos():
             articulo = detalle.articulo
             stock_anterior = articulo.stock_actual
 
@@ -1096,9 +1090,7 @@ class RecepcionActivoListView(BaseAuditedViewMixin, PaginatedListMixin, Filtered
 
     def get_queryset(self) -> QuerySet:
         """Retorna recepciones no eliminadas con relaciones optimizadas."""
-        queryset = super().get_queryset().filter(
-            eliminado=False
-        ).select_related(
+        queryset = super().get_queryset().vivos().select_related(
             'orden_compra', 'estado', 'recibido_por'
         )
 
@@ -1133,7 +1125,7 @@ class RecepcionActivoDetailView(BaseAuditedViewMixin, DetailView):
 
     def get_queryset(self) -> QuerySet:
         """Optimiza consultas con select_related."""
-        return super().get_queryset().filter(eliminado=False).select_related(
+        return super().get_queryset().vivos().select_related(
             'orden_compra', 'estado', 'recibido_por'
         )
 
@@ -1143,9 +1135,7 @@ class RecepcionActivoDetailView(BaseAuditedViewMixin, DetailView):
         context['titulo'] = f'Recepción {self.object.numero}'
 
         # Detalles de la recepción
-        context['detalles'] = self.object.detalles.filter(
-            eliminado=False
-        ).select_related('activo')
+        context['detalles'] = self.object.detalles.vivos().select_related('activo')
 
         return context
 
@@ -1290,7 +1280,7 @@ class RecepcionActivoConfirmarView(BaseAuditedViewMixin, DetailView):
 
     def get_queryset(self) -> QuerySet:
         """Solo recepciones no eliminadas."""
-        return super().get_queryset().filter(eliminado=False)
+        return super().get_queryset().vivos()
 
     def get_context_data(self, **kwargs) -> dict:
         """Agrega datos al contexto."""
@@ -1309,8 +1299,8 @@ class RecepcionActivoConfirmarView(BaseAuditedViewMixin, DetailView):
 
         if not estado_completado:
             # Si no existe COMPLETADA, buscar cualquier estado final excluyendo CANCELADA
-            estado_completado = EstadoRecepcion.objects.filter(
-                es_final=True, activo=True, eliminado=False
+            estado_completado = EstadoRecepcion.vivos.filter(
+                es_final=True, activo=True
             ).exclude(codigo='CANCELADA').first()
 
         if estado_completado:
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import (
     Taller, TipoEquipo, Equipo, MantenimientoEquipo,
-    Marca, Modelo, NombreArticulo, SectorInventario
+    Marca, Modelo, NombreArticulo, SectorInventario, TomaInventario
 )
 
 
@@ -106,3 +106,10 @@ class SectorInventarioAdmin(admin.ModelAdmin):
     search_fields = ['codigo', 'nombre']
     readonly_fields = ['fecha_creacion', 'fecha_actualizacion']
 
+
+@admin.register(TomaInventario)
+class TomaInventarioAdmin(admin.ModelAdmin):
+    list_display = ['numero', 'ubicacion', 'bodega', 'estado', 'responsable', 'fecha_creacion', 'fecha_cierre']
+    list_filter = ['estado', 'eliminado']
+    search_fields = ['numero']
+    readonly_fields = ['resultado', 'fecha_creacion', 'fecha_actualizacion', 'fecha_cierre']
@@ -6,3 +6,7 @@ class InventarioConfig(AppConfig):
     name = 'apps.inventario'
     verbose_name = 'Gestión de Inventario'
 
+    def ready(self):
+        """Ejecutar configuraciones cuando la app esté lista."""
+        # Importar signals para que se registren automáticamente
+        from . import signals
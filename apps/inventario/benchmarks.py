@@ -0,0 +1,321 @@
+"""
+Benchmark de vistas con el cliente de pruebas de Django.
+
+Recorre las vistas más usadas (listados con búsqueda, menús, reportes,
+endpoints AJAX y los flujos de creación/confirmación) sobre un dataset
+generado con `generate_dataset`, mide latencia p50/p95, consultas SQL y
+memoria máxima por petición, y compara contra una línea base en JSON
+versionada en el repositorio.
+
+Lo usan el comando `benchmark_vistas` y el test `BenchmarkVistasTest`.
+"""
+import json
+import logging
+import math
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from apps.activos.models import Activo
+from apps.bodega.models import Articulo, Bodega, TipoMovimiento
+from apps.compras.models import EstadoRecepcion, OrdenCompra, TipoRecepcion
+from apps.solicitudes.models import Solicitud
+
+
+# Línea base versionada (se regenera con `benchmark_vistas --guardar`)
+BASELINE = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+
+# Holguras sobre la línea base antes de considerar una regresión
+TOLERANCIA_TIEMPO = 0.5       # +50% en p95
+TOLERANCIA_MEMORIA = 0.25     # +25% de memoria máxima
+HOLGURA_TIEMPO_MS = 5.0       # diferencias menores a esto son ruido
+HOLGURA_MEMORIA_KB = 64.0
+
+USUARIO_BENCHMARK = '__benchmark_vistas__'
+
+
+# ==================== ESCENARIOS ====================
+
+def _get(nombre_url: str, kwargs: Callable[[dict], dict] = None, params: Callable[[dict], dict] = None):
+    """Escenario GET sobre una URL con nombre; kwargs y params dependen del contexto."""
+    def peticion(client: Client, ctx: dict):
+        url = reverse(nombre_url, kwargs=kwargs(ctx) if kwargs else None)
+        return client.get(url, params(ctx) if params else None)
+    return peticion
+
+
+def _crear_movimiento(client: Client, ctx: dict):
+    """Registra una entrada de bodega (MovimientoCreateView)."""
+    return client.post(reverse('bodega:movimiento_crear'), {
+        'articulo': ctx['articulo'].pk, 'tipo': ctx['tipo_movimiento'].pk,
+        'cantidad': '1', 'operacion': 'ENTRADA', 'motivo': 'Benchmark',
+    })
+
+
+def _crear_y_confirmar_recepcion(client: Client, ctx: dict):
+    """Crea una recepción de artículos con tres líneas y la confirma (actualiza stock)."""
+    datos = {
+        'tipo': ctx['tipo_recepcion'].pk, 'bodega': ctx['bodega'].pk,
+        'documento_referencia': 'BENCH', 'observaciones': '',
+    }
+    for i, articulo_id in enumerate(ctx['articulos_recepcion']):
+        datos[f'detalles[{i}][articulo_id]'] = articulo_id
+        datos[f'detalles[{i}][cantidad]'] = '2'
+    respuesta = client.post(reverse('compras:recepcion_articulo_crear'), datos)
+    if respuesta.status_code != 302:
+        return respuesta
+    pk = int(respuesta['Location'].rstrip('/').rsplit('/', 1)[-1])
+    return client.post(reverse('compras:recepcion_articulo_confirmar', kwargs={'pk': pk}))
+
+
+ESCENARIOS: Dict[str, Callable] = {
+    # Listados y búsquedas
+    'activos_lista': _get('activos:lista_activos'),
+    'activos_buscar': _get('activos:lista_activos', params=lambda ctx: {'buscar': 'Activo 1'}),
+    'activos_movimientos': _get('activos:lista_movimientos'),
+    'activos_movimientos_buscar': _get('activos:lista_movimientos', params=lambda ctx: {'buscar': 'Activo 1'}),
+    'activo_detalle': _get('activos:detalle_activo', kwargs=lambda ctx: {'pk': ctx['activo'].pk}),
+    'articulos_lista': _get('bodega:articulo_lista'),
+    'articulos_buscar': _get('bodega:articulo_lista', params=lambda ctx: {'q': 'Artículo 1'}),
+    'articulo_detalle': _get('bodega:articulo_detalle', kwargs=lambda ctx: {'pk': ctx['articulo'].pk}),
+    'bodega_movimientos': _get('bodega:movimiento_lista'),
+    'bodega_movimientos_articulo': _get(
+        'bodega:movimiento_lista', params=lambda ctx: {'articulo': ctx['articulo'].pk, 'operacion': 'SALIDA'}
+    ),
+    'solicitudes_lista': _get('solicitudes:lista_solicitudes'),
+    'solicitud_detalle': _get('solicitudes:detalle_solicitud', kwargs=lambda ctx: {'pk': ctx['solicitud'].pk}),
+    'ordenes_lista': _get('compras:orden_compra_lista'),
+    'orden_detalle': _get('compras:orden_compra_detalle', kwargs=lambda ctx: {'pk': ctx['orden'].pk}),
+    'usuarios_lista': _get('accounts:lista_usuarios', params=lambda ctx: {'q': 'gonzalez'}),
+    'auditoria_lista': _get('accounts:lista_auditoria'),
+    # Menús
+    'menu_inventario': _get('activos:menu_inventario'),
+    'menu_bodega': _get('bodega:menu_bodega'),
+    'menu_compras': _get('compras:menu_compras'),
+    'menu_solicitudes': _get('solicitudes:menu_solicitudes'),
+    'menu_bajas': _get('bajas_inventario:menu_bajas'),
+    'menu_usuarios': _get('accounts:menu_usuarios'),
+    # Reportes
+    'reportes_dashboard': _get('reportes:dashboard'),
+    'reporte_movimientos': _get('reportes:movimientos'),
+    'panel_accesos': _get('accounts:panel_accesos'),
+    # AJAX
+    'ajax_escaner': _get('inventario:api_escaner', params=lambda ctx: {'codigo': ctx['activo'].codigo_barras}),
+    'ajax_articulos_orden': _get(
+        'compras:obtener_articulos_orden_compra', params=lambda ctx: {'orden_id': ctx['orden'].pk}
+    ),
+    'ajax_contador_notificaciones': _get('notificaciones:contador'),
+    # Flujos de creación / confirmación
+    'crear_movimiento_bodega': _crear_movimiento,
+    'crear_confirmar_recepcion': _crear_y_confirmar_recepcion,
+}
+
+# Escenarios que no se miden ni se guardan en la línea base, con el motivo.
+# Una vista que responde 500 no mide nada útil y su entrada en la línea base
+# ocultaría la regresión cuando se arregle y vuelva a fallar.
+OMITIDOS: Dict[str, str] = {
+    'reportes_dashboard': 'la app reportes aún no tiene plantillas (reportes/dashboard.html)',
+    'reporte_movimientos': 'la app reportes aún no tiene plantillas (reportes/movimientos.html)',
+}
+
+
+# ==================== PREPARACIÓN ====================
+
+def preparar_contexto(prefijo: str = 'DS') -> dict:
+    """
+    Elige los objetos del dataset sobre los que se ejecutan los escenarios y
+    crea el usuario y los catálogos propios del benchmark.
+
+    Args:
+        prefijo: Prefijo con que se generó el dataset
+
+    Returns:
+        dict: Objetos usados por los escenarios
+
+    Raises:
+        LookupError: Si no hay un dataset generado con ese prefijo
+    """
+    articulos = list(
+        Articulo.vivos.filter(sku__startswith=f'{prefijo}-')
+        .order_by('id').values_list('id', flat=True)[:3]
+    )
+    if not articulos:
+        raise LookupError(f'No hay dataset con prefijo {prefijo}; ejecute generate_dataset primero')
+
+    usuario, _ = User.objects.get_or_create(
+        username=USUARIO_BENCHMARK, defaults={'is_staff': True, 'is_superuser': True}
+    )
+    tipo_recepcion, _ = TipoRecepcion.objects.get_or_create(
+        codigo='__BENCH__', defaults={'nombre': 'Benchmark', 'requiere_orden': False}
+    )
+    EstadoRecepcion.objects.get_or_create(
+        codigo='__BENCH_INI__', defaults={'nombre': 'Benchmark inicial', 'es_inicial': True}
+    )
+    EstadoRecepcion.objects.get_or_create(
+        codigo='__BENCH_FIN__', defaults={'nombre': 'Benchmark final', 'es_final': True}
+    )
+
+    return {
+        'usuario': usuario,
+        'articulo': Articulo.objects.get(pk=articulos[0]),
+        'articulos_recepcion': articulos,
+        'activo': Activo.objects.filter(codigo__startswith=f'{prefijo}-').order_by('id').first(),
+        'bodega': Bodega.objects.filter(codigo__startswith=f'{prefijo}-').order_by('id').first(),
+        'tipo_movimiento': TipoMovimiento.objects.get(codigo=f'{prefijo}-ENT'),
+        'tipo_recepcion': tipo_recepcion,
+        'orden': OrdenCompra.objects.filter(numero__startswith=f'{prefijo}-').order_by('-id').first(),
+        'solicitud': Solicitud.objects.filter(numero__startswith=f'{prefijo}-').order_by('-id').first(),
+    }
+
+
+# ==================== MEDICIÓN ====================
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    indice = max(0, math.ceil(percentil / 100 * len(valores)) - 1)
+    return valores[indice]
+
+
+def medir(client: Client, peticion: Callable, ctx: dict, repeticiones: int = 20) -> dict:
+    """
+    Mide un escenario.
+
+    Una ejecución previa sin medir carga módulos, plantillas y cachés (si
+    no, el primer escenario carga con esa memoria); la siguiente cuenta las
+    consultas y la memoria máxima (tracemalloc la hace más lenta, por eso
+    no entra en las latencias) y luego se cronometran `repeticiones`
+    ejecuciones. Si el escenario responde con error 5xx no se cronometra.
+
+    Args:
+        client: Cliente de pruebas con sesión iniciada
+        peticion: Escenario a medir
+        ctx: Contexto de `preparar_contexto`
+        repeticiones: Ejecuciones cronometradas
+
+    Returns:
+        dict: p50_ms, p95_ms, consultas, memoria_kb y status
+    """
+    peticion(client, ctx)
+
+    # captured_queries se lee de connection.queries, que cada petición
+    # posterior vacía (request_started): el conteo se toma de inmediato
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as capturadas:
+            respuesta = peticion(client, ctx)
+        consultas = len(capturadas.captured_queries)
+        _, memoria = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    tiempos = []
+    for _ in range(repeticiones if respuesta.status_code < 500 else 0):
+        inicio = time.perf_counter()
+        peticion(client, ctx)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+
+    return {
+        'p50_ms': round(_percentil(tiempos, 50), 2) if tiempos else None,
+        'p95_ms': round(_percentil(tiempos, 95), 2) if tiempos else None,
+        'consultas': consultas,
+        'memoria_kb': round(memoria / 1024, 1),
+        'status': respuesta.status_code,
+    }
+
+
+@contextmanager
+def sesion(ctx: dict):
+    """
+    Cliente de pruebas con la sesión del usuario del benchmark.
+
+    Corre con DEBUG=False, igual que producción y que el runner de tests:
+    con DEBUG=True cada consulta se acumula en connection.queries y eso
+    distorsiona tiempos y memoria. Los errores 5xx se devuelven como
+    respuesta (sin traza en el log) en vez de interrumpir la ejecución.
+    """
+    client = Client(SERVER_NAME='localhost', raise_request_exception=False)
+    client.force_login(ctx['usuario'])
+    logger = logging.getLogger('django.request')
+    nivel = logger.level
+    logger.setLevel(logging.CRITICAL)
+    try:
+        with override_settings(DEBUG=False):
+            yield client
+    finally:
+        logger.setLevel(nivel)
+
+
+def ejecutar(ctx: dict, repeticiones: int = 20, filtro: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Ejecuta los escenarios (los que contienen `filtro`, si se indica) en
+    una `sesion`, salvo los de OMITIDOS; los errores 5xx quedan en el
+    status del resultado.
+
+    Returns:
+        dict: Resultados de `medir` por nombre de escenario
+    """
+    with sesion(ctx) as client:
+        return {
+            nombre: medir(client, peticion, ctx, repeticiones)
+            for nombre, peticion in ESCENARIOS.items()
+            if nombre not in OMITIDOS and (not filtro or filtro in nombre)
+        }
+
+
+# ==================== LÍNEA BASE ====================
+
+def cargar_baseline(ruta: Path = BASELINE) -> Optional[dict]:
+    """Lee la línea base; None si no existe."""
+    if not ruta.exists():
+        return None
+    return json.loads(ruta.read_text(encoding='utf-8'))
+
+
+def guardar_baseline(resultados: Dict[str, dict], escala: float, ruta: Path = BASELINE) -> None:
+    """Escribe la línea base con los resultados y la escala del dataset medido (sin los OMITIDOS)."""
+    ruta.write_text(json.dumps({
+        'escala': escala,
+        'escenarios': {nombre: r for nombre, r in resultados.items() if nombre not in OMITIDOS},
+    }, indent=2, ensure_ascii=False, sort_keys=True) + '\n', encoding='utf-8')
+
+
+def comparar(resultados: Dict[str, dict], baseline: dict,
+             tolerancia_tiempo: float = TOLERANCIA_TIEMPO,
+             tolerancia_memoria: float = TOLERANCIA_MEMORIA) -> List[str]:
+    """
+    Compara resultados contra la línea base.
+
+    Es regresión: responder con error (>= 400) donde la línea base no lo
+    hacía, cualquier consulta SQL adicional (el conteo es determinista), un
+    p95 sobre la tolerancia o una memoria máxima sobre la tolerancia. Las
+    diferencias menores a las holguras absolutas se ignoran como ruido.
+
+    Returns:
+        list: Descripción de cada regresión (vacía si no hay)
+    """
+    regresiones = []
+    for nombre, actual in resultados.items():
+        base = baseline.get('escenarios', {}).get(nombre)
+        if base is None:
+            continue
+        if actual['status'] >= 400 and actual['status'] != base['status']:
+            regresiones.append(f'{nombre}: status {actual["status"]} (base {base["status"]})')
+        if actual['consultas'] > base['consultas']:
+            regresiones.append(f'{nombre}: {actual["consultas"]} consultas (base {base["consultas"]})')
+        if actual['p95_ms'] is not None and base['p95_ms'] is not None:
+            limite = base['p95_ms'] * (1 + tolerancia_tiempo)
+            if actual['p95_ms'] > limite and actual['p95_ms'] - base['p95_ms'] > HOLGURA_TIEMPO_MS:
+                regresiones.append(f'{nombre}: p95 {actual["p95_ms"]} ms (base {base["p95_ms"]} ms)')
+        limite = base['memoria_kb'] * (1 + tolerancia_memoria)
+        if actual['memoria_kb'] > limite and actual['memoria_kb'] - base['memoria_kb'] > HOLGURA_MEMORIA_KB:
+            regresiones.append(f'{nombre}: memoria {actual["memoria_kb"]} KB (base {base["memoria_kb"]} KB)')
+    return regresiones
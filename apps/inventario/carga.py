@@ -0,0 +1,440 @@
+"""
+Generador de carga concurrente sobre los flujos de negocio completos.
+
+Cada trabajador (hilo o proceso) inicia sesión y repite flujos reales por
+HTTP, llenando los formularios tal como los entrega el servidor:
+
+- solicitud: crear solicitud de artículos → aprobar → despachar
+- compra: crear OC → agregar líneas → crear recepción → confirmar
+- movimiento: registrar entradas/salidas de bodega sobre artículos "calientes"
+
+El transporte es el cliente de pruebas de Django (la aplicación en el
+mismo proceso) o urllib contra un servidor levantado (`--url`). Al final
+se verifican las invariantes stock vs. libro de movimientos.
+
+Lo usa el comando `carga_concurrente`.
+"""
+import math
+import random
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import timedelta
+from html.parser import HTMLParser
+from http.cookiejar import CookieJar
+from typing import Dict, List, Optional
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError, IntegrityError, OperationalError, connection
+from django.db.models import F, OuterRef, Subquery, Window
+from django.db.models.functions import Lag
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.bodega.models import Articulo, Movimiento
+from apps.compras.models import EstadoOrdenCompra
+from apps.inventario.benchmarks import preparar_contexto
+
+
+PASSWORD_CARGA = 'carga123'
+FLUJOS = ('solicitud', 'compra', 'movimiento')
+
+
+# ==================== FORMULARIOS HTML ====================
+
+class _LectorFormularios(HTMLParser):
+    """Extrae los formularios de una página con los valores que enviaría un navegador."""
+
+    def __init__(self):
+        super().__init__()
+        self.formularios: List[dict] = []
+        self._select = None
+        self._textarea = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'form':
+            self.formularios.append({'action': attrs.get('action') or '', 'campos': {}, 'opciones': {}})
+            return
+        if not self.formularios:
+            return
+        form = self.formularios[-1]
+        nombre = attrs.get('name')
+        if tag == 'input' and nombre:
+            tipo = (attrs.get('type') or 'text').lower()
+            if tipo in ('submit', 'button', 'file', 'image', 'reset'):
+                return
+            if tipo in ('checkbox', 'radio') and 'checked' not in attrs:
+                return
+            form['campos'][nombre] = attrs.get('value') or ('on' if tipo == 'checkbox' else '')
+        elif tag == 'select' and nombre:
+            # Como un navegador: un select simple envía la opción marcada o la
+            # primera; uno múltiple sin opciones marcadas no envía nada
+            self._select = (nombre, 'multiple' in attrs)
+            form['opciones'][nombre] = []
+        elif tag == 'option' and self._select:
+            nombre, multiple = self._select
+            valor = attrs.get('value') or ''
+            form['opciones'][nombre].append(valor)
+            if 'selected' in attrs or (not multiple and nombre not in form['campos']):
+                form['campos'][nombre] = valor
+        elif tag == 'textarea' and nombre:
+            self._textarea = nombre
+            form['campos'][nombre] = ''
+
+    def handle_endtag(self, tag):
+        if tag == 'select':
+            self._select = None
+        elif tag == 'textarea':
+            self._textarea = None
+
+    def handle_data(self, data):
+        if self._textarea and self.formularios:
+            self.formularios[-1]['campos'][self._textarea] += data
+
+
+def leer_formulario(html: str) -> dict:
+    """
+    Retorna los campos del formulario principal (el que lleva token CSRF y
+    más campos) con los valores que enviaría un navegador sin tocar nada;
+    las opciones de cada select quedan en `opciones`.
+    """
+    lector = _LectorFormularios()
+    lector.feed(html)
+    candidatos = [f for f in lector.formularios if 'csrfmiddlewaretoken' in f['campos']]
+    if not candidatos:
+        raise ValueError('La página no tiene un formulario con token CSRF')
+    return max(candidatos, key=lambda f: len(f['campos']))
+
+
+def _primera_opcion(formulario: dict, campo: str) -> str:
+    return next((valor for valor in formulario['opciones'].get(campo, []) if valor), '')
+
+
+# ==================== TRANSPORTES ====================
+
+class _Respuesta:
+    __slots__ = ('status', 'html', 'location')
+
+    def __init__(self, status: int, html: str, location: str = ''):
+        self.status, self.html, self.location = status, html, location
+
+    def pk_redireccion(self) -> int:
+        """ID del objeto al que redirige un POST exitoso (…/<pk>/)."""
+        return int(re.findall(r'/(\d+)/?$', self.location)[0])
+
+
+class ClienteWSGI:
+    """Transporte en el mismo proceso (handler de Django vía cliente de pruebas)."""
+
+    def __init__(self):
+        # Las excepciones se propagan para distinguir bloqueos de otros errores
+        self.client = Client(SERVER_NAME='localhost')
+
+    def get(self, url: str) -> _Respuesta:
+        respuesta = self.client.get(url)
+        return _Respuesta(respuesta.status_code, respuesta.content.decode(), respuesta.get('Location', ''))
+
+    def post(self, url: str, datos: dict) -> _Respuesta:
+        respuesta = self.client.post(url, datos)
+        return _Respuesta(respuesta.status_code, respuesta.content.decode(), respuesta.get('Location', ''))
+
+    def cerrar(self):
+        connection.close()
+
+
+class _SinRedirecciones(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class ClienteHTTP:
+    """Transporte contra un servidor levantado (runserver, gunicorn...)."""
+
+    def __init__(self, base: str):
+        self.base = base.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(CookieJar()), _SinRedirecciones()
+        )
+
+    def _abrir(self, url: str, datos: Optional[dict] = None) -> _Respuesta:
+        cuerpo = urllib.parse.urlencode(datos, doseq=True).encode() if datos is not None else None
+        peticion = urllib.request.Request(self.base + url, data=cuerpo, headers={'Referer': self.base + url})
+        try:
+            with self.opener.open(peticion, timeout=60) as respuesta:
+                return _Respuesta(respuesta.status, respuesta.read().decode(errors='replace'))
+        except urllib.error.HTTPError as e:
+            return _Respuesta(e.code, e.read().decode(errors='replace'), e.headers.get('Location', ''))
+
+    def get(self, url: str) -> _Respuesta:
+        return self._abrir(url)
+
+    def post(self, url: str, datos: dict) -> _Respuesta:
+        return self._abrir(url, datos)
+
+    def cerrar(self):
+        pass
+
+
+class ErrorFlujo(Exception):
+    """Un paso de un flujo no terminó como se esperaba."""
+
+    def __init__(self, tipo: str, mensaje: str):
+        super().__init__(mensaje)
+        self.tipo = tipo
+
+
+# ==================== TRABAJADOR ====================
+
+class Trabajador:
+    """
+    Ejecuta flujos con una sesión propia y registra la latencia de cada paso.
+
+    Los errores se clasifican en: bloqueo ("database is locked"),
+    integridad (IntegrityError, ej. números correlativos duplicados),
+    invalido (el formulario volvió con errores) y error (resto de 5xx).
+    """
+
+    def __init__(self, indice: int, config: dict):
+        self.config = config
+        self.rng = random.Random(config['semilla'] + indice)
+        self.usuario = f'carga_{indice:03d}'
+        self.cliente = ClienteHTTP(config['url']) if config['url'] else ClienteWSGI()
+        self.pasos: List[tuple] = []
+        self.errores: List[tuple] = []
+        self.completados: Dict[str, int] = dict.fromkeys(FLUJOS, 0)
+        self._flujo = None
+
+    # ---------- infraestructura ----------
+
+    def _pedir(self, paso: str, metodo: str, url: str, datos: dict = None, esperado: int = None) -> _Respuesta:
+        inicio = time.perf_counter()
+        try:
+            respuesta = self.cliente.get(url) if metodo == 'GET' else self.cliente.post(url, datos)
+        except OperationalError as e:
+            raise ErrorFlujo('bloqueo' if 'locked' in str(e) else 'error', str(e))
+        except IntegrityError as e:
+            raise ErrorFlujo('integridad', str(e))
+        except DatabaseError as e:
+            raise ErrorFlujo('error', str(e))
+        finally:
+            self.pasos.append((self._flujo, paso, (time.perf_counter() - inicio) * 1000))
+
+        if respuesta.status >= 500:
+            tipo = 'bloqueo' if 'database is locked' in respuesta.html else (
+                'integridad' if 'IntegrityError' in respuesta.html else 'error')
+            raise ErrorFlujo(tipo, f'{paso}: HTTP {respuesta.status}')
+        if esperado and respuesta.status != esperado:
+            raise ErrorFlujo('invalido', f'{paso}: HTTP {respuesta.status} (se esperaba {esperado})')
+        return respuesta
+
+    def _enviar(self, paso: str, url: str, valores: dict, formulario: dict = None) -> _Respuesta:
+        """GET del formulario (si no se entrega), completa valores y POST esperando redirección."""
+        if formulario is None:
+            formulario = leer_formulario(self._pedir(f'{paso} (form)', 'GET', url, esperado=200).html)
+        datos = dict(formulario['campos'])
+        datos.update({k: str(v) for k, v in valores.items()})
+        return self._pedir(paso, 'POST', url, datos, esperado=302)
+
+    def iniciar_sesion(self):
+        self._flujo = 'login'
+        self._enviar('login', reverse('account_login'), {'login': self.usuario, 'password': PASSWORD_CARGA})
+
+    # ---------- flujos ----------
+
+    def flujo_solicitud(self):
+        """Crea una solicitud de artículos, la aprueba y la despacha."""
+        ctx = self.config
+        url = reverse('solicitudes:crear_solicitud_articulos')
+        formulario = leer_formulario(self._pedir('solicitud (form)', 'GET', url, esperado=200).html)
+        respuesta = self._enviar('crear solicitud', url, {
+            'tipo_solicitud': _primera_opcion(formulario, 'tipo_solicitud'),
+            'bodega_origen': _primera_opcion(formulario, 'bodega_origen'),
+            'fecha_requerida': (timezone.localdate() + timedelta(days=7)).isoformat(),
+            'area_solicitante': 'Carga concurrente',
+            'motivo': 'Prueba de carga',
+            'detalles-0-articulo': self.rng.choice(ctx['articulos']),
+            'detalles-0-cantidad_solicitada': self.rng.randint(1, 5),
+        }, formulario)
+        pk = respuesta.pk_redireccion()
+
+        url = reverse('solicitudes:aprobar_solicitud', kwargs={'pk': pk})
+        formulario = leer_formulario(self._pedir('aprobar (form)', 'GET', url, esperado=200).html)
+        # El valor inicial viene localizado ("5,00") y el campo no lo acepta;
+        # un input type=number del navegador tampoco, así que se digita
+        cantidades = {
+            k: (v or '1').replace(',', '.') for k, v in formulario['campos'].items()
+            if k.startswith('cantidad_aprobada_')
+        }
+        self._enviar('aprobar', url, cantidades, formulario)
+
+        # La página de despacho no se pide: su plantilla usa un filtro que no
+        # existe; se envían las cantidades aprobadas con el mismo token CSRF
+        self._enviar('despachar', reverse('solicitudes:despachar_solicitud', kwargs={'pk': pk}), {
+            k.replace('aprobada', 'despachada'): v for k, v in cantidades.items()
+        }, {'campos': {'csrfmiddlewaretoken': formulario['campos']['csrfmiddlewaretoken']}})
+
+    def flujo_compra(self):
+        """Crea una OC, le agrega líneas, recibe los artículos y confirma la recepción."""
+        ctx = self.config
+        url = reverse('compras:orden_compra_crear')
+        formulario = leer_formulario(self._pedir('oc (form)', 'GET', url, esperado=200).html)
+        hoy = timezone.localdate()
+        respuesta = self._enviar('crear oc', url, {
+            'proveedor': _primera_opcion(formulario, 'proveedor'),
+            'bodega_destino': ctx['bodega'],
+            'estado': ctx['estado_oc'],
+            'fecha_orden': hoy.isoformat(),
+            'fecha_entrega_esperada': (hoy + timedelta(days=10)).isoformat(),
+        }, formulario)
+        orden = respuesta.pk_redireccion()
+
+        articulos = self.rng.sample(ctx['articulos'], min(len(ctx['articulos']), self.rng.randint(1, 3)))
+        url = reverse('compras:orden_compra_agregar_articulo', kwargs={'pk': orden})
+        for articulo in articulos:
+            self._enviar('agregar línea', url, {
+                'articulo': articulo, 'cantidad': self.rng.randint(1, 10),
+                'precio_unitario': self.rng.randint(500, 5000), 'descuento': 0,
+            })
+
+        url = reverse('compras:recepcion_articulo_crear')
+        valores = {'tipo': ctx['tipo_recepcion'], 'orden_compra': orden, 'bodega': ctx['bodega'],
+                   'documento_referencia': f'GD-{orden}'}
+        for i, articulo in enumerate(articulos):
+            valores[f'detalles[{i}][articulo_id]'] = articulo
+            valores[f'detalles[{i}][cantidad]'] = self.rng.randint(1, 10)
+        recepcion = self._enviar('crear recepción', url, valores).pk_redireccion()
+
+        url = reverse('compras:recepcion_articulo_confirmar', kwargs={'pk': recepcion})
+        self._enviar('confirmar recepción', url, {})
+
+    def flujo_movimiento(self):
+        """Registra una entrada o salida sobre un artículo del grupo caliente."""
+        ctx = self.config
+        self._enviar('movimiento', reverse('bodega:movimiento_crear'), {
+            'articulo': self.rng.choice(ctx['calientes']),
+            'tipo': ctx['tipo_movimiento'],
+            'cantidad': self.rng.randint(1, 3),
+            'operacion': 'ENTRADA' if self.rng.random() < 0.6 else 'SALIDA',
+            'motivo': 'Carga concurrente',
+        })
+
+    # ---------- ciclo ----------
+
+    def ejecutar(self) -> dict:
+        """Repite flujos al azar hasta cumplir la duración o las iteraciones."""
+        try:
+            try:
+                self.iniciar_sesion()
+            except ErrorFlujo as e:
+                self.errores.append(('login', 'login', e.tipo, str(e)))
+                return self.resultado()
+
+            fin = time.monotonic() + self.config['duracion']
+            iteraciones = 0
+            while time.monotonic() < fin and iteraciones < self.config['iteraciones']:
+                self._flujo = self.rng.choice(self.config['flujos'])
+                try:
+                    getattr(self, f'flujo_{self._flujo}')()
+                    self.completados[self._flujo] += 1
+                except ErrorFlujo as e:
+                    self.errores.append((self._flujo, str(e).split(':')[0], e.tipo, str(e)[:200]))
+                iteraciones += 1
+        finally:
+            self.cliente.cerrar()
+        return self.resultado()
+
+    def resultado(self) -> dict:
+        return {'pasos': self.pasos, 'errores': self.errores, 'completados': self.completados}
+
+
+def ejecutar_trabajador(indice: int, config: dict) -> dict:
+    """Punto de entrada de cada hilo o proceso."""
+    return Trabajador(indice, config).ejecutar()
+
+
+# ==================== PREPARACIÓN E INVARIANTES ====================
+
+def preparar(prefijo: str, trabajadores: int, calientes: int) -> dict:
+    """
+    Crea los usuarios de carga y reúne los IDs que usan los flujos.
+
+    Args:
+        prefijo: Prefijo del dataset de `generate_dataset`
+        trabajadores: Cantidad de usuarios carga_NNN a crear
+        calientes: Artículos sobre los que compiten los movimientos
+
+    Returns:
+        dict: Configuración compartida por los trabajadores
+    """
+    ctx = preparar_contexto(prefijo)
+    for indice in range(trabajadores):
+        usuario, creado = User.objects.get_or_create(
+            username=f'carga_{indice:03d}', defaults={'is_staff': True, 'is_superuser': True}
+        )
+        if creado:
+            usuario.set_password(PASSWORD_CARGA)
+            usuario.save(update_fields=['password'])
+
+    articulos = list(
+        Articulo.vivos.filter(sku__startswith=f'{prefijo}-')
+        .order_by('id').values_list('id', flat=True)[:200]
+    )
+    return {
+        'articulos': articulos,
+        'calientes': articulos[:calientes],
+        'bodega': ctx['bodega'].pk,
+        'tipo_movimiento': ctx['tipo_movimiento'].pk,
+        'tipo_recepcion': ctx['tipo_recepcion'].pk,
+        'estado_oc': EstadoOrdenCompra.objects.filter(es_final=False).order_by('id').values_list('id', flat=True)[0],
+        'ultimo_movimiento': Movimiento.objects.order_by('-id').values_list('id', flat=True).first() or 0,
+    }
+
+
+def verificar_invariantes(desde_movimiento: int) -> List[str]:
+    """
+    Verifica stock vs. libro de movimientos en los artículos tocados por la
+    carga (los que tienen movimientos con id > desde_movimiento).
+
+    - el stock actual es el stock_despues del último movimiento
+    - cada movimiento parte del stock en que terminó el anterior
+    - el stock no es negativo
+
+    Returns:
+        list: Descripción de cada violación
+    """
+    tocados = Movimiento.objects.filter(id__gt=desde_movimiento).values('articulo_id').distinct()
+    violaciones = []
+
+    ultimo = Movimiento.objects.filter(articulo=OuterRef('pk')).order_by('-id').values('stock_despues')[:1]
+    for articulo in Articulo.objects.filter(id__in=tocados).annotate(libro=Subquery(ultimo)):
+        if articulo.stock_actual != articulo.libro:
+            violaciones.append(
+                f'{articulo.sku}: stock {articulo.stock_actual} ≠ libro {articulo.libro}'
+            )
+        if articulo.stock_actual < 0:
+            violaciones.append(f'{articulo.sku}: stock negativo {articulo.stock_actual}')
+
+    cortes = Movimiento.objects.filter(articulo_id__in=tocados).annotate(
+        anterior=Window(Lag('stock_despues'), partition_by=[F('articulo_id')], order_by=F('id').asc())
+    ).values('id', 'articulo__sku', 'stock_antes', 'anterior')
+    for mov in cortes:
+        if mov['id'] > desde_movimiento and mov['anterior'] is not None and mov['stock_antes'] != mov['anterior']:
+            violaciones.append(
+                f'{mov["articulo__sku"]}: movimiento {mov["id"]} parte de {mov["stock_antes"]}, '
+                f'el anterior terminó en {mov["anterior"]}'
+            )
+    return violaciones
+
+
+def percentiles(valores: List[float]) -> dict:
+    """p50/p95/p99 y máximo por rango más cercano."""
+    valores = sorted(valores)
+
+    def p(q):
+        return valores[max(0, math.ceil(q / 100 * len(valores)) - 1)]
+
+    return {'n': len(valores), 'p50': p(50), 'p95': p(95), 'p99': p(99), 'max': valores[-1]}
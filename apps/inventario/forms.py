@@ -6,11 +6,11 @@ from django import forms
 from django.contrib.auth.models import User
 from .models import (
     Taller, TipoEquipo, Equipo, MantenimientoEquipo,
-    Marca, Modelo, NombreArticulo, SectorInventario
+    Marca, Modelo, NombreArticulo, SectorInventario, TomaInventario
 )
-from apps.bodega.models import Bodega
+from apps.bodega.models import Bodega, TipoMovimiento
 from apps.compras.models import EstadoOrdenCompra, EstadoRecepcion
-from apps.activos.models import Proveniencia
+from apps.activos.models import Proveniencia, TipoMovimientoActivo
 from apps.solicitudes.models import Departamento
 
 
@@ -232,7 +232,7 @@ class ModeloForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Filtrar solo marcas activas
-        self.fields['marca'].queryset = Marca.objects.filter(activo=True, eliminado=False)
+        self.fields['marca'].queryset = Marca.vivos.filter(activo=True)
 
 
 class NombreArticuloForm(forms.ModelForm):
@@ -264,3 +264,47 @@ class SectorInventarioForm(forms.ModelForm):
             'activo': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
         }
 
+
+class TomaInventarioForm(forms.ModelForm):
+    """Formulario para abrir una toma de inventario"""
+
+    class Meta:
+        model = TomaInventario
+        fields = ['ubicacion', 'bodega', 'observaciones']
+        widgets = {
+            'ubicacion': forms.Select(attrs={'class': 'form-select'}),
+            'bodega': forms.Select(attrs={'class': 'form-select'}),
+            'observaciones': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['ubicacion'].queryset = self.fields['ubicacion'].queryset.filter(
+            activo=True, eliminado=False
+        )
+        self.fields['bodega'].queryset = Bodega.vivos.filter(activo=True)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if bool(cleaned_data.get('ubicacion')) == bool(cleaned_data.get('bodega')):
+            raise forms.ValidationError('Seleccione una ubicación o una bodega (solo una).')
+        return cleaned_data
+
+
+class CerrarTomaInventarioForm(forms.Form):
+    """Formulario para cerrar una toma y elegir los ajustes a aplicar"""
+
+    tipo_movimiento_activo = forms.ModelChoiceField(
+        queryset=TipoMovimientoActivo.vivos.filter(activo=True),
+        required=False,
+        label='Trasladar activos mal ubicados con el tipo',
+        help_text='Dejar vacío para solo informar los activos mal ubicados',
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    tipo_movimiento_bodega = forms.ModelChoiceField(
+        queryset=TipoMovimiento.vivos.filter(activo=True),
+        required=False,
+        label='Ajustar stock a lo contado con el tipo',
+        help_text='Dejar vacío para solo informar las diferencias de stock',
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
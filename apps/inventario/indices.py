@@ -0,0 +1,359 @@
+"""
+Asesor de índices a partir de los planes de ejecución.
+
+Ejecuta los escenarios del benchmark de vistas (apps.inventario.benchmarks)
+capturando cada SELECT, lo pasa por EXPLAIN QUERY PLAN (SQLite) o EXPLAIN
+(PostgreSQL) y marca los recorridos completos de tabla y los ordenamientos
+en B-tree temporal. Para cada hallazgo propone un índice: primero las
+columnas comparadas por igualdad, luego las del ORDER BY (o la del rango);
+los filtros booleanos como eliminado/activo pasan a la condición de un
+índice parcial en vez de ser columnas.
+
+Lo usa el comando `asesor_indices`.
+"""
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.apps import apps
+from django.db import connection, migrations, models
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+
+from apps.inventario import benchmarks
+
+
+# ==================== CAPTURA Y PLANES ====================
+
+def capturar_consultas(ctx: dict, filtro: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Ejecuta cada escenario una vez y registra los SELECT que emite.
+
+    Args:
+        ctx: Contexto de `benchmarks.preparar_contexto`
+        filtro: Solo escenarios cuyo nombre contiene este texto
+
+    Returns:
+        dict: Por texto SQL, los parámetros de la primera ejecución, las
+              veces que se ejecutó y los escenarios que la emitieron
+    """
+    consultas: Dict[str, dict] = {}
+    escenario = None
+
+    def registrar(execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT'):
+            consulta = consultas.setdefault(sql, {'params': tuple(params or ()), 'veces': 0, 'escenarios': set()})
+            consulta['veces'] += 1
+            consulta['escenarios'].add(escenario)
+        return execute(sql, params, many, context)
+
+    with benchmarks.sesion(ctx) as client, connection.execute_wrapper(registrar):
+        for escenario, peticion in benchmarks.ESCENARIOS.items():
+            if not filtro or filtro in escenario:
+                peticion(client, ctx)
+    return consultas
+
+
+def explicar(sql: str, params: tuple) -> List[str]:
+    """
+    Plan de ejecución de una consulta, una línea por paso.
+
+    Raises:
+        ValueError: Si el motor no es SQLite ni PostgreSQL
+    """
+    if connection.vendor == 'sqlite':
+        prefijo, columna = 'EXPLAIN QUERY PLAN ', -1
+    elif connection.vendor == 'postgresql':
+        prefijo, columna = 'EXPLAIN ', 0
+    else:
+        raise ValueError(f'El asesor de índices no soporta el motor {connection.vendor}')
+    with connection.cursor() as cursor:
+        cursor.execute(prefijo + sql, params)
+        return [fila[columna] for fila in cursor.fetchall()]
+
+
+# ==================== ANÁLISIS DEL SQL ====================
+
+# Referencia a columna como la escribe Django: "tabla"."col" o alias U0."col"/T3."col"
+_REF = re.compile(r'(?:"(\w+)"|\b([A-Z]\d+))\."(\w+)"(?:\s+(ASC|DESC))?')
+_SCAN_SQLITE = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?(.*)$')
+_SCAN_POSTGRES = re.compile(r'Seq Scan on (\w+)(?: (\w+))?')
+
+
+def _tablas(sql: str) -> Dict[str, str]:
+    """Alias (y nombres reales) de la consulta → tabla."""
+    alias = {}
+    for tabla, nombre in re.findall(r'(?:FROM|JOIN) "(\w+)"(?: ([A-Z]\d+)\b)?', sql):
+        alias[tabla] = tabla
+        if nombre:
+            alias[nombre] = tabla
+    return alias
+
+
+def _inicio_orden(sql: str) -> int:
+    """Posición del ORDER BY de la consulta externa (nivel 0 de paréntesis), o el largo del SQL."""
+    posicion = sql.rfind(' ORDER BY ')
+    if posicion < 0 or sql[:posicion].count('(') != sql[:posicion].count(')'):
+        return len(sql)
+    return posicion
+
+
+def _parametro(sql: str, posicion: int, params: tuple):
+    """Valor del primer %s desde `posicion`."""
+    indice = sql[:posicion].count('%s')
+    return params[indice] if indice < len(params) else None
+
+
+def columnas_por_tabla(sql: str, params: tuple) -> Dict[str, dict]:
+    """
+    Clasifica, por tabla, las columnas que usan los filtros y el ORDER BY.
+
+    Args:
+        sql: Consulta con marcadores %s
+        params: Parámetros de la consulta
+
+    Returns:
+        dict: Por tabla: igualdad (lista), rango (lista), booleanos
+              ({columna: valor}) y orden (lista de (columna, descendente))
+    """
+    alias = _tablas(sql)
+    fin = _inicio_orden(sql)
+    columnas: Dict[str, dict] = {}
+
+    def info(ref) -> Optional[dict]:
+        tabla = alias.get(ref.group(1) or ref.group(2))
+        if tabla is None:
+            return None
+        return columnas.setdefault(tabla, {'igualdad': [], 'rango': [], 'booleanos': {}, 'orden': []})
+
+    # Filtros: se omite la lista del SELECT (antes del primer FROM)
+    for ref in _REF.finditer(sql, sql.find(' FROM '), fin):
+        destino = info(ref)
+        if destino is None:
+            continue
+        columna = ref.group(3)
+        antes = sql[:ref.start()].rstrip()
+        despues = sql[ref.end():fin].lstrip()
+        if despues.startswith('=') and not despues.startswith('=='):
+            derecha = despues[1:].lstrip()
+            if derecha.startswith('"') or re.match(r'[A-Z]\d+\.', derecha):
+                continue  # condición de JOIN, la cubre el índice de la FK
+            valor = _parametro(sql, sql.index(derecha, ref.end()), params) if derecha.startswith('%s') else None
+            if isinstance(valor, bool):
+                destino['booleanos'][columna] = valor
+            elif columna not in destino['igualdad']:
+                destino['igualdad'].append(columna)
+        elif re.match(r'(IN\b|IS\b)', despues):
+            if columna not in destino['igualdad']:
+                destino['igualdad'].append(columna)
+        elif re.match(r'(<=|>=|<(?!>)|>|BETWEEN\b)', despues):
+            if columna not in destino['rango']:
+                destino['rango'].append(columna)
+        elif despues.startswith('LIKE'):
+            # Solo LIKE 'abc%' (startswith) aprovecha un índice; '%abc%' no
+            valor = _parametro(sql, ref.end(), params)
+            if isinstance(valor, str) and valor and not valor.startswith('%') and columna not in destino['rango']:
+                destino['rango'].append(columna)
+        elif re.search(r'(\(|\bAND|\bOR|\bWHERE|\bNOT)$', antes) and re.match(r'(AND\b|OR\b|\)|$)', despues):
+            # "col" / NOT "col": filtro booleano que Django escribe sin parámetro
+            destino['booleanos'][columna] = not antes.endswith('NOT')
+
+    for ref in _REF.finditer(sql, fin):
+        destino = info(ref)
+        if destino is not None and (ref.group(3), ref.group(4) == 'DESC') not in destino['orden']:
+            destino['orden'].append((ref.group(3), ref.group(4) == 'DESC'))
+    return columnas
+
+
+def hallazgos(plan: List[str], sql: str) -> List[tuple]:
+    """
+    Recorridos completos de tabla y ordenamientos temporales del plan.
+
+    Un SCAN que usa un índice (SQLite) no cuenta como recorrido completo.
+
+    Returns:
+        list: Tuplas (tabla, tipo) con tipo 'scan' u 'orden', sin repetir
+    """
+    alias = _tablas(sql)
+    tablas_orden = sorted({
+        alias[nombre] for ref in _REF.finditer(sql, _inicio_orden(sql))
+        if (nombre := ref.group(1) or ref.group(2)) in alias
+    })
+    resultado = []
+    for paso in plan:
+        paso = paso.strip()
+        sqlite = _SCAN_SQLITE.match(paso)
+        postgres = _SCAN_POSTGRES.search(paso)
+        if sqlite and 'USING' not in sqlite.group(3):
+            tabla = alias.get(sqlite.group(2) or sqlite.group(1))
+            if tabla:
+                resultado.append((tabla, 'scan'))
+        elif postgres:
+            tabla = alias.get(postgres.group(1)) or alias.get((postgres.group(2) or '').upper())
+            if tabla:
+                resultado.append((tabla, 'scan'))
+        elif re.search(r'TEMP B-TREE FOR (RIGHT PART OF |LAST TERM OF )?ORDER BY', paso) or re.match(r'(->\s*)?Sort\b', paso):
+            resultado.extend((tabla, 'orden') for tabla in tablas_orden)
+    return list(dict.fromkeys(resultado))
+
+
+# ==================== PROPUESTAS ====================
+
+def _modelos_por_tabla() -> Dict[str, type]:
+    return {
+        modelo._meta.db_table: modelo for modelo in apps.get_models()
+        if modelo._meta.managed and not modelo._meta.proxy
+    }
+
+
+def _campo(modelo, columna: str) -> Optional[str]:
+    """Nombre del campo del modelo que se guarda en `columna`."""
+    for campo in modelo._meta.concrete_fields:
+        if campo.column == columna:
+            return campo.name
+    return None
+
+
+def _indices_existentes(modelo) -> List[tuple]:
+    """Columnas (en orden) de cada índice que ya tiene la tabla."""
+    meta = modelo._meta
+    existentes = [tuple(campo.lstrip('-') for campo in indice.fields) for indice in meta.indexes]
+    existentes += [tuple(grupo) for grupo in meta.unique_together]
+    existentes += [
+        (campo.name,) for campo in meta.concrete_fields
+        if campo.primary_key or campo.unique or campo.db_index
+    ]
+    return existentes
+
+
+def _nombre_indice(modelo, campos: List[str], condicion: Dict[str, bool]) -> str:
+    """ix_<modelo>_<campos>, recortado a los 30 caracteres que admite Django."""
+    nombre = f'ix_{modelo._meta.model_name[:12]}_' + '_'.join(campo.lstrip('-')[:8] for campo in campos)
+    if condicion:
+        nombre += '_p'
+    if len(nombre) > 30:
+        firma = hashlib.md5(repr((modelo._meta.label, campos, condicion)).encode()).hexdigest()[:4]
+        nombre = f'{nombre[:25].rstrip("_")}_{firma}'
+    return nombre
+
+
+def proponer(modelo, columnas: dict, tipo: str) -> Optional[models.Index]:
+    """
+    Índice para un hallazgo sobre `modelo`.
+
+    Columnas de igualdad primero; luego las del ORDER BY si el hallazgo es
+    un ordenamiento (o si no hay rango), o la primera de rango. Los
+    booleanos van a la condición de un índice parcial.
+
+    Returns:
+        Index | None: None si no hay columnas útiles
+    """
+    campos = [_campo(modelo, columna) for columna in columnas['igualdad']]
+    orden = [('-' if descendente else '') + (_campo(modelo, columna) or '') for columna, descendente in columnas['orden']]
+    rango = [_campo(modelo, columna) for columna in columnas['rango']]
+    if tipo == 'orden' or not rango:
+        campos += orden
+    else:
+        campos += rango[:1]
+    campos = [campo for campo in dict.fromkeys(campos) if campo and campo.lstrip('-')]
+    if not campos:
+        return None
+
+    condicion = {
+        campo: valor for columna, valor in sorted(columnas['booleanos'].items())
+        if (campo := _campo(modelo, columna))
+    }
+    return models.Index(
+        fields=campos,
+        condition=models.Q(**condicion) if condicion else None,
+        name=_nombre_indice(modelo, campos, condicion),
+    )
+
+
+def _cubierto(indice: models.Index, existentes: List[tuple]) -> bool:
+    """El índice propuesto es prefijo de uno que ya existe."""
+    campos = tuple(campo.lstrip('-') for campo in indice.fields)
+    return indice.condition is None and any(existente[:len(campos)] == campos for existente in existentes)
+
+
+def analizar(consultas: Dict[str, dict], min_filas: int = 1000) -> List[dict]:
+    """
+    Analiza las consultas capturadas y agrupa las propuestas por índice.
+
+    Args:
+        consultas: Resultado de `capturar_consultas`
+        min_filas: Tablas con menos filas se ignoran (un recorrido completo
+                   de un catálogo pequeño es lo más barato)
+
+    Returns:
+        list: Por índice propuesto: modelo, indice, tipos de hallazgo,
+              consultas que lo originan (sql, veces, plan) y escenarios;
+              ordenado por cantidad de ejecuciones afectadas
+    """
+    modelos = _modelos_por_tabla()
+    filas: Dict[str, int] = {}
+    propuestas: Dict[tuple, dict] = {}
+
+    for sql, consulta in consultas.items():
+        plan = explicar(sql, consulta['params'])
+        encontrados = hallazgos(plan, sql)
+        if not encontrados:
+            continue
+        columnas = columnas_por_tabla(sql, consulta['params'])
+        for tabla, tipo in encontrados:
+            modelo = modelos.get(tabla)
+            if modelo is None or tabla not in columnas:
+                continue
+            if tabla not in filas:
+                filas[tabla] = modelo._base_manager.count()
+            if filas[tabla] < min_filas:
+                continue
+            indice = proponer(modelo, columnas[tabla], tipo)
+            if indice is None or _cubierto(indice, _indices_existentes(modelo)):
+                continue
+            propuesta = propuestas.setdefault((modelo._meta.label, indice.name), {
+                'modelo': modelo, 'indice': indice, 'filas': filas[tabla],
+                'tipos': set(), 'consultas': [], 'escenarios': set(), 'veces': 0,
+            })
+            propuesta['tipos'].add(tipo)
+            propuesta['escenarios'] |= consulta['escenarios']
+            if sql not in (c['sql'] for c in propuesta['consultas']):
+                propuesta['consultas'].append({'sql': sql, 'veces': consulta['veces'], 'plan': plan})
+                propuesta['veces'] += consulta['veces']
+
+    return sorted(propuestas.values(), key=lambda p: (-p['veces'], p['modelo']._meta.label, p['indice'].name))
+
+
+# ==================== MIGRACIONES ====================
+
+def escribir_migraciones(propuestas: List[dict]) -> List[Path]:
+    """
+    Escribe una migración AddIndex por aplicación con los índices propuestos.
+
+    Los mismos índices deben agregarse a Meta.indexes de cada modelo; si no,
+    el próximo makemigrations los eliminará.
+
+    Returns:
+        list: Rutas de las migraciones escritas
+    """
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    por_app: Dict[str, List[dict]] = {}
+    for propuesta in propuestas:
+        por_app.setdefault(propuesta['modelo']._meta.app_label, []).append(propuesta)
+
+    rutas = []
+    for app_label, lista in sorted(por_app.items()):
+        hojas = sorted(loader.graph.leaf_nodes(app_label))
+        numero = max((MigrationAutodetector.parse_number(nombre) or 0 for _, nombre in hojas), default=0) + 1
+        migracion = migrations.Migration(f'{numero:04d}_indices_sugeridos', app_label)
+        migracion.dependencies = hojas
+        migracion.operations = [
+            migrations.AddIndex(model_name=p['modelo']._meta.model_name, index=p['indice']) for p in lista
+        ]
+        escritor = MigrationWriter(migracion)
+        ruta = Path(escritor.path)
+        ruta.write_text(escritor.as_string(), encoding='utf-8')
+        rutas.append(ruta)
+    return rutas
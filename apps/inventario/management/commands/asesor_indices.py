@@ -0,0 +1,101 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.migrations.serializer import serializer_factory
+
+from apps.bodega.models import Articulo
+from apps.inventario import benchmarks, indices
+
+
+class _Rollback(Exception):
+    """Revierte lo que escriben los escenarios de creación/confirmación."""
+
+
+class Command(BaseCommand):
+    help = (
+        'Asesor de índices: ejecuta los escenarios del benchmark de vistas, pasa '
+        'cada SELECT por EXPLAIN QUERY PLAN (SQLite) / EXPLAIN (PostgreSQL), marca '
+        'recorridos completos de tabla y ordenamientos en B-tree temporal y propone '
+        'índices compuestos o parciales por modelo. Con --migracion los escribe '
+        'como migraciones AddIndex.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--escala', type=float, default=0.01,
+            help='Escala del dataset a generar si no existe (default: 0.01)'
+        )
+        parser.add_argument(
+            '--prefijo', default='DS',
+            help='Prefijo del dataset (default: DS)'
+        )
+        parser.add_argument(
+            '--solo', default=None,
+            help='Analiza solo los escenarios cuyo nombre contiene este texto'
+        )
+        parser.add_argument(
+            '--min-filas', type=int, default=1000,
+            help='Ignora tablas con menos filas (default: 1000)'
+        )
+        parser.add_argument(
+            '--detalle', action='store_true',
+            help='Muestra el SQL y el plan de cada consulta que origina una propuesta'
+        )
+        parser.add_argument(
+            '--migracion', action='store_true',
+            help='Escribe una migración AddIndex por aplicación con las propuestas'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'El asesor de índices no soporta el motor {connection.vendor}')
+
+        prefijo = options['prefijo'].upper()
+        if not Articulo.objects.filter(sku__startswith=f'{prefijo}-').exists():
+            self.stdout.write(f'[+] Generando dataset {prefijo} con escala {options["escala"]}...')
+            call_command('generate_dataset', scale=options['escala'], prefijo=prefijo, stdout=self.stdout)
+
+        self.stdout.write('[+] Capturando consultas de los escenarios...')
+        propuestas = []
+        try:
+            with transaction.atomic():
+                ctx = benchmarks.preparar_contexto(prefijo)
+                consultas = indices.capturar_consultas(ctx, options['solo'])
+                self.stdout.write(f'[+] Analizando {len(consultas)} consultas distintas...\n')
+                propuestas = indices.analizar(consultas, options['min_filas'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        if not propuestas:
+            self.stdout.write(self.style.SUCCESS('[+] Sin recorridos completos ni ordenamientos temporales que indexar'))
+            return
+
+        for propuesta in propuestas:
+            modelo = propuesta['modelo']
+            self.stdout.write(
+                f'[!] {modelo._meta.label} ({propuesta["filas"]} filas): '
+                f'{" y ".join(sorted(propuesta["tipos"]))} en {len(propuesta["consultas"])} consultas, '
+                f'{propuesta["veces"]} ejecuciones ({", ".join(sorted(propuesta["escenarios"]))})'
+            )
+            self.stdout.write(f'    {serializer_factory(propuesta["indice"]).serialize()[0]}')
+            if options['detalle']:
+                for consulta in propuesta['consultas']:
+                    # La lista de columnas del SELECT no aporta: se muestra desde el FROM
+                    sql = consulta['sql']
+                    self.stdout.write(f'      SQL: SELECT ... {sql[sql.find("FROM "):][:400]}')
+                    for paso in consulta['plan']:
+                        self.stdout.write(f'        {paso}')
+
+        if options['migracion']:
+            rutas = indices.escribir_migraciones(propuestas)
+            for ruta in rutas:
+                self.stdout.write(f'[+] Migración escrita: {ruta}')
+            self.stdout.write(self.style.WARNING(
+                '[!] Agregue los mismos índices a Meta.indexes de cada modelo; '
+                'si no, el próximo makemigrations los eliminará'
+            ))
+
+        self.stdout.write(self.style.SUCCESS(f'\n[+] {len(propuestas)} índices propuestos'))
@@ -0,0 +1,92 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.bodega.models import Articulo
+from apps.inventario import benchmarks
+
+
+class _Rollback(Exception):
+    """Revierte lo que escriben los escenarios de creación/confirmación."""
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide las vistas más usadas (listados, menús, reportes, AJAX y flujos de '
+        'creación) con el cliente de pruebas: p50/p95, consultas y memoria máxima. '
+        'Compara contra la línea base versionada y falla si hay regresiones. '
+        'Lo escrito por los escenarios se revierte al terminar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--escala', type=float, default=0.01,
+            help='Escala del dataset a generar si no existe (default: 0.01)'
+        )
+        parser.add_argument(
+            '--prefijo', default='DS',
+            help='Prefijo del dataset (default: DS)'
+        )
+        parser.add_argument(
+            '--repeticiones', type=int, default=20,
+            help='Ejecuciones cronometradas por escenario (default: 20)'
+        )
+        parser.add_argument(
+            '--solo', default=None,
+            help='Ejecuta solo los escenarios cuyo nombre contiene este texto'
+        )
+        parser.add_argument(
+            '--guardar', action='store_true',
+            help='Guarda los resultados como nueva línea base en vez de comparar'
+        )
+        parser.add_argument(
+            '--tolerancia', type=float, default=benchmarks.TOLERANCIA_TIEMPO,
+            help=f'Aumento de p95 tolerado sobre la línea base (default: {benchmarks.TOLERANCIA_TIEMPO})'
+        )
+
+    def handle(self, *args, **options):
+        prefijo = options['prefijo']
+        if not Articulo.objects.filter(sku__startswith=f'{prefijo.upper()}-').exists():
+            self.stdout.write(f'[+] Generando dataset {prefijo} con escala {options["escala"]}...')
+            call_command('generate_dataset', scale=options['escala'], prefijo=prefijo, stdout=self.stdout)
+
+        self.stdout.write(f'[+] Ejecutando escenarios ({options["repeticiones"]} repeticiones)...')
+        for nombre, motivo in benchmarks.OMITIDOS.items():
+            if not options['solo'] or options['solo'] in nombre:
+                self.stdout.write(self.style.WARNING(f'  [!] Omitido {nombre}: {motivo}'))
+        self.stdout.write('')
+        resultados = {}
+        try:
+            with transaction.atomic():
+                ctx = benchmarks.preparar_contexto(prefijo.upper())
+                resultados = benchmarks.ejecutar(ctx, options['repeticiones'], options['solo'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f'  {"Escenario":<32}{"p50 ms":>9}{"p95 ms":>9}{"SQL":>6}{"Mem KB":>10}{"HTTP":>6}')
+        for nombre, r in resultados.items():
+            p50, p95 = (f'{r[k]:.1f}' if r[k] is not None else '-' for k in ('p50_ms', 'p95_ms'))
+            self.stdout.write(
+                f'  {nombre:<32}{p50:>9}{p95:>9}{r["consultas"]:>6}{r["memoria_kb"]:>10.0f}{r["status"]:>6}'
+            )
+
+        if options['guardar']:
+            baseline = benchmarks.cargar_baseline() or {'escenarios': {}}
+            baseline['escenarios'].update(resultados)
+            benchmarks.guardar_baseline(baseline['escenarios'], options['escala'])
+            self.stdout.write(self.style.SUCCESS(f'\n[+] Línea base guardada en {benchmarks.BASELINE}'))
+            return
+
+        baseline = benchmarks.cargar_baseline()
+        if baseline is None:
+            raise CommandError(f'No existe la línea base {benchmarks.BASELINE}; ejecute con --guardar')
+
+        regresiones = benchmarks.comparar(resultados, baseline, tolerancia_tiempo=options['tolerancia'])
+        if regresiones:
+            raise CommandError(
+                f'{len(regresiones)} regresiones contra la línea base:\n  ' + '\n  '.join(regresiones)
+            )
+        self.stdout.write(self.style.SUCCESS('\n[+] Sin regresiones contra la línea base'))
@@ -0,0 +1,151 @@
+import logging
+import multiprocessing
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.bodega.models import Articulo
+from apps.inventario import carga
+
+
+class Command(BaseCommand):
+    help = (
+        'Prueba de carga concurrente: N hilos o procesos repiten flujos completos '
+        '(solicitud → aprobar → despachar, OC → líneas → recepción → confirmar y '
+        'movimientos de bodega) en el mismo proceso o contra un servidor (--url). '
+        'Reporta throughput, percentiles de latencia, errores "database is locked" '
+        'y violaciones de la invariante stock vs. libro de movimientos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--trabajadores', type=int, default=8,
+            help='Hilos o procesos concurrentes (default: 8)'
+        )
+        parser.add_argument(
+            '--procesos', action='store_true',
+            help='Usa procesos en vez de hilos (sin GIL; recomendado con el transporte en proceso)'
+        )
+        parser.add_argument(
+            '--duracion', type=float, default=30,
+            help='Segundos de carga por trabajador (default: 30)'
+        )
+        parser.add_argument(
+            '--iteraciones', type=int, default=10**9,
+            help='Máximo de flujos por trabajador (default: sin límite)'
+        )
+        parser.add_argument(
+            '--flujos', default=','.join(carga.FLUJOS),
+            help=f'Flujos a ejecutar, separados por coma (default: {",".join(carga.FLUJOS)})'
+        )
+        parser.add_argument(
+            '--calientes', type=int, default=5,
+            help='Artículos sobre los que compiten los movimientos (default: 5)'
+        )
+        parser.add_argument(
+            '--url', default=None,
+            help='URL base de un servidor levantado (ej: http://127.0.0.1:8000) que use esta misma base de datos'
+        )
+        parser.add_argument(
+            '--prefijo', default='DS',
+            help='Prefijo del dataset; se genera con escala 0.01 si no existe (default: DS)'
+        )
+        parser.add_argument(
+            '--semilla', type=int, default=42,
+            help='Semilla de la aleatoriedad (default: 42)'
+        )
+
+    def handle(self, *args, **options):
+        flujos = [f.strip() for f in options['flujos'].split(',') if f.strip()]
+        desconocidos = set(flujos) - set(carga.FLUJOS)
+        if desconocidos:
+            raise CommandError(f'Flujos desconocidos: {", ".join(sorted(desconocidos))}')
+
+        prefijo = options['prefijo'].upper()
+        if not Articulo.objects.filter(sku__startswith=f'{prefijo}-').exists():
+            self.stdout.write(f'[+] Generando dataset {prefijo} con escala 0.01...')
+            call_command('generate_dataset', scale=0.01, prefijo=prefijo, stdout=self.stdout)
+
+        trabajadores = options['trabajadores']
+        config = carga.preparar(prefijo, trabajadores, options['calientes'])
+        config.update({
+            'url': options['url'], 'flujos': flujos, 'semilla': options['semilla'],
+            'duracion': options['duracion'], 'iteraciones': options['iteraciones'],
+        })
+
+        modo = 'procesos' if options['procesos'] else 'hilos'
+        destino = options['url'] or 'aplicación en proceso'
+        self.stdout.write(
+            f'[+] {trabajadores} {modo} contra {destino}, flujos {", ".join(flujos)}, '
+            f'{options["duracion"]:.0f} s...'
+        )
+
+        # Los errores se cuentan en el reporte; sin esto cada uno imprime su traza
+        logger = logging.getLogger('django.request')
+        nivel = logger.level
+        logger.setLevel(logging.CRITICAL)
+        inicio = time.perf_counter()
+        try:
+            if options['procesos']:
+                # Los hijos heredan Django ya configurado; cada uno abre su conexión
+                connections.close_all()
+                with multiprocessing.get_context('fork').Pool(trabajadores) as pool:
+                    resultados = pool.starmap(carga.ejecutar_trabajador, [(i, config) for i in range(trabajadores)])
+            else:
+                with ThreadPoolExecutor(trabajadores) as pool:
+                    resultados = list(pool.map(carga.ejecutar_trabajador, range(trabajadores), [config] * trabajadores))
+        finally:
+            logger.setLevel(nivel)
+        duracion = time.perf_counter() - inicio
+
+        self._reportar(resultados, duracion)
+
+        violaciones = carga.verificar_invariantes(config['ultimo_movimiento'])
+        if violaciones:
+            self.stdout.write(self.style.ERROR(f'\n[!] {len(violaciones)} violaciones de invariantes:'))
+            for violacion in violaciones[:50]:
+                self.stdout.write(f'  {violacion}')
+            raise CommandError('La carga dejó el stock inconsistente con el libro de movimientos')
+
+        self.stdout.write(self.style.SUCCESS('\n[+] Invariantes stock vs. libro de movimientos OK'))
+
+    def _reportar(self, resultados, duracion: float) -> None:
+        completados = Counter()
+        pasos = defaultdict(list)
+        errores = Counter()
+        ejemplos = {}
+        for resultado in resultados:
+            completados.update(resultado['completados'])
+            for flujo, paso, ms in resultado['pasos']:
+                pasos[(flujo, paso)].append(ms)
+            for flujo, paso, tipo, mensaje in resultado['errores']:
+                errores[(flujo, tipo)] += 1
+                ejemplos.setdefault((flujo, tipo), mensaje)
+
+        total_flujos = sum(completados.values())
+        total_peticiones = sum(len(v) for v in pasos.values())
+        self.stdout.write(
+            f'\n[+] {total_flujos} flujos completos y {total_peticiones} peticiones en {duracion:.1f} s '
+            f'({total_flujos / duracion:.1f} flujos/s, {total_peticiones / duracion:.1f} peticiones/s)'
+        )
+        for flujo, cantidad in sorted(completados.items()):
+            self.stdout.write(f'  [+] {flujo}: {cantidad} ({cantidad / duracion:.2f}/s)')
+
+        self.stdout.write(f'\n  {"Paso":<44}{"n":>6}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"max ms":>9}')
+        for (flujo, paso), tiempos in sorted(pasos.items()):
+            p = carga.percentiles(tiempos)
+            self.stdout.write(
+                f'  {flujo + " / " + paso:<44}{p["n"]:>6}{p["p50"]:>9.1f}{p["p95"]:>9.1f}'
+                f'{p["p99"]:>9.1f}{p["max"]:>9.1f}'
+            )
+
+        if errores:
+            self.stdout.write(self.style.WARNING(f'\n[!] {sum(errores.values())} errores:'))
+            for (flujo, tipo), cantidad in sorted(errores.items()):
+                self.stdout.write(f'  {flujo:<12}{tipo:<12}{cantidad:>6}  ej: {ejemplos[(flujo, tipo)]}')
+        else:
+            self.stdout.write('\n[+] Sin errores')
@@ -0,0 +1,578 @@
+import io
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from apps.accounts.models import AuthLogAccion, AuthLogs, HistorialLogin, UsuarioToken
+from apps.accounts.services import UsuarioListadoService
+from apps.activos.models import (
+    Activo, CategoriaActivo, EstadoActivo, MovimientoActivo, TipoMovimientoActivo,
+    Ubicacion, UbicacionActual, UnidadMedida
+)
+from apps.bajas_inventario.models import BajaInventario, DetalleBaja, EstadoBaja, MotivoBaja
+from apps.bodega.models import Articulo, Bodega, Categoria, Movimiento, TipoMovimiento
+from apps.bodega.repositories import ArticuloRepository
+from apps.compras.models import DetalleOrdenCompraArticulo, EstadoOrdenCompra, OrdenCompra, Proveedor
+from apps.notificaciones.models import Notificacion, TipoNotificacion
+from apps.solicitudes.models import (
+    Area, Departamento, DetalleSolicitud, EstadoSolicitud, HistorialSolicitud, Solicitud, TipoSolicitud
+)
+
+
+# Filas por tabla con --scale 1 (tamaño de un colegio grande en producción)
+TAMANOS = {
+    'usuarios': 3000,
+    'bodegas': 12,
+    'ubicaciones': 600,
+    'articulos': 8000,
+    'movimientos': 1_000_000,
+    'activos': 100_000,
+    'traslados': 100_000,
+    'proveedores': 300,
+    'ordenes': 8000,
+    'solicitudes': 50_000,
+    'bajas': 2000,
+    'logs': 600_000,
+    'logins': 200_000,
+    'notificaciones': 150_000,
+}
+
+# Contraseña común de los usuarios sintéticos (para los benchmarks con login)
+PASSWORD = 'dataset123'
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera un dataset sintético con el volumen de un colegio en producción '
+        '(activos, movimientos, solicitudes, órdenes de compra, años de logs...). '
+        'Usa aleatoriedad con semilla, inserciones por bloques (bulk_create, o '
+        'executemany en las tablas más grandes) y claves foráneas tomadas de '
+        'pools de IDs en memoria. Con --scale 1 son ~2,3 millones de filas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=float, default=0.1,
+            help='Factor sobre los tamaños de producción (default: 0.1; 1 = tamaño completo)'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=42,
+            help='Semilla de la aleatoriedad (default: 42)'
+        )
+        parser.add_argument(
+            '--anios', type=int, default=3,
+            help='Años de historia de movimientos y logs (default: 3)'
+        )
+        parser.add_argument(
+            '--lote', type=int, default=10000,
+            help='Filas por inserción (default: 10000)'
+        )
+        parser.add_argument(
+            '--prefijo', default='DS',
+            help='Prefijo de los códigos generados (default: DS)'
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.lote = options['lote']
+        self.prefijo = options['prefijo'].upper()
+        self.ahora = timezone.now()
+        self.inicio = self.ahora - timedelta(days=365 * options['anios'])
+        self.n = {
+            nombre: max(1, int(cantidad * options['scale']))
+            for nombre, cantidad in TAMANOS.items()
+        }
+
+        if User.objects.filter(username__startswith=f'{self.prefijo.lower()}_').exists():
+            raise CommandError(
+                f'Ya existe un dataset con prefijo {self.prefijo}; use otro --prefijo o una base vacía'
+            )
+
+        if connection.vendor == 'sqlite' and not connection.in_atomic_block:
+            # Carga masiva: sin fsync por transacción (solo para esta conexión;
+            # SQLite no permite cambiarlo dentro de una transacción)
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA synchronous = OFF')
+
+        self.stdout.write(f'[+] Generando dataset {self.prefijo} (escala {options["scale"]}, semilla {options["seed"]})...')
+        inicio = time.perf_counter()
+        self.total = 0
+
+        self._catalogos()
+        with self._fechas_manuales(
+            Articulo, Movimiento, Activo, MovimientoActivo, UbicacionActual, OrdenCompra,
+            DetalleOrdenCompraArticulo, Solicitud, DetalleSolicitud, HistorialSolicitud,
+            BajaInventario, DetalleBaja
+        ):
+            self._usuarios()
+            self._bodega()
+            self._movimientos()
+            self._activos()
+            self._compras()
+            self._solicitudes()
+            self._bajas()
+            self._auditoria()
+            self._notificaciones()
+
+        duracion = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f'\n[+] Dataset generado: {self.total} filas en {duracion:.1f} s '
+            f'({self.total / max(duracion, 0.001):.0f} filas/s). '
+            f'Usuarios {self.prefijo.lower()}_*, contraseña "{PASSWORD}"'
+        ))
+
+    # ==================== UTILIDADES ====================
+
+    @contextmanager
+    def _fechas_manuales(self, *modelos):
+        """
+        Desactiva auto_now/auto_now_add de los modelos indicados para poder
+        repartir las filas en el tiempo; `_fechar` asigna esas fechas.
+        """
+        self.campos_fecha = {}
+        originales = []
+        for modelo in modelos:
+            campos = []
+            for campo in modelo._meta.concrete_fields:
+                if getattr(campo, 'auto_now', False) or getattr(campo, 'auto_now_add', False):
+                    originales.append((campo, campo.auto_now, campo.auto_now_add))
+                    campo.auto_now = campo.auto_now_add = False
+                    campos.append((campo.attname, isinstance(campo, models.DateTimeField)))
+            self.campos_fecha[modelo] = campos
+        try:
+            yield
+        finally:
+            for campo, auto_now, auto_now_add in originales:
+                campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
+
+    def _fechar(self, obj, fecha):
+        for attname, es_datetime in self.campos_fecha[type(obj)]:
+            setattr(obj, attname, fecha if es_datetime else fecha.date())
+        return obj
+
+    def _fecha(self, i: int, total: int):
+        """Fecha de la fila i de total, repartidas en orden dentro del período."""
+        paso = (self.ahora - self.inicio) / max(total, 1)
+        return self.inicio + paso * i + paso * self.rng.random()
+
+    def _insertar(self, modelo, filas, etiqueta: str = None):
+        """bulk_create por bloques de `lote` sobre un iterable de instancias."""
+        creados, bloque = [], []
+        with transaction.atomic():
+            for fila in filas:
+                bloque.append(fila)
+                if len(bloque) >= self.lote:
+                    creados.extend(modelo.objects.bulk_create(bloque))
+                    bloque = []
+            if bloque:
+                creados.extend(modelo.objects.bulk_create(bloque))
+        self.total += len(creados)
+        if etiqueta:
+            self.stdout.write(f'  [+] {etiqueta}: {len(creados)}')
+        return creados
+
+    def _insertar_ids(self, modelo, filas, etiqueta: str = None):
+        """Como `_insertar`, pero solo conserva los IDs (para tablas grandes)."""
+        ids, bloque = [], []
+        with transaction.atomic():
+            for fila in filas:
+                bloque.append(fila)
+                if len(bloque) >= self.lote:
+                    ids.extend(obj.pk for obj in modelo.objects.bulk_create(bloque))
+                    bloque = []
+            if bloque:
+                ids.extend(obj.pk for obj in modelo.objects.bulk_create(bloque))
+        self.total += len(ids)
+        if etiqueta:
+            self.stdout.write(f'  [+] {etiqueta}: {len(ids)}')
+        return ids
+
+    def _insertar_sql(self, modelo, columnas, filas, etiqueta: str = None) -> int:
+        """
+        INSERT con executemany para las tablas de millones de filas: evita
+        instanciar modelos y compilar SQL por fila, que con bulk_create es
+        la mayor parte del tiempo. `filas` entrega tuplas en el orden de
+        `columnas`, con las fechas ya adaptadas con `_dt`.
+        """
+        ops = connection.ops
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            ops.quote_name(modelo._meta.db_table),
+            ', '.join(ops.quote_name(columna) for columna in columnas),
+            ', '.join(['%s'] * len(columnas))
+        )
+        filas, total = iter(filas), 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            while bloque := list(islice(filas, self.lote)):
+                cursor.executemany(sql, bloque)
+                total += len(bloque)
+        self.total += total
+        if etiqueta:
+            self.stdout.write(f'  [+] {etiqueta}: {total}')
+        return total
+
+    def _dt(self, fecha):
+        """Fecha con zona horaria al formato de la base de datos."""
+        return connection.ops.adapt_datetimefield_value(fecha)
+
+    def _catalogo(self, modelo, codigo: str, **defaults):
+        return modelo.objects.get_or_create(codigo=codigo, defaults=defaults)[0]
+
+    # ==================== CATÁLOGOS ====================
+
+    def _catalogos(self):
+        """Catálogos pequeños: reutiliza los comandos de setup y crea el resto."""
+        salida = io.StringIO()
+        call_command('setup_activos_data', stdout=salida)
+        call_command('setup_solicitudes_data', stdout=salida)
+
+        p = self.prefijo
+        self.acciones = {
+            glosa: AuthLogAccion.objects.get_or_create(glosa=glosa, defaults={'activo': True})[0]
+            for glosa in ('LOGIN', 'LOGOUT', 'LOGIN_FALLIDO', 'CREAR', 'ACTUALIZAR', 'ELIMINAR')
+        }
+        self.tipos_mov = {
+            'ENTRADA': self._catalogo(TipoMovimiento, f'{p}-ENT', nombre='Entrada (dataset)'),
+            'SALIDA': self._catalogo(TipoMovimiento, f'{p}-SAL', nombre='Salida (dataset)'),
+        }
+        self.categorias = [
+            self._catalogo(Categoria, f'{p}-CAT-{i:02d}', nombre=f'Categoría {i}').pk for i in range(40)
+        ]
+        self.categorias_activo = [
+            self._catalogo(CategoriaActivo, f'{p}-CA-{i:02d}', nombre=f'Categoría de activo {i}').pk for i in range(20)
+        ]
+        self.unidad = self._catalogo(UnidadMedida, f'{p}-UN', nombre='Unidad', simbolo='u')
+        self.estados_activo = list(EstadoActivo.objects.filter(activo=True).values_list('pk', flat=True))
+        self.tipo_ingreso = TipoMovimientoActivo.objects.get(codigo='ASIG')
+        self.tipo_traslado = TipoMovimientoActivo.objects.get(codigo='TRASL')
+        self.estados_oc = [
+            self._catalogo(EstadoOrdenCompra, f'{p}-EOC-{i}', nombre=nombre, es_inicial=(i == 0), es_final=(i >= 2))
+            for i, nombre in enumerate(('Pendiente', 'Aprobada', 'Recibida', 'Cancelada'))
+        ]
+        self.estados_solicitud = {e.codigo: e for e in EstadoSolicitud.objects.all()}
+        self.tipos_solicitud = list(TipoSolicitud.objects.values_list('pk', flat=True))
+        self.motivo_baja = self._catalogo(MotivoBaja, f'{p}-MB', nombre='Obsolescencia')
+        self.estado_baja = self._catalogo(EstadoBaja, f'{p}-EB', nombre='Registrada', es_inicial=True)
+        self.tipos_notificacion = [
+            self._catalogo(TipoNotificacion, f'{p}-TN-{i}', nombre=f'Aviso {i}').pk for i in range(5)
+        ]
+        self.departamentos = [
+            self._catalogo(Departamento, f'{p}-DEP-{i:02d}', nombre=f'Departamento {i}') for i in range(10)
+        ]
+        self.areas = [
+            self._catalogo(Area, f'{p}-AR-{i:02d}', nombre=f'Área {i}', departamento=self.departamentos[i % 10])
+            for i in range(40)
+        ]
+        self.stdout.write('  [+] Catálogos listos')
+
+    # ==================== USUARIOS ====================
+
+    def _usuarios(self):
+        prefijo = self.prefijo.lower()
+        password = make_password(PASSWORD)
+        nombres = ('Ana', 'José', 'María', 'Pedro', 'Camila', 'Tomás', 'Valentina', 'Matías', 'Sofía', 'Benjamín')
+        apellidos = ('González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva', 'Martínez', 'Sepúlveda')
+
+        usuarios = self._insertar(User, (
+            User(
+                username=f'{prefijo}_{i:06d}', password=password,
+                first_name=self.rng.choice(nombres), last_name=self.rng.choice(apellidos),
+                email=f'{prefijo}.{i:06d}@colegio.cl', is_staff=i < 20, date_joined=self.inicio
+            )
+            for i in range(self.n['usuarios'])
+        ), 'Usuarios')
+        self.usuarios = [u.pk for u in usuarios]
+
+        self._insertar(UsuarioToken, (
+            UsuarioToken(usuario_id=u.pk, token=token)
+            for u in usuarios for token in UsuarioListadoService.tokens(u)
+        ))
+        grupos = list(Group.objects.values_list('pk', flat=True))
+        if grupos:
+            self._insertar(User.groups.through, (
+                User.groups.through(user_id=pk, group_id=self.rng.choice(grupos)) for pk in self.usuarios
+            ))
+
+    def _usuario(self) -> int:
+        return self.rng.choice(self.usuarios)
+
+    # ==================== BODEGA ====================
+
+    def _bodega(self):
+        p = self.prefijo
+        self.bodegas = [
+            Bodega.objects.create(codigo=f'{p}-BOD-{i:02d}', nombre=f'Bodega {i}', responsable_id=self._usuario()).pk
+            for i in range(self.n['bodegas'])
+        ]
+        articulos = self._insertar(Articulo, (
+            self._fechar(Articulo(
+                sku=f'{p}-ART-{i:06d}', codigo=f'ART{i:06d}', codigo_barras=f'{p}ART{i:06d}',
+                nombre=f'Artículo {i}', categoria_id=self.rng.choice(self.categorias),
+                ubicacion_fisica_id=self.rng.choice(self.bodegas), unidad_medida='UN',
+                stock_minimo=Decimal(self.rng.randint(5, 20)), stock_maximo=Decimal(self.rng.randint(200, 500)),
+                punto_reorden=Decimal(self.rng.randint(20, 40)),
+            ), self.inicio)
+            for i in range(self.n['articulos'])
+        ), 'Artículos')
+        self.articulos = [a.pk for a in articulos]
+
+    def _movimientos(self):
+        """
+        Movimientos de bodega en orden cronológico. El stock de cada artículo
+        se sigue en memoria, así stock_antes/stock_despues encadenan y el
+        stock_actual final coincide con el último movimiento.
+        """
+        stock = dict.fromkeys(self.articulos, 0)
+        total = self.n['movimientos']
+
+        tipos = {operacion: tipo.pk for operacion, tipo in self.tipos_mov.items()}
+
+        def filas():
+            for i in range(total):
+                articulo_id = self.rng.choice(self.articulos)
+                antes = stock[articulo_id]
+                cantidad = self.rng.randint(1, 20)
+                if antes < cantidad or self.rng.random() < 0.45:
+                    operacion, despues = 'ENTRADA', antes + cantidad
+                else:
+                    operacion, despues = 'SALIDA', antes - cantidad
+                stock[articulo_id] = despues
+                fecha = self._dt(self._fecha(i, total))
+                yield (
+                    True, False, fecha, fecha, articulo_id, tipos[operacion], cantidad, operacion,
+                    self._usuario(), 'Movimiento generado', antes, despues
+                )
+
+        self._insertar_sql(Movimiento, (
+            'activo', 'eliminado', 'fecha_creacion', 'fecha_actualizacion', 'articulo_id', 'tipo_id',
+            'cantidad', 'operacion', 'usuario_id', 'motivo', 'stock_antes', 'stock_despues'
+        ), filas(), 'Movimientos de bodega')
+
+        articulos = [Articulo(pk=pk, stock_actual=Decimal(cantidad)) for pk, cantidad in stock.items()]
+        with transaction.atomic():
+            Articulo.objects.bulk_update(articulos, ['stock_actual'], batch_size=1000)
+            ids = list(stock)
+            for inicio in range(0, len(ids), 1000):
+                ArticuloRepository.actualizar_estado_stock(ids[inicio:inicio + 1000])
+
+    # ==================== ACTIVOS ====================
+
+    def _activos(self):
+        p = self.prefijo
+        self.ubicaciones = [
+            Ubicacion.objects.get_or_create(
+                codigo=f'{p}-UB-{i:04d}', defaults={'nombre': f'Sala {i}', 'edificio': f'Edificio {i % 6}'}
+            )[0].pk
+            for i in range(self.n['ubicaciones'])
+        ]
+        total = self.n['activos']
+        self.activos = self._insertar_ids(Activo, (
+            self._fechar(Activo(
+                codigo=f'{p}-ACT-{i:07d}', codigo_barras=f'{p}ACT{i:07d}', nombre=f'Activo {i}',
+                categoria_id=self.rng.choice(self.categorias_activo), unidad_medida=self.unidad,
+                estado_id=self.rng.choice(self.estados_activo),
+                precio_unitario=Decimal(self.rng.randint(5, 2000) * 1000),
+            ), self._fecha(i, total))
+            for i in range(total)
+        ), 'Activos')
+
+        # Ingreso de cada activo y luego traslados al azar; se recuerda el
+        # último movimiento de cada activo para UbicacionActual
+        ultimo = {}
+
+        def filas():
+            traslados = self.n['traslados']
+            for i, activo_id in enumerate(self.activos):
+                ubicacion_id = self.rng.choice(self.ubicaciones)
+                ultimo[activo_id] = ubicacion_id
+                yield self._fechar(MovimientoActivo(
+                    activo_id=activo_id, tipo_movimiento=self.tipo_ingreso, ubicacion_destino_id=ubicacion_id,
+                    usuario_registro_id=self._usuario(),
+                ), self._fecha(i, total))
+            for i in range(traslados):
+                activo_id = self.rng.choice(self.activos)
+                ubicacion_id = self.rng.choice(self.ubicaciones)
+                ultimo[activo_id] = ubicacion_id
+                yield self._fechar(MovimientoActivo(
+                    activo_id=activo_id, tipo_movimiento=self.tipo_traslado, ubicacion_destino_id=ubicacion_id,
+                    responsable_id=self._usuario(), usuario_registro_id=self._usuario(),
+                ), self._fecha(i, traslados))
+
+        ids = self._insertar_ids(MovimientoActivo, filas(), 'Movimientos de activos')
+
+        # El último movimiento de cada activo es el de mayor ID
+        ultimo_mov = {}
+        for mov_id, activo_id in MovimientoActivo.objects.filter(
+            id__gte=min(ids)
+        ).values_list('id', 'activo_id').iterator(chunk_size=self.lote):
+            ultimo_mov[activo_id] = mov_id
+        self._insertar(UbicacionActual, (
+            self._fechar(UbicacionActual(
+                activo_id=activo_id, ubicacion_id=ultimo[activo_id], ultimo_movimiento_id=mov_id,
+            ), self.ahora)
+            for activo_id, mov_id in ultimo_mov.items()
+        ), 'Ubicaciones actuales')
+
+    # ==================== COMPRAS ====================
+
+    def _compras(self):
+        p = self.prefijo
+        self.proveedores = [
+            Proveedor.objects.create(
+                rut=f'{76000000 + i}-{i % 10}', razon_social=f'Proveedor {i} SpA', direccion=f'Calle {i}'
+            ).pk
+            for i in range(self.n['proveedores'])
+        ]
+        total = self.n['ordenes']
+        ordenes = self._insertar(OrdenCompra, (
+            self._fechar(OrdenCompra(
+                numero=f'{p}-OC-{i:06d}', fecha_orden=self._fecha(i, total).date(),
+                proveedor_id=self.rng.choice(self.proveedores), bodega_destino_id=self.rng.choice(self.bodegas),
+                estado=self.rng.choice(self.estados_oc), solicitante_id=self._usuario(),
+            ), self._fecha(i, total))
+            for i in range(total)
+        ), 'Órdenes de compra')
+
+        def detalles():
+            for orden in ordenes:
+                for articulo_id in self.rng.sample(self.articulos, min(len(self.articulos), self.rng.randint(1, 6))):
+                    cantidad, precio = Decimal(self.rng.randint(1, 100)), Decimal(self.rng.randint(500, 50000))
+                    yield self._fechar(DetalleOrdenCompraArticulo(
+                        orden_compra_id=orden.pk, articulo_id=articulo_id, cantidad=cantidad,
+                        precio_unitario=precio, subtotal=cantidad * precio,
+                    ), orden.fecha_creacion)
+
+        self._insertar_ids(DetalleOrdenCompraArticulo, detalles(), 'Detalles de órdenes')
+
+    # ==================== SOLICITUDES ====================
+
+    def _solicitudes(self):
+        p = self.prefijo
+        estados = [c for c in ('PENDIENTE', 'APROBADA', 'DESPACHADA', 'RECHAZADA') if c in self.estados_solicitud]
+        total = self.n['solicitudes']
+
+        def filas():
+            for i in range(total):
+                fecha = self._fecha(i, total)
+                estado = self.estados_solicitud[self.rng.choice(estados)]
+                area = self.rng.choice(self.areas)
+                solicitud = Solicitud(
+                    numero=f'{p}-SOL-{i:06d}', fecha_requerida=(fecha + timedelta(days=7)).date(),
+                    tipo_solicitud_id=self.rng.choice(self.tipos_solicitud), estado=estado,
+                    solicitante_id=self._usuario(), area_solicitante=area.nombre,
+                    departamento_id=area.departamento_id, area=area,
+                    bodega_origen_id=self.rng.choice(self.bodegas), motivo='Solicitud generada',
+                )
+                if estado.codigo in ('APROBADA', 'DESPACHADA'):
+                    solicitud.aprobador_id, solicitud.fecha_aprobacion = self._usuario(), fecha + timedelta(hours=4)
+                if estado.codigo == 'DESPACHADA':
+                    solicitud.despachador_id, solicitud.fecha_despacho = self._usuario(), fecha + timedelta(days=1)
+                yield self._fechar(solicitud, fecha)
+
+        solicitudes = self._insertar(Solicitud, filas(), 'Solicitudes')
+
+        def detalles():
+            for solicitud in solicitudes:
+                for articulo_id in self.rng.sample(self.articulos, min(len(self.articulos), self.rng.randint(1, 5))):
+                    cantidad = Decimal(self.rng.randint(1, 30))
+                    aprobada = solicitud.aprobador_id is not None
+                    yield self._fechar(DetalleSolicitud(
+                        solicitud_id=solicitud.pk, articulo_id=articulo_id, cantidad_solicitada=cantidad,
+                        cantidad_aprobada=cantidad if aprobada else Decimal(0),
+                        cantidad_despachada=cantidad if solicitud.despachador_id else Decimal(0),
+                    ), solicitud.fecha_solicitud)
+
+        self._insertar_ids(DetalleSolicitud, detalles(), 'Detalles de solicitudes')
+        self._insertar_ids(HistorialSolicitud, (
+            self._fechar(HistorialSolicitud(
+                solicitud_id=s.pk, estado_nuevo=s.estado, usuario_id=s.solicitante_id,
+            ), s.fecha_solicitud)
+            for s in solicitudes
+        ), 'Historial de solicitudes')
+
+    # ==================== BAJAS ====================
+
+    def _bajas(self):
+        p = self.prefijo
+        total = self.n['bajas']
+        bajas = self._insertar(BajaInventario, (
+            self._fechar(BajaInventario(
+                numero=f'{p}-BAJ-{i:06d}', fecha_baja=self._fecha(i, total).date(),
+                motivo=self.motivo_baja, estado=self.estado_baja, bodega_id=self.rng.choice(self.bodegas),
+                solicitante_id=self._usuario(), descripcion='Baja generada',
+            ), self._fecha(i, total))
+            for i in range(total)
+        ), 'Bajas')
+
+        def detalles():
+            for baja in bajas:
+                for activo_id in self.rng.sample(self.activos, min(len(self.activos), self.rng.randint(1, 3))):
+                    valor = Decimal(self.rng.randint(5, 500) * 1000)
+                    yield self._fechar(DetalleBaja(
+                        baja_id=baja.pk, activo_id=activo_id, cantidad=Decimal(1),
+                        valor_unitario=valor, valor_total=valor,
+                    ), baja.fecha_registro)
+
+        self._insertar_ids(DetalleBaja, detalles(), 'Detalles de bajas')
+
+    # ==================== AUDITORÍA Y ACCESOS ====================
+
+    def _auditoria(self):
+        total = self.n['logs']
+        acciones = [(accion.pk, accion.glosa) for accion in self.acciones.values()]
+
+        def logs():
+            for i in range(total):
+                accion_id, glosa = self.rng.choice(acciones)
+                usuario_id = None if glosa == 'LOGIN_FALLIDO' else self._usuario()
+                yield (
+                    usuario_id, accion_id, f'{glosa.capitalize()} registro {self.rng.randint(1, 99999)}',
+                    f'10.{self.rng.randint(0, 3)}.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}',
+                    'Mozilla/5.0 (dataset)', self._dt(self._fecha(i, total))
+                )
+
+        self._insertar_sql(AuthLogs, (
+            'usuario_id', 'accion_id', 'descripcion', 'ip_usuario', 'agente', 'fecha_creacion'
+        ), logs(), 'Logs de auditoría')
+
+        total = self.n['logins']
+        self._insertar_sql(HistorialLogin, (
+            'usuario_id', 'direccion_ip', 'agente', 'fecha_login'
+        ), (
+            (
+                self._usuario(), f'10.0.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}',
+                'Mozilla/5.0 (dataset)', self._dt(self._fecha(i, total))
+            )
+            for i in range(total)
+        ), 'Historial de logins')
+        self.stdout.write('  [!] Ejecute backfill_resumen_accesos para los resúmenes del panel de accesos')
+
+    # ==================== NOTIFICACIONES ====================
+
+    def _notificaciones(self):
+        total = self.n['notificaciones']
+        limite_leidas = self.ahora - timedelta(days=30)
+
+        def filas():
+            for i in range(total):
+                fecha = self._fecha(i, total)
+                leida = fecha < limite_leidas or self.rng.random() < 0.5
+                yield (
+                    True, False, self._dt(fecha), self._dt(fecha), self.rng.choice(self.tipos_notificacion),
+                    self._usuario(), 'Notificación generada', 'Mensaje de prueba', leida,
+                    self._dt(fecha + timedelta(hours=2)) if leida else None, False, False
+                )
+
+        self._insertar_sql(Notificacion, (
+            'activo', 'eliminado', 'fecha_creacion', 'fecha_actualizacion', 'tipo_id', 'usuario_destino_id',
+            'titulo', 'mensaje', 'leida', 'fecha_lectura', 'archivada', 'email_enviado'
+        ), filas(), 'Notificaciones')
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2026-10-18 20:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activos', '0006_activo_nombre_articulo_activo_sector_and_more'),
+        ('bodega', '0005_remove_articulo_marca_old'),
+        ('inventario', '0002_marca_alter_equipo_options_alter_equipo_activo_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TomaInventario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('activo', models.BooleanField(default=True, help_text='Estado activo/inactivo del registro', verbose_name='Activo')),
+                ('eliminado', models.BooleanField(default=False, help_text='Estado eliminado/no eliminado del registro', verbose_name='Eliminado')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, help_text='Fecha y hora de creación del registro', verbose_name='Fecha de Creación')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True, help_text='Fecha y hora de última actualización', verbose_name='Fecha de Actualización')),
+                ('numero', models.CharField(max_length=20, unique=True, verbose_name='Número')),
+                ('estado', models.CharField(choices=[('ABIERTA', 'Abierta'), ('CERRADA', 'Cerrada'), ('ANULADA', 'Anulada')], default='ABIERTA', max_length=20, verbose_name='Estado')),
+                ('fecha_cierre', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Cierre')),
+                ('observaciones', models.TextField(blank=True, null=True, verbose_name='Observaciones')),
+                ('resultado', models.JSONField(blank=True, help_text='Diferencias calculadas al cerrar la toma', null=True, verbose_name='Resultado')),
+                ('bodega', models.ForeignKey(blank=True, help_text='Bodega cuyos artículos se cuentan', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='tomas_inventario', to='bodega.bodega', verbose_name='Bodega')),
+                ('responsable', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='tomas_inventario', to=settings.AUTH_USER_MODEL, verbose_name='Responsable')),
+                ('ubicacion', models.ForeignKey(blank=True, help_text='Ubicación cuyos activos se cuentan', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='tomas_inventario', to='activos.ubicacion', verbose_name='Ubicación')),
+            ],
+            options={
+                'verbose_name': 'Toma de Inventario',
+                'verbose_name_plural': 'Tomas de Inventario',
+                'db_table': 'inventario_toma',
+                'ordering': ['-fecha_creacion'],
+                'permissions': [('cerrar_tomainventario', 'Puede cerrar tomas de inventario y aplicar ajustes')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LecturaTomaInventario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo_barras', models.CharField(max_length=100, verbose_name='Código de Barras')),
+                ('cantidad', models.DecimalField(decimal_places=2, default=1, max_digits=10, verbose_name='Cantidad')),
+                ('fecha_lectura', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Lectura')),
+                ('activo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='lecturas_toma', to='activos.activo', verbose_name='Activo')),
+                ('articulo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='lecturas_toma', to='bodega.articulo', verbose_name='Artículo')),
+                ('toma', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lecturas', to='inventario.tomainventario', verbose_name='Toma')),
+            ],
+            options={
+                'verbose_name': 'Lectura de Toma de Inventario',
+                'verbose_name_plural': 'Lecturas de Toma de Inventario',
+                'db_table': 'inventario_toma_lectura',
+                'ordering': ['toma', 'id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tomainventario',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('bodega__isnull', True), ('ubicacion__isnull', False)), models.Q(('bodega__isnull', False), ('ubicacion__isnull', True)), _connector='OR'), name='inventario_toma_ubicacion_o_bodega'),
+        ),
+    ]
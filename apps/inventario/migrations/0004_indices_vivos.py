@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activos', '0007_indices_vivos'),
+        ('bodega', '0006_indices_vivos'),
+        ('inventario', '0003_toma_inventario'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_equipo_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='mantenimientoequipo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['equipo', '-fecha_mantenimiento'], name='ix_mant_equipo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='marca',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['nombre'], name='ix_marca_nombre_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='modelo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['marca', 'nombre'], name='ix_modelo_marca_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='nombrearticulo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['nombre'], name='ix_nomart_nombre_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='sectorinventario',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_sector_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='taller',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_taller_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='tipoequipo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_tipoequipo_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='tomainventario',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['-fecha_creacion'], name='ix_toma_fecha_vivo'),
+        ),
+    ]
@@ -5,7 +5,7 @@ Incluye modelos faltantes que se requieren para la gestión completa.
 
 from django.db import models
 from django.contrib.auth.models import User
-from core.models import BaseModel
+from core.models import BaseModel, indice_vivos
 
 
 class Taller(BaseModel):
@@ -57,6 +57,9 @@ class Taller(BaseModel):
         verbose_name = 'Taller'
         verbose_name_plural = 'Talleres'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_taller_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -88,6 +91,9 @@ class TipoEquipo(BaseModel):
         verbose_name = 'Tipo de Equipo'
         verbose_name_plural = 'Tipos de Equipos'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_tipoequipo_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -192,6 +198,9 @@ class Equipo(BaseModel):
             ('asignar_equipos', 'Puede asignar equipos a usuarios/talleres'),
             ('ver_mantenimientos', 'Puede ver historial de mantenimientos'),
         ]
+        indexes = [
+            indice_vivos('codigo', nombre='ix_equipo_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -245,6 +254,9 @@ class MantenimientoEquipo(BaseModel):
         verbose_name = 'Mantenimiento de Equipo'
         verbose_name_plural = 'Mantenimientos de Equipos'
         ordering = ['-fecha_mantenimiento']
+        indexes = [
+            indice_vivos('equipo', '-fecha_mantenimiento', nombre='ix_mant_equipo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.equipo.codigo} - {self.fecha_mantenimiento} - {self.tipo_mantenimiento}"
@@ -270,6 +282,9 @@ class Marca(BaseModel):
         verbose_name_plural = 'Marcas'
         ordering = ['nombre']
     
+        indexes = [
+            indice_vivos('nombre', nombre='ix_marca_nombre_vivo'),
+        ]
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
 
@@ -298,6 +313,9 @@ class Modelo(BaseModel):
         ordering = ['marca__nombre', 'nombre']
         unique_together = [['marca', 'nombre']]  # Evita duplicados por marca
     
+        indexes = [
+            indice_vivos('marca', 'nombre', nombre='ix_modelo_marca_vivo'),
+        ]
     def __str__(self):
         return f"{self.marca.nombre} - {self.nombre}"
 
@@ -327,6 +345,9 @@ class NombreArticulo(BaseModel):
         verbose_name_plural = 'Nombres de Artículos'
         ordering = ['nombre']
     
+        indexes = [
+            indice_vivos('nombre', nombre='ix_nomart_nombre_vivo'),
+        ]
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
 
@@ -360,6 +381,145 @@ class SectorInventario(BaseModel):
         verbose_name_plural = 'Sectores de Inventario'
         ordering = ['codigo']
     
+        indexes = [
+            indice_vivos('codigo', nombre='ix_sector_codigo_vivo'),
+        ]
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
 
+
+
+# ==================== TOMA DE INVENTARIO ====================
+
+class TomaInventario(BaseModel):
+    """
+    Sesión de conteo físico (toma de inventario) de una ubicación o bodega.
+
+    Las lecturas del escáner se acumulan en LecturaTomaInventario mientras la
+    toma está abierta; al cerrarla se guarda en `resultado` la diferencia entre
+    lo esperado según el sistema y lo efectivamente encontrado.
+    """
+    ESTADO_ABIERTA = 'ABIERTA'
+    ESTADO_CERRADA = 'CERRADA'
+    ESTADO_ANULADA = 'ANULADA'
+
+    numero = models.CharField(max_length=20, unique=True, verbose_name='Número')
+    ubicacion = models.ForeignKey(
+        'activos.Ubicacion',
+        on_delete=models.PROTECT,
+        related_name='tomas_inventario',
+        blank=True,
+        null=True,
+        verbose_name='Ubicación',
+        help_text='Ubicación cuyos activos se cuentan'
+    )
+    bodega = models.ForeignKey(
+        'bodega.Bodega',
+        on_delete=models.PROTECT,
+        related_name='tomas_inventario',
+        blank=True,
+        null=True,
+        verbose_name='Bodega',
+        help_text='Bodega cuyos artículos se cuentan'
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=[
+            (ESTADO_ABIERTA, 'Abierta'),
+            (ESTADO_CERRADA, 'Cerrada'),
+            (ESTADO_ANULADA, 'Anulada'),
+        ],
+        default=ESTADO_ABIERTA,
+        verbose_name='Estado'
+    )
+    responsable = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name='tomas_inventario',
+        verbose_name='Responsable'
+    )
+    fecha_cierre = models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Cierre')
+    observaciones = models.TextField(blank=True, null=True, verbose_name='Observaciones')
+    resultado = models.JSONField(
+        blank=True,
+        null=True,
+        verbose_name='Resultado',
+        help_text='Diferencias calculadas al cerrar la toma'
+    )
+
+    class Meta:
+        db_table = 'inventario_toma'
+        verbose_name = 'Toma de Inventario'
+        verbose_name_plural = 'Tomas de Inventario'
+        ordering = ['-fecha_creacion']
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    models.Q(ubicacion__isnull=False, bodega__isnull=True) |
+                    models.Q(ubicacion__isnull=True, bodega__isnull=False)
+                ),
+                name='inventario_toma_ubicacion_o_bodega'
+            ),
+        ]
+        permissions = [
+            ('cerrar_tomainventario', 'Puede cerrar tomas de inventario y aplicar ajustes'),
+        ]
+        indexes = [
+            indice_vivos('-fecha_creacion', nombre='ix_toma_fecha_vivo'),
+        ]
+
+    def __str__(self):
+        return f"{self.numero} - {self.ubicacion or self.bodega}"
+
+    @property
+    def esta_abierta(self) -> bool:
+        return self.estado == self.ESTADO_ABIERTA
+
+
+class LecturaTomaInventario(models.Model):
+    """
+    Lecturas de códigos de barras registradas durante una toma.
+
+    Se guarda una fila por código y lote recibido (con la cantidad de veces
+    leído), ya resuelta al activo o artículo correspondiente para que el
+    cierre no necesite volver a buscar por código.
+    """
+    toma = models.ForeignKey(
+        TomaInventario,
+        on_delete=models.CASCADE,
+        related_name='lecturas',
+        verbose_name='Toma'
+    )
+    codigo_barras = models.CharField(max_length=100, verbose_name='Código de Barras')
+    cantidad = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=1,
+        verbose_name='Cantidad'
+    )
+    activo = models.ForeignKey(
+        'activos.Activo',
+        on_delete=models.SET_NULL,
+        related_name='lecturas_toma',
+        blank=True,
+        null=True,
+        verbose_name='Activo'
+    )
+    articulo = models.ForeignKey(
+        'bodega.Articulo',
+        on_delete=models.SET_NULL,
+        related_name='lecturas_toma',
+        blank=True,
+        null=True,
+        verbose_name='Artículo'
+    )
+    fecha_lectura = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Lectura')
+
+    class Meta:
+        db_table = 'inventario_toma_lectura'
+        verbose_name = 'Lectura de Toma de Inventario'
+        verbose_name_plural = 'Lecturas de Toma de Inventario'
+        ordering = ['toma', 'id']
+
+    def __str__(self):
+        return f"{self.toma.numero} - {self.codigo_barras} ({self.cantidad})"
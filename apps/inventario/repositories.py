@@ -0,0 +1,121 @@
+"""
+Repository Pattern para el módulo de inventario.
+
+Separa la lógica de acceso a datos de la lógica de negocio,
+siguiendo el principio de Inversión de Dependencias (SOLID).
+"""
+from typing import Optional, List
+from django.db.models import QuerySet, Sum
+from apps.activos.models import UbicacionActual, Ubicacion
+from apps.bodega.models import Articulo, Bodega
+from .models import TomaInventario, LecturaTomaInventario
+
+
+# ==================== TOMA INVENTARIO REPOSITORY ====================
+
+class TomaInventarioRepository:
+    """Repository para gestionar tomas de inventario."""
+
+    @staticmethod
+    def get_all() -> QuerySet[TomaInventario]:
+        """Retorna todas las tomas no eliminadas con relaciones optimizadas."""
+        return TomaInventario.vivos.select_related(
+            'ubicacion', 'bodega', 'responsable'
+        ).order_by('-fecha_creacion')
+
+    @staticmethod
+    def get_by_id(toma_id: int) -> Optional[TomaInventario]:
+        """Obtiene una toma por su ID."""
+        try:
+            return TomaInventario.vivos.select_related(
+                'ubicacion', 'bodega', 'responsable'
+            ).get(id=toma_id)
+        except TomaInventario.DoesNotExist:
+            return None
+
+    @staticmethod
+    def get_for_update(toma_id: int) -> TomaInventario:
+        """Obtiene la toma bloqueando su fila hasta el fin de la transacción."""
+        return TomaInventario.vivos.select_for_update().get(id=toma_id)
+
+    @staticmethod
+    def exists_abierta(ubicacion: Optional[Ubicacion] = None, bodega: Optional[Bodega] = None) -> bool:
+        """Verifica si ya hay una toma abierta para la ubicación o bodega."""
+        return TomaInventario.vivos.filter(
+            ubicacion=ubicacion,
+            bodega=bodega,
+            estado=TomaInventario.ESTADO_ABIERTA
+        ).exists()
+
+
+# ==================== LECTURA TOMA REPOSITORY ====================
+
+class LecturaTomaInventarioRepository:
+    """Repository para las lecturas de códigos de barras de una toma."""
+
+    @staticmethod
+    def bulk_create(lecturas: List[LecturaTomaInventario], batch_size: int = 500) -> List[LecturaTomaInventario]:
+        """Inserta un lote de lecturas."""
+        return LecturaTomaInventario.objects.bulk_create(lecturas, batch_size=batch_size)
+
+    @staticmethod
+    def get_resumen_activos(toma: TomaInventario) -> QuerySet:
+        """
+        Agrupa las lecturas de la toma por código con el activo y su ubicación actual.
+
+        Es el lado "encontrado" de la conciliación de activos: una sola consulta.
+        """
+        return LecturaTomaInventario.objects.filter(
+            toma=toma
+        ).values(
+            'codigo_barras', 'activo_id', 'activo__codigo', 'activo__nombre',
+            'activo__ubicacion_actual__ubicacion__codigo'
+        ).annotate(
+            total=Sum('cantidad')
+        ).order_by()
+
+    @staticmethod
+    def get_resumen_articulos(toma: TomaInventario) -> QuerySet:
+        """
+        Agrupa las lecturas de la toma por código con el artículo y su bodega.
+
+        Es el lado "encontrado" de la conciliación de bodega: una sola consulta.
+        """
+        return LecturaTomaInventario.objects.filter(
+            toma=toma
+        ).values(
+            'codigo_barras', 'articulo_id', 'articulo__sku', 'articulo__nombre',
+            'articulo__ubicacion_fisica__codigo'
+        ).annotate(
+            total=Sum('cantidad')
+        ).order_by()
+
+    @staticmethod
+    def count_by_toma(toma: TomaInventario) -> int:
+        """Cuenta las filas de lectura de una toma."""
+        return LecturaTomaInventario.objects.filter(toma=toma).count()
+
+
+# ==================== ESPERADOS (LADO SISTEMA) ====================
+
+class InventarioEsperadoRepository:
+    """Repository con lo que el sistema espera encontrar en una toma."""
+
+    @staticmethod
+    def get_activos_en_ubicacion(ubicacion: Ubicacion) -> QuerySet:
+        """Activos cuya ubicación actual es la indicada (una sola consulta)."""
+        return UbicacionActual.objects.filter(
+            ubicacion=ubicacion,
+            activo__eliminado=False
+        ).values_list(
+            'activo_id', 'activo__codigo', 'activo__nombre'
+        ).order_by()
+
+    @staticmethod
+    def get_articulos_en_bodega(bodega: Bodega) -> QuerySet:
+        """Artículos de la bodega con su stock (una sola consulta)."""
+        return Articulo.vivos.filter(
+            ubicacion_fisica=bodega
+        ).values_list(
+            'id', 'sku', 'nombre', 'stock_actual'
+        ).order_by()
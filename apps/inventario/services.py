@@ -0,0 +1,502 @@
+"""
+Service Layer para el módulo de inventario.
+
+Contiene la lógica de negocio transversal a activos y artículos de bodega,
+siguiendo el principio de Single Responsibility (SOLID).
+"""
+from collections import Counter
+from decimal import Decimal
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from core.utils import generar_codigo_unico
+from apps.activos.models import Ubicacion, TipoMovimientoActivo
+from apps.activos.repositories import ActivoRepository
+from apps.activos.services import MovimientoActivoService
+from apps.bodega.models import Bodega, TipoMovimiento
+from apps.bodega.repositories import ArticuloRepository
+from apps.bodega.services import MovimientoService
+from .models import TomaInventario, LecturaTomaInventario
+from .repositories import (
+    TomaInventarioRepository, LecturaTomaInventarioRepository,
+    InventarioEsperadoRepository
+)
+
+
+# ==================== ESCÁNER SERVICE ====================
+
+class EscanerService:
+    """
+    Service para resolver códigos de barras leídos por escáneres de mano.
+
+    Cada código se resuelve a un resumen compacto de Activo o Artículo. Los
+    resúmenes se guardan en la caché del proceso con clave por código de
+    barras; las señales de guardado/eliminación y las operaciones masivas
+    invalidan las claves afectadas, de modo que las lecturas repetidas no
+    tocan la base de datos.
+    """
+
+    CACHE_PREFIX = 'escaner:'
+    # Permiso que exige cada tipo de resumen
+    PERMISOS = {'activo': 'activos.view_activo', 'articulo': 'bodega.view_articulo'}
+
+    @classmethod
+    def _cache_key(cls, codigo_barras: str) -> str:
+        return f'{cls.CACHE_PREFIX}{codigo_barras}'
+
+    @staticmethod
+    def normalizar_codigos(codigos: Iterable[Any]) -> List[str]:
+        """
+        Limpia una lista de códigos leídos: quita espacios, vacíos y duplicados.
+
+        Args:
+            codigos: Códigos tal como llegan del escáner
+
+        Returns:
+            Lista de códigos únicos en el orden recibido
+        """
+        limpios = (str(codigo).strip() for codigo in codigos if codigo is not None)
+        return list(dict.fromkeys(codigo for codigo in limpios if codigo))
+
+    @classmethod
+    def tipos_permitidos(cls, usuario) -> Tuple[str, ...]:
+        """Tipos de resumen ('activo', 'articulo') que el usuario puede ver."""
+        return tuple(tipo for tipo, permiso in cls.PERMISOS.items() if usuario.has_perm(permiso))
+
+    def resolver(
+        self,
+        codigos: List[str],
+        tipos: Iterable[str] = ('activo', 'articulo')
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resuelve un lote de códigos de barras.
+
+        Primero se consulta la caché con un único get_many; los códigos que
+        faltan se buscan con una consulta por modelo sobre el índice único de
+        codigo_barras (primero activos, luego artículos). Los resúmenes de un
+        tipo no incluido en `tipos` se descartan; si el código resolvió a un
+        activo y se permiten artículos, se busca además como artículo.
+
+        Args:
+            codigos: Códigos de barras normalizados
+            tipos: Tipos de resumen que se pueden retornar
+
+        Returns:
+            Diccionario código -> resumen (None si el código no existe o no
+            es de un tipo permitido)
+        """
+        tipos = set(tipos)
+        resueltos = self._resolver(codigos)
+        ocultos = [codigo for codigo, resumen in resueltos.items() if resumen and resumen['tipo'] not in tipos]
+        if ocultos:
+            resueltos.update(dict.fromkeys(ocultos))
+            if 'articulo' in tipos:
+                resueltos.update(self._buscar_articulos(ocultos))
+        return resueltos
+
+    def _resolver(self, codigos: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Resuelve los códigos sin filtrar por tipo, pasando por la caché."""
+        claves = {self._cache_key(codigo): codigo for codigo in codigos}
+        en_cache = cache.get_many(list(claves))
+        resultados: Dict[str, Optional[Dict[str, Any]]] = {
+            claves[clave]: resumen for clave, resumen in en_cache.items()
+        }
+
+        pendientes = [codigo for codigo in codigos if codigo not in resultados]
+        if pendientes:
+            encontrados = self._buscar_activos(pendientes)
+            restantes = [codigo for codigo in pendientes if codigo not in encontrados]
+            if restantes:
+                encontrados.update(self._buscar_articulos(restantes))
+
+            if encontrados:
+                cache.set_many(
+                    {self._cache_key(codigo): resumen for codigo, resumen in encontrados.items()},
+                    timeout=settings.ESCANER_CACHE_TIMEOUT
+                )
+            resultados.update(encontrados)
+
+        return {codigo: resultados.get(codigo) for codigo in codigos}
+
+    @staticmethod
+    def _buscar_activos(codigos: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Busca activos por código de barras y arma sus resúmenes."""
+        return {
+            fila['codigo_barras']: {
+                'tipo': 'activo',
+                'id': fila['id'],
+                'codigo': fila['codigo'],
+                'nombre': fila['nombre'],
+                'estado': fila['estado__codigo'],
+                'ubicacion': fila['ubicacion_actual__ubicacion__codigo'],
+            }
+            for fila in ActivoRepository.get_resumen_by_codigos_barras(codigos)
+        }
+
+    @staticmethod
+    def _buscar_articulos(codigos: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Busca artículos de bodega por código de barras y arma sus resúmenes."""
+        return {
+            fila['codigo_barras']: {
+                'tipo': 'articulo',
+                'id': fila['id'],
+                'codigo': fila['sku'],
+                'nombre': fila['nombre'],
+                'unidad': fila['unidad_medida'],
+                'bodega': fila['ubicacion_fisica__codigo'],
+            }
+            for fila in ArticuloRepository.get_resumen_by_codigos_barras(codigos)
+        }
+
+    @classmethod
+    def invalidar(cls, codigos_barras: Iterable[Optional[str]]) -> None:
+        """
+        Elimina de la caché los resúmenes de los códigos indicados.
+
+        La invalidación se difiere al commit de la transacción en curso para
+        que una lectura concurrente no vuelva a cachear datos sin confirmar.
+        """
+        claves = [cls._cache_key(codigo) for codigo in codigos_barras if codigo]
+        if claves:
+            transaction.on_commit(lambda: cache.delete_many(claves))
+
+    @classmethod
+    def invalidar_activos(cls, activo_ids: List[int]) -> None:
+        """
+        Invalida los resúmenes de varios activos a partir de sus IDs.
+
+        Pensado para operaciones masivas (UPDATE / bulk_create) que no disparan
+        señales de modelo. Usa una sola consulta para obtener los códigos.
+        """
+        if activo_ids:
+            cls.invalidar(ActivoRepository.get_codigos_barras_by_ids(activo_ids))
+
+
+# ==================== TOMA INVENTARIO SERVICE ====================
+
+class TomaInventarioService:
+    """
+    Service para tomas de inventario (conteo físico) de ubicaciones y bodegas.
+
+    Las lecturas se registran por lotes ya resueltas con EscanerService. Al
+    cerrar la toma, la conciliación lee lo esperado y lo encontrado con una
+    consulta por lado y calcula faltantes, sobrantes y mal ubicados con
+    operaciones de conjuntos en memoria.
+    """
+
+    def __init__(self):
+        self.toma_repo = TomaInventarioRepository()
+        self.lectura_repo = LecturaTomaInventarioRepository()
+        self.esperado_repo = InventarioEsperadoRepository()
+        self.escaner = EscanerService()
+
+    @transaction.atomic
+    def abrir_toma(
+        self,
+        responsable: User,
+        ubicacion: Optional[Ubicacion] = None,
+        bodega: Optional[Bodega] = None,
+        observaciones: str = ''
+    ) -> TomaInventario:
+        """
+        Abre una toma de inventario para una ubicación o una bodega.
+
+        Args:
+            responsable: Usuario a cargo del conteo
+            ubicacion: Ubicación de activos a contar
+            bodega: Bodega de artículos a contar
+            observaciones: Observaciones (opcional)
+
+        Returns:
+            Toma creada
+
+        Raises:
+            ValidationError: Si no se indica exactamente una ubicación o bodega,
+                o si ya existe una toma abierta para ella
+        """
+        if bool(ubicacion) == bool(bodega):
+            raise ValidationError('Debe indicar una ubicación o una bodega (solo una).')
+
+        if self.toma_repo.exists_abierta(ubicacion=ubicacion, bodega=bodega):
+            raise ValidationError(f'Ya existe una toma abierta para {ubicacion or bodega}.')
+
+        return TomaInventario.objects.create(
+            numero=generar_codigo_unico('TOMA', TomaInventario, 'numero', longitud=8),
+            ubicacion=ubicacion,
+            bodega=bodega,
+            responsable=responsable,
+            observaciones=observaciones
+        )
+
+    @staticmethod
+    def validar_cantidad(cantidad: Decimal) -> Decimal:
+        """
+        Valida la cantidad de una lectura: finita, no negativa y dentro de la
+        precisión de LecturaTomaInventario.cantidad.
+
+        Raises:
+            ValidationError: Si la cantidad no es válida
+        """
+        if not cantidad.is_finite() or cantidad < 0:
+            raise ValidationError({'cantidad': f'Cantidad inválida: {cantidad}'})
+        try:
+            LecturaTomaInventario._meta.get_field('cantidad').run_validators(cantidad)
+        except ValidationError as e:
+            raise ValidationError({'cantidad': f'Cantidad inválida: {cantidad}. {" ".join(e.messages)}'})
+        return cantidad
+
+    @transaction.atomic
+    def registrar_lecturas(
+        self,
+        toma: TomaInventario,
+        lecturas: Iterable[Tuple[str, Decimal]]
+    ) -> Dict[str, Any]:
+        """
+        Registra un lote de lecturas del escáner.
+
+        Las lecturas repetidas del mismo código dentro del lote se agrupan en
+        una sola fila con la cantidad acumulada.
+
+        Args:
+            toma: Toma abierta
+            lecturas: Pares (código de barras, cantidad)
+
+        Returns:
+            Diccionario con la cantidad de códigos registrados y los códigos
+            que no corresponden a ningún activo o artículo
+
+        Raises:
+            ValidationError: Si la toma no está abierta o alguna cantidad
+                (individual o acumulada por código) no es válida
+        """
+        if not toma.esta_abierta:
+            raise ValidationError('La toma de inventario no está abierta.')
+
+        cantidades: Counter = Counter()
+        for codigo, cantidad in lecturas:
+            codigo = str(codigo).strip()
+            if codigo:
+                cantidades[codigo] += self.validar_cantidad(cantidad)
+        for cantidad in cantidades.values():
+            self.validar_cantidad(cantidad)
+
+        if not cantidades:
+            return {'registrados': 0, 'no_registrados': []}
+
+        resueltos = self.escaner.resolver(list(cantidades))
+        filas = []
+        no_registrados = []
+        for codigo, cantidad in cantidades.items():
+            resumen = resueltos[codigo] or {}
+            if not resumen:
+                no_registrados.append(codigo)
+            filas.append(LecturaTomaInventario(
+                toma=toma,
+                codigo_barras=codigo,
+                cantidad=cantidad,
+                activo_id=resumen.get('id') if resumen.get('tipo') == 'activo' else None,
+                articulo_id=resumen.get('id') if resumen.get('tipo') == 'articulo' else None
+            ))
+        self.lectura_repo.bulk_create(filas)
+
+        return {'registrados': len(filas), 'no_registrados': no_registrados}
+
+    def conciliar(self, toma: TomaInventario) -> Dict[str, Any]:
+        """
+        Calcula las diferencias entre lo esperado y lo encontrado en la toma.
+
+        Args:
+            toma: Toma a conciliar
+
+        Returns:
+            Diccionario serializable con el resultado de la conciliación
+        """
+        if toma.ubicacion_id:
+            return self._conciliar_ubicacion(toma)
+        return self._conciliar_bodega(toma)
+
+    def _conciliar_ubicacion(self, toma: TomaInventario) -> Dict[str, Any]:
+        """Concilia activos: esperados según UbicacionActual vs. escaneados."""
+        esperados = {
+            activo_id: [activo_id, codigo, nombre]
+            for activo_id, codigo, nombre in self.esperado_repo.get_activos_en_ubicacion(toma.ubicacion)
+        }
+
+        encontrados = {}
+        sobrantes = []
+        for fila in self.lectura_repo.get_resumen_activos(toma):
+            if fila['activo_id'] is None:
+                sobrantes.append(fila['codigo_barras'])
+            else:
+                encontrados[fila['activo_id']] = fila
+
+        faltantes = esperados.keys() - encontrados.keys()
+        mal_ubicados = encontrados.keys() - esperados.keys()
+
+        return {
+            'tipo': 'ubicacion',
+            'esperados': len(esperados),
+            'encontrados': len(encontrados),
+            'faltantes': [esperados[activo_id] for activo_id in sorted(faltantes)],
+            'mal_ubicados': [
+                [
+                    activo_id,
+                    encontrados[activo_id]['activo__codigo'],
+                    encontrados[activo_id]['activo__nombre'],
+                    encontrados[activo_id]['activo__ubicacion_actual__ubicacion__codigo'],
+                ]
+                for activo_id in sorted(mal_ubicados)
+            ],
+            'sobrantes': sorted(sobrantes),
+        }
+
+    def _conciliar_bodega(self, toma: TomaInventario) -> Dict[str, Any]:
+        """Concilia artículos: stock del sistema vs. cantidades contadas."""
+        esperados = {
+            articulo_id: (sku, nombre, stock)
+            for articulo_id, sku, nombre, stock in self.esperado_repo.get_articulos_en_bodega(toma.bodega)
+        }
+
+        contados = {}
+        sobrantes = []
+        for fila in self.lectura_repo.get_resumen_articulos(toma):
+            if fila['articulo_id'] is None:
+                sobrantes.append(fila['codigo_barras'])
+            else:
+                contados[fila['articulo_id']] = fila
+
+        con_stock = {articulo_id for articulo_id, (_, _, stock) in esperados.items() if stock > 0}
+        faltantes = con_stock - contados.keys()
+        mal_ubicados = contados.keys() - esperados.keys()
+        diferencias = [
+            articulo_id for articulo_id in sorted(contados.keys() & esperados.keys())
+            if contados[articulo_id]['total'] != esperados[articulo_id][2]
+        ]
+
+        return {
+            'tipo': 'bodega',
+            'esperados': len(esperados),
+            'encontrados': len(contados),
+            'faltantes': [
+                [articulo_id, *esperados[articulo_id][:2], str(esperados[articulo_id][2])]
+                for articulo_id in sorted(faltantes)
+            ],
+            'diferencias': [
+                [
+                    articulo_id, *esperados[articulo_id][:2],
+                    str(esperados[articulo_id][2]), str(contados[articulo_id]['total'])
+                ]
+                for articulo_id in diferencias
+            ],
+            'mal_ubicados': [
+                [
+                    articulo_id,
+                    contados[articulo_id]['articulo__sku'],
+                    contados[articulo_id]['articulo__nombre'],
+                    contados[articulo_id]['articulo__ubicacion_fisica__codigo'],
+                    str(contados[articulo_id]['total']),
+                ]
+                for articulo_id in sorted(mal_ubicados)
+            ],
+            'sobrantes': sorted(sobrantes),
+        }
+
+    @transaction.atomic
+    def cerrar_toma(
+        self,
+        toma: TomaInventario,
+        usuario: User,
+        tipo_movimiento_activo: Optional[TipoMovimientoActivo] = None,
+        tipo_movimiento_bodega: Optional[TipoMovimiento] = None
+    ) -> TomaInventario:
+        """
+        Cierra una toma, guarda la conciliación y aplica ajustes opcionales.
+
+        - Con tipo_movimiento_activo (tomas de ubicación) los activos mal
+          ubicados se trasladan en bloque a la ubicación contada, conservando
+          su responsable. Los que no permiten movimiento quedan en
+          resultado['no_trasladados'].
+        - Con tipo_movimiento_bodega (tomas de bodega) el stock de los
+          artículos faltantes o con diferencias se ajusta a lo contado.
+
+        Args:
+            toma: Toma abierta
+            usuario: Usuario que cierra la toma
+            tipo_movimiento_activo: Tipo para trasladar mal ubicados (opcional)
+            tipo_movimiento_bodega: Tipo para ajustar stock (opcional)
+
+        Returns:
+            Toma cerrada con su resultado
+
+        Raises:
+            ValidationError: Si la toma no está abierta o el ajuste falla
+        """
+        # Bloquear la toma: dos cierres simultáneos no deben aplicar ajustes dos veces
+        toma = self.toma_repo.get_for_update(toma.pk)
+        if not toma.esta_abierta:
+            raise ValidationError('La toma de inventario no está abierta.')
+
+        resultado = self.conciliar(toma)
+        observaciones = f'Toma de inventario {toma.numero}'
+
+        if toma.ubicacion_id and tipo_movimiento_activo and resultado['mal_ubicados']:
+            # Solo se trasladan los activos cuyo estado permite movimiento; el
+            # resto queda informado en no_trasladados y no impide el cierre
+            mal_ubicados = ActivoRepository.filter_para_traslado().filter(
+                id__in=[fila[0] for fila in resultado['mal_ubicados']]
+            )
+            movibles = mal_ubicados.filter(estado__permite_movimiento=True)
+            movimientos = []
+            if movibles.exists():
+                # El conteo solo corrige la ubicación: cada activo conserva su responsable
+                movimientos, _ = MovimientoActivoService().trasladar_masivo(
+                    activos=movibles,
+                    tipo_movimiento=tipo_movimiento_activo,
+                    usuario_registro=usuario,
+                    ubicacion_destino=toma.ubicacion,
+                    observaciones=observaciones,
+                    conservar_responsable=True
+                )
+            trasladados = {movimiento.activo_id for movimiento in movimientos}
+            resultado['trasladados'] = len(movimientos)
+            resultado['no_trasladados'] = [
+                fila[0] for fila in resultado['mal_ubicados'] if fila[0] not in trasladados
+            ]
+
+        if toma.bodega_id and tipo_movimiento_bodega:
+            stock_contado = {fila[0]: Decimal('0') for fila in resultado['faltantes']}
+            stock_contado.update({fila[0]: Decimal(fila[4]) for fila in resultado['diferencias']})
+            movimientos = MovimientoService().ajustar_stock_masivo(
+                stock_contado=stock_contado,
+                tipo=tipo_movimiento_bodega,
+                usuario=usuario,
+                motivo=observaciones
+            ) if stock_contado else []
+            resultado['ajustados'] = len(movimientos)
+
+        toma.resultado = resultado
+        toma.estado = TomaInventario.ESTADO_CERRADA
+        toma.fecha_cierre = timezone.now()
+        toma.save(update_fields=['resultado', 'estado', 'fecha_cierre', 'fecha_actualizacion'])
+        return toma
+
+    @transaction.atomic
+    def anular_toma(self, toma: TomaInventario) -> TomaInventario:
+        """
+        Anula una toma abierta sin aplicar ajustes.
+
+        Raises:
+            ValidationError: Si la toma no está abierta
+        """
+        toma = self.toma_repo.get_for_update(toma.pk)
+        if not toma.esta_abierta:
+            raise ValidationError('La toma de inventario no está abierta.')
+
+        toma.estado = TomaInventario.ESTADO_ANULADA
+        toma.fecha_cierre = timezone.now()
+        toma.save(update_fields=['estado', 'fecha_cierre', 'fecha_actualizacion'])
+        return toma
@@ -0,0 +1,45 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from apps.activos.models import Activo, UbicacionActual
+from apps.activos.signals import activos_actualizados_masivo
+from apps.bodega.models import Articulo
+from .services import EscanerService
+
+
+# --------------------------
+#  Caché del escáner de códigos de barras
+# --------------------------
+@receiver(pre_save, sender=Activo)
+@receiver(pre_save, sender=Articulo)
+def capturar_codigo_barras_anterior(sender, instance, update_fields=None, **kwargs):
+    """Recuerda el código de barras previo para invalidarlo si cambia."""
+    if not instance.pk or (update_fields is not None and 'codigo_barras' not in update_fields):
+        return
+    instance._codigo_barras_anterior = sender.objects.filter(
+        pk=instance.pk
+    ).values_list('codigo_barras', flat=True).first()
+
+
+@receiver(post_save, sender=Activo)
+@receiver(post_delete, sender=Activo)
+@receiver(post_save, sender=Articulo)
+@receiver(post_delete, sender=Articulo)
+def invalidar_escaner_producto(sender, instance, **kwargs):
+    """Invalida el resumen cacheado del activo o artículo guardado/eliminado."""
+    EscanerService.invalidar([
+        instance.codigo_barras,
+        getattr(instance, '_codigo_barras_anterior', None),
+    ])
+
+
+@receiver(post_save, sender=UbicacionActual)
+@receiver(post_delete, sender=UbicacionActual)
+def invalidar_escaner_ubicacion(sender, instance, **kwargs):
+    """La ubicación forma parte del resumen del activo: invalidarlo al moverlo."""
+    EscanerService.invalidar_activos([instance.activo_id])
+
+
+@receiver(activos_actualizados_masivo)
+def invalidar_escaner_activos_masivo(sender, activo_ids, **kwargs):
+    """Traslados y bajas masivas escriben con UPDATE/bulk_create, sin post_save."""
+    EscanerService.invalidar_activos(activo_ids)
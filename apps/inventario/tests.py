@@ -1,4 +1,545 @@
+"""
+Tests del módulo de inventario: benchmark de vistas, dataset sintético,
+asesor de índices, generador de carga, escáner y tomas de inventario.
+
+El benchmark de vistas compara contra la línea base versionada. Es lento
+(genera un dataset y repite cada escenario), por eso solo corre con
+BENCHMARK_VISTAS=1:
+
+    BENCHMARK_VISTAS=1 python manage.py test apps.inventario
+
+La línea base se regenera con `python manage.py benchmark_vistas --guardar`.
+"""
+
+import os
+import unittest
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.activos.models import (
+    Activo, CategoriaActivo, EstadoActivo, MovimientoActivo, TipoMovimientoActivo, UnidadMedida, Ubicacion,
+    UbicacionActual
+)
+from apps.activos.services import MovimientoActivoService
+from apps.bodega.models import Articulo, Movimiento, TipoMovimiento
+from apps.bodega.tests import crear_articulo_con_movimientos
+from apps.accounts.models import AuthLogs
+from apps.inventario import benchmarks, carga, indices
+from apps.inventario.models import TomaInventario
+from apps.inventario.services import EscanerService, TomaInventarioService
+
+
+# ============================================================================
+# BENCHMARK DE VISTAS
+# ============================================================================
+
+@unittest.skipUnless(os.environ.get('BENCHMARK_VISTAS'), 'defina BENCHMARK_VISTAS=1 para medir las vistas')
+class BenchmarkVistasTest(TestCase):
+    """
+    Test: Las vistas más usadas no empeoran respecto de la línea base
+    Criterio: Sin errores nuevos, sin consultas SQL adicionales y p95 y memoria
+              máxima dentro de las tolerancias de apps.inventario.benchmarks
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.baseline = benchmarks.cargar_baseline()
+        escala = cls.baseline['escala'] if cls.baseline else 0.01
+        call_command('generate_dataset', scale=escala, stdout=StringIO())
+
+    def setUp(self):
+        cache.clear()
+
+    def test_sin_regresiones(self):
+        """Compara cada escenario con la línea base y lista todas las regresiones."""
+        self.assertIsNotNone(self.baseline, f'Falta {benchmarks.BASELINE}: ejecute benchmark_vistas --guardar')
+
+        resultados = benchmarks.ejecutar(benchmarks.preparar_contexto())
+        regresiones = benchmarks.comparar(resultados, self.baseline)
+
+        self.assertFalse(regresiones, '\n' + '\n'.join(regresiones))
+
+
+class LineaBaseVistasTest(TestCase):
+    """
+    Test: La línea base versionada solo contiene escenarios medibles
+    Criterio: Ningún escenario con error de servidor y ninguno de los omitidos
+    """
+
+    def test_sin_errores_ni_omitidos(self):
+        escenarios = benchmarks.cargar_baseline()['escenarios']
+
+        self.assertEqual([n for n, r in escenarios.items() if r['status'] >= 500], [])
+        self.assertFalse(set(escenarios) & set(benchmarks.OMITIDOS))
+        self.assertLessEqual(set(benchmarks.OMITIDOS), set(benchmarks.ESCENARIOS))
+
+
+# ============================================================================
+# DATASET SINTÉTICO
+# ============================================================================
+
+class GenerateDatasetTest(TestCase):
+    """
+    Test: generate_dataset carga un dataset coherente y reproducible
+    Criterio: A escala mínima termina, el stock de cada artículo es el
+              stock_despues de su último movimiento y la misma semilla
+              genera los mismos datos
+    """
+
+    MODELOS = (User, Articulo, Movimiento, Activo, MovimientoActivo, UbicacionActual, AuthLogs)
+
+    def generar(self, seed: int) -> dict:
+        """Genera el dataset en un savepoint, lo resume, verifica el libro y lo descarta."""
+        salida = StringIO()
+        with transaction.atomic():
+            call_command('generate_dataset', scale=0.001, seed=seed, stdout=salida)
+            self.assertIn('Dataset generado', salida.getvalue())
+
+            ultimo = Movimiento.objects.filter(articulo=OuterRef('pk')).order_by(
+                '-fecha_creacion', '-id'
+            ).values('stock_despues')[:1]
+            articulos = Articulo.objects.filter(sku__startswith='DS-').annotate(libro=Subquery(ultimo))
+            self.assertTrue(articulos.exists())
+            for articulo in articulos:
+                self.assertEqual(articulo.stock_actual, articulo.libro, articulo.sku)
+            self.assertEqual(carga.verificar_invariantes(0), [])
+
+            resumen = {
+                'filas': {modelo.__name__: modelo.objects.count() for modelo in self.MODELOS},
+                'movimientos': list(Movimiento.objects.order_by('id').values_list(
+                    'articulo__sku', 'operacion', 'cantidad', 'stock_despues'
+                )),
+            }
+            transaction.set_rollback(True)
+        return resumen
+
+    def test_escala_minima_reproducible(self):
+        primera = self.generar(seed=7)
+
+        self.assertEqual(primera['filas']['Movimiento'], 1000)
+        self.assertEqual(self.generar(seed=7), primera)
+        self.assertNotEqual(self.generar(seed=8)['movimientos'], primera['movimientos'])
+
+
+# ============================================================================
+# ASESOR DE ÍNDICES
+# ============================================================================
+
+class AsesorIndicesTest(TestCase):
+    """
+    Test: El asesor clasifica las columnas del SQL de Django y propone índices
+    Criterio: Igualdad y ORDER BY forman el índice; los booleanos, su condición
+    """
+
+    def test_columnas_por_tabla(self):
+        """Alias de subconsultas, filtros booleanos sin parámetro y LIKE con comodín inicial."""
+        consulta = Activo.objects.filter(
+            eliminado=False, nombre__icontains='silla', fecha_creacion__gte=timezone.now(),
+        ).exclude(pk__in=Activo.objects.filter(activo=False).values('pk')).order_by('-codigo')
+        sql, params = consulta.query.sql_with_params()
+
+        columnas = indices.columnas_por_tabla(sql, params)['activo']
+
+        self.assertEqual(columnas['booleanos'], {'eliminado': False, 'activo': False})
+        self.assertEqual(columnas['rango'], ['fecha_creacion'])
+        self.assertEqual(columnas['orden'], [('codigo', True)])
+
+    def test_propone_indice_parcial_para_ordenamiento(self):
+        """Filtrar por tipo y ordenar por fecha deja un B-tree temporal: se propone el índice."""
+        sql, params = Movimiento.vivos.filter(tipo_id=1).order_by('-fecha_creacion').query.sql_with_params()
+
+        propuestas = indices.analizar({sql: {'params': params, 'veces': 3, 'escenarios': {'prueba'}}}, min_filas=0)
+
+        self.assertEqual(len(propuestas), 1)
+        indice = propuestas[0]['indice']
+        self.assertIs(propuestas[0]['modelo'], Movimiento)
+        self.assertEqual(indice.fields, ['tipo', '-fecha_creacion'])
+        self.assertEqual(indice.condition, Q(eliminado=False))
+        self.assertLessEqual(len(indice.name), 30)
+
+    def test_no_propone_indice_existente(self):
+        """Artículo y fecha ya están cubiertos por el índice parcial ix_mov_articulo_fecha_vivo."""
+        sql, params = Movimiento.vivos.filter(articulo_id=1).order_by('-fecha_creacion').query.sql_with_params()
+
+        self.assertEqual(indices.analizar({sql: {'params': params, 'veces': 1, 'escenarios': set()}}, min_filas=0), [])
+
+
+# ============================================================================
+# CARGA CONCURRENTE
+# ============================================================================
+
+class LectorFormulariosTest(TestCase):
+    """
+    Test: leer_formulario obtiene lo que enviaría un navegador sin tocar nada
+    Criterio: Elige el formulario con token CSRF y más campos, respeta las
+              reglas de checkbox, radio, select y textarea, y lo leído de una
+              página renderizada se puede enviar tal cual
+    """
+
+    HTML = """
+        <form action="/buscar/"><input name="q" value="silla"></form>
+        <form method="post" action="/guardar/">
+          <input type="hidden" name="csrfmiddlewaretoken" value="token">
+          <input name="nombre" value="Resma"><input name="vacio">
+          <input type="checkbox" name="activo" checked><input type="checkbox" name="urgente">
+          <input type="radio" name="prioridad" value="baja">
+          <input type="radio" name="prioridad" value="alta" checked>
+          <select name="bodega"><option value="">---</option><option value="3">B3</option></select>
+          <select name="estado"><option value="1">A</option><option value="2" selected>B</option></select>
+          <select name="grupos" multiple><option value="7">G7</option></select>
+          <textarea name="motivo">Reposición
+mensual</textarea>
+          <input type="file" name="adjunto"><input type="submit" name="guardar" value="Guardar">
+        </form>
+        <form method="post"><input type="hidden" name="csrfmiddlewaretoken" value="token"></form>
+    """
+
+    def test_reglas_de_envio(self):
+        formulario = carga.leer_formulario(self.HTML)
+
+        self.assertEqual(formulario['action'], '/guardar/')
+        self.assertEqual(formulario['campos'], {
+            'csrfmiddlewaretoken': 'token', 'nombre': 'Resma', 'vacio': '', 'activo': 'on',
+            'prioridad': 'alta', 'bodega': '', 'estado': '2', 'motivo': 'Reposición\nmensual',
+        })
+        self.assertEqual(formulario['opciones']['grupos'], ['7'])
+        self.assertEqual(carga._primera_opcion(formulario, 'bodega'), '3')
+
+    def test_sin_token_csrf(self):
+        with self.assertRaises(ValueError):
+            carga.leer_formulario('<form><input name="q"></form>')
+
+    def test_formulario_renderizado(self):
+        """El formulario de movimiento de bodega, completado como en la carga, registra el movimiento."""
+        articulo = crear_articulo_con_movimientos([])
+        self.client.force_login(User.objects.create_superuser('carga', password='carga123'))
+        url = reverse('bodega:movimiento_crear')
+
+        formulario = carga.leer_formulario(self.client.get(url).content.decode())
+
+        self.assertIn('csrfmiddlewaretoken', formulario['campos'])
+        self.assertEqual(formulario['opciones']['operacion'], ['', 'ENTRADA', 'SALIDA'])
+        datos = dict(formulario['campos'], articulo=articulo.pk, tipo=TipoMovimiento.objects.get().pk,
+                     cantidad=4, operacion='ENTRADA', motivo='Carga')
+        self.assertEqual(self.client.post(url, datos).status_code, 302)
+        articulo.refresh_from_db()
+        self.assertEqual(articulo.stock_actual, Decimal('4'))
+
+
+class InvariantesCargaTest(TestCase):
+    """
+    Test: verificar_invariantes detecta un libro de movimientos roto
+    Criterio: Sin violaciones tras movimientos válidos; informa stock distinto
+              del libro, stock negativo y un movimiento que no parte del
+              anterior, solo en los artículos tocados desde el corte
+    """
+
+    def setUp(self):
+        hoy = timezone.localdate()
+        self.articulo = crear_articulo_con_movimientos(
+            [(hoy, Decimal('10')), (hoy, Decimal('-3')), (hoy, Decimal('5'))]
+        )
+        self.movimientos = list(Movimiento.objects.order_by('id'))
+
+    def test_libro_consistente(self):
+        self.assertEqual(carga.verificar_invariantes(0), [])
+
+    def test_cadena_rota(self):
+        Movimiento.objects.filter(pk=self.movimientos[1].pk).update(stock_antes=Decimal('8'))
+        Articulo.objects.filter(pk=self.articulo.pk).update(stock_actual=Decimal('-1'))
+
+        violaciones = carga.verificar_invariantes(0)
+
+        self.assertEqual(len(violaciones), 3)
+        self.assertIn('K-001: stock -1', violaciones[0])
+        self.assertIn('libro 12', violaciones[0])
+        self.assertIn('stock negativo', violaciones[1])
+        self.assertIn(f'movimiento {self.movimientos[1].pk} parte de 8', violaciones[2])
+
+    def test_solo_desde_el_corte(self):
+        """Los movimientos previos al corte no se revisan; el stock del artículo tocado sí."""
+        Movimiento.objects.filter(pk=self.movimientos[1].pk).update(stock_antes=Decimal('8'))
+        Articulo.objects.filter(pk=self.articulo.pk).update(stock_actual=Decimal('11'))
+
+        violaciones = carga.verificar_invariantes(self.movimientos[1].pk)
+
+        self.assertEqual(len(violaciones), 1)
+        self.assertIn('stock 11', violaciones[0])
+        # Sin movimientos posteriores al corte no hay artículos tocados
+        self.assertEqual(carga.verificar_invariantes(self.movimientos[-1].pk), [])
+
+
+# ============================================================================
+# ESCÁNER DE CÓDIGOS DE BARRAS
+# ============================================================================
+
+def crear_activos(codigos, ubicacion=None, responsable=None, estado=None):
+    """Crea activos de prueba (categoría, unidad y estado compartidos), opcionalmente ubicados."""
+    categoria, _ = CategoriaActivo.objects.get_or_create(codigo='CAT', defaults={'nombre': 'Mobiliario'})
+    unidad, _ = UnidadMedida.objects.get_or_create(codigo='UN', defaults={'nombre': 'Unidad', 'simbolo': 'un'})
+    if estado is None:
+        estado, _ = EstadoActivo.objects.get_or_create(codigo='DISP', defaults={'nombre': 'Disponible'})
+    activos = []
+    for codigo in codigos:
+        activo = Activo.objects.create(
+            codigo=codigo, nombre=f'Activo {codigo}', categoria=categoria, unidad_medida=unidad, estado=estado
+        )
+        if ubicacion is not None:
+            UbicacionActual.objects.create(activo=activo, ubicacion=ubicacion, responsable=responsable)
+        activos.append(activo)
+    return activos
+
+
+class EscanerTest(TestCase):
+    """
+    Test: El escáner resuelve códigos de barras a activos y artículos
+    Criterio: Las lecturas repetidas salen de la caché, los cambios de
+              código, ubicación o traslados masivos la invalidan y la API solo
+              entrega los tipos que el usuario puede ver
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = User.objects.create_user('escaner', password='escaner123')
+        cls.usuario.user_permissions.add(Permission.objects.get(codename='view_activo'))
+        cls.sala = Ubicacion.objects.create(codigo='SALA-1', nombre='Sala 1')
+        cls.laboratorio = Ubicacion.objects.create(codigo='LAB-1', nombre='Laboratorio')
+        cls.activo = crear_activos(['A-01'], cls.sala, cls.usuario)[0]
+        cls.articulo = crear_articulo_con_movimientos([])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_resuelve_activos_articulos_e_inexistentes(self):
+        """Un activo con su ubicación, un artículo con su bodega y None para el resto."""
+        resueltos = EscanerService().resolver([self.activo.codigo_barras, self.articulo.codigo_barras, 'NADA'])
+
+        self.assertEqual(resueltos[self.activo.codigo_barras]['tipo'], 'activo')
+        self.assertEqual(resueltos[self.activo.codigo_barras]['ubicacion'], 'SALA-1')
+        self.assertEqual(resueltos[self.articulo.codigo_barras]['tipo'], 'articulo')
+        self.assertEqual(resueltos[self.articulo.codigo_barras]['bodega'], 'BK')
+        self.assertIsNone(resueltos['NADA'])
+
+    def test_segunda_lectura_sale_de_cache(self):
+        """La segunda lectura de códigos existentes no consulta la base de datos."""
+        codigos = [self.activo.codigo_barras, self.articulo.codigo_barras]
+        primera = EscanerService().resolver(codigos)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(EscanerService().resolver(codigos), primera)
+
+    def test_invalida_al_cambiar_codigo_y_ubicacion(self):
+        """save() de activo y de UbicacionActual descartan el resumen cacheado."""
+        service = EscanerService()
+        anterior = self.activo.codigo_barras
+        service.resolver([anterior])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ubicacion_actual = UbicacionActual.objects.get(activo=self.activo)
+            ubicacion_actual.ubicacion = self.laboratorio
+            ubicacion_actual.save()
+        self.assertEqual(service.resolver([anterior])[anterior]['ubicacion'], 'LAB-1')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.activo.codigo_barras = 'NUEVO-01'
+            self.activo.save()
+        self.assertIsNone(service.resolver([anterior])[anterior])
+        self.assertEqual(service.resolver(['NUEVO-01'])['NUEVO-01']['id'], self.activo.pk)
+
+    def test_invalida_en_traslado_masivo(self):
+        """El traslado masivo no dispara post_save; la señal de activos invalida igual."""
+        codigo = self.activo.codigo_barras
+        EscanerService().resolver([codigo])
+        tipo = TipoMovimientoActivo.objects.create(codigo='TRAS', nombre='Traslado')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MovimientoActivoService().trasladar_masivo(
+                activos=Activo.objects.filter(pk=self.activo.pk), tipo_movimiento=tipo,
+                usuario_registro=self.usuario, ubicacion_destino=self.laboratorio, responsable=self.usuario
+            )
+
+        self.assertEqual(EscanerService().resolver([codigo])[codigo]['ubicacion'], 'LAB-1')
+
+    def test_api(self):
+        """GET de un código (404 si no existe), POST por lote, JSON inválido y permisos."""
+        url = reverse('inventario:api_escaner')
+        self.client.force_login(self.usuario)
+
+        respuesta = self.client.get(url, {'codigo': self.activo.codigo_barras})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json()['resultado']['codigo'], 'A-01')
+        self.assertEqual(self.client.get(url, {'codigo': 'NADA'}).status_code, 404)
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+        respuesta = self.client.post(
+            url, {'codigos': [f' {self.activo.codigo_barras} ', self.activo.codigo_barras, 'NADA', '']},
+            content_type='application/json'
+        )
+        self.assertEqual(list(respuesta.json()['resultados']), [self.activo.codigo_barras])
+        self.assertEqual(respuesta.json()['no_encontrados'], ['NADA'])
+        self.assertEqual(self.client.post(url, 'no es json', content_type='application/json').status_code, 400)
+        self.assertEqual(self.client.post(url, {'codigos': 'A'}, content_type='application/json').status_code, 400)
+
+        self.client.force_login(User.objects.create_user('sin_permisos', password='x'))
+        self.assertEqual(self.client.get(url, {'codigo': 'NADA'}).status_code, 403)
+
+    def test_api_por_permiso_de_cada_tipo(self):
+        """Quien solo ve artículos no obtiene datos de activos, y viceversa."""
+        url = reverse('inventario:api_escaner')
+        codigos = [self.activo.codigo_barras, self.articulo.codigo_barras]
+        EscanerService().resolver(codigos)  # ambos resúmenes ya en caché
+        bodeguero = User.objects.create_user('bodeguero', password='x')
+        bodeguero.user_permissions.add(Permission.objects.get(codename='view_articulo'))
+        self.client.force_login(bodeguero)
+
+        respuesta = self.client.get(url, {'codigo': self.activo.codigo_barras})
+        self.assertEqual(respuesta.status_code, 404)
+        self.assertIsNone(respuesta.json()['resultado'])
+        respuesta = self.client.post(url, {'codigos': codigos}, content_type='application/json').json()
+        self.assertEqual(list(respuesta['resultados']), [self.articulo.codigo_barras])
+        self.assertEqual(respuesta['no_encontrados'], [self.activo.codigo_barras])
+
+        self.client.force_login(self.usuario)
+        respuesta = self.client.post(url, {'codigos': codigos}, content_type='application/json').json()
+        self.assertEqual(list(respuesta['resultados']), [self.activo.codigo_barras])
+
+
+# ============================================================================
+# TOMAS DE INVENTARIO
+# ============================================================================
+
+class TomaInventarioTest(TestCase):
+    """
+    Test: Una toma concilia lo escaneado contra lo esperado y al cerrarse
+          aplica los ajustes elegidos
+    Criterio: Faltantes, sobrantes, mal ubicados y diferencias correctos;
+              los activos trasladados conservan su responsable, los que no
+              permiten movimiento no impiden el cierre y el stock queda en lo
+              contado
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulo = crear_articulo_con_movimientos([(timezone.localdate(), Decimal('10'))])
+        cls.usuario = User.objects.get(username='kardex')
+        cls.usuario.user_permissions.add(Permission.objects.get(codename='change_tomainventario'))
+        cls.custodio = User.objects.create_user('custodio', password='custodio123')
+        cls.sala = Ubicacion.objects.create(codigo='SALA-1', nombre='Sala 1')
+        cls.laboratorio = Ubicacion.objects.create(codigo='LAB-1', nombre='Laboratorio')
+        cls.reparacion = EstadoActivo.objects.create(codigo='REP', nombre='En reparación', permite_movimiento=False)
+        # Tipo por defecto: exige ubicación y responsable
+        cls.tipo_activo = TipoMovimientoActivo.objects.create(codigo='TRAS', nombre='Traslado')
+        cls.en_sala = crear_activos(['S-01', 'S-02'], cls.sala, cls.custodio)
+        cls.movible = crear_activos(['L-01'], cls.laboratorio, cls.custodio)[0]
+        cls.en_reparacion = crear_activos(['L-02'], cls.laboratorio, cls.custodio, estado=cls.reparacion)[0]
+        cls.otro = Articulo.objects.create(
+            sku='K-002', codigo='K-002', nombre='Toner', categoria=cls.articulo.categoria,
+            unidad_medida='UN', ubicacion_fisica=cls.articulo.ubicacion_fisica, stock_actual=Decimal('4')
+        )
+
+    def abrir(self, **destino) -> TomaInventario:
+        return TomaInventarioService().abrir_toma(responsable=self.usuario, **destino)
+
+    def test_conciliar_ubicacion(self):
+        """Un esperado sin leer, dos activos de otra sala y un código desconocido."""
+        toma = self.abrir(ubicacion=self.sala)
+        TomaInventarioService().registrar_lecturas(toma, [
+            (a.codigo_barras, Decimal('1')) for a in [self.en_sala[0], self.movible, self.en_reparacion]
+        ] + [('DESCONOCIDO', Decimal('1'))])
+
+        resultado = TomaInventarioService().conciliar(toma)
+
+        self.assertEqual((resultado['esperados'], resultado['encontrados']), (2, 3))
+        self.assertEqual([fila[0] for fila in resultado['faltantes']], [self.en_sala[1].pk])
+        self.assertEqual(
+            [(fila[0], fila[3]) for fila in resultado['mal_ubicados']],
+            [(self.movible.pk, 'LAB-1'), (self.en_reparacion.pk, 'LAB-1')]
+        )
+        self.assertEqual(resultado['sobrantes'], ['DESCONOCIDO'])
+
+    def test_cerrar_traslada_conservando_responsable(self):
+        """El tipo exige responsable, pero el traslado por conteo mantiene el custodio de cada activo."""
+        toma = self.abrir(ubicacion=self.sala)
+        TomaInventarioService().registrar_lecturas(
+            toma, [(a.codigo_barras, Decimal('1')) for a in [*self.en_sala, self.movible, self.en_reparacion]]
+        )
+
+        toma = TomaInventarioService().cerrar_toma(toma, self.usuario, tipo_movimiento_activo=self.tipo_activo)
+
+        self.assertEqual(toma.estado, TomaInventario.ESTADO_CERRADA)
+        self.assertEqual(toma.resultado['trasladados'], 1)
+        self.assertEqual(toma.resultado['no_trasladados'], [self.en_reparacion.pk])
+        ubicacion_actual = UbicacionActual.objects.get(activo=self.movible)
+        self.assertEqual((ubicacion_actual.ubicacion, ubicacion_actual.responsable), (self.sala, self.custodio))
+        self.assertEqual(ubicacion_actual.ultimo_movimiento.responsable, self.custodio)
+        self.assertEqual(UbicacionActual.objects.get(activo=self.en_reparacion).ubicacion, self.laboratorio)
+
+    def test_cerrar_sin_activos_movibles(self):
+        """Si ningún mal ubicado permite movimiento la toma igual se cierra, sin traslados."""
+        toma = self.abrir(ubicacion=self.sala)
+        TomaInventarioService().registrar_lecturas(toma, [(self.en_reparacion.codigo_barras, Decimal('1'))])
+
+        toma = TomaInventarioService().cerrar_toma(toma, self.usuario, tipo_movimiento_activo=self.tipo_activo)
+
+        self.assertEqual(toma.estado, TomaInventario.ESTADO_CERRADA)
+        self.assertEqual((toma.resultado['trasladados'], toma.resultado['no_trasladados']), (0, [self.en_reparacion.pk]))
+
+    def test_cerrar_ajusta_stock_y_no_cierra_dos_veces(self):
+        """Diferencia y faltante quedan en lo contado con su movimiento; un segundo cierre se rechaza."""
+        toma = self.abrir(bodega=self.articulo.ubicacion_fisica)
+        TomaInventarioService().registrar_lecturas(toma, [
+            (self.articulo.codigo_barras, Decimal('5')), (self.articulo.codigo_barras, Decimal('2')),
+        ])
+        tipo = TipoMovimiento.objects.get(codigo='AJ')
+
+        resultado = TomaInventarioService().conciliar(toma)
+        diferencia = resultado['diferencias'][0]
+        self.assertEqual(diferencia[:3], [self.articulo.pk, 'K-001', 'Resma'])
+        self.assertEqual((Decimal(diferencia[3]), Decimal(diferencia[4])), (Decimal('10'), Decimal('7')))
+        self.assertEqual([fila[0] for fila in resultado['faltantes']], [self.otro.pk])
+
+        toma = TomaInventarioService().cerrar_toma(toma, self.usuario, tipo_movimiento_bodega=tipo)
+
+        self.assertEqual(toma.resultado['ajustados'], 2)
+        self.assertEqual(Articulo.objects.get(pk=self.articulo.pk).stock_actual, Decimal('7'))
+        self.assertEqual(Articulo.objects.get(pk=self.otro.pk).stock_actual, Decimal('0'))
+        self.assertEqual(
+            Movimiento.objects.filter(articulo=self.articulo).latest('id').stock_despues, Decimal('7')
+        )
+        with self.assertRaises(ValidationError):
+            TomaInventarioService().cerrar_toma(toma, self.usuario, tipo_movimiento_bodega=tipo)
+        self.assertEqual(Movimiento.objects.filter(articulo=self.otro).count(), 1)
+
+    def test_endpoint_lecturas(self):
+        """Acepta lotes válidos y rechaza cantidades negativas, no finitas o fuera de precisión."""
+        toma = self.abrir(bodega=self.articulo.ubicacion_fisica)
+        url = reverse('inventario:toma_lecturas', args=[toma.pk])
+        self.client.force_login(self.usuario)
+
+        def enviar(cantidad):
+            return self.client.post(
+                url, {'lecturas': [{'codigo': self.articulo.codigo_barras, 'cantidad': cantidad}]},
+                content_type='application/json'
+            )
 
-# Create your tests here.
+        respuesta = self.client.post(
+            url, {'codigos': [self.articulo.codigo_barras, 'DESCONOCIDO']}, content_type='application/json'
+        )
+        self.assertEqual(respuesta.json(), {'registrados': 2, 'no_registrados': ['DESCONOCIDO']})
+        self.assertEqual(enviar('2.5').status_code, 200)
+        for cantidad in ['-1', 'NaN', 'Infinity', '1.234', '1E+20', 'abc']:
+            self.assertEqual(enviar(cantidad).status_code, 400, cantidad)
+        self.assertEqual(Decimal(TomaInventarioService().conciliar(toma)['diferencias'][0][4]), Decimal('3.5'))
 
+        TomaInventarioService().anular_toma(toma)
+        self.assertEqual(enviar('1').status_code, 409)
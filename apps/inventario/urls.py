@@ -87,7 +87,16 @@ urlpatterns = [
     path('sectores/<int:pk>/editar/', views.sector_inventario_update, name='sector_inventario_update'),
     path('sectores/<int:pk>/eliminar/', views.sector_inventario_delete, name='sector_inventario_delete'),
     
+    # Tomas de Inventario
+    path('tomas/', views.toma_list, name='toma_list'),
+    path('tomas/crear/', views.toma_create, name='toma_create'),
+    path('tomas/<int:pk>/', views.toma_detail, name='toma_detail'),
+    path('tomas/<int:pk>/lecturas/', views.toma_lecturas, name='toma_lecturas'),
+    path('tomas/<int:pk>/cerrar/', views.toma_cerrar, name='toma_cerrar'),
+    path('tomas/<int:pk>/anular/', views.toma_anular, name='toma_anular'),
+
     # API AJAX
     path('ajax/filtrar-modelos/', views.ajax_filtrar_modelos, name='ajax_filtrar_modelos'),
+    path('api/escaner/', views.api_escaner, name='api_escaner'),
 ]
 
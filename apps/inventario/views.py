@@ -3,21 +3,30 @@ Vistas CRUD para el módulo de inventario.
 Proporciona interfaces web completas para gestionar catálogos y entidades de inventario.
 """
 
+import json
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.contrib.auth.decorators import login_required
+from django.contrib.auth.decorators import login_required, permission_required
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
 from django.db.models import Q
+from django.views.decorators.http import require_http_methods, require_POST
 from django.views.generic import TemplateView
+from core.utils import registrar_log_auditoria
 from .models import (
     Taller, TipoEquipo, Equipo, MantenimientoEquipo,
-    Marca, Modelo, NombreArticulo, SectorInventario
+    Marca, Modelo, NombreArticulo, SectorInventario, TomaInventario
 )
 from .forms import (
     TallerForm, TipoEquipoForm, EquipoForm, MantenimientoEquipoForm,
     BodegaForm, EstadoOrdenCompraForm, EstadoRecepcionForm, ProvenienciaForm, DepartamentoForm,
-    MarcaForm, ModeloForm, NombreArticuloForm, SectorInventarioForm
+    MarcaForm, ModeloForm, NombreArticuloForm, SectorInventarioForm,
+    TomaInventarioForm, CerrarTomaInventarioForm
 )
+from .repositories import TomaInventarioRepository, LecturaTomaInventarioRepository
+from .services import EscanerService, TomaInventarioService
 from apps.bodega.models import Bodega
 from apps.compras.models import EstadoOrdenCompra, EstadoRecepcion
 from apps.activos.models import Proveniencia
@@ -29,7 +38,7 @@ from apps.solicitudes.models import Departamento
 @login_required
 def taller_list(request):
     """Lista todos los talleres"""
-    queryset = Taller.objects.filter(eliminado=False)
+    queryset = Taller.vivos.all()
     
     # Búsqueda
     search_query = request.GET.get('search', '')
@@ -83,7 +92,7 @@ def taller_create(request):
 @login_required
 def taller_update(request, pk):
     """Actualizar taller existente"""
-    taller = get_object_or_404(Taller, pk=pk, eliminado=False)
+    taller = get_object_or_404(Taller.vivos, pk=pk)
     
     if request.method == 'POST':
         form = TallerForm(request.POST, instance=taller)
@@ -104,7 +113,7 @@ def taller_update(request, pk):
 @login_required
 def taller_delete(request, pk):
     """Eliminar taller (soft delete)"""
-    taller = get_object_or_404(Taller, pk=pk, eliminado=False)
+    taller = get_object_or_404(Taller.vivos, pk=pk)
     
     if request.method == 'POST':
         taller.eliminado = True
@@ -121,7 +130,7 @@ def taller_delete(request, pk):
 @login_required
 def tipo_equipo_list(request):
     """Lista todos los tipos de equipo"""
-    queryset = TipoEquipo.objects.filter(eliminado=False)
+    queryset = TipoEquipo.vivos.all()
     
     search_query = request.GET.get('search', '')
     if search_query:
@@ -170,7 +179,7 @@ def tipo_equipo_create(request):
 @login_required
 def tipo_equipo_update(request, pk):
     """Actualizar tipo de equipo existente"""
-    tipo = get_object_or_404(TipoEquipo, pk=pk, eliminado=False)
+    tipo = get_object_or_404(TipoEquipo.vivos, pk=pk)
     
     if request.method == 'POST':
         form = TipoEquipoForm(request.POST, instance=tipo)
@@ -191,7 +200,7 @@ def tipo_equipo_update(request, pk):
 @login_required
 def tipo_equipo_delete(request, pk):
     """Eliminar tipo de equipo (soft delete)"""
-    tipo = get_object_or_404(TipoEquipo, pk=pk, eliminado=False)
+    tipo = get_object_or_404(TipoEquipo.vivos, pk=pk)
     
     if request.method == 'POST':
         tipo.eliminado = True
@@ -208,7 +217,7 @@ def tipo_equipo_delete(request, pk):
 @login_required
 def equipo_list(request):
     """Lista todos los equipos"""
-    queryset = Equipo.objects.filter(eliminado=False).select_related('tipo', 'responsable', 'taller')
+    queryset = Equipo.vivos.select_related('tipo', 'responsable', 'taller')
     
     search_query = request.GET.get('search', '')
     if search_query:
@@ -247,8 +256,8 @@ def equipo_list(request):
     page_obj = paginator.get_page(page_number)
     
     # Para los filtros del formulario
-    tipos_equipo = TipoEquipo.objects.filter(activo=True, eliminado=False)
-    talleres = Taller.objects.filter(activo=True, eliminado=False)
+    tipos_equipo = TipoEquipo.vivos.filter(activo=True)
+    talleres = Taller.vivos.filter(activo=True)
     
     context = {
         'page_obj': page_obj,
@@ -282,7 +291,7 @@ def equipo_create(request):
 @login_required
 def equipo_update(request, pk):
     """Actualizar equipo existente"""
-    equipo = get_object_or_404(Equipo, pk=pk, eliminado=False)
+    equipo = get_object_or_404(Equipo.vivos, pk=pk)
     
     if request.method == 'POST':
         form = EquipoForm(request.POST, instance=equipo)
@@ -303,7 +312,7 @@ def equipo_update(request, pk):
 @login_required
 def equipo_delete(request, pk):
     """Eliminar equipo (soft delete)"""
-    equipo = get_object_or_404(Equipo, pk=pk, eliminado=False)
+    equipo = get_object_or_404(Equipo.vivos, pk=pk)
     
     if request.method == 'POST':
         equipo.eliminado = True
@@ -318,10 +327,9 @@ def equipo_delete(request, pk):
 @login_required
 def equipo_detail(request, pk):
     """Detalle de equipo con historial de mantenimientos"""
-    equipo = get_object_or_404(Equipo, pk=pk, eliminado=False)
-    mantenimientos = MantenimientoEquipo.objects.filter(
-        equipo=equipo,
-        eliminado=False
+    equipo = get_object_or_404(Equipo.vivos, pk=pk)
+    mantenimientos = MantenimientoEquipo.vivos.filter(
+        equipo=equipo
     ).order_by('-fecha_mantenimiento')
     
     return render(request, 'inventario/equipo_detail.html', {
@@ -335,7 +343,7 @@ def equipo_detail(request, pk):
 @login_required
 def mantenimiento_create(request, equipo_id):
     """Crear nuevo mantenimiento para un equipo"""
-    equipo = get_object_or_404(Equipo, pk=equipo_id, eliminado=False)
+    equipo = get_object_or_404(Equipo.vivos, pk=equipo_id)
     
     if request.method == 'POST':
         form = MantenimientoEquipoForm(request.POST)
@@ -373,11 +381,11 @@ def menu_gestores(request):
     
     try:
         stats = {
-            'total_bodegas': Bodega.objects.filter(eliminado=False).count(),
-            'total_categorias_bodega': CategoriaBodega.objects.filter(eliminado=False).count(),
-            'total_categorias_activos': CategoriaActivo.objects.filter(eliminado=False).count(),
-            'total_talleres': Taller.objects.filter(eliminado=False).count(),
-            'total_equipos': Equipo.objects.filter(eliminado=False).count(),
+            'total_bodegas': Bodega.vivos.count(),
+            'total_categorias_bodega': CategoriaBodega.vivos.count(),
+            'total_categorias_activos': CategoriaActivo.vivos.count(),
+            'total_talleres': Taller.vivos.count(),
+            'total_equipos': Equipo.vivos.count(),
             'total_proveedores': Proveedor.objects.filter(activo=True).count(),
         }
     except Exception:
@@ -400,7 +408,7 @@ def menu_gestores(request):
 @login_required
 def bodega_list(request):
     """Lista todas las bodegas"""
-    queryset = Bodega.objects.filter(eliminado=False).select_related('responsable')
+    queryset = Bodega.vivos.select_related('responsable')
     
     search_query = request.GET.get('search', '')
     if search_query:
@@ -448,7 +456,7 @@ def bodega_create(request):
 @login_required
 def bodega_update(request, pk):
     """Actualizar bodega"""
-    bodega = get_object_or_404(Bodega, pk=pk, eliminado=False)
+    bodega = get_object_or_404(Bodega.vivos, pk=pk)
     
     if request.method == 'POST':
         form = BodegaForm(request.POST, instance=bodega)
@@ -469,7 +477,7 @@ def bodega_update(request, pk):
 @login_required
 def bodega_delete(request, pk):
     """Eliminar bodega (soft delete)"""
-    bodega = get_object_or_404(Bodega, pk=pk, eliminado=False)
+    bodega = get_object_or_404(Bodega.vivos, pk=pk)
     
     if request.method == 'POST':
         bodega.eliminado = True
@@ -570,7 +578,7 @@ def estado_orden_compra_delete(request, pk):
 @login_required
 def estado_recepcion_list(request):
     """Lista todos los estados de recepción"""
-    queryset = EstadoRecepcion.objects.filter(eliminado=False)
+    queryset = EstadoRecepcion.vivos.all()
     
     search_query = request.GET.get('search', '')
     if search_query:
@@ -618,7 +626,7 @@ def estado_recepcion_create(request):
 @login_required
 def estado_recepcion_update(request, pk):
     """Actualizar estado de recepción"""
-    estado = get_object_or_404(EstadoRecepcion, pk=pk, eliminado=False)
+    estado = get_object_or_404(EstadoRecepcion.vivos, pk=pk)
     
     if request.method == 'POST':
         form = EstadoRecepcionForm(request.POST, instance=estado)
@@ -639,7 +647,7 @@ def estado_recepcion_update(request, pk):
 @login_required
 def estado_recepcion_delete(request, pk):
     """Eliminar estado de recepción (soft delete)"""
-    estado = get_object_or_404(EstadoRecepcion, pk=pk, eliminado=False)
+    estado = get_object_or_404(EstadoRecepcion.vivos, pk=pk)
     
     if request.method == 'POST':
         estado.eliminado = True
@@ -656,7 +664,7 @@ def estado_recepcion_delete(request, pk):
 @login_required
 def proveniencia_list(request):
     """Lista todas las proveniencias"""
-    queryset = Proveniencia.objects.filter(eliminado=False)
+    queryset = Proveniencia.vivos.all()
     
     search_query = request.GET.get('search', '')
     if search_query:
@@ -704,7 +712,7 @@ def proveniencia_create(request):
 @login_required
 def proveniencia_update(request, pk):
     """Actualizar proveniencia"""
-    proveniencia = get_object_or_404(Proveniencia, pk=pk, eliminado=False)
+    proveniencia = get_object_or_404(Proveniencia.vivos, pk=pk)
     
     if request.method == 'POST':
         form = ProvenienciaForm(request.POST, instance=proveniencia)
@@ -725,7 +733,7 @@ def proveniencia_update(request, pk):
 @login_required
 def proveniencia_delete(request, pk):
     """Eliminar proveniencia (soft delete)"""
-    proveniencia = get_object_or_404(Proveniencia, pk=pk, eliminado=False)
+    proveniencia = get_object_or_404(Proveniencia.vivos, pk=pk)
     
     if request.method == 'POST':
         proveniencia.eliminado = True
@@ -742,7 +750,7 @@ def proveniencia_delete(request, pk):
 @login_required
 def departamento_list(request):
     """Lista todos los departamentos"""
-    queryset = Departamento.objects.filter(eliminado=False).select_related('responsable')
+    queryset = Departamento.vivos.select_related('responsable')
     
     search_query = request.GET.get('search', '')
     if search_query:
@@ -790,7 +798,7 @@ def departamento_create(request):
 @login_required
 def departamento_update(request, pk):
     """Actualizar departamento"""
-    departamento = get_object_or_404(Departamento, pk=pk, eliminado=False)
+    departamento = get_object_or_404(Departamento.vivos, pk=pk)
     
     if request.method == 'POST':
         form = DepartamentoForm(request.POST, instance=departamento)
@@ -811,7 +819,7 @@ def departamento_update(request, pk):
 @login_required
 def departamento_delete(request, pk):
     """Eliminar departamento (soft delete)"""
-    departamento = get_object_or_404(Departamento, pk=pk, eliminado=False)
+    departamento = get_object_or_404(Departamento.vivos, pk=pk)
     
     if request.method == 'POST':
         departamento.eliminado = True
@@ -828,7 +836,7 @@ def departamento_delete(request, pk):
 @login_required
 def marca_list(request):
     """Lista todas las marcas"""
-    queryset = Marca.objects.filter(eliminado=False)
+    queryset = Marca.vivos.all()
     
     search_query = request.GET.get('search', '')
     if search_query:
@@ -876,7 +884,7 @@ def marca_create(request):
 @login_required
 def marca_update(request, pk):
     """Actualizar marca"""
-    marca = get_object_or_404(Marca, pk=pk, eliminado=False)
+    marca = get_object_or_404(Marca.vivos, pk=pk)
     
     if request.method == 'POST':
         form = MarcaForm(request.POST, instance=marca)
@@ -897,7 +905,7 @@ def marca_update(request, pk):
 @login_required
 def marca_delete(request, pk):
     """Eliminar marca (soft delete)"""
-    marca = get_object_or_404(Marca, pk=pk, eliminado=False)
+    marca = get_object_or_404(Marca.vivos, pk=pk)
     
     if request.method == 'POST':
         marca.eliminado = True
@@ -914,7 +922,7 @@ def marca_delete(request, pk):
 @login_required
 def modelo_list(request):
     """Lista todos los modelos"""
-    queryset = Modelo.objects.filter(eliminado=False).select_related('marca')
+    queryset = Modelo.vivos.select_related('marca')
     
     search_query = request.GET.get('search', '')
     if search_query:
@@ -941,7 +949,7 @@ def modelo_list(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    marcas = Marca.objects.filter(activo=True, eliminado=False)
+    marcas = Marca.vivos.filter(activo=True)
     
     return render(request, 'inventario/modelo_list.html', {
         'page_obj': page_obj,
@@ -971,7 +979,7 @@ def modelo_create(request):
 @login_required
 def modelo_update(request, pk):
     """Actualizar modelo"""
-    modelo = get_object_or_404(Modelo, pk=pk, eliminado=False)
+    modelo = get_object_or_404(Modelo.vivos, pk=pk)
     
     if request.method == 'POST':
         form = ModeloForm(request.POST, instance=modelo)
@@ -992,7 +1000,7 @@ def modelo_update(request, pk):
 @login_required
 def modelo_delete(request, pk):
     """Eliminar modelo (soft delete)"""
-    modelo = get_object_or_404(Modelo, pk=pk, eliminado=False)
+    modelo = get_object_or_404(Modelo.vivos, pk=pk)
     
     if request.method == 'POST':
         modelo.eliminado = True
@@ -1009,7 +1017,7 @@ def modelo_delete(request, pk):
 @login_required
 def nombre_articulo_list(request):
     """Lista todos los nombres de artículos"""
-    queryset = NombreArticulo.objects.filter(eliminado=False).select_related('categoria_recomendada')
+    queryset = NombreArticulo.vivos.select_related('categoria_recomendada')
     
     search_query = request.GET.get('search', '')
     if search_query:
@@ -1057,7 +1065,7 @@ def nombre_articulo_create(request):
 @login_required
 def nombre_articulo_update(request, pk):
     """Actualizar nombre de artículo"""
-    nombre_articulo = get_object_or_404(NombreArticulo, pk=pk, eliminado=False)
+    nombre_articulo = get_object_or_404(NombreArticulo.vivos, pk=pk)
     
     if request.method == 'POST':
         form = NombreArticuloForm(request.POST, instance=nombre_articulo)
@@ -1078,7 +1086,7 @@ def nombre_articulo_update(request, pk):
 @login_required
 def nombre_articulo_delete(request, pk):
     """Eliminar nombre de artículo (soft delete)"""
-    nombre_articulo = get_object_or_404(NombreArticulo, pk=pk, eliminado=False)
+    nombre_articulo = get_object_or_404(NombreArticulo.vivos, pk=pk)
     
     if request.method == 'POST':
         nombre_articulo.eliminado = True
@@ -1095,7 +1103,7 @@ def nombre_articulo_delete(request, pk):
 @login_required
 def sector_inventario_list(request):
     """Lista todos los sectores de inventario"""
-    queryset = SectorInventario.objects.filter(eliminado=False).select_related('responsable')
+    queryset = SectorInventario.vivos.select_related('responsable')
     
     search_query = request.GET.get('search', '')
     if search_query:
@@ -1143,7 +1151,7 @@ def sector_inventario_create(request):
 @login_required
 def sector_inventario_update(request, pk):
     """Actualizar sector de inventario"""
-    sector = get_object_or_404(SectorInventario, pk=pk, eliminado=False)
+    sector = get_object_or_404(SectorInventario.vivos, pk=pk)
     
     if request.method == 'POST':
         form = SectorInventarioForm(request.POST, instance=sector)
@@ -1164,7 +1172,7 @@ def sector_inventario_update(request, pk):
 @login_required
 def sector_inventario_delete(request, pk):
     """Eliminar sector de inventario (soft delete)"""
-    sector = get_object_or_404(SectorInventario, pk=pk, eliminado=False)
+    sector = get_object_or_404(SectorInventario.vivos, pk=pk)
     
     if request.method == 'POST':
         sector.eliminado = True
@@ -1186,12 +1194,240 @@ def ajax_filtrar_modelos(request):
     marca_id = request.GET.get('marca_id')
     
     if marca_id:
-        modelos = Modelo.objects.filter(
+        modelos = Modelo.vivos.filter(
             marca_id=marca_id,
-            activo=True,
-            eliminado=False
+            activo=True
         ).values('id', 'codigo', 'nombre')
         return JsonResponse(list(modelos), safe=False)
     
     return JsonResponse([], safe=False)
 
+
+
+# ==================== API ESCÁNER DE CÓDIGOS DE BARRAS ====================
+
+_JSON_COMPACTO = {'separators': (',', ':'), 'ensure_ascii': False}
+
+
+@login_required
+@require_http_methods(['GET', 'POST'])
+def api_escaner(request):
+    """
+    Endpoint para escáneres de mano: resuelve códigos de barras a activos/artículos.
+
+    - GET ?codigo=XXX: resuelve un código (404 si no existe).
+    - POST con cuerpo JSON {"codigos": [...]}: resuelve un lote de códigos y
+      retorna {"resultados": {codigo: resumen}, "no_encontrados": [...]}.
+
+    Solo se retornan resúmenes de los tipos que el usuario puede ver
+    (activos.view_activo para activos, bodega.view_articulo para artículos).
+    """
+    service = EscanerService()
+    # Cada tipo de resumen exige su propio permiso de lectura
+    tipos = service.tipos_permitidos(request.user)
+    if not tipos:
+        return JsonResponse({'error': 'Sin permisos'}, status=403)
+
+    if request.method == 'GET':
+        codigo = request.GET.get('codigo', '').strip()
+        if not codigo:
+            return JsonResponse({'error': 'Debe indicar el parámetro codigo'}, status=400)
+        resumen = service.resolver([codigo], tipos)[codigo]
+        return JsonResponse(
+            {'codigo': codigo, 'resultado': resumen},
+            status=200 if resumen else 404,
+            json_dumps_params=_JSON_COMPACTO
+        )
+
+    try:
+        codigos = json.loads(request.body or b'{}').get('codigos')
+    except (ValueError, AttributeError):
+        return JsonResponse({'error': 'JSON inválido'}, status=400)
+    if not isinstance(codigos, list):
+        return JsonResponse({'error': 'Debe enviar una lista "codigos"'}, status=400)
+
+    codigos = service.normalizar_codigos(codigos)
+    if len(codigos) > settings.ESCANER_MAX_CODIGOS:
+        return JsonResponse(
+            {'error': f'Máximo {settings.ESCANER_MAX_CODIGOS} códigos por solicitud'},
+            status=400
+        )
+
+    resueltos = service.resolver(codigos, tipos)
+    return JsonResponse({
+        'resultados': {codigo: resumen for codigo, resumen in resueltos.items() if resumen},
+        'no_encontrados': [codigo for codigo, resumen in resueltos.items() if not resumen],
+    }, json_dumps_params=_JSON_COMPACTO)
+
+
+# ==================== TOMAS DE INVENTARIO ====================
+
+
+@login_required
+@permission_required('inventario.view_tomainventario', raise_exception=True)
+def toma_list(request):
+    """Lista las tomas de inventario"""
+    queryset = TomaInventarioRepository.get_all()
+
+    estado_filter = request.GET.get('estado', '')
+    if estado_filter:
+        queryset = queryset.filter(estado=estado_filter)
+
+    paginator = Paginator(queryset, 20)
+    page_obj = paginator.get_page(request.GET.get('page'))
+
+    return render(request, 'inventario/toma_list.html', {
+        'page_obj': page_obj,
+        'estado_filter': estado_filter,
+    })
+
+
+@login_required
+@permission_required('inventario.add_tomainventario', raise_exception=True)
+def toma_create(request):
+    """Abrir una nueva toma de inventario"""
+    if request.method == 'POST':
+        form = TomaInventarioForm(request.POST)
+        if form.is_valid():
+            try:
+                toma = TomaInventarioService().abrir_toma(
+                    responsable=request.user,
+                    ubicacion=form.cleaned_data['ubicacion'],
+                    bodega=form.cleaned_data['bodega'],
+                    observaciones=form.cleaned_data['observaciones'] or ''
+                )
+            except ValidationError as e:
+                form.add_error(None, e)
+            else:
+                registrar_log_auditoria(
+                    request.user, 'CREAR',
+                    f'Abrió la toma de inventario {toma.numero} ({toma.ubicacion or toma.bodega})',
+                    request,
+                    meta={'toma_id': toma.id}
+                )
+                messages.success(request, f'Toma {toma.numero} abierta. Puede comenzar a escanear.')
+                return redirect('inventario:toma_detail', pk=toma.pk)
+    else:
+        form = TomaInventarioForm()
+
+    return render(request, 'inventario/toma_form.html', {'form': form, 'action': 'Abrir'})
+
+
+@login_required
+@permission_required('inventario.view_tomainventario', raise_exception=True)
+def toma_detail(request, pk):
+    """Detalle de una toma: lecturas en curso o resultado de la conciliación"""
+    toma = TomaInventarioRepository.get_by_id(pk)
+    if toma is None:
+        return redirect('inventario:toma_list')
+
+    return render(request, 'inventario/toma_detail.html', {
+        'toma': toma,
+        'total_lecturas': LecturaTomaInventarioRepository.count_by_toma(toma),
+        'resultado': toma.resultado or {},
+        'cerrar_form': CerrarTomaInventarioForm() if toma.esta_abierta else None,
+    })
+
+
+@login_required
+@permission_required('inventario.change_tomainventario', raise_exception=True)
+@require_POST
+def toma_lecturas(request, pk):
+    """
+    Endpoint para escáneres: registra un lote de lecturas en una toma abierta.
+
+    Acepta JSON {"codigos": ["...", ...]} (cada lectura cuenta 1) y/o
+    {"lecturas": [{"codigo": "...", "cantidad": 3}, ...]}. Las cantidades deben
+    ser números finitos, no negativos y con a lo más dos decimales.
+    """
+    toma = TomaInventarioRepository.get_by_id(pk)
+    if toma is None:
+        return JsonResponse({'error': 'Toma no encontrada'}, status=404)
+    if not toma.esta_abierta:
+        return JsonResponse({'error': 'La toma de inventario no está abierta.'}, status=409)
+
+    try:
+        data = json.loads(request.body or b'{}')
+        lecturas = [(codigo, Decimal('1')) for codigo in data.get('codigos', [])]
+        lecturas += [
+            (lectura['codigo'], Decimal(str(lectura.get('cantidad', 1))))
+            for lectura in data.get('lecturas', [])
+        ]
+    except (ValueError, TypeError, KeyError, AttributeError, InvalidOperation):
+        return JsonResponse({'error': 'JSON inválido'}, status=400)
+
+    if len(lecturas) > settings.ESCANER_MAX_CODIGOS:
+        return JsonResponse(
+            {'error': f'Máximo {settings.ESCANER_MAX_CODIGOS} lecturas por solicitud'},
+            status=400
+        )
+
+    try:
+        resumen = TomaInventarioService().registrar_lecturas(toma, lecturas)
+    except ValidationError as e:
+        # Cantidades inválidas son un error del cliente; el resto, la toma cerrada entretanto
+        status = 400 if 'cantidad' in getattr(e, 'error_dict', {}) else 409
+        return JsonResponse({'error': ' '.join(e.messages)}, status=status)
+
+    return JsonResponse(resumen, json_dumps_params=_JSON_COMPACTO)
+
+
+@login_required
+@permission_required('inventario.cerrar_tomainventario', raise_exception=True)
+@require_POST
+def toma_cerrar(request, pk):
+    """Cerrar una toma: conciliar y aplicar los ajustes elegidos"""
+    toma = get_object_or_404(TomaInventario.vivos, pk=pk)
+    form = CerrarTomaInventarioForm(request.POST)
+
+    if form.is_valid():
+        try:
+            toma = TomaInventarioService().cerrar_toma(
+                toma=toma,
+                usuario=request.user,
+                tipo_movimiento_activo=form.cleaned_data['tipo_movimiento_activo'],
+                tipo_movimiento_bodega=form.cleaned_data['tipo_movimiento_bodega']
+            )
+        except ValidationError as e:
+            messages.error(request, ' '.join(e.messages))
+        else:
+            resultado = toma.resultado
+            registrar_log_auditoria(
+                request.user, 'ACTUALIZAR',
+                f'Cerró la toma de inventario {toma.numero}',
+                request,
+                meta={
+                    'toma_id': toma.id,
+                    'faltantes': len(resultado['faltantes']),
+                    'mal_ubicados': len(resultado['mal_ubicados']),
+                    'sobrantes': len(resultado['sobrantes']),
+                    'trasladados': resultado.get('trasladados', 0),
+                    'no_trasladados': resultado.get('no_trasladados', []),
+                    'ajustados': resultado.get('ajustados', 0),
+                }
+            )
+            messages.success(request, f'Toma {toma.numero} cerrada.')
+
+    return redirect('inventario:toma_detail', pk=toma.pk)
+
+
+@login_required
+@permission_required('inventario.change_tomainventario', raise_exception=True)
+@require_POST
+def toma_anular(request, pk):
+    """Anular una toma abierta"""
+    toma = get_object_or_404(TomaInventario.vivos, pk=pk)
+    try:
+        TomaInventarioService().anular_toma(toma)
+    except ValidationError as e:
+        messages.error(request, ' '.join(e.messages))
+    else:
+        registrar_log_auditoria(
+            request.user, 'ACTUALIZAR',
+            f'Anuló la toma de inventario {toma.numero}',
+            request,
+            meta={'toma_id': toma.id}
+        )
+        messages.success(request, f'Toma {toma.numero} anulada.')
+
+    return redirect('inventario:toma_detail', pk=toma.pk)
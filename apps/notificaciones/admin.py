@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import TipoNotificacion, Notificacion, ConfiguracionNotificacion
+from .models import TipoNotificacion, Notificacion, ConfiguracionNotificacion, CorreoSaliente
 
 
 @admin.register(TipoNotificacion)
@@ -48,3 +48,12 @@ class ConfiguracionNotificacionAdmin(admin.ModelAdmin):
     list_filter = ['tipo_notificacion', 'notificacion_sistema', 'notificacion_email']
     search_fields = ['usuario__correo', 'tipo_notificacion__nombre']
     readonly_fields = ['fecha_creacion', 'fecha_modificacion']
+
+
+@admin.register(CorreoSaliente)
+class CorreoSalienteAdmin(admin.ModelAdmin):
+    list_display = ['destinatario', 'asunto', 'estado', 'intentos', 'proximo_intento', 'fecha_envio']
+    list_filter = ['estado']
+    search_fields = ['destinatario', 'asunto']
+    readonly_fields = ['fecha_creacion', 'fecha_envio', 'ultimo_error']
+    raw_id_fields = ['notificacion']
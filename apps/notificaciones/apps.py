@@ -5,3 +5,8 @@ class NotificacionesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.notificaciones'
     verbose_name = 'Gestión de Notificaciones'
+
+    def ready(self):
+        """Ejecutar configuraciones cuando la app esté lista."""
+        # Importar signals para que se registren automáticamente
+        from . import signals
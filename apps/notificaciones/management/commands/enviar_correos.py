@@ -0,0 +1,79 @@
+import smtplib
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.notificaciones.services import CorreoService
+
+
+class Command(BaseCommand):
+    help = (
+        'Envía los correos pendientes de la bandeja de salida en lotes, '
+        'reutilizando una conexión SMTP por lote. Con --continuo queda '
+        'ejecutándose como worker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote', type=int, default=settings.NOTIFICACIONES_EMAIL_LOTE,
+            help='Correos por conexión SMTP (default: NOTIFICACIONES_EMAIL_LOTE)'
+        )
+        parser.add_argument(
+            '--tasa', type=float, default=settings.NOTIFICACIONES_EMAIL_TASA,
+            help='Máximo de correos por segundo, 0 sin límite (default: NOTIFICACIONES_EMAIL_TASA)'
+        )
+        parser.add_argument(
+            '--max-intentos', type=int, default=settings.NOTIFICACIONES_EMAIL_MAX_INTENTOS,
+            help='Intentos antes de marcar un correo como fallido'
+        )
+        parser.add_argument(
+            '--continuo', action='store_true',
+            help='No terminar al vaciar la bandeja; esperar nuevos correos'
+        )
+        parser.add_argument(
+            '--intervalo', type=float, default=10.0,
+            help='Segundos de espera con la bandeja vacía en modo continuo (default: 10)'
+        )
+
+    def handle(self, *args, **options):
+        service = CorreoService()
+        totales = {'enviados': 0, 'reintentos': 0, 'fallidos': 0}
+        espera_error = options['intervalo']
+
+        self.stdout.write('[+] Enviando correos pendientes...')
+        while True:
+            try:
+                resultado = service.enviar_pendientes(
+                    lote=options['lote'],
+                    max_intentos=options['max_intentos'],
+                    tasa=options['tasa']
+                )
+            except (smtplib.SMTPException, OSError) as exc:
+                # Servidor SMTP no disponible: el lote queda pendiente
+                self.stderr.write(f'  [!] No se pudo conectar al servidor SMTP: {exc}')
+                if not options['continuo']:
+                    break
+                time.sleep(espera_error)
+                espera_error = min(espera_error * 2, 300)
+                continue
+
+            espera_error = options['intervalo']
+            for clave, valor in resultado.items():
+                totales[clave] += valor
+            procesados = sum(resultado.values())
+            if procesados:
+                self.stdout.write(
+                    f"  [+] Lote: {resultado['enviados']} enviados, "
+                    f"{resultado['reintentos']} reprogramados, {resultado['fallidos']} fallidos"
+                )
+                continue
+
+            if not options['continuo']:
+                break
+            time.sleep(options['intervalo'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\n[+] Finalizado: {totales['enviados']} enviados, "
+            f"{totales['reintentos']} reprogramados, {totales['fallidos']} fallidos"
+        ))
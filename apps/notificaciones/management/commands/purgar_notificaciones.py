@@ -0,0 +1,74 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.notificaciones.repositories import NotificacionRepository
+from apps.notificaciones.services import NotificacionService
+
+
+class Command(BaseCommand):
+    help = (
+        'Elimina en bloques las notificaciones vencidas y las leídas o archivadas '
+        'más antiguas que el período de retención. Pensado para ejecutarse desde '
+        'cron o una tarea programada, p. ej.: '
+        'python manage.py purgar_notificaciones --pausa 0.2'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias', type=int, default=settings.NOTIFICACIONES_RETENCION_DIAS,
+            help='Días que se conservan las leídas/archivadas (default: NOTIFICACIONES_RETENCION_DIAS)'
+        )
+        parser.add_argument(
+            '--lote', type=int, default=500,
+            help='Notificaciones eliminadas por transacción (default: 500)'
+        )
+        parser.add_argument(
+            '--pausa', type=float, default=0.1,
+            help='Segundos de espera entre bloques para liberar la base (default: 0.1)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo informa cuántas notificaciones se eliminarían'
+        )
+
+    def handle(self, *args, **options):
+        ahora = timezone.now()
+        fecha_limite = ahora - timedelta(days=options['dias'])
+
+        resumen = NotificacionRepository.get_resumen_purgables(fecha_limite, ahora)
+        self.stdout.write(f"[+] Notificaciones purgables (leídas/archivadas antes de {fecha_limite:%Y-%m-%d}):")
+        self.stdout.write(f"  [+] Vencidas: {resumen['vencidas']}")
+        self.stdout.write(f"  [+] Leídas antiguas: {resumen['leidas']}")
+        self.stdout.write(f"  [+] Archivadas sin leer antiguas: {resumen['archivadas']}")
+        self.stdout.write(f"  [+] Total: {resumen['total']}")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('\n[!] Dry-run: no se eliminó ninguna notificación'))
+            return
+        if not resumen['total']:
+            self.stdout.write(self.style.SUCCESS('\n[+] Nada que purgar'))
+            return
+
+        service = NotificacionService()
+        inicio = time.perf_counter()
+        total, bloques = 0, 0
+        # Una pasada por criterio, cada una sobre su propio índice
+        for criterio in NotificacionRepository.CRITERIOS_PURGA:
+            while True:
+                eliminadas = service.purgar_lote(criterio, fecha_limite, ahora, lote=options['lote'])
+                if not eliminadas:
+                    break
+                total += eliminadas
+                bloques += 1
+                if bloques % 20 == 0:
+                    self.stdout.write(f'  [+] {total} eliminadas en {bloques} bloques...')
+                time.sleep(options['pausa'])
+
+        duracion = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f'\n[+] Purga finalizada: {total} notificaciones eliminadas en {bloques} bloques ({duracion:.1f} s)'
+        ))
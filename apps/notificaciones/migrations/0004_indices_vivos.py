@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificaciones', '0003_configuracion_usuario_fk'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tiponotificacion',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_notiftipo_codigo_vivo'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificaciones', '0004_indices_vivos'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notificacion',
+            index=models.Index(condition=models.Q(('fecha_expiracion__isnull', False)), fields=['fecha_expiracion'], name='ix_notif_expiracion'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacion',
+            index=models.Index(condition=models.Q(('leida', True)), fields=['fecha_creacion'], name='ix_notif_leida_creacion'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacion',
+            index=models.Index(condition=models.Q(('archivada', True)), fields=['fecha_creacion'], name='ix_notif_archivada_creacion'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
-from core.models import BaseModel
+from django.utils import timezone
+from core.models import BaseModel, indice_vivos
 
 
 class TipoNotificacion(BaseModel):
@@ -43,6 +44,9 @@ class TipoNotificacion(BaseModel):
         verbose_name = 'Tipo de Notificación'
         verbose_name_plural = 'Tipos de Notificaciones'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_notiftipo_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -139,6 +143,11 @@ class Notificacion(BaseModel):
             models.Index(fields=['usuario_destino', '-fecha_creacion']),
             models.Index(fields=['usuario_destino', 'leida']),
             models.Index(fields=['tipo', '-fecha_creacion']),
+            # Purga: una pasada por criterio sobre su índice parcial
+            models.Index(fields=['fecha_expiracion'], condition=models.Q(fecha_expiracion__isnull=False),
+                         name='ix_notif_expiracion'),
+            models.Index(fields=['fecha_creacion'], condition=models.Q(leida=True), name='ix_notif_leida_creacion'),
+            models.Index(fields=['fecha_creacion'], condition=models.Q(archivada=True), name='ix_notif_archivada_creacion'),
         ]
 
     def __str__(self):
@@ -148,14 +157,20 @@ class Notificacion(BaseModel):
         """Marca la notificación como leída"""
         if not self.leida:
             from django.utils import timezone
+            from .services import ContadorNotificacionesService
             self.leida = True
             self.fecha_lectura = timezone.now()
-            self.save(update_fields=['leida', 'fecha_lectura'])
+            # UPDATE condicional: solo una petición concurrente descuenta del contador
+            actualizadas = Notificacion.objects.filter(pk=self.pk, leida=False).update(
+                leida=True, fecha_lectura=self.fecha_lectura
+            )
+            if actualizadas and not self.archivada:
+                ContadorNotificacionesService.sumar(self.usuario_destino_id, -1)
 
 
 class ConfiguracionNotificacion(BaseModel):
     """Modelo para configurar preferencias de notificaciones por usuario"""
-    usuario = models.OneToOneField(
+    usuario = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
         related_name='configuracion_notificaciones',
@@ -192,3 +207,61 @@ class ConfiguracionNotificacion(BaseModel):
 
     def __str__(self):
         return f"{self.usuario.correo} - {self.tipo_notificacion.nombre}"
+
+
+class CorreoSaliente(models.Model):
+    """
+    Bandeja de salida de correos (outbox).
+
+    Las vistas y servicios solo insertan filas aquí; el comando
+    `enviar_correos` las despacha en lotes por SMTP, de modo que ninguna
+    petición web espera al servidor de correo.
+    """
+    ESTADO_PENDIENTE = 'PENDIENTE'
+    ESTADO_ENVIADO = 'ENVIADO'
+    ESTADO_FALLIDO = 'FALLIDO'
+    ESTADO_CHOICES = [
+        (ESTADO_PENDIENTE, 'Pendiente'),
+        (ESTADO_ENVIADO, 'Enviado'),
+        (ESTADO_FALLIDO, 'Fallido'),
+    ]
+
+    destinatario = models.EmailField(max_length=254, verbose_name='Destinatario')
+    remitente = models.CharField(max_length=254, blank=True, null=True, verbose_name='Remitente')
+    asunto = models.CharField(max_length=255, verbose_name='Asunto')
+    cuerpo = models.TextField(verbose_name='Cuerpo')
+    cuerpo_html = models.TextField(blank=True, null=True, verbose_name='Cuerpo HTML')
+    notificacion = models.ForeignKey(
+        Notificacion,
+        on_delete=models.SET_NULL,
+        related_name='correos',
+        verbose_name='Notificación',
+        blank=True,
+        null=True
+    )
+
+    # Entrega
+    estado = models.CharField(
+        max_length=10,
+        choices=ESTADO_CHOICES,
+        default=ESTADO_PENDIENTE,
+        verbose_name='Estado'
+    )
+    intentos = models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')
+    proximo_intento = models.DateTimeField(default=timezone.now, verbose_name='Próximo Intento')
+    ultimo_error = models.TextField(blank=True, null=True, verbose_name='Último Error')
+
+    fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')
+    fecha_envio = models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Envío')
+
+    class Meta:
+        db_table = 'notificacion_correo_saliente'
+        verbose_name = 'Correo Saliente'
+        verbose_name_plural = 'Correos Salientes'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['estado', 'proximo_intento']),
+        ]
+
+    def __str__(self):
+        return f"{self.destinatario} - {self.asunto}"
@@ -0,0 +1,312 @@
+"""
+Repository Pattern para el módulo de notificaciones.
+
+Separa la lógica de acceso a datos de la lógica de negocio,
+siguiendo el principio de Inversión de Dependencias (SOLID).
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from django.db.models import QuerySet, Q, F, Count
+from django.contrib.auth.models import User, Group, Permission
+from django.utils import timezone
+from apps.solicitudes.models import Departamento, Area, Equipo
+from .models import Notificacion, TipoNotificacion, ConfiguracionNotificacion, CorreoSaliente
+
+
+# ==================== NOTIFICACION REPOSITORY ====================
+
+class NotificacionRepository:
+    """Repository para gestionar acceso a datos de Notificacion."""
+
+    @staticmethod
+    def filter_by_usuario(usuario: User) -> QuerySet[Notificacion]:
+        """Retorna las notificaciones no archivadas de un usuario."""
+        return Notificacion.objects.filter(
+            usuario_destino=usuario,
+            archivada=False
+        ).select_related('tipo', 'usuario_origen').order_by('-fecha_creacion')
+
+    @staticmethod
+    def count_no_leidas(usuario_id: int) -> int:
+        """Cuenta las notificaciones no leídas y no archivadas de un usuario."""
+        return Notificacion.objects.filter(
+            usuario_destino_id=usuario_id,
+            leida=False,
+            archivada=False
+        ).count()
+
+    @staticmethod
+    def marcar_todas_leidas(usuario: User) -> int:
+        """Marca como leídas todas las notificaciones pendientes de un usuario."""
+        return Notificacion.objects.filter(
+            usuario_destino=usuario,
+            leida=False
+        ).update(leida=True, fecha_lectura=timezone.now())
+
+    @staticmethod
+    def archivar(notificacion_id: int) -> int:
+        """Archiva una notificación si aún no lo estaba (UPDATE condicional)."""
+        return Notificacion.objects.filter(
+            pk=notificacion_id,
+            archivada=False
+        ).update(archivada=True)
+
+    @staticmethod
+    def bulk_create(notificaciones: List[Notificacion], batch_size: int = 500) -> List[Notificacion]:
+        """Inserta varias notificaciones en lotes."""
+        return Notificacion.objects.bulk_create(notificaciones, batch_size=batch_size)
+
+    # Criterios de purga. Cada uno se resuelve en una pasada propia sobre su
+    # índice parcial (ix_notif_expiracion, ix_notif_leida_creacion,
+    # ix_notif_archivada_creacion); un OR entre ellos obligaría a recorrer la
+    # tabla completa en cada bloque.
+    CRITERIOS_PURGA = ('vencidas', 'leidas', 'archivadas')
+
+    @staticmethod
+    def filtro_purga(criterio: str, fecha_limite: datetime, ahora: datetime) -> Q:
+        """
+        Condición de un criterio de purga: vencidas, o leídas/archivadas
+        creadas antes de `fecha_limite`.
+        """
+        return {
+            'vencidas': Q(fecha_expiracion__lt=ahora),
+            'leidas': Q(leida=True, fecha_creacion__lt=fecha_limite),
+            'archivadas': Q(archivada=True, fecha_creacion__lt=fecha_limite),
+        }[criterio]
+
+    @staticmethod
+    def get_resumen_purgables(fecha_limite: datetime, ahora: datetime) -> dict:
+        """
+        Cuenta en un solo agregado las notificaciones purgables por motivo.
+
+        Recorre la tabla una vez por ejecución (no por bloque) para informar
+        el total sin contar dos veces las que cumplen varios criterios.
+        """
+        antiguas = Q(fecha_creacion__lt=fecha_limite)
+        filtros = [
+            NotificacionRepository.filtro_purga(criterio, fecha_limite, ahora)
+            for criterio in NotificacionRepository.CRITERIOS_PURGA
+        ]
+        return Notificacion.objects.aggregate(
+            vencidas=Count('id', filter=filtros[0]),
+            leidas=Count('id', filter=antiguas & Q(leida=True)),
+            archivadas=Count('id', filter=antiguas & Q(archivada=True, leida=False)),
+            total=Count('id', filter=filtros[0] | filtros[1] | filtros[2]),
+        )
+
+    @staticmethod
+    def get_ids_purgables(criterio: str, fecha_limite: datetime, ahora: datetime, limite: int) -> List[int]:
+        """
+        Retorna el siguiente bloque de IDs purgables por un criterio.
+
+        Recorre el índice parcial del criterio en su propio orden; como cada
+        bloque se elimina antes de pedir el siguiente, el rango pendiente se
+        acorta y no hace falta avanzar sobre la clave primaria.
+        """
+        columna = 'fecha_expiracion' if criterio == 'vencidas' else 'fecha_creacion'
+        return list(
+            Notificacion.objects.filter(
+                NotificacionRepository.filtro_purga(criterio, fecha_limite, ahora)
+            ).order_by(columna).values_list('id', flat=True)[:limite]
+        )
+
+    @staticmethod
+    def delete_by_ids(notificacion_ids: List[int]) -> int:
+        """Elimina un bloque de notificaciones; retorna cuántas se eliminaron."""
+        eliminadas, _ = Notificacion.objects.filter(id__in=notificacion_ids).delete()
+        return eliminadas
+
+    @staticmethod
+    def marcar_email_enviado(notificacion_ids: List[int], fecha: datetime) -> int:
+        """Marca en un solo UPDATE el email de varias notificaciones como enviado."""
+        return Notificacion.objects.filter(
+            id__in=notificacion_ids,
+            email_enviado=False
+        ).update(email_enviado=True, fecha_envio_email=fecha)
+
+    @staticmethod
+    def get_destinatarios_email(usuario_ids: List[int]) -> List[Tuple[int, str]]:
+        """Retorna (id, email) de los usuarios activos que tienen email."""
+        return list(
+            User.objects.filter(id__in=usuario_ids, is_active=True).exclude(
+                email=''
+            ).values_list('id', 'email').order_by()
+        )
+
+    @staticmethod
+    def get_destinatarios_ids(
+        grupos: Optional[Iterable[Group]] = None,
+        departamentos: Optional[Iterable[Departamento]] = None,
+        permisos: Optional[Iterable[str]] = None
+    ) -> List[int]:
+        """
+        Resuelve en una sola consulta los usuarios destinatarios de un envío masivo.
+
+        Un usuario es destinatario si está activo y cumple alguno de los
+        criterios (pertenece a un grupo, es responsable/líder en un
+        departamento o tiene uno de los permisos, directo, por grupo o por ser
+        superusuario). Todos los criterios se expresan como subconsultas, sin
+        filas duplicadas. Las preferencias por tipo no se consultan aquí: las
+        aplica PreferenciasNotificacionService desde caché.
+
+        Args:
+            grupos: Grupos destinatarios
+            departamentos: Departamentos destinatarios
+            permisos: Permisos en formato 'app_label.codename'
+
+        Returns:
+            Lista de IDs de usuario
+        """
+        criterios = Q()
+
+        if grupos:
+            criterios |= Q(id__in=User.groups.through.objects.filter(
+                group__in=grupos
+            ).values('user_id'))
+
+        if departamentos:
+            departamento_ids = [getattr(departamento, 'pk', departamento) for departamento in departamentos]
+            criterios |= Q(id__in=Departamento.objects.filter(
+                id__in=departamento_ids, responsable__isnull=False
+            ).values('responsable_id'))
+            criterios |= Q(id__in=Area.objects.filter(
+                departamento_id__in=departamento_ids, activo=True, responsable__isnull=False
+            ).values('responsable_id'))
+            criterios |= Q(id__in=Equipo.objects.filter(
+                departamento_id__in=departamento_ids, activo=True, lider__isnull=False
+            ).values('lider_id'))
+
+        if permisos:
+            filtro_permisos = Q()
+            for permiso in permisos:
+                app_label, codename = permiso.split('.', 1)
+                filtro_permisos |= Q(content_type__app_label=app_label, codename=codename)
+            permisos_qs = Permission.objects.filter(filtro_permisos)
+
+            criterios |= Q(is_superuser=True)
+            criterios |= Q(id__in=User.user_permissions.through.objects.filter(
+                permission__in=permisos_qs
+            ).values('user_id'))
+            criterios |= Q(id__in=User.groups.through.objects.filter(
+                group__permissions__in=permisos_qs
+            ).values('user_id'))
+
+        if not criterios:
+            return []
+
+        return list(
+            User.objects.filter(criterios, is_active=True).values_list('id', flat=True).order_by()
+        )
+
+
+# ==================== TIPO NOTIFICACION REPOSITORY ====================
+
+class TipoNotificacionRepository:
+    """Repository para el catálogo de tipos de notificación."""
+
+    @staticmethod
+    def get_activos() -> QuerySet[TipoNotificacion]:
+        """Retorna los tipos activos y no eliminados."""
+        return TipoNotificacion.vivos.filter(
+            activo=True
+        ).order_by('codigo')
+
+    @staticmethod
+    def get_ids_activos() -> List[int]:
+        """Retorna los IDs de los tipos activos y no eliminados, ordenados."""
+        return list(TipoNotificacion.vivos.filter(
+            activo=True
+        ).order_by('id').values_list('id', flat=True))
+
+
+# ==================== CONFIGURACION NOTIFICACION REPOSITORY ====================
+
+class ConfiguracionNotificacionRepository:
+    """Repository para las preferencias de notificación por usuario y tipo."""
+
+    @staticmethod
+    def filter_by_usuario(usuario: User) -> QuerySet[ConfiguracionNotificacion]:
+        """Retorna las preferencias del usuario para los tipos activos."""
+        return ConfiguracionNotificacion.objects.filter(
+            usuario=usuario,
+            tipo_notificacion__activo=True,
+            tipo_notificacion__eliminado=False
+        ).select_related('tipo_notificacion').order_by('tipo_notificacion__codigo')
+
+    @staticmethod
+    def bulk_create_ignorando_existentes(configuraciones: List[ConfiguracionNotificacion]) -> None:
+        """
+        Inserta preferencias en un solo INSERT, ignorando las que ya existen.
+
+        Dos peticiones simultáneas del mismo usuario no chocan por el
+        unique_together (usuario, tipo_notificacion).
+        """
+        ConfiguracionNotificacion.objects.bulk_create(configuraciones, ignore_conflicts=True)
+
+    @staticmethod
+    def bulk_update(configuraciones: List[ConfiguracionNotificacion], campos: List[str]) -> int:
+        """Actualiza varias preferencias en un solo UPDATE."""
+        return ConfiguracionNotificacion.objects.bulk_update(configuraciones, campos)
+
+    @staticmethod
+    def get_desactivadas(usuario_ids: List[int]) -> QuerySet:
+        """
+        Retorna (usuario_id, tipo_id, sistema, email) de las preferencias con
+        algún canal desactivado para los usuarios indicados.
+        """
+        return ConfiguracionNotificacion.objects.filter(
+            Q(notificacion_sistema=False) | Q(notificacion_email=False),
+            usuario_id__in=usuario_ids
+        ).values_list(
+            'usuario_id', 'tipo_notificacion_id', 'notificacion_sistema', 'notificacion_email'
+        ).order_by()
+
+    @staticmethod
+    def get_usuarios_desactivados(usuario_ids: List[int], tipo_id: int, campo: str) -> QuerySet:
+        """
+        Retorna los IDs de los usuarios indicados que tienen desactivado el
+        canal `campo` ('notificacion_sistema' o 'notificacion_email') para un tipo.
+        """
+        return ConfiguracionNotificacion.objects.filter(
+            usuario_id__in=usuario_ids, tipo_notificacion_id=tipo_id, **{campo: False}
+        ).values_list('usuario_id', flat=True).order_by()
+
+
+# ==================== CORREO SALIENTE REPOSITORY ====================
+
+class CorreoSalienteRepository:
+    """Repository para la bandeja de salida de correos."""
+
+    @staticmethod
+    def bulk_create(correos: List[CorreoSaliente], batch_size: int = 500) -> List[CorreoSaliente]:
+        """Encola varios correos en lotes."""
+        return CorreoSaliente.objects.bulk_create(correos, batch_size=batch_size)
+
+    @staticmethod
+    def get_pendientes(fecha: datetime, limite: int) -> QuerySet[CorreoSaliente]:
+        """
+        Retorna los correos pendientes cuyo próximo intento ya venció.
+
+        Usa el índice (estado, proximo_intento).
+        """
+        return CorreoSaliente.objects.filter(
+            estado=CorreoSaliente.ESTADO_PENDIENTE,
+            proximo_intento__lte=fecha
+        ).order_by('proximo_intento', 'id')[:limite]
+
+    @staticmethod
+    def marcar_enviados(correo_ids: List[int], fecha: datetime) -> int:
+        """Marca en un solo UPDATE un lote de correos como enviados."""
+        return CorreoSaliente.objects.filter(id__in=correo_ids).update(
+            estado=CorreoSaliente.ESTADO_ENVIADO,
+            fecha_envio=fecha,
+            intentos=F('intentos') + 1,
+            ultimo_error=None
+        )
+
+    @staticmethod
+    def bulk_update_reintentos(correos: List[CorreoSaliente]) -> int:
+        """Guarda intentos, estado y próximo intento de los correos que fallaron."""
+        return CorreoSaliente.objects.bulk_update(
+            correos, ['estado', 'intentos', 'proximo_intento', 'ultimo_error']
+        )
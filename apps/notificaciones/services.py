@@ -0,0 +1,762 @@
+"""
+Service Layer para el módulo de notificaciones.
+
+Contiene la lógica de negocio y coordina los repositories,
+siguiendo el principio de Single Responsibility (SOLID).
+"""
+import asyncio
+import smtplib
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Iterable, List, Dict, Set, Tuple
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User, Group
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+from django.utils.html import strip_tags
+from apps.solicitudes.models import Departamento
+from .models import Notificacion, TipoNotificacion, ConfiguracionNotificacion, CorreoSaliente
+from .repositories import (
+    NotificacionRepository, TipoNotificacionRepository,
+    ConfiguracionNotificacionRepository, CorreoSalienteRepository
+)
+
+
+# ==================== CONTADOR DE NO LEÍDAS ====================
+
+class ContadorNotificacionesService:
+    """
+    Contador de notificaciones no leídas por usuario, mantenido en caché.
+
+    El valor se calcula con un COUNT solo cuando no está en caché; después se
+    incrementa o decrementa en cada creación, lectura o archivado, de modo que
+    las consultas periódicas del contador no tocan la base de datos. Los
+    cambios se aplican al confirmar la transacción.
+
+    Un incremento que no encuentra el contador deja una marca de recuento:
+    si una lectura estaba contando en ese momento, su COUNT puede no incluir
+    el cambio, y al ver la marca descarta el valor que acaba de guardar.
+
+    Los long-poll del mismo proceso esperan un asyncio.Event por usuario que
+    se activa al aplicar cada cambio; los cambios hechos en otro proceso se
+    detectan releyendo la caché cada NOTIFICACIONES_LONG_POLL_INTERVALO.
+    """
+
+    CACHE_PREFIX = 'notificaciones:no_leidas:'
+    # usuario_id -> esperas activas (loop, evento) de este proceso
+    _esperas: Dict[int, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+    _esperas_lock = threading.Lock()
+
+    @classmethod
+    def _cache_key(cls, usuario_id: int) -> str:
+        return f'{cls.CACHE_PREFIX}{usuario_id}'
+
+    @classmethod
+    def _recontar_key(cls, usuario_id: int) -> str:
+        return f'{cls.CACHE_PREFIX}recontar:{usuario_id}'
+
+    @classmethod
+    def obtener(cls, usuario_id: int) -> int:
+        """
+        Retorna la cantidad de notificaciones no leídas de un usuario.
+
+        Args:
+            usuario_id: ID del usuario
+
+        Returns:
+            Cantidad de notificaciones no leídas y no archivadas
+        """
+        key = cls._cache_key(usuario_id)
+        contador = cache.get(key)
+        if contador is None:
+            recontar = cls._recontar_key(usuario_id)
+            cache.delete(recontar)
+            contador = NotificacionRepository.count_no_leidas(usuario_id)
+            # add no pisa un valor que otro proceso haya dejado mientras contábamos
+            if cache.add(key, contador, timeout=settings.NOTIFICACIONES_CONTADOR_TIMEOUT):
+                # Un incremento perdido mientras contábamos: la próxima lectura recuenta
+                if cache.get(recontar):
+                    cache.delete(key)
+            else:
+                contador = cache.get(key, contador)
+        return max(contador, 0)
+
+    @classmethod
+    def sumar(cls, usuario_id: int, delta: int) -> None:
+        """
+        Ajusta el contador de un usuario en `delta` al confirmar la transacción.
+
+        Si el contador no está en caché solo se deja la marca de recuento: la
+        próxima lectura lo recalcula desde la base de datos.
+        """
+        if not delta:
+            return
+
+        def aplicar():
+            try:
+                cache.incr(cls._cache_key(usuario_id), delta)
+            except ValueError:
+                cache.set(cls._recontar_key(usuario_id), True, timeout=settings.NOTIFICACIONES_CONTADOR_TIMEOUT)
+            cls._avisar([usuario_id])
+
+        transaction.on_commit(aplicar)
+
+    @classmethod
+    def reiniciar(cls, usuario_id: int, valor: int = 0) -> None:
+        """Fija el contador de un usuario al confirmar la transacción."""
+        def aplicar():
+            cache.set(cls._cache_key(usuario_id), valor, timeout=settings.NOTIFICACIONES_CONTADOR_TIMEOUT)
+            cls._avisar([usuario_id])
+
+        transaction.on_commit(aplicar)
+
+    @classmethod
+    def invalidar(cls, usuario_ids: List[int]) -> None:
+        """
+        Descarta los contadores de varios usuarios con un solo delete_many.
+
+        Se usa tras inserciones masivas (bulk_create no dispara señales); cada
+        contador se recalcula en la próxima lectura del usuario.
+        """
+        usuario_ids = list(usuario_ids)
+        claves = [cls._cache_key(usuario_id) for usuario_id in usuario_ids]
+        if claves:
+            def aplicar():
+                cache.delete_many(claves)
+                cls._avisar(usuario_ids)
+
+            transaction.on_commit(aplicar)
+
+    @classmethod
+    def _avisar(cls, usuario_ids: List[int]) -> None:
+        """Despierta los long-poll de este proceso que esperan a estos usuarios."""
+        with cls._esperas_lock:
+            esperas = [espera for usuario_id in usuario_ids for espera in cls._esperas.get(usuario_id, ())]
+        for loop, evento in esperas:
+            # Puede llamarse desde otro hilo (vista síncrona, on_commit)
+            loop.call_soon_threadsafe(evento.set)
+
+    @classmethod
+    async def aobtener(cls, usuario_id: int) -> int:
+        """
+        Versión asíncrona de `obtener`: lee la caché con la API asíncrona y
+        solo pasa a un hilo para el COUNT cuando el contador no está en caché.
+        """
+        contador = await cache.aget(cls._cache_key(usuario_id))
+        if contador is None:
+            return await sync_to_async(cls.obtener)(usuario_id)
+        return max(contador, 0)
+
+    @classmethod
+    async def esperar_cambio(cls, usuario_id: int, conocido: int, timeout: float) -> int:
+        """
+        Espera a que el contador de un usuario difiera de `conocido`.
+
+        Despierta en cuanto este proceso aplica un cambio al contador; como
+        respaldo para los cambios hechos en otros procesos, relee la caché
+        cada NOTIFICACIONES_LONG_POLL_INTERVALO segundos.
+
+        Args:
+            usuario_id: ID del usuario
+            conocido: Último valor que conoce el cliente
+            timeout: Segundos máximos de espera
+
+        Returns:
+            Valor actual del contador (igual a `conocido` si se agotó la espera)
+        """
+        espera = (asyncio.get_running_loop(), asyncio.Event())
+        with cls._esperas_lock:
+            cls._esperas.setdefault(usuario_id, set()).add(espera)
+        limite = time.monotonic() + timeout
+        try:
+            while True:
+                # Se limpia antes de leer: un aviso posterior a la lectura no se pierde
+                espera[1].clear()
+                contador = await cls.aobtener(usuario_id)
+                restante = limite - time.monotonic()
+                if contador != conocido or restante <= 0:
+                    return contador
+                try:
+                    await asyncio.wait_for(
+                        espera[1].wait(), min(restante, settings.NOTIFICACIONES_LONG_POLL_INTERVALO)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with cls._esperas_lock:
+                esperas = cls._esperas.get(usuario_id)
+                esperas.discard(espera)
+                if not esperas:
+                    del cls._esperas[usuario_id]
+
+
+# ==================== PREFERENCIAS ====================
+
+class PreferenciasNotificacionService:
+    """
+    Preferencias de notificación por usuario y tipo.
+
+    Para el envío, las preferencias de cada usuario se resumen en dos enteros
+    guardados en caché (bit encendido = canal desactivado para ese tipo), así
+    el fan-out filtra destinatarios con un get_many en lugar de cruzar la tabla
+    de configuración por cada uno. Un usuario sin filas de configuración queda
+    como (0, 0): todo habilitado.
+
+    Cada tipo activo ocupa una posición densa (0, 1, 2...) y no su ID, que
+    puede crecer sin límite. El mapa tipo -> posición se guarda en caché con
+    una versión que también llevan las máscaras; al cambiar un tipo se
+    descarta el mapa y las máscaras de la versión anterior dejan de usarse.
+    """
+
+    CACHE_PREFIX = 'notificaciones:preferencias:'
+    POSICIONES_KEY = 'notificaciones:preferencias_posiciones'
+    CANAL_SISTEMA = 0
+    CANAL_EMAIL = 1
+
+    def __init__(self):
+        self.configuracion_repo = ConfiguracionNotificacionRepository()
+
+    @classmethod
+    def _cache_key(cls, usuario_id: int) -> str:
+        return f'{cls.CACHE_PREFIX}{usuario_id}'
+
+    def obtener_configuraciones(self, usuario: User) -> List[ConfiguracionNotificacion]:
+        """
+        Retorna las preferencias del usuario para todos los tipos activos.
+
+        Las que faltan se crean en un solo INSERT (ignorando conflictos) y se
+        vuelven a leer; si no falta ninguna basta con una lectura.
+
+        Args:
+            usuario: Usuario
+
+        Returns:
+            Configuraciones ordenadas por código de tipo
+        """
+        configuraciones = list(self.configuracion_repo.filter_by_usuario(usuario))
+        existentes = {config.tipo_notificacion_id for config in configuraciones}
+        faltantes = [
+            ConfiguracionNotificacion(
+                usuario=usuario,
+                tipo_notificacion=tipo,
+                notificacion_sistema=True,
+                notificacion_email=tipo.enviar_email
+            )
+            for tipo in TipoNotificacionRepository.get_activos()
+            if tipo.id not in existentes
+        ]
+        if faltantes:
+            self.configuracion_repo.bulk_create_ignorando_existentes(faltantes)
+            configuraciones = list(self.configuracion_repo.filter_by_usuario(usuario))
+        return configuraciones
+
+    @transaction.atomic
+    def guardar(
+        self,
+        usuario: User,
+        configuraciones: List[ConfiguracionNotificacion],
+        sistema: Set[int],
+        email: Set[int]
+    ) -> int:
+        """
+        Guarda las preferencias del usuario con un único bulk_update.
+
+        Args:
+            usuario: Usuario dueño de las configuraciones
+            configuraciones: Configuraciones obtenidas con obtener_configuraciones
+            sistema: IDs de tipo con notificación en sistema habilitada
+            email: IDs de tipo con notificación por email habilitada
+
+        Returns:
+            Cantidad de configuraciones modificadas
+        """
+        ahora = timezone.now()
+        modificadas = []
+        for config in configuraciones:
+            en_sistema = config.tipo_notificacion_id in sistema
+            por_email = config.tipo_notificacion_id in email
+            if (config.notificacion_sistema, config.notificacion_email) != (en_sistema, por_email):
+                config.notificacion_sistema = en_sistema
+                config.notificacion_email = por_email
+                config.fecha_modificacion = ahora
+                modificadas.append(config)
+
+        if modificadas:
+            self.configuracion_repo.bulk_update(
+                modificadas, ['notificacion_sistema', 'notificacion_email', 'fecha_modificacion']
+            )
+            self.invalidar([usuario.id])
+        return len(modificadas)
+
+    @classmethod
+    def _posiciones(cls) -> Tuple[str, Dict[int, int]]:
+        """
+        Retorna (version, {tipo_id: posicion}) de los tipos activos, desde
+        caché o construyéndolo con una consulta.
+        """
+        posiciones = cache.get(cls.POSICIONES_KEY)
+        if posiciones is None:
+            posiciones = (
+                uuid.uuid4().hex,
+                {tipo_id: bit for bit, tipo_id in enumerate(TipoNotificacionRepository.get_ids_activos())}
+            )
+            cache.set(cls.POSICIONES_KEY, posiciones, timeout=settings.NOTIFICACIONES_PREFERENCIAS_TIMEOUT)
+        return posiciones
+
+    @classmethod
+    def _mascaras(
+        cls, usuario_ids: List[int], version: str, posiciones: Dict[int, int]
+    ) -> Dict[int, Tuple[int, int]]:
+        """
+        Retorna {usuario_id: (mascara_sistema, mascara_email)} de los canales
+        desactivados, leyendo de caché y calculando las faltantes (o de otra
+        versión del mapa de posiciones) con una consulta por bloque de 500 usuarios.
+        """
+        claves = {cls._cache_key(usuario_id): usuario_id for usuario_id in usuario_ids}
+        mascaras = {
+            claves[clave]: (sistema, email)
+            for clave, (version_cache, sistema, email) in cache.get_many(list(claves)).items()
+            if version_cache == version
+        }
+        faltantes = [usuario_id for usuario_id in usuario_ids if usuario_id not in mascaras]
+
+        for inicio in range(0, len(faltantes), 500):
+            bloque = faltantes[inicio:inicio + 500]
+            calculadas = {usuario_id: [0, 0] for usuario_id in bloque}
+            for usuario_id, tipo_id, en_sistema, por_email in (
+                ConfiguracionNotificacionRepository.get_desactivadas(bloque)
+            ):
+                bit = posiciones.get(tipo_id)
+                if bit is None:
+                    continue
+                if not en_sistema:
+                    calculadas[usuario_id][cls.CANAL_SISTEMA] |= 1 << bit
+                if not por_email:
+                    calculadas[usuario_id][cls.CANAL_EMAIL] |= 1 << bit
+            cache.set_many(
+                {cls._cache_key(usuario_id): (version, *valor) for usuario_id, valor in calculadas.items()},
+                timeout=settings.NOTIFICACIONES_PREFERENCIAS_TIMEOUT
+            )
+            mascaras.update({usuario_id: tuple(valor) for usuario_id, valor in calculadas.items()})
+
+        return mascaras
+
+    @classmethod
+    def filtrar(cls, usuario_ids: List[int], tipo: TipoNotificacion, canal: int) -> List[int]:
+        """
+        Deja solo los usuarios que tienen habilitado el canal para el tipo.
+
+        Un tipo inactivo no tiene posición en las máscaras: sus preferencias
+        se consultan directamente.
+
+        Args:
+            usuario_ids: Candidatos
+            tipo: Tipo de notificación
+            canal: CANAL_SISTEMA o CANAL_EMAIL
+
+        Returns:
+            IDs de usuario, en el mismo orden
+        """
+        if not usuario_ids:
+            return []
+        version, posiciones = cls._posiciones()
+        if tipo.id not in posiciones:
+            campo = 'notificacion_sistema' if canal == cls.CANAL_SISTEMA else 'notificacion_email'
+            desactivados = set(
+                ConfiguracionNotificacionRepository.get_usuarios_desactivados(usuario_ids, tipo.id, campo)
+            )
+            return [usuario_id for usuario_id in usuario_ids if usuario_id not in desactivados]
+
+        bit = 1 << posiciones[tipo.id]
+        mascaras = cls._mascaras(usuario_ids, version, posiciones)
+        return [usuario_id for usuario_id in usuario_ids if not mascaras[usuario_id][canal] & bit]
+
+    @classmethod
+    def invalidar(cls, usuario_ids: List[int]) -> None:
+        """Descarta las preferencias en caché de los usuarios al confirmar la transacción."""
+        claves = [cls._cache_key(usuario_id) for usuario_id in usuario_ids]
+        if claves:
+            transaction.on_commit(lambda: cache.delete_many(claves))
+
+    @classmethod
+    def invalidar_tipos(cls) -> None:
+        """Descarta el mapa de posiciones al confirmar un cambio en los tipos."""
+        transaction.on_commit(lambda: cache.delete(cls.POSICIONES_KEY))
+
+
+# ==================== NOTIFICACION SERVICE ====================
+
+class NotificacionService:
+    """Service para lógica de negocio de Notificacion."""
+
+    def __init__(self):
+        self.notificacion_repo = NotificacionRepository()
+
+    @transaction.atomic
+    def marcar_todas_leidas(self, usuario: User) -> int:
+        """
+        Marca como leídas todas las notificaciones del usuario.
+
+        Returns:
+            Cantidad de notificaciones actualizadas
+        """
+        actualizadas = self.notificacion_repo.marcar_todas_leidas(usuario)
+        ContadorNotificacionesService.reiniciar(usuario.id)
+        return actualizadas
+
+    @transaction.atomic
+    def archivar(self, notificacion: Notificacion) -> Notificacion:
+        """Archiva una notificación y descuenta del contador si no estaba leída."""
+        if not notificacion.archivada:
+            notificacion.archivada = True
+            if self.notificacion_repo.archivar(notificacion.pk) and not notificacion.leida:
+                ContadorNotificacionesService.sumar(notificacion.usuario_destino_id, -1)
+        return notificacion
+
+    @transaction.atomic
+    def purgar_lote(
+        self,
+        criterio: str,
+        fecha_limite: datetime,
+        ahora: datetime,
+        lote: int = 500
+    ) -> int:
+        """
+        Elimina un bloque de notificaciones que cumplen un criterio de purga
+        (vencidas, leídas o archivadas antes de `fecha_limite`).
+
+        Cada bloque es una transacción corta, de modo que el bloqueo de
+        escritura (en SQLite, de toda la base) se libera entre bloques.
+
+        Args:
+            criterio: Uno de NotificacionRepository.CRITERIOS_PURGA
+            fecha_limite: Se purgan las leídas/archivadas creadas antes de esta fecha
+            ahora: Referencia para considerar una notificación vencida
+            lote: Máximo de notificaciones por bloque
+
+        Returns:
+            Cantidad de notificaciones eliminadas (0 si el criterio no tiene más)
+
+        Raises:
+            ValidationError: Si el criterio no existe
+        """
+        if criterio not in self.notificacion_repo.CRITERIOS_PURGA:
+            raise ValidationError(f'Criterio de purga desconocido: {criterio}')
+        ids = self.notificacion_repo.get_ids_purgables(criterio, fecha_limite, ahora, lote)
+        if not ids:
+            return 0
+        return self.notificacion_repo.delete_by_ids(ids)
+
+    @transaction.atomic
+    def broadcast(
+        self,
+        tipo: TipoNotificacion,
+        titulo: str,
+        mensaje: str,
+        grupos: Optional[Iterable[Group]] = None,
+        departamentos: Optional[Iterable[Departamento]] = None,
+        permisos: Optional[Iterable[str]] = None,
+        usuario_origen: Optional[User] = None,
+        enlace: Optional[str] = None,
+        modulo: Optional[str] = None,
+        referencia_id: Optional[int] = None,
+        referencia_tipo: Optional[str] = None,
+        fecha_expiracion: Optional[datetime] = None,
+        batch_size: int = 500
+    ) -> int:
+        """
+        Envía una notificación a todos los usuarios que cumplan los criterios.
+
+        Los destinatarios se resuelven en una consulta y se filtran con las
+        preferencias en caché (PreferenciasNotificacionService); las
+        notificaciones se insertan con bulk_create en lotes de `batch_size` y los contadores de
+        no leídas de los destinatarios se invalidan en bloque. Si el tipo
+        envía email, los correos se encolan en la bandeja de salida.
+
+        Args:
+            tipo: Tipo de notificación
+            titulo: Título
+            mensaje: Mensaje
+            grupos: Grupos destinatarios (opcional)
+            departamentos: Departamentos destinatarios: responsables del
+                departamento, de sus áreas y líderes de sus equipos (opcional)
+            permisos: Permisos 'app_label.codename' requeridos (opcional)
+            usuario_origen: Usuario que origina la notificación (opcional)
+            enlace: URL de la notificación (opcional)
+            modulo: Módulo relacionado (opcional)
+            referencia_id: ID del objeto relacionado (opcional)
+            referencia_tipo: Tipo del objeto relacionado (opcional)
+            fecha_expiracion: Fecha de expiración (opcional)
+            batch_size: Tamaño de cada INSERT
+
+        Returns:
+            Cantidad de notificaciones creadas
+
+        Raises:
+            ValidationError: Si no se indica ningún criterio de destinatarios o
+                algún permiso no tiene el formato 'app_label.codename'
+        """
+        permisos = list(permisos or [])
+        if not (grupos or departamentos or permisos):
+            raise ValidationError('Debe indicar grupos, departamentos o permisos destinatarios.')
+
+        invalidos = [
+            str(permiso) for permiso in permisos
+            if not isinstance(permiso, str) or not all(permiso.partition('.')[::2])
+        ]
+        if invalidos:
+            raise ValidationError({
+                'permisos': f'Permisos con formato inválido (se espera app_label.codename): {", ".join(invalidos)}'
+            })
+
+        usuario_ids = PreferenciasNotificacionService.filtrar(
+            self.notificacion_repo.get_destinatarios_ids(
+                grupos=grupos,
+                departamentos=departamentos,
+                permisos=permisos
+            ),
+            tipo,
+            PreferenciasNotificacionService.CANAL_SISTEMA
+        )
+        if not usuario_ids:
+            return 0
+
+        notificaciones = self.notificacion_repo.bulk_create([
+            Notificacion(
+                tipo=tipo,
+                usuario_destino_id=usuario_id,
+                usuario_origen=usuario_origen,
+                titulo=titulo,
+                mensaje=mensaje,
+                enlace=enlace,
+                modulo=modulo,
+                referencia_id=referencia_id,
+                referencia_tipo=referencia_tipo,
+                fecha_expiracion=fecha_expiracion
+            )
+            for usuario_id in usuario_ids
+        ], batch_size=batch_size)
+
+        if tipo.enviar_email:
+            CorreoService().encolar_notificaciones(notificaciones, batch_size=batch_size)
+
+        ContadorNotificacionesService.invalidar(usuario_ids)
+        return len(usuario_ids)
+
+
+# ==================== CORREO SERVICE ====================
+
+class CorreoService:
+    """
+    Service para la bandeja de salida de correos.
+
+    Encolar es una inserción más dentro de la transacción del llamador; el
+    envío lo hace `enviar_pendientes` (comando `enviar_correos`) fuera del
+    ciclo de petición, reutilizando una sola conexión SMTP por lote. La
+    entrega es "al menos una vez": si el proceso se interrumpe entre el envío
+    y la actualización del lote, esos correos se reenviarán. Se asume un único
+    worker a la vez.
+    """
+
+    def __init__(self):
+        self.correo_repo = CorreoSalienteRepository()
+        self.notificacion_repo = NotificacionRepository()
+
+    def encolar(
+        self,
+        destinatarios: Iterable[str],
+        asunto: str,
+        cuerpo: str,
+        cuerpo_html: Optional[str] = None,
+        remitente: Optional[str] = None
+    ) -> List[CorreoSaliente]:
+        """
+        Encola un correo por destinatario.
+
+        Args:
+            destinatarios: Direcciones de correo
+            asunto: Asunto
+            cuerpo: Cuerpo en texto plano
+            cuerpo_html: Alternativa HTML (opcional)
+            remitente: Remitente; por defecto DEFAULT_FROM_EMAIL al enviar
+
+        Returns:
+            Correos encolados
+        """
+        return self.correo_repo.bulk_create([
+            CorreoSaliente(
+                destinatario=destinatario,
+                remitente=remitente,
+                asunto=asunto,
+                cuerpo=cuerpo,
+                cuerpo_html=cuerpo_html
+            )
+            for destinatario in destinatarios
+        ])
+
+    def encolar_mensaje(self, mensaje: EmailMessage) -> List[CorreoSaliente]:
+        """Encola un EmailMessage ya renderizado (p. ej. los de allauth) en vez de enviarlo."""
+        cuerpo_html = None
+        cuerpo = mensaje.body
+        if mensaje.content_subtype == 'html':
+            cuerpo_html, cuerpo = mensaje.body, strip_tags(mensaje.body)
+        else:
+            for contenido, mimetype in getattr(mensaje, 'alternatives', []):
+                if mimetype == 'text/html':
+                    cuerpo_html = contenido
+        return self.encolar(
+            destinatarios=mensaje.to,
+            asunto=mensaje.subject,
+            cuerpo=cuerpo,
+            cuerpo_html=cuerpo_html,
+            remitente=mensaje.from_email
+        )
+
+    def encolar_notificaciones(
+        self,
+        notificaciones: List[Notificacion],
+        batch_size: int = 500
+    ) -> int:
+        """
+        Encola el correo de varias notificaciones de un mismo tipo.
+
+        Las preferencias se leen de caché y los emails de los destinatarios
+        se resuelven en una consulta.
+
+        Args:
+            notificaciones: Notificaciones ya guardadas, todas del mismo tipo
+            batch_size: Tamaño de cada INSERT
+
+        Returns:
+            Cantidad de correos encolados
+        """
+        if not notificaciones:
+            return 0
+
+        tipo = notificaciones[0].tipo
+        usuario_ids = PreferenciasNotificacionService.filtrar(
+            [notificacion.usuario_destino_id for notificacion in notificaciones],
+            tipo,
+            PreferenciasNotificacionService.CANAL_EMAIL
+        )
+        emails = dict(self.notificacion_repo.get_destinatarios_email(usuario_ids))
+        correos = [
+            CorreoSaliente(
+                destinatario=emails[notificacion.usuario_destino_id],
+                asunto=f'[{tipo.nombre}] {notificacion.titulo}',
+                cuerpo=self._cuerpo_notificacion(notificacion),
+                notificacion_id=notificacion.pk
+            )
+            for notificacion in notificaciones
+            if notificacion.usuario_destino_id in emails
+        ]
+        self.correo_repo.bulk_create(correos, batch_size=batch_size)
+        return len(correos)
+
+    @staticmethod
+    def _cuerpo_notificacion(notificacion: Notificacion) -> str:
+        """Texto plano del correo de una notificación."""
+        lineas = [notificacion.titulo, '', notificacion.mensaje]
+        if notificacion.enlace:
+            lineas += ['', notificacion.enlace]
+        return '\n'.join(lineas)
+
+    def enviar_pendientes(
+        self,
+        lote: Optional[int] = None,
+        max_intentos: Optional[int] = None,
+        tasa: Optional[float] = None,
+        backoff: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Envía un lote de correos pendientes por una única conexión SMTP.
+
+        Los enviados se marcan con un UPDATE (y sus notificaciones con otro).
+        Los que fallan se reprograman con backoff exponencial
+        (backoff * 2^(intentos-1) segundos) hasta `max_intentos`, tras lo cual
+        quedan FALLIDOS. Si la conexión se corta a mitad de lote se reabre
+        para el siguiente correo.
+
+        Args:
+            lote: Máximo de correos por conexión
+            max_intentos: Intentos antes de marcar como FALLIDO
+            tasa: Máximo de correos por segundo (0 o None: sin límite)
+            backoff: Segundos de espera base entre reintentos
+
+        Returns:
+            Diccionario con enviados, reintentos y fallidos
+
+        Raises:
+            OSError, smtplib.SMTPException: Si no se puede abrir la conexión;
+                el lote queda intacto para la próxima pasada
+        """
+        lote = lote or settings.NOTIFICACIONES_EMAIL_LOTE
+        max_intentos = max_intentos or settings.NOTIFICACIONES_EMAIL_MAX_INTENTOS
+        tasa = settings.NOTIFICACIONES_EMAIL_TASA if tasa is None else tasa
+        backoff = backoff or settings.NOTIFICACIONES_EMAIL_BACKOFF
+
+        resultado = {'enviados': 0, 'reintentos': 0, 'fallidos': 0}
+        pendientes = list(self.correo_repo.get_pendientes(timezone.now(), lote))
+        if not pendientes:
+            return resultado
+
+        intervalo = 1.0 / tasa if tasa else 0
+        enviados, con_error = [], []
+        conexion = get_connection(fail_silently=False)
+
+        with conexion:
+            for correo in pendientes:
+                inicio = time.monotonic()
+                try:
+                    conexion.send_messages([self._construir_mensaje(correo, conexion)])
+                    enviados.append(correo)
+                except (smtplib.SMTPException, OSError) as exc:
+                    correo.ultimo_error = str(exc)[:1000]
+                    con_error.append(correo)
+                    # Una conexión rota se descarta y send_messages abre otra
+                    conexion.close()
+                espera = intervalo - (time.monotonic() - inicio)
+                if espera > 0:
+                    time.sleep(espera)
+
+        ahora = timezone.now()
+        with transaction.atomic():
+            if enviados:
+                self.correo_repo.marcar_enviados([correo.id for correo in enviados], ahora)
+                notificacion_ids = [correo.notificacion_id for correo in enviados if correo.notificacion_id]
+                if notificacion_ids:
+                    self.notificacion_repo.marcar_email_enviado(notificacion_ids, ahora)
+
+            for correo in con_error:
+                correo.intentos += 1
+                if correo.intentos >= max_intentos:
+                    correo.estado = CorreoSaliente.ESTADO_FALLIDO
+                    resultado['fallidos'] += 1
+                else:
+                    correo.proximo_intento = ahora + timedelta(seconds=backoff * 2 ** (correo.intentos - 1))
+                    resultado['reintentos'] += 1
+            if con_error:
+                self.correo_repo.bulk_update_reintentos(con_error)
+
+        resultado['enviados'] = len(enviados)
+        return resultado
+
+    @staticmethod
+    def _construir_mensaje(correo: CorreoSaliente, conexion) -> EmailMultiAlternatives:
+        """Arma el mensaje de un correo encolado sobre la conexión compartida."""
+        mensaje = EmailMultiAlternatives(
+            subject=correo.asunto,
+            body=correo.cuerpo,
+            from_email=correo.remitente or settings.DEFAULT_FROM_EMAIL,
+            to=[correo.destinatario],
+            connection=conexion
+        )
+        if correo.cuerpo_html:
+            mensaje.attach_alternative(correo.cuerpo_html, 'text/html')
+        return mensaje
@@ -0,0 +1,48 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Notificacion, ConfiguracionNotificacion, TipoNotificacion
+from .services import ContadorNotificacionesService, CorreoService, PreferenciasNotificacionService
+
+
+# --------------------------
+#  Contador de no leídas
+# --------------------------
+@receiver(post_save, sender=Notificacion)
+def sumar_notificacion_creada(sender, instance, created, **kwargs):
+    """Incrementa el contador del destinatario al crear una notificación pendiente."""
+    if created and not instance.leida and not instance.archivada:
+        ContadorNotificacionesService.sumar(instance.usuario_destino_id, 1)
+
+
+@receiver(post_delete, sender=Notificacion)
+def restar_notificacion_eliminada(sender, instance, **kwargs):
+    """Descuenta del contador al eliminar una notificación pendiente."""
+    if not instance.leida and not instance.archivada:
+        ContadorNotificacionesService.sumar(instance.usuario_destino_id, -1)
+
+
+# --------------------------
+#  Bandeja de salida de correos
+# --------------------------
+@receiver(post_save, sender=Notificacion)
+def encolar_correo_notificacion(sender, instance, created, **kwargs):
+    """Encola el correo de una notificación nueva si su tipo envía email."""
+    if created and not instance.email_enviado and instance.tipo.enviar_email:
+        CorreoService().encolar_notificaciones([instance])
+
+
+# --------------------------
+#  Preferencias en caché
+# --------------------------
+@receiver(post_save, sender=ConfiguracionNotificacion)
+@receiver(post_delete, sender=ConfiguracionNotificacion)
+def invalidar_preferencias(sender, instance, **kwargs):
+    """Descarta las preferencias en caché del usuario al cambiar una configuración."""
+    PreferenciasNotificacionService.invalidar([instance.usuario_id])
+
+
+@receiver(post_save, sender=TipoNotificacion)
+@receiver(post_delete, sender=TipoNotificacion)
+def invalidar_posiciones_preferencias(sender, instance, **kwargs):
+    """Rehace el mapa de bits de las preferencias al cambiar el catálogo de tipos."""
+    PreferenciasNotificacionService.invalidar_tipos()
@@ -0,0 +1,616 @@
+"""
+Tests del módulo de notificaciones: contador de no leídas, destinatarios del
+envío masivo, purga, bandeja de salida de correos y preferencias.
+
+El envío se prueba contra un servidor SMTP mínimo que corre en un hilo del
+propio proceso, de modo que se ejercita el backend SMTP real de Django sin
+depender de un servidor externo.
+"""
+
+import asyncio
+import socketserver
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User, Group, Permission
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.solicitudes.models import Area, Departamento, Equipo
+from apps.notificaciones.models import (
+    TipoNotificacion,
+    Notificacion,
+    ConfiguracionNotificacion,
+    CorreoSaliente
+)
+from apps.notificaciones.repositories import NotificacionRepository
+from apps.notificaciones.services import (
+    ContadorNotificacionesService,
+    NotificacionService,
+    CorreoService,
+    PreferenciasNotificacionService
+)
+
+
+# ============================================================================
+# TESTS DEL CONTADOR DE NO LEÍDAS
+# ============================================================================
+
+class ContadorNotificacionesTest(TestCase):
+    """
+    Test: El contador de no leídas se mantiene en caché con incrementos
+    Criterio: Coincide con un COUNT tras crear, leer, leer todas y archivar, y
+              un incremento perdido durante un recuento no deja un valor viejo
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.tipo = TipoNotificacion.objects.create(codigo='AVISO', nombre='Aviso')
+        self.usuario = User.objects.create_user('lector', password='lector123')
+
+    def crear(self, cantidad: int = 1) -> list:
+        with self.captureOnCommitCallbacks(execute=True):
+            return [
+                Notificacion.objects.create(
+                    tipo=self.tipo, usuario_destino=self.usuario, titulo='Aviso', mensaje='Texto'
+                )
+                for _ in range(cantidad)
+            ]
+
+    def contador(self) -> int:
+        return ContadorNotificacionesService.obtener(self.usuario.id)
+
+    def test_sigue_creacion_lectura_y_archivado(self):
+        """Tras la primera lectura, el contador se ajusta sin volver a contar."""
+        notificaciones = self.crear(3)
+        self.assertEqual(self.contador(), 3)
+
+        self.crear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.contador(), 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notificaciones[0].marcar_como_leida()
+            notificaciones[0].marcar_como_leida()
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificacionService().archivar(notificaciones[1])
+        self.assertEqual(self.contador(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificacionService().marcar_todas_leidas(self.usuario)
+        self.assertEqual(self.contador(), 0)
+        self.assertEqual(NotificacionRepository.count_no_leidas(self.usuario.id), 0)
+
+    def test_incremento_durante_recuento(self):
+        """Una notificación confirmada mientras se cuenta fuerza un nuevo recuento."""
+        self.crear()
+        contar = NotificacionRepository.count_no_leidas
+
+        def contar_mientras_llega_otra(usuario_id):
+            total = contar(usuario_id)
+            self.crear()
+            return total
+
+        with mock.patch.object(NotificacionRepository, 'count_no_leidas', side_effect=contar_mientras_llega_otra):
+            self.assertEqual(self.contador(), 1)
+
+        self.assertEqual(self.contador(), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.contador(), 2)
+
+    @override_settings(NOTIFICACIONES_LONG_POLL_TIMEOUT=0.3, NOTIFICACIONES_LONG_POLL_INTERVALO=0.02)
+    async def test_long_poll(self):
+        """Responde al tiro si el valor conocido difiere, al cambiar o al agotar la espera."""
+        url = reverse('notificaciones:esperar_contador')
+        await self.async_client.aforce_login(self.usuario)
+        clave = ContadorNotificacionesService._cache_key(self.usuario.id)
+
+        respuesta = await self.async_client.get(url, {'contador': '5'})
+        self.assertEqual(respuesta.json(), {'contador': 0, 'cambio': True})
+
+        respuesta = await self.async_client.get(url, {'contador': '0'})
+        self.assertEqual(respuesta.json(), {'contador': 0, 'cambio': False})
+
+        async def llega_notificacion():
+            await asyncio.sleep(0.05)
+            cache.incr(clave)
+
+        respuesta, _ = await asyncio.gather(self.async_client.get(url, {'contador': '0'}), llega_notificacion())
+        self.assertEqual(respuesta.json(), {'contador': 1, 'cambio': True})
+
+    @override_settings(NOTIFICACIONES_LONG_POLL_TIMEOUT=5, NOTIFICACIONES_LONG_POLL_INTERVALO=30)
+    async def test_long_poll_despierta_con_el_cambio(self):
+        """Un cambio aplicado en este proceso despierta la espera sin esperar el intervalo."""
+        url = reverse('notificaciones:esperar_contador')
+        await self.async_client.aforce_login(self.usuario)
+        await ContadorNotificacionesService.aobtener(self.usuario.id)
+
+        async def llega_notificacion():
+            await asyncio.sleep(0.05)
+            # Desde otro hilo y fuera de transacción, como una vista síncrona al confirmar
+            await sync_to_async(ContadorNotificacionesService.sumar, thread_sensitive=False)(self.usuario.id, 1)
+
+        inicio = time.monotonic()
+        respuesta, _ = await asyncio.gather(self.async_client.get(url, {'contador': '0'}), llega_notificacion())
+
+        self.assertEqual(respuesta.json(), {'contador': 1, 'cambio': True})
+        self.assertLess(time.monotonic() - inicio, 2)
+        self.assertEqual(ContadorNotificacionesService._esperas, {})
+
+    async def test_lectura_asincrona_usa_la_cache(self):
+        """aobtener cuenta una vez y después solo lee la caché."""
+        self.assertEqual(await ContadorNotificacionesService.aobtener(self.usuario.id), 0)
+        with mock.patch.object(NotificacionRepository, 'count_no_leidas') as contar:
+            self.assertEqual(await ContadorNotificacionesService.aobtener(self.usuario.id), 0)
+        contar.assert_not_called()
+
+
+# ============================================================================
+# TESTS DE DESTINATARIOS DEL ENVÍO MASIVO
+# ============================================================================
+
+class DestinatariosBroadcastTest(TestCase):
+    """
+    Test: broadcast resuelve destinatarios por grupo, departamento y permiso
+    Criterio: Cada usuario activo que cumple algún criterio recibe una sola
+              notificación; los inactivos y los que no cumplen, ninguna
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tipo = TipoNotificacion.objects.create(codigo='AVISO', nombre='Aviso')
+        cls.u = {
+            nombre: User.objects.create_user(nombre, password='x')
+            for nombre in ['docente', 'jefe', 'encargado', 'lider', 'con_permiso', 'por_grupo', 'ninguno']
+        }
+        cls.u['admin'] = User.objects.create_superuser('admin', password='x')
+        cls.u['inactivo'] = User.objects.create_user('inactivo', password='x', is_active=False)
+
+        cls.docentes = Group.objects.create(name='Docentes')
+        cls.u['docente'].groups.add(cls.docentes)
+        cls.u['inactivo'].groups.add(cls.docentes)
+
+        cls.departamento = Departamento.objects.create(codigo='CIE', nombre='Ciencias', responsable=cls.u['jefe'])
+        Area.objects.create(codigo='LAB', nombre='Laboratorio', departamento=cls.departamento,
+                            responsable=cls.u['encargado'])
+        Area.objects.create(codigo='OLD', nombre='Cerrada', departamento=cls.departamento,
+                            responsable=cls.u['ninguno'], activo=False)
+        Equipo.objects.create(codigo='EQ1', nombre='Equipo 1', departamento=cls.departamento, lider=cls.u['lider'])
+
+        permiso = Permission.objects.get(codename='view_activo')
+        cls.u['con_permiso'].user_permissions.add(permiso)
+        bodegueros = Group.objects.create(name='Bodegueros')
+        bodegueros.permissions.add(permiso)
+        cls.u['por_grupo'].groups.add(bodegueros)
+
+    def setUp(self):
+        cache.clear()
+
+    def destinatarios(self, **criterios) -> set:
+        NotificacionService().broadcast(tipo=self.tipo, titulo='Aviso', mensaje='Texto', **criterios)
+        ids = Notificacion.objects.values_list('usuario_destino_id', flat=True)
+        self.assertEqual(len(ids), len(set(ids)))
+        return {User.objects.get(pk=pk).username for pk in ids}
+
+    def test_por_grupo(self):
+        self.assertEqual(self.destinatarios(grupos=[self.docentes]), {'docente'})
+
+    def test_por_departamento(self):
+        """Responsable del departamento, de sus áreas activas y líderes de sus equipos."""
+        self.assertEqual(
+            self.destinatarios(departamentos=[self.departamento]), {'jefe', 'encargado', 'lider'}
+        )
+
+    def test_por_permiso_incluye_grupos_y_superusuarios(self):
+        self.assertEqual(
+            self.destinatarios(permisos=['activos.view_activo']), {'con_permiso', 'por_grupo', 'admin'}
+        )
+
+    def test_criterios_combinados_sin_duplicados(self):
+        """Un usuario que cumple varios criterios recibe una sola notificación."""
+        self.u['jefe'].groups.add(self.docentes)
+
+        self.assertEqual(
+            self.destinatarios(grupos=[self.docentes], departamentos=[self.departamento.pk]),
+            {'docente', 'jefe', 'encargado', 'lider'}
+        )
+
+    def test_criterios_invalidos(self):
+        """Sin criterios o con permisos sin 'app_label.codename' se rechaza sin crear nada."""
+        service = NotificacionService()
+        for permisos in [None, ['view_activo'], ['activos.'], ['.view_activo']]:
+            with self.assertRaises(ValidationError):
+                service.broadcast(tipo=self.tipo, titulo='Aviso', mensaje='Texto', permisos=permisos)
+        self.assertFalse(Notificacion.objects.exists())
+
+
+# ============================================================================
+# TESTS DE PURGA
+# ============================================================================
+
+class PurgarNotificacionesTest(TestCase):
+    """
+    Test: purgar_notificaciones elimina vencidas y leídas/archivadas antiguas
+    Criterio: --dry-run solo informa; la purga real elimina exactamente las
+              que cumplen algún criterio, en bloques, y conserva el resto
+    """
+
+    def setUp(self):
+        tipo = TipoNotificacion.objects.create(codigo='AVISO', nombre='Aviso')
+        usuario = User.objects.create_user('purga', password='purga123')
+        ahora = timezone.now()
+        antigua = ahora - timedelta(days=200)
+        casos = {
+            'vencida': dict(fecha_expiracion=ahora - timedelta(days=1)),
+            'leida_antigua': dict(leida=True, creada=antigua),
+            'archivada_antigua': dict(archivada=True, creada=antigua),
+            'leida_y_archivada': dict(leida=True, archivada=True, creada=antigua),
+            'leida_reciente': dict(leida=True),
+            'pendiente_antigua': dict(creada=antigua),
+            'por_vencer': dict(fecha_expiracion=ahora + timedelta(days=1)),
+        }
+        self.ids = {}
+        for titulo, campos in casos.items():
+            creada = campos.pop('creada', None)
+            notificacion = Notificacion.objects.create(
+                tipo=tipo, usuario_destino=usuario, titulo=titulo, mensaje='Texto', **campos
+            )
+            if creada:
+                Notificacion.objects.filter(pk=notificacion.pk).update(fecha_creacion=creada)
+            self.ids[titulo] = notificacion.pk
+
+    def purgar(self, **opciones) -> str:
+        salida = StringIO()
+        call_command('purgar_notificaciones', dias=90, pausa=0, stdout=salida, **opciones)
+        return salida.getvalue()
+
+    def test_dry_run_no_elimina(self):
+        salida = self.purgar(dry_run=True)
+
+        self.assertIn('Vencidas: 1', salida)
+        self.assertIn('Leídas antiguas: 2', salida)
+        self.assertIn('Archivadas sin leer antiguas: 1', salida)
+        self.assertIn('Total: 4', salida)
+        self.assertEqual(Notificacion.objects.count(), len(self.ids))
+
+    def test_purga_en_bloques(self):
+        """Con bloques de 1 cada criterio necesita varias pasadas y ninguna queda a medias."""
+        salida = self.purgar(lote=1)
+
+        self.assertIn('4 notificaciones eliminadas en 4 bloques', salida)
+        self.assertEqual(
+            set(Notificacion.objects.values_list('titulo', flat=True)),
+            {'leida_reciente', 'pendiente_antigua', 'por_vencer'}
+        )
+        self.assertIn('Nada que purgar', self.purgar())
+
+    def test_criterio_desconocido(self):
+        with self.assertRaises(ValidationError):
+            NotificacionService().purgar_lote('todas', timezone.now(), timezone.now())
+
+
+# ============================================================================
+# SERVIDOR SMTP DE PRUEBA
+# ============================================================================
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Implementa lo justo de SMTP para el backend de Django."""
+
+    def _responder(self, linea: str) -> None:
+        self.wfile.write(f'{linea}\r\n'.encode())
+
+    def handle(self):
+        servidor = self.server
+        with servidor.lock:
+            servidor.conexiones += 1
+        self._responder('220 localhost SMTP de prueba')
+        destinatarios = []
+        while True:
+            linea = self.rfile.readline().decode().rstrip('\r\n')
+            if not linea:
+                return
+            comando = linea[:4].upper()
+            if comando in ('EHLO', 'HELO'):
+                self._responder('250 localhost')
+            elif comando == 'MAIL':
+                destinatarios = []
+                self._responder('250 OK')
+            elif comando == 'RCPT':
+                direccion = linea.split(':', 1)[1].strip(' <>')
+                if direccion in servidor.rechazados:
+                    self._responder('550 Buzón no disponible')
+                else:
+                    destinatarios.append(direccion)
+                    self._responder('250 OK')
+            elif comando == 'DATA':
+                self._responder('354 Fin con <CRLF>.<CRLF>')
+                while self.rfile.readline().decode().rstrip('\r\n') != '.':
+                    pass
+                with servidor.lock:
+                    servidor.recibidos.extend(destinatarios)
+                self._responder('250 OK')
+            elif comando == 'QUIT':
+                self._responder('221 Adiós')
+                return
+            else:
+                self._responder('250 OK')
+
+
+class ServidorSMTPPrueba(socketserver.ThreadingTCPServer):
+    """Servidor SMTP en memoria que registra conexiones y destinatarios."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.conexiones = 0
+        self.recibidos = []
+        self.rechazados = set()
+
+
+# ============================================================================
+# TESTS DE LA BANDEJA DE SALIDA
+# ============================================================================
+
+class CorreoSalienteTest(TestCase):
+    """Tests del encolado y del envío en lotes de correos."""
+
+    def setUp(self):
+        """Levanta el servidor SMTP de prueba y crea destinatarios."""
+        cache.clear()
+        self.smtp = ServidorSMTPPrueba()
+        threading.Thread(target=self.smtp.serve_forever, daemon=True).start()
+        self.addCleanup(self.smtp.server_close)
+        self.addCleanup(self.smtp.shutdown)
+
+        self.smtp_settings = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=self.smtp.server_address[1],
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER='',
+            EMAIL_HOST_PASSWORD=''
+        )
+
+        self.tipo = TipoNotificacion.objects.create(
+            codigo='AVISO', nombre='Aviso', enviar_email=True
+        )
+        self.grupo = Group.objects.create(name='Docentes')
+        self.usuarios = []
+        for i in range(5):
+            usuario = User.objects.create(
+                username=f'docente{i}', email=f'docente{i}@colegio.cl'
+            )
+            usuario.groups.add(self.grupo)
+            self.usuarios.append(usuario)
+
+    def _broadcast(self) -> int:
+        return NotificacionService().broadcast(
+            tipo=self.tipo, titulo='Reunión', mensaje='Mañana a las 10', grupos=[self.grupo]
+        )
+
+    def test_broadcast_encola_sin_enviar(self):
+        """Crear notificaciones solo inserta en la bandeja; no abre conexiones SMTP."""
+        with self.smtp_settings:
+            self._broadcast()
+
+        self.assertEqual(CorreoSaliente.objects.filter(estado=CorreoSaliente.ESTADO_PENDIENTE).count(), 5)
+        self.assertEqual(self.smtp.conexiones, 0)
+
+    def test_respeta_preferencia_email_y_usuarios_sin_email(self):
+        """No se encola correo a quien lo desactivó ni a quien no tiene email."""
+        ConfiguracionNotificacion.objects.create(
+            usuario=self.usuarios[0], tipo_notificacion=self.tipo, notificacion_email=False
+        )
+        User.objects.filter(pk=self.usuarios[1].pk).update(email='')
+
+        self._broadcast()
+
+        self.assertEqual(Notificacion.objects.count(), 5)
+        self.assertEqual(CorreoSaliente.objects.count(), 3)
+
+    def test_notificacion_individual_encola_correo(self):
+        """Una notificación creada con save() también pasa por la bandeja."""
+        notificacion = Notificacion.objects.create(
+            tipo=self.tipo, usuario_destino=self.usuarios[0], titulo='Hola', mensaje='Mensaje'
+        )
+        correo = CorreoSaliente.objects.get()
+        self.assertEqual(correo.notificacion, notificacion)
+        self.assertEqual(correo.destinatario, 'docente0@colegio.cl')
+
+    def test_envio_en_lote_reutiliza_una_conexion(self):
+        """Todo el lote viaja por una conexión y las notificaciones quedan marcadas."""
+        self._broadcast()
+
+        with self.smtp_settings:
+            resultado = CorreoService().enviar_pendientes(lote=50)
+
+        self.assertEqual(resultado['enviados'], 5)
+        self.assertEqual(self.smtp.conexiones, 1)
+        self.assertEqual(sorted(self.smtp.recibidos), sorted(u.email for u in self.usuarios))
+        self.assertFalse(CorreoSaliente.objects.exclude(estado=CorreoSaliente.ESTADO_ENVIADO).exists())
+        self.assertEqual(Notificacion.objects.filter(email_enviado=True).count(), 5)
+
+    def test_rechazo_reprograma_con_backoff_y_luego_falla(self):
+        """Un destinatario rechazado se reintenta más tarde y, agotados los intentos, queda FALLIDO."""
+        self.smtp.rechazados.add('docente0@colegio.cl')
+        self._broadcast()
+
+        with self.smtp_settings:
+            resultado = CorreoService().enviar_pendientes(max_intentos=2, backoff=60)
+        self.assertEqual(resultado, {'enviados': 4, 'reintentos': 1, 'fallidos': 0})
+
+        rechazado = CorreoSaliente.objects.get(destinatario='docente0@colegio.cl')
+        self.assertEqual(rechazado.intentos, 1)
+        self.assertGreater(rechazado.proximo_intento, timezone.now() + timedelta(seconds=30))
+
+        # Aún no vence el backoff: no hay nada que enviar
+        with self.smtp_settings:
+            self.assertEqual(CorreoService().enviar_pendientes()['enviados'], 0)
+
+        CorreoSaliente.objects.filter(pk=rechazado.pk).update(proximo_intento=timezone.now())
+        with self.smtp_settings:
+            resultado = CorreoService().enviar_pendientes(max_intentos=2)
+        self.assertEqual(resultado['fallidos'], 1)
+        self.assertEqual(
+            CorreoSaliente.objects.get(pk=rechazado.pk).estado, CorreoSaliente.ESTADO_FALLIDO
+        )
+        self.assertFalse(Notificacion.objects.get(usuario_destino=self.usuarios[0]).email_enviado)
+
+    def test_reset_password_se_encola(self):
+        """El correo de restablecer contraseña de allauth no se envía en la petición."""
+        response = self.client.post(
+            reverse('account_reset_password'), {'email': 'docente0@colegio.cl'}
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertTrue(CorreoSaliente.objects.filter(destinatario='docente0@colegio.cl').exists())
+
+
+# ============================================================================
+# TESTS DE PREFERENCIAS
+# ============================================================================
+
+class PreferenciasNotificacionTest(TestCase):
+    """Tests de la materialización en lote y de las preferencias en caché."""
+
+    def setUp(self):
+        """Crea tipos y un usuario autenticado."""
+        cache.clear()
+        self.tipos = [
+            TipoNotificacion.objects.create(codigo=f'T{i}', nombre=f'Tipo {i}', enviar_email=bool(i % 2))
+            for i in range(4)
+        ]
+        self.usuario = User.objects.create(username='preferencias', email='pref@colegio.cl')
+        self.grupo = Group.objects.create(name='Preferencias')
+        self.usuario.groups.add(self.grupo)
+        self.service = PreferenciasNotificacionService()
+
+    def test_materializa_todas_en_lote(self):
+        """La primera lectura crea una configuración por tipo; las siguientes solo leen."""
+        configuraciones = self.service.obtener_configuraciones(self.usuario)
+        self.assertEqual(len(configuraciones), 4)
+        self.assertEqual(
+            [c.notificacion_email for c in configuraciones], [t.enviar_email for t in self.tipos]
+        )
+
+        with self.assertNumQueries(2):
+            self.service.obtener_configuraciones(self.usuario)
+
+    def test_post_guarda_con_un_solo_update(self):
+        """La vista guarda todas las preferencias modificadas de una vez."""
+        self.client.force_login(self.usuario)
+        self.service.obtener_configuraciones(self.usuario)
+
+        datos = {f'sistema_{tipo.id}': 'on' for tipo in self.tipos[1:]}
+        response = self.client.post(reverse('notificaciones:configuracion'), datos)
+
+        self.assertEqual(response.status_code, 302)
+        desactivadas = ConfiguracionNotificacion.objects.filter(
+            usuario=self.usuario, notificacion_sistema=False
+        )
+        self.assertEqual([c.tipo_notificacion for c in desactivadas], [self.tipos[0]])
+        self.assertFalse(
+            ConfiguracionNotificacion.objects.filter(usuario=self.usuario, notificacion_email=True).exists()
+        )
+
+    def test_broadcast_usa_preferencias_en_cache(self):
+        """El fan-out respeta las preferencias y se actualiza al guardarlas."""
+        configuraciones = self.service.obtener_configuraciones(self.usuario)
+        tipo = self.tipos[0]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.guardar(
+                self.usuario, configuraciones, sistema={t.id for t in self.tipos[1:]}, email=set()
+            )
+        enviados = NotificacionService().broadcast(
+            tipo=tipo, titulo='Aviso', mensaje='Texto', grupos=[self.grupo]
+        )
+        self.assertEqual(enviados, 0)
+
+        # Segunda vez: las preferencias vienen de caché, sin leer la configuración
+        with CaptureQueriesContext(connection) as ctx:
+            NotificacionService().broadcast(
+                tipo=tipo, titulo='Aviso', mensaje='Texto', grupos=[self.grupo]
+            )
+        self.assertFalse(any('notificacion_configuracion' in q['sql'] for q in ctx.captured_queries))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.guardar(
+                self.usuario, configuraciones, sistema={t.id for t in self.tipos}, email=set()
+            )
+        enviados = NotificacionService().broadcast(
+            tipo=tipo, titulo='Aviso', mensaje='Texto', grupos=[self.grupo]
+        )
+        self.assertEqual(enviados, 1)
+
+    def test_mascaras_usan_posiciones_densas(self):
+        """Un tipo con ID alto ocupa la siguiente posición y no el bit de su ID."""
+        with self.captureOnCommitCallbacks(execute=True):
+            alto = TipoNotificacion.objects.create(id=100000, codigo='ALTO', nombre='Alto')
+        ConfiguracionNotificacion.objects.create(
+            usuario=self.usuario, tipo_notificacion=alto, notificacion_sistema=False, notificacion_email=True
+        )
+
+        self.assertEqual(
+            PreferenciasNotificacionService.filtrar(
+                [self.usuario.id], alto, PreferenciasNotificacionService.CANAL_SISTEMA
+            ),
+            []
+        )
+        _, posiciones = PreferenciasNotificacionService._posiciones()
+        self.assertEqual(sorted(posiciones.values()), list(range(5)))
+        version, sistema, email = cache.get(PreferenciasNotificacionService._cache_key(self.usuario.id))
+        self.assertEqual((sistema, email), (1 << posiciones[alto.id], 0))
+
+    def test_cambio_de_tipos_rehace_posiciones(self):
+        """Al desactivar un tipo se descartan el mapa y las máscaras de la versión anterior."""
+        tipo = self.tipos[1]
+        ConfiguracionNotificacion.objects.create(
+            usuario=self.usuario, tipo_notificacion=tipo, notificacion_sistema=False, notificacion_email=False
+        )
+        self.assertEqual(
+            PreferenciasNotificacionService.filtrar(
+                [self.usuario.id], tipo, PreferenciasNotificacionService.CANAL_EMAIL
+            ),
+            []
+        )
+        version, _ = PreferenciasNotificacionService._posiciones()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tipo.activo = False
+            tipo.save()
+        nueva_version, posiciones = PreferenciasNotificacionService._posiciones()
+        self.assertNotEqual(nueva_version, version)
+        self.assertNotIn(tipo.id, posiciones)
+
+        # Fuera del mapa, la preferencia del tipo inactivo se consulta directamente
+        self.assertEqual(
+            PreferenciasNotificacionService.filtrar(
+                [self.usuario.id], tipo, PreferenciasNotificacionService.CANAL_EMAIL
+            ),
+            []
+        )
+        self.assertEqual(
+            PreferenciasNotificacionService.filtrar(
+                [self.usuario.id], self.tipos[2], PreferenciasNotificacionService.CANAL_EMAIL
+            ),
+            [self.usuario.id]
+        )
+        self.assertEqual(
+            cache.get(PreferenciasNotificacionService._cache_key(self.usuario.id)), (nueva_version, 0, 0)
+        )
@@ -10,4 +10,5 @@ urlpatterns = [
     path('archivar/<int:pk>/', views.archivar_notificacion, name='archivar'),
     path('configuracion/', views.configuracion_notificaciones, name='configuracion'),
     path('contador/', views.contador_notificaciones, name='contador'),
+    path('contador/esperar/', views.esperar_contador_notificaciones, name='esperar_contador'),
 ]
@@ -1,29 +1,24 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
-from django.utils import timezone
-from .models import Notificacion, TipoNotificacion, ConfiguracionNotificacion
+from .models import Notificacion
+from .repositories import NotificacionRepository
+from .services import ContadorNotificacionesService, NotificacionService, PreferenciasNotificacionService
 
 
 @login_required
 def lista_notificaciones(request):
     """Vista para listar notificaciones del usuario"""
-    notificaciones = Notificacion.objects.filter(
-        usuario_destino=request.user,
-        archivada=False
-    ).select_related('tipo', 'usuario_origen').order_by('-fecha_creacion')
+    notificaciones = NotificacionRepository.filter_by_usuario(request.user)
 
     # Filtros
     solo_no_leidas = request.GET.get('no_leidas')
     if solo_no_leidas:
         notificaciones = notificaciones.filter(leida=False)
 
-    # Contar no leídas
-    no_leidas = Notificacion.objects.filter(
-        usuario_destino=request.user,
-        leida=False,
-        archivada=False
-    ).count()
+    # Contar no leídas (contador incremental en caché)
+    no_leidas = ContadorNotificacionesService.obtener(request.user.id)
 
     context = {
         'notificaciones': notificaciones,
@@ -52,10 +47,7 @@ def marcar_como_leida(request, pk):
 @login_required
 def marcar_todas_leidas(request):
     """Vista para marcar todas las notificaciones como leídas"""
-    Notificacion.objects.filter(
-        usuario_destino=request.user,
-        leida=False
-    ).update(leida=True, fecha_lectura=timezone.now())
+    NotificacionService().marcar_todas_leidas(request.user)
 
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({'success': True})
@@ -71,8 +63,7 @@ def archivar_notificacion(request, pk):
         pk=pk,
         usuario_destino=request.user
     )
-    notificacion.archivada = True
-    notificacion.save(update_fields=['archivada'])
+    NotificacionService().archivar(notificacion)
 
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({'success': True})
@@ -83,30 +74,18 @@ def archivar_notificacion(request, pk):
 @login_required
 def configuracion_notificaciones(request):
     """Vista para configurar preferencias de notificaciones"""
-    tipos = TipoNotificacion.objects.filter(activo=True)
-
-    # Obtener o crear configuraciones
-    configuraciones = []
-    for tipo in tipos:
-        config, created = ConfiguracionNotificacion.objects.get_or_create(
-            usuario=request.user,
-            tipo_notificacion=tipo,
-            defaults={
-                'notificacion_sistema': True,
-                'notificacion_email': tipo.enviar_email
-            }
-        )
-        configuraciones.append(config)
+    service = PreferenciasNotificacionService()
+    configuraciones = service.obtener_configuraciones(request.user)
 
     if request.method == 'POST':
-        # Actualizar configuraciones
-        for config in configuraciones:
-            sistema_key = f'sistema_{config.tipo_notificacion.id}'
-            email_key = f'email_{config.tipo_notificacion.id}'
-
-            config.notificacion_sistema = sistema_key in request.POST
-            config.notificacion_email = email_key in request.POST
-            config.save()
+        # Actualizar configuraciones (un solo bulk_update)
+        tipo_ids = [config.tipo_notificacion_id for config in configuraciones]
+        service.guardar(
+            request.user,
+            configuraciones,
+            sistema={tipo_id for tipo_id in tipo_ids if f'sistema_{tipo_id}' in request.POST},
+            email={tipo_id for tipo_id in tipo_ids if f'email_{tipo_id}' in request.POST}
+        )
 
         return redirect('notificaciones:configuracion')
 
@@ -120,10 +99,29 @@ def configuracion_notificaciones(request):
 @login_required
 def contador_notificaciones(request):
     """Vista AJAX para obtener el contador de notificaciones no leídas"""
-    contador = Notificacion.objects.filter(
-        usuario_destino=request.user,
-        leida=False,
-        archivada=False
-    ).count()
+    contador = ContadorNotificacionesService.obtener(request.user.id)
 
     return JsonResponse({'contador': contador})
+
+
+@login_required
+async def esperar_contador_notificaciones(request):
+    """
+    Long-poll del contador de notificaciones no leídas.
+
+    El cliente envía el último valor conocido en ?contador=N; la respuesta se
+    retiene hasta que el contador cambie o se cumpla el tiempo máximo. La
+    espera despierta con cada cambio del contador en este proceso y solo lee
+    la caché (API asíncrona), no la base de datos. Pensada para servirse con
+    ASGI (core/asgi.py), donde la espera no ocupa un worker.
+    """
+    user = await request.auser()
+    try:
+        conocido = int(request.GET.get('contador', -1))
+    except ValueError:
+        conocido = -1
+
+    contador = await ContadorNotificacionesService.esperar_cambio(
+        user.id, conocido, settings.NOTIFICACIONES_LONG_POLL_TIMEOUT
+    )
+    return JsonResponse({'contador': contador, 'cambio': contador != conocido})
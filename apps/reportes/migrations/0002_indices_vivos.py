@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reportes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reportegenerado',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['-fecha_generacion'], name='ix_repgen_fecha_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='tiporeporte',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['modulo', 'codigo'], name='ix_reptipo_codigo_vivo'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
-from core.models import BaseModel
+from core.models import BaseModel, indice_vivos
 
 
 class TipoReporte(BaseModel):
@@ -29,6 +29,9 @@ class TipoReporte(BaseModel):
         verbose_name = 'Tipo de Reporte'
         verbose_name_plural = 'Tipos de Reportes'
         ordering = ['modulo', 'codigo']
+        indexes = [
+            indice_vivos('modulo', 'codigo', nombre='ix_reptipo_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -81,6 +84,9 @@ class ReporteGenerado(BaseModel):
         verbose_name = 'Reporte Generado'
         verbose_name_plural = 'Reportes Generados'
         ordering = ['-fecha_generacion']
+        indexes = [
+            indice_vivos('-fecha_generacion', nombre='ix_repgen_fecha_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.tipo_reporte.nombre} - {self.usuario.correo} ({self.fecha_generacion})"
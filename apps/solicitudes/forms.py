@@ -87,11 +87,11 @@ class SolicitudForm(forms.ModelForm):
         # Filtrar solo bodegas activas
         self.fields['bodega_origen'].queryset = Bodega.objects.filter(activo=True)
         # Filtrar solo departamentos activos
-        self.fields['departamento'].queryset = Departamento.objects.filter(activo=True, eliminado=False)
+        self.fields['departamento'].queryset = Departamento.vivos.filter(activo=True)
         # Filtrar solo áreas activas
-        self.fields['area'].queryset = Area.objects.filter(activo=True, eliminado=False).select_related('departamento')
+        self.fields['area'].queryset = Area.vivos.filter(activo=True).select_related('departamento')
         # Filtrar solo equipos activos
-        self.fields['equipo'].queryset = Equipo.objects.filter(activo=True, eliminado=False).select_related('departamento')
+        self.fields['equipo'].queryset = Equipo.vivos.filter(activo=True).select_related('departamento')
 
         # Hacer campos opcionales
         self.fields['bodega_origen'].required = False
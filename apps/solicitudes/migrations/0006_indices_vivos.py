@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activos', '0007_indices_vivos'),
+        ('bodega', '0006_indices_vivos'),
+        ('solicitudes', '0005_detallesolicitud_articulo_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='area',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_area_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='departamento',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_depto_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='detallesolicitud',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['solicitud'], name='ix_soldet_solicitud_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='equipo',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_solequipo_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='estadosolicitud',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_solestado_codigo_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='historialsolicitud',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['solicitud', '-fecha_cambio'], name='ix_solhist_solicitud_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='solicitud',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['-fecha_solicitud', '-numero'], name='ix_sol_fecha_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='solicitud',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['solicitante', '-fecha_solicitud', '-numero'], name='ix_sol_solicitante_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='solicitud',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['estado', '-fecha_solicitud', '-numero'], name='ix_sol_estado_vivo'),
+        ),
+        migrations.AddIndex(
+            model_name='tiposolicitud',
+            index=models.Index(condition=models.Q(('eliminado', False)), fields=['codigo'], name='ix_soltipo_codigo_vivo'),
+        ),
+    ]
@@ -3,7 +3,7 @@ from django.core.validators import MinValueValidator
 from django.contrib.auth.models import User
 from apps.activos.models import Activo
 from apps.bodega.models import Bodega, Articulo
-from core.models import BaseModel
+from core.models import BaseModel, indice_vivos
 
 
 class Departamento(BaseModel):
@@ -27,6 +27,9 @@ class Departamento(BaseModel):
         verbose_name = 'Departamento'
         verbose_name_plural = 'Departamentos'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_depto_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -59,6 +62,9 @@ class Area(BaseModel):
         verbose_name = 'Área'
         verbose_name_plural = 'Áreas'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_area_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -91,6 +97,9 @@ class Equipo(BaseModel):
         verbose_name = 'Equipo'
         verbose_name_plural = 'Equipos'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_solequipo_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -110,6 +119,9 @@ class TipoSolicitud(BaseModel):
         verbose_name = 'Tipo de Solicitud'
         verbose_name_plural = 'Tipos de Solicitud'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_soltipo_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -136,6 +148,9 @@ class EstadoSolicitud(BaseModel):
         verbose_name = 'Estado de Solicitud'
         verbose_name_plural = 'Estados de Solicitudes'
         ordering = ['codigo']
+        indexes = [
+            indice_vivos('codigo', nombre='ix_solestado_codigo_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -285,6 +300,11 @@ class Solicitud(BaseModel):
             ('delete_any_solicitud', 'Puede eliminar cualquier solicitud'),
             ('ver_todas_solicitudes', 'Puede ver todas las solicitudes'),
         ]
+        indexes = [
+            indice_vivos('-fecha_solicitud', '-numero', nombre='ix_sol_fecha_vivo'),
+            indice_vivos('solicitante', '-fecha_solicitud', '-numero', nombre='ix_sol_solicitante_vivo'),
+            indice_vivos('estado', '-fecha_solicitud', '-numero', nombre='ix_sol_estado_vivo'),
+        ]
 
     def __str__(self):
         return f"SOL-{self.numero} - {self.solicitante.email}"
@@ -344,6 +364,9 @@ class DetalleSolicitud(BaseModel):
         verbose_name = 'Detalle de Solicitud'
         verbose_name_plural = 'Detalles de Solicitudes'
         ordering = ['solicitud', 'id']
+        indexes = [
+            indice_vivos('solicitud', nombre='ix_soldet_solicitud_vivo'),
+        ]
 
     def __str__(self):
         producto = self.articulo or self.activo
@@ -407,6 +430,9 @@ class HistorialSolicitud(BaseModel):
         verbose_name = 'Historial de Solicitud'
         verbose_name_plural = 'Historial de Solicitudes'
         ordering = ['-fecha_cambio']
+        indexes = [
+            indice_vivos('solicitud', '-fecha_cambio', nombre='ix_solhist_solicitud_vivo'),
+        ]
 
     def __str__(self):
         return f"{self.solicitud.numero} - {self.estado_nuevo.nombre} ({self.fecha_cambio})"
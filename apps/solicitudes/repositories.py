@@ -23,15 +23,15 @@ class DepartamentoRepository:
     @staticmethod
     def get_all() -> QuerySet[Departamento]:
         """Retorna todos los departamentos activos y no eliminados."""
-        return Departamento.objects.filter(
-            activo=True, eliminado=False
+        return Departamento.vivos.filter(
+            activo=True
         ).order_by('codigo')
 
     @staticmethod
     def get_by_id(departamento_id: int) -> Optional[Departamento]:
         """Obtiene un departamento por su ID."""
         try:
-            return Departamento.objects.get(id=departamento_id, eliminado=False, activo=True)
+            return Departamento.vivos.get(id=departamento_id, activo=True)
         except Departamento.DoesNotExist:
             return None
 
@@ -39,7 +39,7 @@ class DepartamentoRepository:
     def get_by_codigo(codigo: str) -> Optional[Departamento]:
         """Obtiene un departamento por su código."""
         try:
-            return Departamento.objects.get(codigo=codigo, eliminado=False, activo=True)
+            return Departamento.vivos.get(codigo=codigo, activo=True)
         except Departamento.DoesNotExist:
             return None
 
@@ -52,16 +52,16 @@ class AreaRepository:
     @staticmethod
     def get_all() -> QuerySet[Area]:
         """Retorna todas las áreas activas y no eliminadas."""
-        return Area.objects.filter(
-            activo=True, eliminado=False
+        return Area.vivos.filter(
+            activo=True
         ).select_related('departamento').order_by('codigo')
 
     @staticmethod
     def get_by_id(area_id: int) -> Optional[Area]:
         """Obtiene un área por su ID."""
         try:
-            return Area.objects.select_related('departamento').get(
-                id=area_id, eliminado=False, activo=True
+            return Area.vivos.select_related('departamento').get(
+                id=area_id, activo=True
             )
         except Area.DoesNotExist:
             return None
@@ -70,8 +70,8 @@ class AreaRepository:
     def get_by_codigo(codigo: str) -> Optional[Area]:
         """Obtiene un área por su código."""
         try:
-            return Area.objects.select_related('departamento').get(
-                codigo=codigo, eliminado=False, activo=True
+            return Area.vivos.select_related('departamento').get(
+                codigo=codigo, activo=True
             )
         except Area.DoesNotExist:
             return None
@@ -79,10 +79,9 @@ class AreaRepository:
     @staticmethod
     def filter_by_departamento(departamento: Departamento) -> QuerySet[Area]:
         """Retorna áreas de un departamento específico."""
-        return Area.objects.filter(
+        return Area.vivos.filter(
             departamento=departamento,
-            activo=True,
-            eliminado=False
+            activo=True
         ).order_by('codigo')
 
 
@@ -94,16 +93,16 @@ class EquipoRepository:
     @staticmethod
     def get_all() -> QuerySet[Equipo]:
         """Retorna todos los equipos activos y no eliminados."""
-        return Equipo.objects.filter(
-            activo=True, eliminado=False
+        return Equipo.vivos.filter(
+            activo=True
         ).select_related('departamento').order_by('codigo')
 
     @staticmethod
     def get_by_id(equipo_id: int) -> Optional[Equipo]:
         """Obtiene un equipo por su ID."""
         try:
-            return Equipo.objects.select_related('departamento').get(
-                id=equipo_id, eliminado=False, activo=True
+            return Equipo.vivos.select_related('departamento').get(
+                id=equipo_id, activo=True
             )
         except Equipo.DoesNotExist:
             return None
@@ -112,8 +111,8 @@ class EquipoRepository:
     def get_by_codigo(codigo: str) -> Optional[Equipo]:
         """Obtiene un equipo por su código."""
         try:
-            return Equipo.objects.select_related('departamento').get(
-                codigo=codigo, eliminado=False, activo=True
+            return Equipo.vivos.select_related('departamento').get(
+                codigo=codigo, activo=True
             )
         except Equipo.DoesNotExist:
             return None
@@ -121,10 +120,9 @@ class EquipoRepository:
     @staticmethod
     def filter_by_departamento(departamento: Departamento) -> QuerySet[Equipo]:
         """Retorna equipos de un departamento específico."""
-        return Equipo.objects.filter(
+        return Equipo.vivos.filter(
             departamento=departamento,
-            activo=True,
-            eliminado=False
+            activo=True
         ).order_by('codigo')
 
 
@@ -136,15 +134,15 @@ class TipoSolicitudRepository:
     @staticmethod
     def get_all() -> QuerySet[TipoSolicitud]:
         """Retorna todos los tipos activos y no eliminados."""
-        return TipoSolicitud.objects.filter(
-            activo=True, eliminado=False
+        return TipoSolicitud.vivos.filter(
+            activo=True
         ).order_by('codigo')
 
     @staticmethod
     def get_by_id(tipo_id: int) -> Optional[TipoSolicitud]:
         """Obtiene un tipo por su ID."""
         try:
-            return TipoSolicitud.objects.get(id=tipo_id, eliminado=False, activo=True)
+            return TipoSolicitud.vivos.get(id=tipo_id, activo=True)
         except TipoSolicitud.DoesNotExist:
             return None
 
@@ -152,22 +150,22 @@ class TipoSolicitudRepository:
     def get_by_codigo(codigo: str) -> Optional[TipoSolicitud]:
         """Obtiene un tipo por su código."""
         try:
-            return TipoSolicitud.objects.get(codigo=codigo, eliminado=False, activo=True)
+            return TipoSolicitud.vivos.get(codigo=codigo, activo=True)
         except TipoSolicitud.DoesNotExist:
             return None
 
     @staticmethod
     def get_with_aprobacion() -> QuerySet[TipoSolicitud]:
         """Retorna tipos que requieren aprobación."""
-        return TipoSolicitud.objects.filter(
-            requiere_aprobacion=True, activo=True, eliminado=False
+        return TipoSolicitud.vivos.filter(
+            requiere_aprobacion=True, activo=True
         ).order_by('codigo')
 
     @staticmethod
     def get_without_aprobacion() -> QuerySet[TipoSolicitud]:
         """Retorna tipos que NO requieren aprobación."""
-        return TipoSolicitud.objects.filter(
-            requiere_aprobacion=False, activo=True, eliminado=False
+        return TipoSolicitud.vivos.filter(
+            requiere_aprobacion=False, activo=True
         ).order_by('codigo')
 
 
@@ -179,15 +177,15 @@ class EstadoSolicitudRepository:
     @staticmethod
     def get_all() -> QuerySet[EstadoSolicitud]:
         """Retorna todos los estados activos y no eliminados."""
-        return EstadoSolicitud.objects.filter(
-            activo=True, eliminado=False
+        return EstadoSolicitud.vivos.filter(
+            activo=True
         ).order_by('codigo')
 
     @staticmethod
     def get_by_id(estado_id: int) -> Optional[EstadoSolicitud]:
         """Obtiene un estado por su ID."""
         try:
-            return EstadoSolicitud.objects.get(id=estado_id, eliminado=False, activo=True)
+            return EstadoSolicitud.vivos.get(id=estado_id, activo=True)
         except EstadoSolicitud.DoesNotExist:
             return None
 
@@ -195,29 +193,29 @@ class EstadoSolicitudRepository:
     def get_by_codigo(codigo: str) -> Optional[EstadoSolicitud]:
         """Obtiene un estado por su código."""
         try:
-            return EstadoSolicitud.objects.get(codigo=codigo, eliminado=False, activo=True)
+            return EstadoSolicitud.vivos.get(codigo=codigo, activo=True)
         except EstadoSolicitud.DoesNotExist:
             return None
 
     @staticmethod
     def get_inicial() -> Optional[EstadoSolicitud]:
         """Obtiene el estado inicial del sistema."""
-        return EstadoSolicitud.objects.filter(
-            es_inicial=True, activo=True, eliminado=False
+        return EstadoSolicitud.vivos.filter(
+            es_inicial=True, activo=True
         ).first()
 
     @staticmethod
     def get_finales() -> QuerySet[EstadoSolicitud]:
         """Retorna todos los estados finales."""
-        return EstadoSolicitud.objects.filter(
-            es_final=True, activo=True, eliminado=False
+        return EstadoSolicitud.vivos.filter(
+            es_final=True, activo=True
         ).order_by('codigo')
 
     @staticmethod
     def get_que_requieren_accion() -> QuerySet[EstadoSolicitud]:
         """Retorna estados que requieren acción."""
-        return EstadoSolicitud.objects.filter(
-            requiere_accion=True, activo=True, eliminado=False
+        return EstadoSolicitud.vivos.filter(
+            requiere_accion=True, activo=True
         ).order_by('codigo')
 
 
@@ -229,9 +227,7 @@ class SolicitudRepository:
     @staticmethod
     def get_all() -> QuerySet[Solicitud]:
         """Retorna todas las solicitudes no eliminadas con relaciones optimizadas."""
-        return Solicitud.objects.filter(
-            eliminado=False
-        ).select_related(
+        return Solicitud.vivos.select_related(
             'tipo_solicitud', 'estado', 'solicitante',
             'aprobador', 'despachador', 'bodega_origen'
         ).order_by('-fecha_solicitud', '-numero')
@@ -240,10 +236,10 @@ class SolicitudRepository:
     def get_by_id(solicitud_id: int) -> Optional[Solicitud]:
         """Obtiene una solicitud por su ID."""
         try:
-            return Solicitud.objects.select_related(
+            return Solicitud.vivos.select_related(
                 'tipo_solicitud', 'estado', 'solicitante',
                 'aprobador', 'despachador', 'bodega_origen'
-            ).get(id=solicitud_id, eliminado=False)
+            ).get(id=solicitud_id)
         except Solicitud.DoesNotExist:
             return None
 
@@ -251,19 +247,18 @@ class SolicitudRepository:
     def get_by_numero(numero: str) -> Optional[Solicitud]:
         """Obtiene una solicitud por su número."""
         try:
-            return Solicitud.objects.select_related(
+            return Solicitud.vivos.select_related(
                 'tipo_solicitud', 'estado', 'solicitante',
                 'aprobador', 'despachador', 'bodega_origen'
-            ).get(numero=numero, eliminado=False)
+            ).get(numero=numero)
         except Solicitud.DoesNotExist:
             return None
 
     @staticmethod
     def filter_by_solicitante(solicitante: User) -> QuerySet[Solicitud]:
         """Retorna solicitudes de un solicitante específico."""
-        return Solicitud.objects.filter(
-            solicitante=solicitante,
-            eliminado=False
+        return Solicitud.vivos.filter(
+            solicitante=solicitante
         ).select_related(
             'tipo_solicitud', 'estado', 'aprobador', 'despachador', 'bodega_origen'
         ).order_by('-fecha_solicitud')
@@ -271,9 +266,8 @@ class SolicitudRepository:
     @staticmethod
     def filter_by_estado(estado: EstadoSolicitud) -> QuerySet[Solicitud]:
         """Retorna solicitudes en un estado específico."""
-        return Solicitud.objects.filter(
-            estado=estado,
-            eliminado=False
+        return Solicitud.vivos.filter(
+            estado=estado
         ).select_related(
             'tipo_solicitud', 'solicitante', 'aprobador', 'despachador', 'bodega_origen'
         ).order_by('-fecha_solicitud')
@@ -281,9 +275,8 @@ class SolicitudRepository:
     @staticmethod
     def filter_by_tipo(tipo_solicitud: TipoSolicitud) -> QuerySet[Solicitud]:
         """Retorna solicitudes de un tipo específico."""
-        return Solicitud.objects.filter(
-            tipo_solicitud=tipo_solicitud,
-            eliminado=False
+        return Solicitud.vivos.filter(
+            tipo_solicitud=tipo_solicitud
         ).select_related(
             'estado', 'solicitante', 'aprobador', 'despachador', 'bodega_origen'
         ).order_by('-fecha_solicitud')
@@ -291,9 +284,8 @@ class SolicitudRepository:
     @staticmethod
     def filter_by_tipo_choice(tipo: str) -> QuerySet[Solicitud]:
         """Retorna solicitudes por tipo de choice (ACTIVO o ARTICULO)."""
-        return Solicitud.objects.filter(
-            tipo=tipo,
-            eliminado=False
+        return Solicitud.vivos.filter(
+            tipo=tipo
         ).select_related(
             'tipo_solicitud', 'estado', 'solicitante',
             'aprobador', 'despachador', 'bodega_origen'
@@ -302,9 +294,8 @@ class SolicitudRepository:
     @staticmethod
     def filter_by_bodega(bodega: Bodega) -> QuerySet[Solicitud]:
         """Retorna solicitudes de una bodega específica."""
-        return Solicitud.objects.filter(
-            bodega_origen=bodega,
-            eliminado=False
+        return Solicitud.vivos.filter(
+            bodega_origen=bodega
         ).select_related(
             'tipo_solicitud', 'estado', 'solicitante',
             'aprobador', 'despachador'
@@ -313,10 +304,9 @@ class SolicitudRepository:
     @staticmethod
     def filter_pendientes_aprobacion() -> QuerySet[Solicitud]:
         """Retorna solicitudes pendientes de aprobación."""
-        return Solicitud.objects.filter(
+        return Solicitud.vivos.filter(
             estado__requiere_accion=True,
-            aprobador__isnull=True,
-            eliminado=False
+            aprobador__isnull=True
         ).select_related(
             'tipo_solicitud', 'estado', 'solicitante', 'bodega_origen'
         ).order_by('-fecha_solicitud')
@@ -324,11 +314,10 @@ class SolicitudRepository:
     @staticmethod
     def filter_pendientes_despacho() -> QuerySet[Solicitud]:
         """Retorna solicitudes pendientes de despacho."""
-        return Solicitud.objects.filter(
+        return Solicitud.vivos.filter(
             aprobador__isnull=False,
             despachador__isnull=True,
-            estado__es_final=False,
-            eliminado=False
+            estado__es_final=False
         ).select_related(
             'tipo_solicitud', 'estado', 'solicitante',
             'aprobador', 'bodega_origen'
@@ -346,13 +335,12 @@ class SolicitudRepository:
     def search(query: str) -> QuerySet[Solicitud]:
         """Búsqueda de solicitudes por número o solicitante."""
         from django.db.models import Q
-        return Solicitud.objects.filter(
+        return Solicitud.vivos.filter(
             Q(numero__icontains=query) |
             Q(solicitante__first_name__icontains=query) |
             Q(solicitante__last_name__icontains=query) |
             Q(solicitante__email__icontains=query) |
-            Q(area_solicitante__icontains=query),
-            eliminado=False
+            Q(area_solicitante__icontains=query)
         ).select_related(
             'tipo_solicitud', 'estado', 'solicitante',
             'aprobador', 'despachador', 'bodega_origen'
@@ -367,18 +355,17 @@ class DetalleSolicitudRepository:
     @staticmethod
     def filter_by_solicitud(solicitud: Solicitud) -> QuerySet[DetalleSolicitud]:
         """Retorna detalles de una solicitud específica."""
-        return DetalleSolicitud.objects.filter(
-            solicitud=solicitud,
-            eliminado=False
+        return DetalleSolicitud.vivos.filter(
+            solicitud=solicitud
         ).select_related('activo').order_by('id')
 
     @staticmethod
     def get_by_id(detalle_id: int) -> Optional[DetalleSolicitud]:
         """Obtiene un detalle por su ID."""
         try:
-            return DetalleSolicitud.objects.select_related(
+            return DetalleSolicitud.vivos.select_related(
                 'solicitud', 'activo'
-            ).get(id=detalle_id, eliminado=False)
+            ).get(id=detalle_id)
         except DetalleSolicitud.DoesNotExist:
             return None
 
@@ -386,10 +373,9 @@ class DetalleSolicitudRepository:
     def filter_pendientes_despacho(solicitud: Solicitud) -> QuerySet[DetalleSolicitud]:
         """Retorna detalles pendientes de despacho."""
         from django.db.models import F
-        return DetalleSolicitud.objects.filter(
+        return DetalleSolicitud.vivos.filter(
             solicitud=solicitud,
-            cantidad_aprobada__gt=F('cantidad_despachada'),
-            eliminado=False
+            cantidad_aprobada__gt=F('cantidad_despachada')
         ).select_related('activo').order_by('id')
 
 
@@ -401,9 +387,8 @@ class HistorialSolicitudRepository:
     @staticmethod
     def filter_by_solicitud(solicitud: Solicitud) -> QuerySet[HistorialSolicitud]:
         """Retorna el historial de una solicitud específica."""
-        return HistorialSolicitud.objects.filter(
-            solicitud=solicitud,
-            eliminado=False
+        return HistorialSolicitud.vivos.filter(
+            solicitud=solicitud
         ).select_related(
             'estado_anterior', 'estado_nuevo', 'usuario'
         ).order_by('-fecha_cambio')
@@ -412,9 +397,9 @@ class HistorialSolicitudRepository:
     def get_by_id(historial_id: int) -> Optional[HistorialSolicitud]:
         """Obtiene un registro de historial por su ID."""
         try:
-            return HistorialSolicitud.objects.select_related(
+            return HistorialSolicitud.vivos.select_related(
                 'solicitud', 'estado_anterior', 'estado_nuevo', 'usuario'
-            ).get(id=historial_id, eliminado=False)
+            ).get(id=historial_id)
         except HistorialSolicitud.DoesNotExist:
             return None
 
@@ -434,6 +434,7 @@ class SolicitudDeleteView(BaseAuditedViewMixin, AtomicTransactionMixin, DeleteVi
         """Procesa la eliminación con log de auditoría."""
         self.object = self.get_object()
         numero = self.object.numero
+        solicitud_id = self.object.pk
 
         # Eliminar
         response = super().delete(request, *args, **kwargs)
@@ -443,7 +444,8 @@ class SolicitudDeleteView(BaseAuditedViewMixin, AtomicTransactionMixin, DeleteVi
             usuario=request.user,
             accion_glosa='ELIMINAR',
             descripcion=f'Eliminó solicitud {numero}',
-            request=request
+            request=request,
+            meta={'solicitud_id': solicitud_id}
         )
 
         messages.success(request, f'Solicitud {numero} eliminada exitosamente.')
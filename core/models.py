@@ -4,15 +4,53 @@ from django.conf import settings
 # Create your models here.
 
 
+class BaseQuerySet(models.QuerySet):
+    """QuerySet de los modelos con borrado lógico."""
+
+    def vivos(self):
+        """Solo registros no eliminados."""
+        return self.filter(eliminado=False)
+
+
+class VivosManager(models.Manager.from_queryset(BaseQuerySet)):
+    """
+    Manager de registros no eliminados (WHERE eliminado = false).
+
+    Las consultas que parten de aquí calzan con la condición de los índices
+    parciales `indice_vivos`, que solo contienen filas vivas.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(eliminado=False)
+
+
+def indice_vivos(*campos: str, nombre: str) -> models.Index:
+    """
+    Índice parcial sobre los registros no eliminados.
+
+    Args:
+        campos: Campos del índice ('-campo' para orden descendente)
+        nombre: Nombre del índice (máximo 30 caracteres)
+    """
+    return models.Index(fields=list(campos), condition=models.Q(eliminado=False), name=nombre)
+
+
 class BaseModel(models.Model):
     """
     Modelo base para auditoría - todos los modelos heredan de esta clase
+
+    Managers:
+        objects: Todos los registros, incluidos los eliminados
+        vivos: Solo los no eliminados (usar en listados y búsquedas)
     """
     activo = models.BooleanField(default=True, verbose_name="Activo", help_text="Estado activo/inactivo del registro")
     eliminado = models.BooleanField(default=False, verbose_name="Eliminado", help_text="Estado eliminado/no eliminado del registro")
     fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación", help_text="Fecha y hora de creación del registro")
     fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name="Fecha de Actualización", help_text="Fecha y hora de última actualización")
 
+    objects = BaseQuerySet.as_manager()
+    vivos = VivosManager()
+
     class Meta:
         abstract = True
         
\ No newline at end of file
@@ -146,6 +146,15 @@ DATABASES = {
 DATABASE_ROUTERS = ['core.db_router.DatabaseRouter']
 
 
+# Caché
+# Por defecto en memoria del proceso. Con varios workers usar una caché
+# compartida (ej: CACHE_URL=dbcache://cache_table o redis://...) para que
+# los contadores de notificaciones sean consistentes entre procesos
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -199,6 +208,10 @@ ACCOUNT_FORMS = {
     "reset_password_from_key": "apps.accounts.forms.PasswordResetKeyForm",
 }
 
+# Los correos de allauth (restablecer contraseña, etc.) se encolan en la
+# bandeja de salida en lugar de enviarse dentro de la petición
+ACCOUNT_ADAPTER = "apps.accounts.adapters.AccountAdapter"
+
 AUTHENTICATION_BACKENDS = [
     # Needed to login by username in Django admin, regardless of `allauth`
     'django.contrib.auth.backends.ModelBackend',
@@ -242,6 +255,52 @@ EMAIL_HOST_USER = env('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL')
 
+# Bajas de inventario
+# Códigos del estado de activo y del tipo de movimiento que se aplican
+# a los activos al confirmar una baja
+BAJAS_ESTADO_ACTIVO_CODIGO = env('BAJAS_ESTADO_ACTIVO_CODIGO', default='BAJA')
+BAJAS_TIPO_MOVIMIENTO_CODIGO = env('BAJAS_TIPO_MOVIMIENTO_CODIGO', default='BAJA')
+
+# Escáner de códigos de barras
+# Segundos que se mantiene en caché el resumen de un código leído y
+# cantidad máxima de códigos aceptados por solicitud
+ESCANER_CACHE_TIMEOUT = env.int('ESCANER_CACHE_TIMEOUT', default=300)
+ESCANER_MAX_CODIGOS = env.int('ESCANER_MAX_CODIGOS', default=500)
+
+# Notificaciones
+# Duración en caché del contador de no leídas y parámetros del long-poll
+# (el intervalo es el respaldo para cambios hechos en otros procesos; los
+# del mismo proceso despiertan la espera al instante)
+NOTIFICACIONES_CONTADOR_TIMEOUT = env.int('NOTIFICACIONES_CONTADOR_TIMEOUT', default=3600)
+NOTIFICACIONES_LONG_POLL_TIMEOUT = env.int('NOTIFICACIONES_LONG_POLL_TIMEOUT', default=25)
+NOTIFICACIONES_LONG_POLL_INTERVALO = env.float('NOTIFICACIONES_LONG_POLL_INTERVALO', default=1.0)
+# Duración en caché de las preferencias por usuario (se invalidan al cambiar)
+NOTIFICACIONES_PREFERENCIAS_TIMEOUT = env.int('NOTIFICACIONES_PREFERENCIAS_TIMEOUT', default=86400)
+# Días que se conservan las notificaciones leídas o archivadas (purgar_notificaciones)
+NOTIFICACIONES_RETENCION_DIAS = env.int('NOTIFICACIONES_RETENCION_DIAS', default=90)
+
+# Bandeja de salida de correos (comando enviar_correos)
+# Correos por conexión SMTP, intentos antes de darlos por fallidos, límite
+# de correos por segundo (0 = sin límite) y segundos base del backoff
+NOTIFICACIONES_EMAIL_LOTE = env.int('NOTIFICACIONES_EMAIL_LOTE', default=50)
+NOTIFICACIONES_EMAIL_MAX_INTENTOS = env.int('NOTIFICACIONES_EMAIL_MAX_INTENTOS', default=5)
+NOTIFICACIONES_EMAIL_TASA = env.float('NOTIFICACIONES_EMAIL_TASA', default=0)
+NOTIFICACIONES_EMAIL_BACKOFF = env.int('NOTIFICACIONES_EMAIL_BACKOFF', default=60)
+
+# Retención del log de auditoría (AuthLogs)
+# Días que se conservan en la tabla y carpeta, dentro de MEDIA_ROOT, donde
+# el comando archivar_auditoria deja los JSONL comprimidos. Si MEDIA_ROOT se
+# publica directamente, excluir esta carpeta en el servidor web.
+AUDITORIA_RETENCION_DIAS = env.int('AUDITORIA_RETENCION_DIAS', default=180)
+AUDITORIA_ARCHIVO_DIR = env('AUDITORIA_ARCHIVO_DIR', default='auditoria')
+
+# Bloqueo de logins fallidos (contadores en caché, sin escrituras por intento)
+# Intentos por usuario o IP dentro de la ventana (segundos) antes de bloquear,
+# y cada cuántos segundos se escribe el resumen de fallidos de una IP en AuthLogs
+LOGIN_INTENTOS_MAX = env.int('LOGIN_INTENTOS_MAX', default=5)
+LOGIN_INTENTOS_VENTANA = env.int('LOGIN_INTENTOS_VENTANA', default=300)
+LOGIN_FALLIDOS_INTERVALO = env.int('LOGIN_FALLIDOS_INTERVALO', default=60)
+
 # Media files (uploaded files)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -9,6 +9,8 @@ from .business import (
     format_rut,
     validar_rut,
     truncar_texto,
+    normalizar_texto,
+    tokens_busqueda,
     generar_codigo_unico,
 )
 
@@ -18,5 +20,7 @@ __all__ = [
     'format_rut',
     'validar_rut',
     'truncar_texto',
+    'normalizar_texto',
+    'tokens_busqueda',
     'generar_codigo_unico',
 ]
@@ -4,8 +4,9 @@ Utilidades de lógica de negocio reutilizables.
 Contiene funciones para validación de RUT, generación de códigos,
 formateo de texto y otras utilidades de negocio.
 """
-from typing import Optional
+from typing import List, Optional
 import re
+import unicodedata
 
 
 def format_rut(rut: str) -> str:
@@ -129,6 +130,51 @@ def truncar_texto(texto: str, longitud: int = 100, sufijo: str = '...') -> str:
     return texto[:longitud - len(sufijo)].strip() + sufijo
 
 
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza un texto para búsquedas: minúsculas y sin tildes.
+
+    Args:
+        texto: Texto a normalizar
+
+    Returns:
+        str: Texto normalizado
+
+    Example:
+        >>> normalizar_texto('José Muñoz')
+        'jose munoz'
+    """
+    if not texto:
+        return ''
+
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def tokens_busqueda(*valores: Optional[str], longitud: int = 254) -> List[str]:
+    """
+    Tokens de búsqueda de un registro: cada valor normalizado completo y sus
+    palabras, todos recortados a `longitud` caracteres.
+
+    Args:
+        valores: Textos del registro (los vacíos o None se ignoran)
+        longitud: Largo máximo de cada token (el de la columna que los guarda)
+
+    Returns:
+        List[str]: Tokens únicos ordenados
+
+    Example:
+        >>> tokens_busqueda('Ana', 'ana.perez@colegio.cl')
+        ['ana', 'ana.perez@colegio.cl', 'cl', 'colegio', 'perez']
+    """
+    tokens = set()
+    for valor in map(normalizar_texto, valores):
+        if valor:
+            tokens.add(valor)
+            tokens.update(palabra for palabra in re.split(r'[\W_]+', valor) if palabra)
+    return sorted({token[:longitud] for token in tokens})
+
+
 def generar_codigo_unico(
     prefijo: str,
     modelo,
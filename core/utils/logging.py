@@ -1,11 +1,36 @@
 """
 Utilidades centralizadas para registro de logs y auditoría.
 """
-from typing import Optional
+from typing import List, Optional, Tuple
 from django.http import HttpRequest
 from django.contrib.auth.models import User
 
 
+def extraer_referencias(meta: Optional[dict]) -> List[Tuple[str, int]]:
+    """
+    Extrae las referencias a objetos de la metadata de un log.
+
+    Cada clave `<tipo>_id` con un entero y cada `<tipo>_ids` con una lista de
+    enteros produce pares (tipo, id), sin repetidos.
+
+    Example:
+        >>> extraer_referencias({'activo_ids': [1, 2], 'toma_id': 7, 'omitidos': []})
+        [('activo', 1), ('activo', 2), ('toma', 7)]
+    """
+    referencias = []
+    for clave, valor in (meta or {}).items():
+        if clave.endswith('_ids') and isinstance(valor, (list, tuple)):
+            tipo, valores = clave[:-4], valor
+        elif clave.endswith('_id'):
+            tipo, valores = clave[:-3], [valor]
+        else:
+            continue
+        referencias.extend(
+            (tipo, v) for v in valores if isinstance(v, int) and not isinstance(v, bool)
+        )
+    return list(dict.fromkeys(referencias))
+
+
 def registrar_log_auditoria(
     usuario: User,
     accion_glosa: str,
@@ -39,7 +64,7 @@ def registrar_log_auditoria(
         ... )
     """
     # Import dentro de la función para evitar dependencias circulares
-    from apps.accounts.models import AuthLogs, AuthLogAccion
+    from apps.accounts.models import AuthLogs, AuthLogAccion, AuthLogReferencia
     from .http import get_client_ip
 
     try:
@@ -56,7 +81,7 @@ def registrar_log_auditoria(
         agente = request.META.get('HTTP_USER_AGENT', '')
 
         # Crear el log
-        AuthLogs.objects.create(
+        log = AuthLogs.objects.create(
             usuario=usuario,
             accion=accion,
             descripcion=descripcion,
@@ -65,6 +90,14 @@ def registrar_log_auditoria(
             meta=meta
         )
 
+        # Indexar los objetos referenciados en meta (activo_id, solicitud_id...)
+        referencias = extraer_referencias(meta)
+        if referencias:
+            AuthLogReferencia.objects.bulk_create([
+                AuthLogReferencia(log=log, tipo=tipo, objeto_id=objeto_id)
+                for tipo, objeto_id in referencias
+            ], batch_size=500)
+
     except Exception as e:
         # Log silencioso - no queremos que falle la operación principal
         # por un error en el logging